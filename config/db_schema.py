@@ -12,12 +12,13 @@ from sqlalchemy import (
     Float,
     Boolean,
     ForeignKey,
+    Index,
     create_engine,
     text,
     event,
 )
 from sqlalchemy.orm import declarative_base, sessionmaker
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 import os
 import hashlib
@@ -760,6 +761,21 @@ class Daughter(Base):
     spawner_service = Column(
         String(64), nullable=True
     )  # Servicio spawner que creó ésta (ej. "spawner")
+    expires_at = Column(DateTime, nullable=True)  # started_at + ttl_seconds
+
+    # Reaper del spawner: status IN (...) AND expires_at < now
+    __table_args__ = (
+        Index("ix_daughters_status_expires_at", "status", "expires_at"),
+    )
+
+
+@event.listens_for(Daughter, "before_insert")
+@event.listens_for(Daughter, "before_update")
+def _set_daughter_expires_at(mapper, connection, target):
+    if target.started_at is not None:
+        target.expires_at = target.started_at + timedelta(
+            seconds=target.ttl_seconds or 300
+        )
 
 
 class DaughterAttempt(Base):
@@ -803,6 +819,22 @@ class IntentLog(Base):
     notes = Column(Text, nullable=True)
 
 
+class CorrelationResult(Base):
+    """Resultado de un INTENT por correlation_id (GET /vx11/result)."""
+
+    __tablename__ = "vx11_results"
+
+    correlation_id = Column(String(64), primary_key=True)  # lookup exacto por PK
+    status = Column(String(16), nullable=False)  # QUEUED|RUNNING|DONE|ERROR
+    result_json = Column(Text, nullable=True)
+    error = Column(Text, nullable=True)
+    mode = Column(String(32), nullable=True)
+    provider = Column(String(64), nullable=True)
+    spawn_id = Column(String(64), nullable=True, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 def _table_exists(engine, name: str) -> bool:
     with engine.connect() as conn:
         res = conn.execute(
@@ -1129,6 +1161,44 @@ def _ensure_operator_session_unique(engine):
         pass
 
 
+def _ensure_spawns_name_index(engine):
+    """/vx11/result/spawn-* resuelve por spawns.name: lookup exacto indexado."""
+    try:
+        with engine.begin() as conn:
+            conn.execute(
+                text("CREATE INDEX IF NOT EXISTS ix_spawns_name ON spawns(name)")
+            )
+    except Exception:
+        pass
+
+
+def _ensure_daughters_expires_at(engine):
+    """BDs previas: añade daughters.expires_at, lo rellena y crea el índice del reaper."""
+    try:
+        with engine.begin() as conn:
+            columns = {
+                row[1] for row in conn.execute(text("PRAGMA table_info(daughters)"))
+            }
+            if columns and "expires_at" not in columns:
+                conn.execute(text("ALTER TABLE daughters ADD COLUMN expires_at DATETIME"))
+                conn.execute(
+                    text(
+                        "UPDATE daughters SET expires_at = "
+                        "strftime('%Y-%m-%d %H:%M:%f', started_at, "
+                        "'+' || COALESCE(ttl_seconds, 300) || ' seconds') "
+                        "WHERE started_at IS NOT NULL"
+                    )
+                )
+            conn.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_daughters_status_expires_at "
+                    "ON daughters(status, expires_at)"
+                )
+            )
+    except Exception:
+        pass
+
+
 def _seed_canonical_tables(engine):
     repo_root = Path(__file__).resolve().parents[1]
     master_path = repo_root / "docs" / "CANONICAL_MASTER_VX11.json"
@@ -1286,6 +1356,8 @@ if os.environ.get("VX11_TEST_IMPORT_SAFE", "0") in ("0", "false", "False", ""):
     Base.metadata.create_all(unified_engine)
     migrate_legacy_tables(unified_engine)
     _ensure_operator_session_unique(unified_engine)
+    _ensure_spawns_name_index(unified_engine)
+    _ensure_daughters_expires_at(unified_engine)
     _seed_canonical_tables(unified_engine)
 else:
     # En modo de import seguro para tests, evitamos crear/migrar tablas
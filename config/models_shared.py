@@ -7,6 +7,8 @@ class SpawnCallbackRequest(BaseModel):
     status: str = Field(..., min_length=1)  # DONE|ERROR|...
     result: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
+    spawn_id: Optional[str] = None
+    duration_ms: Optional[int] = None
 
 class SpawnCallbackResponse(BaseModel):
     ok: bool = True
@@ -147,6 +147,21 @@ class VX11Settings(BaseSettings):
     deepseek_monthly_limit_tokens: int = 3000000
     deepseek_reset_hour_utc: int = 0
 
+    # ========== SHUBNIGGURATH DSP ==========
+    shub_dsp_workers: Optional[int] = None  # None = núcleos físicos; 0 = in-process
+    shub_batch_workers: Optional[int] = None  # Archivos concurrentes por batch job
+    shub_analysis_cache_path: str = "/app/data/runtime/shub_analysis_cache.db"
+    shub_analysis_cache_max_mb: int = 256  # 0 = caché desactivada
+
+    # ========== MADRE RUNNER ==========
+    madre_plan_max_parallel: int = 4  # pasos de un plan en vuelo a la vez (1 = secuencial)
+    madre_result_wait_max_s: float = 30.0  # tope del long-poll de /vx11/result
+    madre_result_cache_ttl_s: float = 300.0  # resultados terminados en memoria
+    madre_write_behind_batch: int = 100  # filas de routing/usage por transacción
+    madre_write_behind_interval_s: float = 1.0  # flush periódico de la cola write-behind
+    madre_write_behind_max_pending: int = 10000  # tope; se descartan las más antiguas
+    madre_daughter_poll_fallback_s: float = 15.0  # sondeo de respaldo si no llega la notificación
+
     # ========== LEARNER (IA DECISIONES) ==========
     learner_db_name: str = "hive"
     learner_min_confidence: float = 0.5
@@ -15,6 +15,8 @@ from .parser import FallbackParser
 from .policy import PolicyEngine
 from .planner import Planner
 from .runner import Runner
+from .results import ResultStore
+from .write_behind import WriteBehindQueue
 from .delegation import DelegationClient
 
 __all__ = [
@@ -31,5 +33,7 @@ __all__ = [
     "PolicyEngine",
     "Planner",
     "Runner",
+    "ResultStore",
+    "WriteBehindQueue",
     "DelegationClient",
 ]
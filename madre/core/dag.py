@@ -0,0 +1,76 @@
+"""DAG scheduling shared by plan steps (Runner) and compiled DSL workflows."""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+
+async def run_dag(
+    order_deps: List[Set[int]],
+    data_deps: List[Set[int]],
+    run: Callable[[int], Awaitable[bool]],
+    skip: Callable[[int, Optional[int]], None],
+    max_parallel: int,
+    finished: Optional[Dict[int, bool]] = None,
+    barrier: Optional[Callable[[int], bool]] = None,
+) -> bool:
+    """
+    Run steps 0..n-1 once their dependencies have finished.
+
+    run(i) executes step i and returns True on success. Ready steps run
+    concurrently, at most max_parallel at a time, picked in list order.
+
+    - order_deps only sequence steps; data_deps also propagate failure: a
+      step whose data dependency failed is not run, skip(i, j) is called
+      with the failed dependency j and the step counts as failed.
+    - Steps that can never become ready (unknown index, self-reference or a
+      cycle) are reported with skip(i, None).
+    - finished maps steps completed in an earlier run to their outcome.
+    - barrier(i) True stops scheduling at ready step i; once in-flight steps
+      finish the call returns False (paused). Otherwise returns True.
+
+    Cancelling the caller cancels in-flight steps.
+    """
+    outcome: Dict[int, bool] = dict(finished or {})
+    pending = [i for i in range(len(order_deps)) if i not in outcome]
+    running: Dict[asyncio.Task, int] = {}
+    limit = max(1, max_parallel)
+
+    try:
+        while pending or running:
+            paused = False
+            for i in list(pending):
+                if len(running) >= limit:
+                    break
+                if not (order_deps[i] | data_deps[i]) <= outcome.keys():
+                    continue
+                if barrier is not None and barrier(i):
+                    paused = True
+                    break
+
+                pending.remove(i)
+                failed = sorted(j for j in data_deps[i] if not outcome[j])
+                if failed:
+                    skip(i, failed[0])
+                    outcome[i] = False
+                    continue
+                running[asyncio.create_task(run(i))] = i
+
+            if paused and not running:
+                return False
+
+            if not running:
+                # Nothing runnable: unknown steps or a dependency cycle
+                for i in pending:
+                    skip(i, None)
+                    outcome[i] = False
+                break
+
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                outcome[running.pop(task)] = bool(task.result())
+    except BaseException:
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+        raise
+    return True
@@ -10,18 +10,198 @@ from config.db_schema import (
     DaughterTask,
     RoutingEvent,
     CLIUsageStat,
+    CorrelationResult,
 )
 from datetime import datetime
 import json
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 log = logging.getLogger("madre.db")
 
+# Observational tables accepted by MadreDB.insert_observations()
+OBSERVATION_MODELS = {
+    "routing_event": RoutingEvent,
+    "cli_usage_stat": CLIUsageStat,
+}
+
+
+def _apply_result(
+    db,
+    correlation_id: str,
+    status: str,
+    result: Any = None,
+    error: Optional[str] = None,
+    mode: Optional[str] = None,
+    provider: Optional[str] = None,
+    spawn_id: Optional[str] = None,
+) -> None:
+    """Upsert a vx11_results row inside an open session (no commit)."""
+    entry = db.get(CorrelationResult, correlation_id)
+    if entry is None:
+        entry = CorrelationResult(correlation_id=correlation_id)
+        db.add(entry)
+    entry.status = status
+    entry.result_json = json.dumps(result, default=str) if result is not None else None
+    entry.error = error
+    entry.mode = mode or entry.mode
+    entry.provider = provider or entry.provider
+    entry.spawn_id = spawn_id or entry.spawn_id
+    entry.updated_at = datetime.utcnow()
+
+
+class IntentUnitOfWork:
+    """
+    Bookkeeping for one intent, staged in memory and written in a single
+    transaction by commit().
+
+    Staging is last-write-wins for the intent log status and the result, so
+    an error path can simply overwrite what the happy path staged. Callbacks
+    registered with after_commit() run only once commit() has succeeded; a
+    failed commit discards them.
+    """
+
+    def __init__(self):
+        self.intent_log_id: Optional[int] = None
+        self._intent: Optional[Dict[str, Any]] = None
+        self._tasks: List[Dict[str, Any]] = []
+        self._contexts: List[Dict[str, Any]] = []
+        self._result: Optional[Dict[str, Any]] = None
+        self._after_commit: List[Callable[[], None]] = []
+
+    def log_intent(
+        self,
+        source: str,
+        payload: Dict[str, Any],
+        result_status: str = "planned",
+        notes: Optional[str] = None,
+    ) -> None:
+        """Stage the intents_log row."""
+        self._intent = {
+            "source": source,
+            "payload": payload,
+            "result_status": result_status,
+            "notes": notes or "",
+            "closed": False,
+        }
+
+    def close_intent(self, result_status: str, notes: Optional[str] = None) -> None:
+        """Stage the final intents_log status (see MadreDB.close_intent_log)."""
+        if self._intent is None:
+            return
+        self._intent["result_status"] = result_status
+        self._intent["closed"] = True
+        if notes:
+            self._intent["notes"] = notes
+
+    def create_task(
+        self,
+        task_id: str,
+        name: str,
+        module: str,
+        action: str,
+        status: str = "pending",
+    ) -> None:
+        """Stage a tasks row."""
+        self._tasks.append(
+            {"uuid": task_id, "name": name, "module": module, "action": action, "status": status}
+        )
+
+    def set_context(self, task_id: str, key: str, value: Any, scope: str = "global") -> None:
+        """Stage a context key-value pair."""
+        self._contexts.append(
+            {
+                "task_id": task_id,
+                "key": key,
+                "value": json.dumps(value) if not isinstance(value, str) else value,
+                "scope": scope,
+            }
+        )
+
+    def upsert_result(
+        self,
+        correlation_id: str,
+        status: str,
+        result: Any = None,
+        error: Optional[str] = None,
+        mode: Optional[str] = None,
+        provider: Optional[str] = None,
+        spawn_id: Optional[str] = None,
+    ) -> None:
+        """Stage the vx11_results row (see MadreDB.upsert_result)."""
+        self._result = {
+            "correlation_id": correlation_id,
+            "status": status,
+            "result": result,
+            "error": error,
+            "mode": mode,
+            "provider": provider,
+            "spawn_id": spawn_id,
+        }
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Run callback after the next successful commit()."""
+        self._after_commit.append(callback)
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._intent or self._tasks or self._contexts or self._result)
+
+    def commit(self) -> Optional[int]:
+        """Write everything staged in one transaction. Returns the intents_log ID."""
+        if not self.pending:
+            self._run_after_commit()
+            return self.intent_log_id
+        db = get_session("vx11")
+        try:
+            entry = None
+            if self._intent is not None:
+                entry = IntentLog(
+                    source=self._intent["source"],
+                    payload_json=json.dumps(self._intent["payload"]),
+                    result_status=self._intent["result_status"],
+                    notes=self._intent["notes"],
+                )
+                if self._intent["closed"]:
+                    entry.processed_by_madre_at = datetime.utcnow()
+                db.add(entry)
+            db.add_all(Task(**task) for task in self._tasks)
+            db.add_all(Context(**ctx) for ctx in self._contexts)
+            if self._result is not None:
+                _apply_result(db, **self._result)
+            db.commit()
+            if entry is not None:
+                self.intent_log_id = entry.id
+        except Exception as e:
+            log.error(f"intent unit of work failed: {e}")
+            db.rollback()
+            self._after_commit = []
+            raise
+        finally:
+            db.close()
+
+        self._intent = None
+        self._tasks, self._contexts, self._result = [], [], None
+        self._run_after_commit()
+        return self.intent_log_id
+
+    def _run_after_commit(self) -> None:
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                log.error(f"after_commit callback failed: {e}")
+
 
 class MadreDB:
     """Repository pattern: encapsulates all Madre DB writes/reads."""
 
+    @staticmethod
+    def unit_of_work() -> IntentUnitOfWork:
+        """Start staging one intent's bookkeeping; nothing is written until commit()."""
+        return IntentUnitOfWork()
+
     @staticmethod
     def create_intent_log(
         source: str,
@@ -250,6 +430,49 @@ class MadreDB:
         finally:
             db.close()
 
+    @staticmethod
+    def upsert_result(
+        correlation_id: str,
+        status: str,
+        result: Any = None,
+        error: Optional[str] = None,
+        mode: Optional[str] = None,
+        provider: Optional[str] = None,
+        spawn_id: Optional[str] = None,
+    ) -> None:
+        """Insert or update vx11_results row (exact match on correlation_id)."""
+        db = get_session("vx11")
+        try:
+            _apply_result(db, correlation_id, status, result, error, mode, provider, spawn_id)
+            db.commit()
+        except Exception as e:
+            log.error(f"upsert_result failed: {e}")
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    @staticmethod
+    def get_result(correlation_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve vx11_results row by correlation_id."""
+        db = get_session("vx11")
+        try:
+            entry = db.get(CorrelationResult, correlation_id)
+            if entry is None:
+                return None
+            return {
+                "correlation_id": entry.correlation_id,
+                "status": entry.status,
+                "result": json.loads(entry.result_json) if entry.result_json else None,
+                "error": entry.error,
+                "mode": entry.mode,
+                "provider": entry.provider,
+                "spawn_id": entry.spawn_id,
+                "updated_at": entry.updated_at.isoformat() if entry.updated_at else None,
+            }
+        finally:
+            db.close()
+
     @staticmethod
     def insert_routing_event(
         trace_id: str,
@@ -340,3 +563,23 @@ class MadreDB:
             return None
         finally:
             db.close()
+
+    @staticmethod
+    def insert_observations(rows: List[Tuple[str, Dict[str, Any]]]) -> int:
+        """Bulk insert observational rows (kind, fields) in one transaction.
+
+        kind is a key of OBSERVATION_MODELS. Returns the number of rows written.
+        """
+        if not rows:
+            return 0
+        db = get_session("vx11")
+        try:
+            db.add_all(OBSERVATION_MODELS[kind](**fields) for kind, fields in rows)
+            db.commit()
+            return len(rows)
+        except Exception as e:
+            log.error(f"insert_observations failed: {e}")
+            db.rollback()
+            raise
+        finally:
+            db.close()
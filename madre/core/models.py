@@ -80,10 +80,14 @@ class StepV2(BaseModel):
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     result: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
+    # step_ids this step waits for. None = after the previous step (sequential)
+    depends_on: Optional[List[str]] = None
+    started_at: Optional[datetime] = None
+    duration_ms: Optional[float] = None
 
 
 class PlanV2(BaseModel):
-    """Canonical plan: sequence of steps."""
+    """Canonical plan: DAG of steps (list order + depends_on)."""
 
     plan_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     intent_id: str
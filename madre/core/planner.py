@@ -1,4 +1,4 @@
-"""Planner: Intent → Plan (sequence of steps)."""
+"""Planner: Intent → Plan (steps + dependencies)."""
 
 import logging
 from typing import List, Optional, Dict, Any
@@ -45,11 +45,20 @@ class Planner:
         else:
             plan.steps.extend(self._plan_madre(intent))
 
-        # Step 3: Gather results (NOOP placeholder)
+        # Routed steps are independent of each other and of the healthcheck
+        # (run concurrently). The healthcheck never gated them: a failed step
+        # does not stop a plan, so it only delayed them. Its result is
+        # collected by the gather step. Blocking steps still act as barriers.
+        for step in plan.steps:
+            if step.depends_on is None and not step.blocking:
+                step.depends_on = []
+
+        # Step 3: Gather results (NOOP placeholder), after every earlier step
         plan.steps.append(
             StepV2(
                 type=StepType.NOOP,
                 payload={"reason": "plan_complete"},
+                depends_on=[step.step_id for step in plan.steps],
             )
         )
 
@@ -0,0 +1,147 @@
+"""Result store: correlation_id -> result, with long-poll waiters."""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from .db import IntentUnitOfWork, MadreDB
+
+log = logging.getLogger("madre.results")
+
+TERMINAL_STATUSES = {"DONE", "ERROR"}
+
+# Spawner callback status -> result status
+SPAWN_STATUS_MAP = {
+    "done": "DONE",
+    "success": "DONE",
+    "completed": "DONE",
+    "failed": "ERROR",
+    "error": "ERROR",
+    "timeout": "ERROR",
+    "running": "RUNNING",
+}
+
+
+class ResultStore:
+    """
+    Results keyed by correlation_id.
+
+    Writes go to vx11_results (primary-key lookups). Completed results are
+    also kept in a short-lived in-memory cache, and wait() parks callers on
+    a future that is resolved the moment a terminal result is written.
+    """
+
+    def __init__(self, cache_ttl_s: float = 300.0, cache_max_entries: int = 1024):
+        self.cache_ttl_s = cache_ttl_s
+        self.cache_max_entries = cache_max_entries
+        self._cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+
+    def put(
+        self,
+        correlation_id: str,
+        status: str,
+        result: Any = None,
+        error: Optional[str] = None,
+        mode: Optional[str] = None,
+        provider: Optional[str] = None,
+        spawn_id: Optional[str] = None,
+        uow: Optional[IntentUnitOfWork] = None,
+    ) -> Dict[str, Any]:
+        """
+        Persist a result and wake waiters if it is terminal.
+
+        With uow the row is staged in that unit of work instead of being
+        committed here; the caller commits it, and the cache and waiters only
+        see the result once that commit succeeds.
+        """
+        status = status.upper()
+        record = {
+            "correlation_id": correlation_id,
+            "status": status,
+            "result": result,
+            "error": error,
+            "mode": mode,
+            "provider": provider,
+            "spawn_id": spawn_id,
+            "updated_at": datetime.utcnow().isoformat(),
+        }
+        try:
+            (uow or MadreDB).upsert_result(
+                correlation_id,
+                status,
+                result=result,
+                error=error,
+                mode=mode,
+                provider=provider,
+                spawn_id=spawn_id,
+            )
+        except Exception as e:
+            # Waiters still get the in-memory result
+            log.error(f"result persist failed for {correlation_id}: {e}")
+
+        if uow is not None:
+            uow.after_commit(lambda: self._publish(correlation_id, record))
+        else:
+            self._publish(correlation_id, record)
+        return record
+
+    def get(self, correlation_id: str) -> Optional[Dict[str, Any]]:
+        """Latest result: in-memory cache first, then the DB."""
+        cached = self._cache.get(correlation_id)
+        if cached is not None:
+            expires_at, record = cached
+            if expires_at > time.monotonic():
+                self._cache.move_to_end(correlation_id)
+                return record
+            del self._cache[correlation_id]
+
+        try:
+            record = MadreDB.get_result(correlation_id)
+        except Exception as e:
+            log.error(f"result lookup failed for {correlation_id}: {e}")
+            return None
+        if record is not None and record["status"] in TERMINAL_STATUSES:
+            self._remember(correlation_id, record)
+        return record
+
+    async def wait(self, correlation_id: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        Long-poll: return as soon as the result is terminal, or the latest
+        known state (possibly None) once timeout seconds have passed.
+        """
+        record = self.get(correlation_id)
+        if timeout <= 0 or (record is not None and record["status"] in TERMINAL_STATUSES):
+            return record
+
+        future = asyncio.get_running_loop().create_future()
+        waiters = self._waiters.setdefault(correlation_id, [])
+        waiters.append(future)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return self.get(correlation_id)
+        finally:
+            if future in waiters:
+                waiters.remove(future)
+            if not waiters and self._waiters.get(correlation_id) is waiters:
+                del self._waiters[correlation_id]
+
+    def _publish(self, correlation_id: str, record: Dict[str, Any]) -> None:
+        """Cache a terminal result and wake its waiters."""
+        if record["status"] in TERMINAL_STATUSES:
+            self._remember(correlation_id, record)
+            for future in self._waiters.pop(correlation_id, []):
+                if not future.done():
+                    future.set_result(record)
+        else:
+            self._cache.pop(correlation_id, None)
+
+    def _remember(self, correlation_id: str, record: Dict[str, Any]) -> None:
+        self._cache[correlation_id] = (time.monotonic() + self.cache_ttl_s, record)
+        self._cache.move_to_end(correlation_id)
+        while len(self._cache) > self.cache_max_entries:
+            self._cache.popitem(last=False)
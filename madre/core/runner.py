@@ -1,8 +1,12 @@
-"""Runner: executes plan steps."""
+"""Runner: executes plan steps (dependency DAG, bounded concurrency)."""
 
+import asyncio
 import logging
+import time
 import httpx
-from typing import Optional, Dict, Any
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Set, Tuple
+from .dag import run_dag
 from .models import PlanV2, StatusEnum, StepType
 from .db import MadreDB
 from config.settings import settings
@@ -14,52 +18,137 @@ log = logging.getLogger("madre.runner")
 class Runner:
     """Executes plan steps safely."""
 
-    def __init__(self, timeout_sec: float = 5.0):
+    def __init__(self, timeout_sec: float = 5.0, max_parallel: Optional[int] = None):
         self.timeout_sec = timeout_sec
+        self.max_parallel = max(1, max_parallel or settings.madre_plan_max_parallel)
 
     async def execute_plan(self, plan: PlanV2, plan_id: str) -> PlanV2:
-        """Execute all steps in plan. Returns updated plan."""
+        """
+        Execute plan steps as a DAG. Returns updated plan.
+
+        Ready steps (all dependencies finished) run concurrently, at most
+        max_parallel at a time. A failed step does not stop the plan; only
+        steps that explicitly depend on it are marked as errors. A blocking
+        WAITING step is a barrier: once reached, in-flight steps finish and
+        the plan pauses. Cancelling the caller cancels in-flight steps,
+        which stay PENDING.
+        """
         plan.status = StatusEnum.RUNNING
+        plan_start = time.perf_counter()
 
-        for i, step in enumerate(plan.steps):
-            log.info(f"Executing step {i}: {step.type}")
+        order_deps, data_deps = self._dependencies(plan)
+        finished = {
+            i: step.status == StatusEnum.DONE
+            for i, step in enumerate(plan.steps)
+            if step.status in (StatusEnum.DONE, StatusEnum.ERROR)
+        }
 
-            # Skip if already done/error
-            if step.status in [StatusEnum.DONE, StatusEnum.ERROR]:
-                continue
+        async def run(i: int) -> bool:
+            log.info(f"Executing step {i}: {plan.steps[i].type}")
+            await self._run_step(plan, i)
+            return plan.steps[i].status == StatusEnum.DONE
 
-            # If blocking and waiting, stop execution
-            if step.blocking and step.status == StatusEnum.WAITING:
-                log.info(f"Step {i} is blocking and waiting. Pausing plan.")
-                plan.status = StatusEnum.WAITING
-                MadreDB.update_task(plan_id, status="WAITING")
-                return plan
+        def skip(i: int, failed: Optional[int]) -> None:
+            if failed is None:
+                self._fail_step(plan, i, "unresolvable_dependencies")
+            else:
+                self._fail_step(plan, i, f"dependency_failed:{plan.steps[failed].step_id}")
 
-            try:
-                result = await self._execute_step(step)
-                step.result = result
-                step.status = StatusEnum.DONE
-                MadreDB.record_action(
-                    module="madre",
-                    action=f"step_executed:{step.type}",
-                    reason=f"step_{i}",
-                )
-            except Exception as e:
-                log.error(f"Step {i} failed: {e}")
-                step.error = str(e)
-                step.status = StatusEnum.ERROR
-                # Don't stop plan; continue with other steps
-                MadreDB.record_action(
-                    module="madre",
-                    action=f"step_failed:{step.type}",
-                    reason=str(e),
-                )
+        def barrier(i: int) -> bool:
+            step = plan.steps[i]
+            return step.blocking and step.status == StatusEnum.WAITING
+
+        completed = await run_dag(
+            order_deps, data_deps, run, skip, self.max_parallel, finished, barrier
+        )
+        if not completed:
+            log.info("Plan reached a blocking step that is waiting. Pausing plan.")
+            plan.status = StatusEnum.WAITING
+            MadreDB.update_task(plan_id, status="WAITING")
+            return plan
 
         # All steps completed (or had errors)
+        total_ms = (time.perf_counter() - plan_start) * 1000
+        steps_ms = sum(step.duration_ms or 0.0 for step in plan.steps)
+        log.info(f"Plan {plan_id} done in {total_ms:.1f}ms (sum of steps {steps_ms:.1f}ms)")
         plan.status = StatusEnum.DONE
         MadreDB.update_task(plan_id, status="DONE", result=plan.json())
         return plan
 
+    def _dependencies(self, plan: PlanV2) -> Tuple[List[Set[int]], List[Set[int]]]:
+        """
+        (order, data) dependency index sets per step.
+
+        data: explicit depends_on (a failure propagates to dependents).
+        order: legacy sequencing (depends_on=None waits for the previous step)
+        and blocking-step barriers; failures do not propagate.
+        """
+        index = {step.step_id: i for i, step in enumerate(plan.steps)}
+        order: List[Set[int]] = [set() for _ in plan.steps]
+        data: List[Set[int]] = [set() for _ in plan.steps]
+
+        barrier: Optional[int] = None
+        for i, step in enumerate(plan.steps):
+            if step.depends_on is None:
+                if i > 0:
+                    order[i].add(i - 1)
+            else:
+                for step_id in step.depends_on:
+                    # Unknown ids never resolve (reported as unresolvable)
+                    data[i].add(index.get(step_id, i))
+            if barrier is not None:
+                order[i].add(barrier)
+            if step.blocking:
+                order[i].update(range(i))
+                barrier = i
+
+        return order, data
+
+    async def _run_step(self, plan: PlanV2, i: int) -> None:
+        """Execute one step and record its status, result and timing."""
+        step = plan.steps[i]
+        step.status = StatusEnum.RUNNING
+        step.started_at = datetime.utcnow()
+        start = time.perf_counter()
+        try:
+            step.result = await self._execute_step(step)
+            step.status = StatusEnum.DONE
+            MadreDB.record_action(
+                module="madre",
+                action=f"step_executed:{step.type}",
+                reason=f"step_{i}",
+            )
+        except asyncio.CancelledError:
+            step.status = StatusEnum.PENDING
+            step.started_at = None
+            raise
+        except Exception as e:
+            log.error(f"Step {i} failed: {e}")
+            step.error = str(e)
+            step.status = StatusEnum.ERROR
+            # Don't stop plan; continue with other steps
+            MadreDB.record_action(
+                module="madre",
+                action=f"step_failed:{step.type}",
+                reason=str(e),
+            )
+        finally:
+            if step.started_at is not None:
+                step.duration_ms = (time.perf_counter() - start) * 1000
+            step.updated_at = datetime.utcnow()
+
+    def _fail_step(self, plan: PlanV2, i: int, reason: str) -> None:
+        step = plan.steps[i]
+        log.error(f"Step {i} not executed: {reason}")
+        step.error = reason
+        step.status = StatusEnum.ERROR
+        step.updated_at = datetime.utcnow()
+        MadreDB.record_action(
+            module="madre",
+            action=f"step_failed:{step.type}",
+            reason=reason,
+        )
+
     async def _execute_step(self, step) -> Dict[str, Any]:
         """Execute single step."""
         if step.type == StepType.SYSTEM_HEALTHCHECK:
@@ -0,0 +1,140 @@
+"""Write-behind queue: observational rows flushed to the DB in batches."""
+
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from .db import MadreDB, OBSERVATION_MODELS
+
+log = logging.getLogger("madre.write_behind")
+
+
+class WriteBehindQueue:
+    """
+    Buffers routing events and CLI usage stats off the request path.
+
+    enqueue() never touches the DB. A background flusher writes up to
+    batch_size rows per transaction, every interval_s or as soon as a full
+    batch is waiting. When max_pending is exceeded the oldest rows are
+    dropped (they are metrics, not state), also when a failed batch is put
+    back. stop() lets an in-flight flush finish, then drains what is left.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 100,
+        interval_s: float = 1.0,
+        max_pending: int = 10000,
+    ):
+        self.batch_size = max(1, batch_size)
+        self.interval_s = interval_s
+        self.max_pending = max_pending
+        self.dropped = 0
+        self.written = 0
+        self._pending: Deque[Tuple[str, Dict[str, Any]]] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def enqueue(self, kind: str, **fields: Any) -> None:
+        """Queue one row for table kind (see OBSERVATION_MODELS)."""
+        if kind not in OBSERVATION_MODELS:
+            raise ValueError(f"unknown observation kind: {kind}")
+        fields.setdefault("timestamp", datetime.utcnow())
+        self._pending.append((kind, fields))
+        self._trim()
+        if self._wakeup is not None and len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    def _trim(self) -> None:
+        """Drop the oldest rows beyond max_pending."""
+        while len(self._pending) > self.max_pending:
+            self._pending.popleft()
+            self.dropped += 1
+
+    def routing_event(
+        self,
+        trace_id: str,
+        route_type: str,
+        provider_id: str,
+        score: Optional[float] = None,
+        reasoning_short: Optional[str] = None,
+    ) -> None:
+        """Queued counterpart of MadreDB.insert_routing_event."""
+        self.enqueue(
+            "routing_event",
+            trace_id=trace_id,
+            route_type=route_type,
+            provider_id=provider_id,
+            score=score or 0.0,
+            reasoning_short=reasoning_short,
+        )
+
+    def cli_usage_stat(
+        self,
+        provider_id: str,
+        success: bool,
+        latency_ms: int,
+        cost_estimated: Optional[float] = None,
+        tokens_estimated: Optional[int] = None,
+        error_class: Optional[str] = None,
+    ) -> None:
+        """Queued counterpart of MadreDB.insert_cli_usage_stat."""
+        self.enqueue(
+            "cli_usage_stat",
+            provider_id=provider_id,
+            success=success,
+            latency_ms=latency_ms,
+            cost_estimated=cost_estimated or 0.0,
+            tokens_estimated=tokens_estimated or 0,
+            error_class=error_class,
+        )
+
+    async def flush(self) -> int:
+        """Write everything pending, one transaction per batch."""
+        total = 0
+        while self._pending:
+            batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+            try:
+                total += await asyncio.to_thread(MadreDB.insert_observations, batch)
+            except Exception as e:
+                # Put the batch back and retry on the next tick
+                self._pending.extendleft(reversed(batch))
+                self._trim()
+                log.error(f"write-behind flush failed ({len(batch)} rows kept): {e}")
+                break
+        self.written += total
+        return total
+
+    def start(self) -> None:
+        """Start the background flusher on the running loop."""
+        if self._task is None or self._task.done():
+            self._stopping = False
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flusher and drain pending rows."""
+        if self._task is not None:
+            # Cancelling could interrupt a flush whose batch is already
+            # popped; let the loop finish it and exit on its own instead
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        self._wakeup = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval_s)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
@@ -37,6 +37,18 @@ logger = logging.getLogger(__name__)
 VX11_TOKEN = get_token("VX11_GATEWAY_TOKEN") or settings.api_token
 AUTH_HEADERS = {settings.token_header: VX11_TOKEN}
 
+TERMINAL_STATUSES = ("completed", "failed", "expired")
+
+# Estado de la fila daughters escrita por Spawner -> estado local
+SPAWNER_STATUS_MAP = {
+    "completed": "completed",
+    "finished": "completed",
+    "failed": "failed",
+    "killed": "failed",
+    "cancelled": "failed",
+    "expired": "expired",
+}
+
 
 class Daughter:
     """Represenación de una hija (proceso autónomo coordinado)."""
@@ -60,6 +72,8 @@ class Daughter:
         self.result: Optional[Dict[str, Any]] = None
         self.error: Optional[str] = None
         self.spawner_pid: Optional[int] = None
+        self.spawn_uuid: Optional[str] = None
+        self.spawner_daughter_id: Optional[int] = None
         self.progress: float = 0.0
         self.last_heartbeat: Optional[datetime] = None
         self.mutation_level: int = 0
@@ -72,6 +86,13 @@ class Daughter:
         elapsed = (datetime.utcnow() - self.started_at).total_seconds()
         return elapsed > self.ttl_seconds
     
+    def seconds_to_expiry(self) -> float:
+        """Segundos hasta que expire el TTL (inf si no ha arrancado)."""
+        if not self.started_at:
+            return float("inf")
+        elapsed = (datetime.utcnow() - self.started_at).total_seconds()
+        return max(0.0, self.ttl_seconds - elapsed)
+    
     def is_stale(self, threshold_seconds: int = 30) -> bool:
         """Verificar si hija no ha reportado en threshold_seconds."""
         if not self.last_heartbeat:
@@ -100,12 +121,46 @@ class Daughter:
 
 
 class DaughterManager:
-    """Gestor de hijas con soporte real a Spawner."""
+    """
+    Gestor de hijas con soporte real a Spawner.
+    
+    La finalización es por eventos: complete/fail (notificados por Spawner)
+    resuelven los futures de wait_for_daughter al instante. Un sondeo lento
+    de la BD de Spawner queda como respaldo por si se pierde la notificación.
+    """
     
-    def __init__(self):
+    def __init__(self, poll_fallback_interval: Optional[float] = None):
         self.daughters: Dict[str, Daughter] = {}
         self.max_concurrent = 8  # Máximo 8 hijas simultáneamente
         self.heartbeat_interval = 10  # Segundos entre heartbeats
+        self.poll_fallback_interval = (
+            poll_fallback_interval
+            if poll_fallback_interval is not None
+            else settings.madre_daughter_poll_fallback_s
+        )
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+        # Ids con los que Spawner notifica (daughter_id entero, spawn_uuid) -> id local
+        self._aliases: Dict[str, str] = {}
+    
+    def _get(self, daughter_id: Any) -> Optional[Daughter]:
+        """Buscar hija por id local o por cualquiera de sus ids en Spawner."""
+        key = str(daughter_id)
+        daughter = self.daughters.get(key)
+        if daughter is None and key in self._aliases:
+            daughter = self.daughters.get(self._aliases[key])
+        return daughter
+    
+    def _finish(self, daughter: Daughter) -> None:
+        """Despertar a quien espera esta hija (estado ya terminal)."""
+        record = daughter.to_dict()
+        for future in self._waiters.pop(daughter.id, []):
+            if not future.done():
+                future.set_result(record)
+    
+    def _expire(self, daughter: Daughter) -> None:
+        daughter.status = "expired"
+        daughter.completed_at = daughter.completed_at or datetime.utcnow()
+        self._finish(daughter)
     
     async def spawn_daughter(self,
                             task_name: str,
@@ -154,6 +209,7 @@ class DaughterManager:
                 "intent_type": task_type,
                 "purpose": task_name,
                 "ttl": ttl_seconds,
+                "priority": daughter.priority,
                 "context": {
                     "daughter_id": daughter.id,
                     "parameters": parameters,
@@ -176,6 +232,11 @@ class DaughterManager:
             
             result = resp.json()
             daughter.spawner_pid = result.get("pid")
+            daughter.spawn_uuid = result.get("spawn_uuid")
+            daughter.spawner_daughter_id = result.get("daughter_id")
+            for alias in (daughter.spawn_uuid, daughter.spawner_daughter_id):
+                if alias is not None:
+                    self._aliases[str(alias)] = daughter.id
             daughter.status = "running"
             daughter.started_at = datetime.utcnow()
             daughter.last_heartbeat = datetime.utcnow()
@@ -205,7 +266,7 @@ class DaughterManager:
         Returns:
             True si heartbeat registrado
         """
-        daughter = self.daughters.get(daughter_id)
+        daughter = self._get(daughter_id)
         if not daughter:
             logger.warning(f"Heartbeat from unknown daughter: {daughter_id}")
             return False
@@ -215,7 +276,7 @@ class DaughterManager:
         
         # Verificar TTL
         if daughter.is_expired():
-            daughter.status = "expired"
+            self._expire(daughter)
             write_log("madre", f"daughter_expired:{daughter_id}")
             return False
         
@@ -223,7 +284,7 @@ class DaughterManager:
     
     async def complete_daughter(self, daughter_id: str, result: Dict[str, Any]) -> bool:
         """Marcar hija como completada."""
-        daughter = self.daughters.get(daughter_id)
+        daughter = self._get(daughter_id)
         if not daughter:
             return False
         
@@ -231,34 +292,36 @@ class DaughterManager:
         daughter.completed_at = datetime.utcnow()
         daughter.result = result
         daughter.progress = 1.0
+        self._finish(daughter)
         
-        write_log("madre", f"daughter_completed:{daughter_id}")
-        logger.info(f"✓ Daughter {daughter_id} completed")
+        write_log("madre", f"daughter_completed:{daughter.id}")
+        logger.info(f"✓ Daughter {daughter.id} completed")
         return True
     
     async def fail_daughter(self, daughter_id: str, error: str) -> bool:
         """Marcar hija como fallida."""
-        daughter = self.daughters.get(daughter_id)
+        daughter = self._get(daughter_id)
         if not daughter:
             return False
         
         daughter.status = "failed"
         daughter.completed_at = datetime.utcnow()
         daughter.error = error
+        self._finish(daughter)
         
-        write_log("madre", f"daughter_failed:{daughter_id}:{error}", level="ERROR")
-        logger.error(f"✗ Daughter {daughter_id} failed: {error}")
+        write_log("madre", f"daughter_failed:{daughter.id}:{error}", level="ERROR")
+        logger.error(f"✗ Daughter {daughter.id} failed: {error}")
         return True
     
     async def get_daughter_status(self, daughter_id: str) -> Optional[Dict[str, Any]]:
         """Obtener estado de hija."""
-        daughter = self.daughters.get(daughter_id)
+        daughter = self._get(daughter_id)
         if not daughter:
             return None
         
         # Verificar si expiró
         if daughter.status == "running" and daughter.is_expired():
-            daughter.status = "expired"
+            self._expire(daughter)
         
         # Verificar si está stale (sin heartbeat)
         if daughter.status == "running" and daughter.is_stale(threshold_seconds=60):
@@ -272,7 +335,7 @@ class DaughterManager:
         for daughter in self.daughters.values():
             # Actualizar estado si expiró
             if daughter.status == "running" and daughter.is_expired():
-                daughter.status = "expired"
+                self._expire(daughter)
             
             if status_filter and daughter.status != status_filter:
                 continue
@@ -282,26 +345,78 @@ class DaughterManager:
         return daughters_list
     
     async def wait_for_daughter(self, daughter_id: str, timeout: float = 300.0) -> Optional[Dict[str, Any]]:
-        """Esperar a que hija se complete (blocking)."""
-        start_time = time.time()
-        poll_interval = 0.5  # Poll cada 500ms
+        """
+        Esperar a que hija se complete (blocking).
         
-        while True:
-            daughter = self.daughters.get(daughter_id)
-            if not daughter:
-                logger.warning(f"Daughter {daughter_id} not found")
-                return None
-            
-            # Check si completó o falló
-            if daughter.status in ("completed", "failed", "expired"):
-                return daughter.to_dict()
-            
-            # Check timeout
-            if time.time() - start_time > timeout:
-                logger.warning(f"Timeout waiting for daughter {daughter_id}")
-                return None
-            
-            await asyncio.sleep(poll_interval)
+        Se despierta en cuanto complete/fail/expiración resuelven el future.
+        Cada poll_fallback_interval (o al vencer el TTL) se consulta la BD
+        de Spawner por si la notificación se perdió.
+        """
+        daughter = self._get(daughter_id)
+        if not daughter:
+            logger.warning(f"Daughter {daughter_id} not found")
+            return None
+        if daughter.status in TERMINAL_STATUSES:
+            return daughter.to_dict()
+        
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        future = loop.create_future()
+        waiters = self._waiters.setdefault(daughter.id, [])
+        waiters.append(future)
+        try:
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    logger.warning(f"Timeout waiting for daughter {daughter_id}")
+                    return None
+                wait_s = min(remaining, self.poll_fallback_interval, daughter.seconds_to_expiry())
+                try:
+                    return await asyncio.wait_for(asyncio.shield(future), max(wait_s, 0.01))
+                except asyncio.TimeoutError:
+                    pass
+                
+                # Respaldo: TTL local y estado persistido por Spawner
+                if daughter.status == "running" and daughter.is_expired():
+                    self._expire(daughter)
+                elif daughter.status not in TERMINAL_STATUSES:
+                    await self._sync_from_spawner_db(daughter)
+                if daughter.status in TERMINAL_STATUSES:
+                    return daughter.to_dict()
+        finally:
+            if future in waiters:
+                waiters.remove(future)
+            if not waiters and self._waiters.get(daughter.id) is waiters:
+                del self._waiters[daughter.id]
+    
+    async def _sync_from_spawner_db(self, daughter: Daughter) -> None:
+        """Aplicar el estado terminal de la fila daughters de Spawner, si lo hay."""
+        if not daughter.spawn_uuid:
+            return
+        
+        def _read() -> Optional[Tuple[str, Optional[str]]]:
+            session = get_session("vx11")
+            try:
+                return (
+                    session.query(DBDaughter.status, DBDaughter.error_last)
+                    .filter(DBDaughter.spawn_uuid == daughter.spawn_uuid)
+                    .first()
+                )
+            finally:
+                session.close()
+        
+        try:
+            row = await asyncio.to_thread(_read)
+        except Exception as e:
+            logger.error(f"Daughter {daughter.id} fallback poll failed: {e}")
+            return
+        status = SPAWNER_STATUS_MAP.get(row[0]) if row else None
+        if status == "completed":
+            await self.complete_daughter(daughter.id, {"recovered_from": "spawner_db"})
+        elif status == "failed":
+            await self.fail_daughter(daughter.id, row[1] or f"spawner_status:{row[0]}")
+        elif status == "expired":
+            self._expire(daughter)
     
     async def cleanup_expired_daughters(self):
         """Background task: Limpiar hijas expiradas."""
@@ -312,8 +427,7 @@ class DaughterManager:
                 expired_ids = []
                 for daughter_id, daughter in list(self.daughters.items()):
                     if daughter.status == "running" and daughter.is_expired():
-                        daughter.status = "expired"
-                        daughter.completed_at = datetime.utcnow()
+                        self._expire(daughter)
                         write_log("madre", f"daughter_cleanup_expired:{daughter_id}")
                     
                     # Remover muy antiguas (> 1 hora)
@@ -325,6 +439,12 @@ class DaughterManager:
                 for daughter_id in expired_ids:
                     del self.daughters[daughter_id]
                     logger.info(f"Removed old daughter from memory: {daughter_id}")
+                if expired_ids:
+                    self._aliases = {
+                        alias: target
+                        for alias, target in self._aliases.items()
+                        if target in self.daughters
+                    }
             
             except Exception as e:
                 logger.error(f"Cleanup task error: {e}")
@@ -18,15 +18,35 @@ EJEMPLO:
           )
 """
 
+import copy
 import json
 import logging
-from typing import Dict, Any, Optional, List, Tuple
-from dataclasses import dataclass, asdict
+import re
+from collections import OrderedDict
+from typing import Dict, Any, Awaitable, Callable, Optional, List, Set, Tuple
+from dataclasses import dataclass, asdict, replace
 from enum import Enum
 from datetime import datetime
 
+from madre.core.dag import run_dag
+
 logger = logging.getLogger("vx11.madre.dsl_compiler")
 
+# Referencia al resultado de un paso previo: "${steps[0].task_id}"
+STEP_REF_PATTERN = re.compile(r"\$\{steps\[(\d+)\]")
+
+# Acciones sin orden entre sí dentro del mismo executor (lecturas, spawns)
+CONCURRENT_ACTIONS = {
+    "spawn",
+    "chat",
+    "list_tools",
+    "get_report",
+    "get_task_status",
+    "system_health",
+    "scan_drift",
+    "detect_drift",
+}
+
 
 class ExecutorType(Enum):
     """Ejecutores disponibles para pasos de workflow"""
@@ -49,6 +69,7 @@ class WorkflowStep:
     timeout_ms: int = 30000
     retry_count: int = 1
     fallback_executor: Optional[ExecutorType] = None
+    depends_on: Optional[List[int]] = None  # índices de pasos; None = tras el anterior
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -58,6 +79,7 @@ class WorkflowStep:
             "timeout_ms": self.timeout_ms,
             "retry_count": self.retry_count,
             "fallback_executor": self.fallback_executor.value if self.fallback_executor else None,
+            "depends_on": self.depends_on,
         }
 
 
@@ -76,6 +98,37 @@ class WorkflowPlan:
         if self.created_at is None:
             self.created_at = datetime.utcnow().isoformat()
     
+    def dependencies(self) -> Tuple[List[Set[int]], List[Set[int]]]:
+        """
+        Dependencias (orden, datos) de cada paso, igual que Runner:
+        depends_on=None solo ordena tras el paso anterior; depends_on
+        explícito es dependencia de datos (un fallo se propaga). Índices
+        inexistentes apuntan al propio paso y nunca se resuelven.
+        """
+        order: List[Set[int]] = [set() for _ in self.steps]
+        data: List[Set[int]] = [set() for _ in self.steps]
+        for i, step in enumerate(self.steps):
+            if step.depends_on is None:
+                if i > 0:
+                    order[i].add(i - 1)
+            else:
+                data[i].update(j if 0 <= j < len(self.steps) else i for j in step.depends_on)
+        return order, data
+    
+    def critical_path_ms(self) -> int:
+        """Peor caso de duración con pasos independientes en paralelo"""
+        order, data = self.dependencies()
+        finish: Dict[int, int] = {}
+        
+        def end(i: int, path: Tuple[int, ...] = ()) -> int:
+            if i not in finish:
+                deps = [j for j in order[i] | data[i] if j != i and j not in path]
+                start = max((end(j, path + (i,)) for j in deps), default=0)
+                finish[i] = start + self.steps[i].timeout_ms
+            return finish[i]
+        
+        return max((end(i) for i in range(len(self.steps))), default=0)
+    
     def to_dict(self) -> Dict[str, Any]:
         return {
             "workflow_id": self.workflow_id,
@@ -88,6 +141,41 @@ class WorkflowPlan:
         }
 
 
+async def run_workflow_steps(
+    plan: WorkflowPlan,
+    run_step: Callable[[int, WorkflowStep], Awaitable[Optional[Dict[str, Any]]]],
+    max_parallel: int = 4,
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Ejecutar los pasos del plan como DAG con el mismo planificador que
+    Runner (madre.core.dag.run_dag), con como mucho max_parallel en vuelo.
+    
+    run_step(idx, step) devuelve la entrada de resultado del paso; status
+    "error" cuenta como fallo. Un paso cuya dependencia de datos falló no se
+    ejecuta ("dependency_failed:<idx>") y dependencias irresolubles o ciclos
+    dan "unresolvable_dependencies". Devuelve las entradas en orden del plan.
+    """
+    order_deps, data_deps = plan.dependencies()
+    results: List[Optional[Dict[str, Any]]] = [None] * len(plan.steps)
+    
+    async def run(i: int) -> bool:
+        results[i] = await run_step(i, plan.steps[i])
+        return (results[i] or {}).get("status") != "error"
+    
+    def skip(i: int, failed: Optional[int]) -> None:
+        reason = "unresolvable_dependencies" if failed is None else f"dependency_failed:{failed}"
+        logger.warning(f"workflow {plan.workflow_id}: paso {i} no ejecutado ({reason})")
+        results[i] = {
+            "step": i,
+            "status": "error",
+            "executor": plan.steps[i].executor.value,
+            "error": reason,
+        }
+    
+    await run_dag(order_deps, data_deps, run, skip, max_parallel)
+    return results
+
+
 class VX11DSLCompiler:
     """
     Compilador DSL que transforma VX11Intents a WorkflowPlans.
@@ -103,28 +191,132 @@ class VX11DSLCompiler:
     - OPERATOR: Comandos del operador
     """
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 256):
         self.workflow_counter = 0
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # (tipo, clave normalizada, policy_version) -> plan plantilla
+        self._plan_cache: "OrderedDict[Tuple[str, str, str], WorkflowPlan]" = OrderedDict()
         logger.info("DSL Compiler VX11 inicializado (PASO 3.0)")
     
-    def compile(self, intent: Dict[str, Any]) -> WorkflowPlan:
+    def compile(self, intent: Dict[str, Any], policy_version: str = "") -> WorkflowPlan:
         """
         Compila un intent a un plan de workflow ejecutable.
         
         Args:
             intent: Dict con estructura de VX11Intent.to_dict()
+            policy_version: versión de políticas vigente; forma parte de la
+                clave de caché, así que cambiarla invalida los planes previos
             
         Returns:
             WorkflowPlan con steps ejecutables
         """
+        key = (
+            "intent",
+            json.dumps(
+                [
+                    intent.get("domain", "UNKNOWN"),
+                    intent.get("action", "unknown"),
+                    intent.get("parameters", {}),
+                    intent.get("priority", 2),
+                ],
+                sort_keys=True,
+                default=str,
+            ),
+            policy_version,
+        )
+        template = self._cache_get(key)
+        if template is None:
+            template = self._build_plan(intent)
+            self._cache_put(key, template)
+        return self._instantiate(template)
+    
+    def compile_text(
+        self, text: str, parser: Any, policy_version: str = ""
+    ) -> Tuple[Optional[WorkflowPlan], List[str]]:
+        """
+        Texto natural → WorkflowPlan, sin parsear ni compilar si el texto
+        normalizado ya se vio con la misma policy_version.
+        
+        Args:
+            text: Texto natural o DSL
+            parser: VX11DSLParser usado en caso de fallo de caché
+            policy_version: ver compile()
+            
+        Returns:
+            (WorkflowPlan, errors)
+        """
+        from madre.dsl_parser import normalize_intent_text
+        
+        key = ("text", normalize_intent_text(text), policy_version)
+        template = self._cache_get(key)
+        if template is None:
+            intent = parser.parse(text)
+            if not intent:
+                return None, ["No se pudo parsear DSL text"]
+            plan, errors = self.compile_and_validate(intent.to_dict(), policy_version)
+            if errors:
+                return None, errors
+            self._cache_put(key, plan)
+            return plan, []
+        return self._instantiate(template), []
+    
+    def invalidate_cache(self) -> None:
+        """Vaciar la caché de planes compilados."""
+        self._plan_cache.clear()
+    
+    def _cache_get(self, key: Tuple[str, str, str]) -> Optional[WorkflowPlan]:
+        template = self._plan_cache.get(key)
+        if template is None:
+            self.cache_misses += 1
+            return None
+        self.cache_hits += 1
+        self._plan_cache.move_to_end(key)
+        return template
+    
+    def _cache_put(self, key: Tuple[str, str, str], plan: WorkflowPlan) -> None:
+        if self.cache_size <= 0:
+            return
+        # La plantilla no comparte pasos con el plan entregado al llamador
+        self._plan_cache[key] = replace(plan, steps=self._copy_steps(plan.steps))
+        self._plan_cache.move_to_end(key)
+        while len(self._plan_cache) > self.cache_size:
+            self._plan_cache.popitem(last=False)
+    
+    @staticmethod
+    def _copy_steps(steps: List[WorkflowStep]) -> List[WorkflowStep]:
+        return [
+            replace(
+                step,
+                parameters=copy.deepcopy(step.parameters),
+                depends_on=list(step.depends_on) if step.depends_on is not None else None,
+            )
+            for step in steps
+        ]
+    
+    def _next_workflow_id(self) -> str:
         self.workflow_counter += 1
-        workflow_id = f"wf_{self.workflow_counter}_{int(datetime.utcnow().timestamp() * 1000)}"
+        return f"wf_{self.workflow_counter}_{int(datetime.utcnow().timestamp() * 1000)}"
+    
+    def _instantiate(self, template: WorkflowPlan) -> WorkflowPlan:
+        """Plan nuevo (id, created_at y pasos propios) a partir de una plantilla."""
+        return replace(
+            template,
+            workflow_id=self._next_workflow_id(),
+            created_at=None,
+            steps=self._copy_steps(template.steps),
+        )
+    
+    def _build_plan(self, intent: Dict[str, Any]) -> WorkflowPlan:
+        """Compilación completa (sin caché)."""
+        workflow_id = "wf_template"
         
         domain = intent.get("domain", "UNKNOWN")
         action = intent.get("action", "unknown")
         parameters = intent.get("parameters", {})
         
-        logger.info(f"Compilando workflow {workflow_id}: {domain}::{action}")
+        logger.info(f"Compilando workflow: {domain}::{action}")
         
         # Compilar según dominio
         if domain == "TASK":
@@ -150,6 +342,8 @@ class VX11DSLCompiler:
                 parameters=parameters,
             )]
         
+        self.infer_dependencies(steps)
+        
         return WorkflowPlan(
             workflow_id=workflow_id,
             domain=domain,
@@ -158,6 +352,29 @@ class VX11DSLCompiler:
             priority=intent.get("priority", 2),
         )
     
+    @staticmethod
+    def infer_dependencies(steps: List[WorkflowStep]) -> None:
+        """
+        Completar depends_on de los pasos que no lo declaran:
+        - referencias ${steps[N]...} en los parámetros → depende de N;
+        - pasos consecutivos del mismo executor mantienen su orden, salvo
+          que ambas acciones sean CONCURRENT_ACTIONS.
+        El resto de pasos son independientes y pueden ejecutarse en paralelo.
+        """
+        last_by_executor: Dict[ExecutorType, int] = {}
+        for i, step in enumerate(steps):
+            if step.depends_on is None:
+                params_text = json.dumps(step.parameters, default=str)
+                deps = {int(n) for n in STEP_REF_PATTERN.findall(params_text) if int(n) < i}
+                previous = last_by_executor.get(step.executor)
+                if previous is not None and not (
+                    step.action in CONCURRENT_ACTIONS
+                    and steps[previous].action in CONCURRENT_ACTIONS
+                ):
+                    deps.add(previous)
+                step.depends_on = sorted(deps)
+            last_by_executor[step.executor] = i
+    
     def _compile_task(self, action: str, params: Dict) -> List[WorkflowStep]:
         """Compilar dominio TASK"""
         steps = []
@@ -392,7 +609,9 @@ class VX11DSLCompiler:
         
         return steps
     
-    def compile_and_validate(self, intent: Dict[str, Any]) -> Tuple[Optional[WorkflowPlan], List[str]]:
+    def compile_and_validate(
+        self, intent: Dict[str, Any], policy_version: str = ""
+    ) -> Tuple[Optional[WorkflowPlan], List[str]]:
         """
         Compila y valida un intent.
         
@@ -415,7 +634,7 @@ class VX11DSLCompiler:
             return None, errors
         
         try:
-            plan = self.compile(intent)
+            plan = self.compile(intent, policy_version)
             logger.info(f"✓ Workflow compilado exitosamente: {plan.workflow_id}")
             return plan, []
         except Exception as e:
@@ -424,23 +643,38 @@ class VX11DSLCompiler:
             return None, errors
 
 
-def compile_dsl_to_workflow(dsl_text: str) -> Tuple[Optional[WorkflowPlan], List[str]]:
+_default_parser = None
+_default_compiler: Optional[VX11DSLCompiler] = None
+
+
+def get_compiler() -> VX11DSLCompiler:
+    """Compilador compartido del proceso (su caché de planes se reutiliza)."""
+    global _default_compiler
+    if _default_compiler is None:
+        _default_compiler = VX11DSLCompiler()
+    return _default_compiler
+
+
+def compile_dsl_to_workflow(
+    dsl_text: str, policy_version: str = ""
+) -> Tuple[Optional[WorkflowPlan], List[str]]:
     """
     Helper function: Parsea DSL text → Compila a Workflow.
     
+    Parser y compilador son compartidos: un texto ya visto (normalizado)
+    con la misma policy_version no se vuelve a parsear ni compilar.
+    
     Args:
         dsl_text: Texto DSL como "VX11::AUDIO analyze file=/audio.wav"
+        policy_version: versión de políticas vigente
         
     Returns:
         (WorkflowPlan, errors)
     """
-    from madre.dsl_parser import VX11DSLParser
-    
-    parser = VX11DSLParser()
-    intent = parser.parse(dsl_text)
-    
-    if not intent:
-        return None, ["No se pudo parsear DSL text"]
+    global _default_parser
+    if _default_parser is None:
+        from madre.dsl_parser import VX11DSLParser
+        
+        _default_parser = VX11DSLParser()
     
-    compiler = VX11DSLCompiler()
-    return compiler.compile_and_validate(intent.to_dict())
+    return get_compiler().compile_text(dsl_text, _default_parser, policy_version)
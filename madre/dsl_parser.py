@@ -28,6 +28,24 @@ from datetime import datetime
 
 logger = logging.getLogger("vx11.madre.dsl_parser")
 
+# Extracción de parámetros (compiladas una vez)
+FILE_PATTERN = re.compile(r"(?:archivo|file|archivo|with)\s+([^\s,]+\.(?:mp3|wav|flac|ogg))")
+PRIORITY_PATTERN = re.compile(r"prioridad\s+(\d+)")
+LUFS_PATTERN = re.compile(r"(-?\d+\.?\d*)\s*LUFS")
+
+
+def normalize_intent_text(text: str) -> str:
+    """Forma canónica del texto: minúsculas y espacios colapsados."""
+    return " ".join(text.lower().split())
+
+
+def _first_match(patterns: List["re.Pattern"], text: str) -> Optional[int]:
+    """Índice del primer patrón (en orden de prioridad) que casa en el texto."""
+    for index, pattern in enumerate(patterns):
+        if pattern.search(text):
+            return index
+    return None
+
 
 class VX11Domain(Enum):
     """Dominios VX11 canónicos"""
@@ -93,6 +111,7 @@ class VX11DSLParser:
     def __init__(self):
         self.domain_patterns = self._init_domain_patterns()
         self.action_patterns = self._init_action_patterns()
+        self._compile_dispatchers()
         logger.info("DSL Parser VX11 inicializado (PASO 4)")
     
     def _init_domain_patterns(self) -> Dict[VX11Domain, List[Tuple[str, float]]]:
@@ -144,6 +163,35 @@ class VX11DSLParser:
             ],
         }
     
+    def _compile_dispatchers(self) -> None:
+        """
+        Precompilar los patrones en dispatchers ordenados por prioridad.
+
+        Dominios: patrones ordenados por peso (y orden de declaración en
+        empate), así el primero que casa es el de mayor confianza y el resto
+        no se evalúa. Acciones: una regex por acción con todas sus palabras
+        clave, en orden de declaración.
+        """
+        entries = [
+            (domain, pattern, weight)
+            for domain, patterns in self.domain_patterns.items()
+            for pattern, weight in patterns
+        ]
+        entries.sort(key=lambda entry: -entry[2])  # estable: empates en orden de declaración
+        self._domain_ranking = [(domain, weight) for domain, _, weight in entries]
+        self._domain_dispatcher = [re.compile(pattern, re.IGNORECASE) for _, pattern, _ in entries]
+
+        self._action_dispatchers: Dict[VX11Domain, Tuple[List["re.Pattern"], List[str]]] = {}
+        for domain, action_map in self.action_patterns.items():
+            patterns = [
+                re.compile(
+                    r"\b(?:" + "|".join(re.escape(k) for k in keywords) + r")\b",
+                    re.IGNORECASE,
+                )
+                for keywords in action_map.values()
+            ]
+            self._action_dispatchers[domain] = (patterns, list(action_map))
+    
     def _init_action_patterns(self) -> Dict[VX11Domain, Dict[str, List[str]]]:
         """Patrones para detectar acciones por dominio"""
         return {
@@ -202,9 +250,9 @@ class VX11DSLParser:
         Returns:
             VX11Intent si parsea exitosamente, None si no hay dominio claro
         """
-        logger.info(f"Parsing DSL: {input_text[:80]}...")
+        logger.debug(f"Parsing DSL: {input_text[:80]}...")
         
-        text_lower = input_text.lower()
+        text_lower = normalize_intent_text(input_text)
         
         # 1) Detectar dominio
         domain, confidence = self._detect_domain(text_lower)
@@ -229,7 +277,7 @@ class VX11DSLParser:
             original_text=input_text,
         )
         
-        logger.info(f"Intent parsed: {intent.to_vx11_command()}")
+        logger.debug(f"Intent parsed: {intent.to_vx11_command()}")
         return intent
     
     def _detect_domain(self, text_lower: str) -> Tuple[Optional[VX11Domain], float]:
@@ -239,28 +287,18 @@ class VX11DSLParser:
         Returns:
             (Domain, confidence) o (None, 0.0)
         """
-        best_domain = None
-        best_confidence = 0.0
-        
-        for domain, patterns in self.domain_patterns.items():
-            for pattern, weight in patterns:
-                if re.search(pattern, text_lower, re.IGNORECASE):
-                    if weight > best_confidence:
-                        best_confidence = weight
-                        best_domain = domain
-        
-        return best_domain, best_confidence
+        index = _first_match(self._domain_dispatcher, text_lower)
+        if index is None:
+            return None, 0.0
+        return self._domain_ranking[index]
     
     def _detect_action(self, text_lower: str, domain: VX11Domain) -> Optional[str]:
         """Detecta acción dentro de un dominio"""
-        action_map = self.action_patterns.get(domain, {})
-        
-        for action, keywords in action_map.items():
-            for keyword in keywords:
-                if re.search(rf"\b{keyword}\b", text_lower, re.IGNORECASE):
-                    return action
-        
-        return None
+        if domain not in self._action_dispatchers:
+            return None
+        patterns, actions = self._action_dispatchers[domain]
+        index = _first_match(patterns, text_lower)
+        return actions[index] if index is not None else None
     
     def _extract_parameters(self, text_lower: str, domain: VX11Domain, action: str) -> Dict[str, Any]:
         """Extrae parámetros específicos según dominio y acción"""
@@ -268,12 +306,12 @@ class VX11DSLParser:
         
         # Parámetros genéricos
         # archivo/file
-        file_match = re.search(r"(?:archivo|file|archivo|with)\s+([^\s,]+\.(?:mp3|wav|flac|ogg))", text_lower)
+        file_match = FILE_PATTERN.search(text_lower)
         if file_match:
             params["file"] = file_match.group(1)
         
         # prioridad
-        priority_match = re.search(r"prioridad\s+(\d+)", text_lower)
+        priority_match = PRIORITY_PATTERN.search(text_lower)
         if priority_match:
             params["priority"] = int(priority_match.group(1))
         
@@ -287,7 +325,7 @@ class VX11DSLParser:
                     params["intensity"] = "medium"
             elif "master" in text_lower:
                 params["operation"] = "mastering"
-                lufs_match = re.search(r"(-?\d+\.?\d*)\s*LUFS", text_lower)
+                lufs_match = LUFS_PATTERN.search(text_lower)
                 if lufs_match:
                     params["target_loudness"] = float(lufs_match.group(1))
         
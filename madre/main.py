@@ -36,11 +36,14 @@ from .core import (
     PolicyEngine,
     Planner,
     Runner,
+    ResultStore,
+    WriteBehindQueue,
     DelegationClient,
 )
 from . import rails_router
 from .llm.deepseek_client import call_deepseek_r1, is_deepseek_available
 from .core.models import StatusEnum, ModeEnum
+from .core.results import SPAWN_STATUS_MAP
 from config.models_shared import SpawnCallbackRequest, SpawnCallbackResponse
 
 log = logging.getLogger("vx11.madre")
@@ -67,6 +70,12 @@ _planner = Planner(
 )
 _runner = Runner()
 _delegator = DelegationClient()
+_results = ResultStore(cache_ttl_s=settings.madre_result_cache_ttl_s)
+_observations = WriteBehindQueue(
+    batch_size=settings.madre_write_behind_batch,
+    interval_s=settings.madre_write_behind_interval_s,
+    max_pending=settings.madre_write_behind_max_pending,
+)
 
 # Session store: {session_id -> {mode, last_activity, ...}}
 _SESSIONS: Dict[str, Dict[str, Any]] = {}
@@ -111,6 +120,7 @@ async def lifespan(app: FastAPI):
     # Inicia background task de TTL
     _ttl_checker_task = asyncio.create_task(_ttl_checker_background())
     log.info("TTL checker task started")
+    _observations.start()
 
     try:
         yield
@@ -122,6 +132,7 @@ async def lifespan(app: FastAPI):
                 await _ttl_checker_task
             except asyncio.CancelledError:
                 pass
+        await _observations.stop()
         write_log("madre", "shutdown:v7_closed")
 
 
@@ -1032,13 +1043,15 @@ async def vx11_intent(req: CoreMVPIntentRequest):
     If require.spawner=true: routes to spawner, returns QUEUED
     Otherwise: executes via fallback_local, returns DONE
     """
-    intent_log_id = None
+    # All bookkeeping for this intent is committed once, on the way out;
+    # routing events / usage stats go through the write-behind queue.
+    uow = MadreDB.unit_of_work()
     try:
         correlation_id = req.correlation_id or str(uuid.uuid4())
         intent_id = correlation_id
 
         # Store in intent log
-        intent_log_id = MadreDB.create_intent_log(
+        uow.log_intent(
             source="tentaculo_link",
             payload={
                 "intent_type": req.intent_type,
@@ -1052,20 +1065,19 @@ async def vx11_intent(req: CoreMVPIntentRequest):
         # If spawner required: queue to spawner
         if req.require.get("spawner", False):
             task_id = str(uuid.uuid4())
-            MadreDB.create_task(
+            uow.create_task(
                 task_id=task_id,
                 name="vx11_spawner_task",
                 module="madre",
                 action="spawn",
                 status="queued",
             )
-            MadreDB.set_context(task_id, "spawn:correlation_id", correlation_id)
-            MadreDB.set_context(task_id, "spawn:payload", req.payload)
+            uow.set_context(task_id, "spawn:correlation_id", correlation_id)
+            uow.set_context(task_id, "spawn:payload", req.payload)
 
             write_log("madre", f"vx11_intent:spawner_queued:{correlation_id}")
 
-            MadreDB.close_intent_log(
-                intent_log_id,
+            uow.close_intent(
                 result_status="spawner_queued",
                 notes=f"spawner_task_id:{task_id}",
             )
@@ -1074,6 +1086,16 @@ async def vx11_intent(req: CoreMVPIntentRequest):
             _mode_member = getattr(ModeEnum, "SPAWNER", None)
             _mode_value = _mode_member.value if _mode_member is not None else "SPAWNER"
 
+            _results.put(
+                correlation_id,
+                "QUEUED",
+                result={"task_id": task_id},
+                mode=_mode_value,
+                provider="spawner",
+                uow=uow,
+            )
+            uow.commit()
+
             return {
                 "status": "queued",
                 "correlation_id": correlation_id,
@@ -1131,9 +1153,9 @@ async def vx11_intent(req: CoreMVPIntentRequest):
                             f"vx11_intent:switch_done:{correlation_id}:provider={provider_name}",
                         )
 
-                        # Record routing event and CLI usage stat
+                        # Record routing event and CLI usage stat (write-behind)
                         try:
-                            MadreDB.insert_routing_event(
+                            _observations.routing_event(
                                 trace_id=correlation_id,
                                 route_type="intent_delegation",
                                 provider_id=provider_name,
@@ -1142,7 +1164,7 @@ async def vx11_intent(req: CoreMVPIntentRequest):
                                     "reasoning", "Switch delegation completed"
                                 ),
                             )
-                            MadreDB.insert_cli_usage_stat(
+                            _observations.cli_usage_stat(
                                 provider_id=provider_name,
                                 success=True,
                                 latency_ms=_latency_ms,
@@ -1151,7 +1173,7 @@ async def vx11_intent(req: CoreMVPIntentRequest):
                                 error_class=None,
                             )
                             write_log(
-                                "madre", f"vx11_intent:events_recorded:{correlation_id}"
+                                "madre", f"vx11_intent:events_queued:{correlation_id}"
                             )
                         except Exception as e:
                             write_log(
@@ -1159,11 +1181,19 @@ async def vx11_intent(req: CoreMVPIntentRequest):
                                 f"vx11_intent:events_record_failed:{correlation_id}:{str(e)[:100]}",
                             )
 
-                        MadreDB.close_intent_log(
-                            intent_log_id,
+                        uow.close_intent(
                             result_status="done",
                             notes="executed_via_switch",
                         )
+                        _results.put(
+                            correlation_id,
+                            StatusEnum.DONE.value,
+                            result=sjson,
+                            mode="SWITCH",
+                            provider=provider_name,
+                            uow=uow,
+                        )
+                        uow.commit()
                         return {
                             "status": StatusEnum.DONE.value,
                             "correlation_id": correlation_id,
@@ -1200,11 +1230,19 @@ async def vx11_intent(req: CoreMVPIntentRequest):
 
         write_log("madre", f"vx11_intent:executed:{correlation_id}")
 
-        MadreDB.close_intent_log(
-            intent_log_id,
+        uow.close_intent(
             result_status="done",
             notes=f"executed_fallback",
         )
+        _results.put(
+            correlation_id,
+            StatusEnum.DONE.value,
+            result=result,
+            mode=ModeEnum.MADRE.value,
+            provider="fallback_local",
+            uow=uow,
+        )
+        uow.commit()
 
         return {
             "status": StatusEnum.DONE.value,
@@ -1219,16 +1257,23 @@ async def vx11_intent(req: CoreMVPIntentRequest):
         correlation_id = req.correlation_id or str(uuid.uuid4())
         write_log("madre", f"vx11_intent:exception:{correlation_id}:{str(e)}")
 
-        # Only attempt to close the intent log if it was created
-        if intent_log_id is not None:
-            try:
-                MadreDB.close_intent_log(
-                    intent_log_id,
-                    result_status="error",
-                    notes=f"exception:{str(e)}",
-                )
-            except Exception:
-                pass
+        # Overwrites whatever the failed path staged (no-op if nothing was logged)
+        uow.close_intent(
+            result_status="error",
+            notes=f"exception:{str(e)}",
+        )
+        _results.put(
+            correlation_id,
+            StatusEnum.ERROR.value,
+            error=str(e),
+            mode=ModeEnum.MADRE.value,
+            provider="fallback_local",
+            uow=uow,
+        )
+        try:
+            uow.commit()
+        except Exception:
+            pass
 
         return {
             "status": StatusEnum.ERROR.value,
@@ -1242,31 +1287,43 @@ async def vx11_intent(req: CoreMVPIntentRequest):
 
 
 @app.get("/vx11/result/{correlation_id}")
-async def vx11_result(correlation_id: str):
+async def vx11_result(correlation_id: str, wait: float = 0.0):
     """
     GET /vx11/result/{correlation_id}: Query result of prior intent.
 
     INVARIANT:
-    - Looks up correlation_id in intent log / task context
-    - Returns status, result, error
+    - Exact lookup of correlation_id in the result store (vx11_results)
+    - ?wait=N long-polls up to N seconds (capped by settings) and returns
+      as soon as the result reaches DONE/ERROR
+    - Unknown correlation_id → 404
     """
     try:
-        # Try to find intent log with this correlation_id
-        # For now, return minimal response (if intent was synchronous, it's done)
-        # If spawner, it's still running
+        wait = min(max(wait, 0.0), settings.madre_result_wait_max_s)
+        record = await _results.wait(correlation_id, wait)
 
-        # Check if there's a spawner task for this correlation_id
-        # This would require querying the Task table (pseudo-code)
+        write_log(
+            "madre",
+            f"vx11_result:queried:{correlation_id}:status={record['status'] if record else 'not_found'}",
+        )
 
-        write_log("madre", f"vx11_result:queried:{correlation_id}")
+        if record is None:
+            return JSONResponse(
+                status_code=404,
+                content={
+                    "correlation_id": correlation_id,
+                    "status": StatusEnum.ERROR.value,
+                    "result": None,
+                    "error": "not_found",
+                },
+            )
 
         return {
             "correlation_id": correlation_id,
-            "status": StatusEnum.DONE.value,  # Most synchronous executions are done immediately
-            "result": {"note": "synchronous execution completed"},
-            "error": None,
-            "mode": ModeEnum.MADRE.value,
-            "provider": "fallback_local",
+            "status": record["status"],
+            "result": record["result"],
+            "error": record["error"],
+            "mode": record["mode"],
+            "provider": record["provider"],
         }
 
     except Exception as e:
@@ -1315,22 +1372,16 @@ async def madre_spawn_callback(req: SpawnCallbackRequest):
     try:
         correlation_id = req.correlation_id or str(uuid.uuid4())
 
-        # Store result in result store (in-memory or DB)
-        # For now: simple in-memory storage
-        # In production: update copilot_actions_log or results table in vx11.db
-
-        result_data = {
-            "spawn_id": req.spawn_id,
-            "correlation_id": correlation_id,
-            "status": req.status,
-            "result": req.result,
-            "error": req.error,
-            "duration_ms": req.duration_ms,
-            "received_at": datetime.utcnow().isoformat(),
-        }
+        # Store result (wakes /vx11/result long-polls on this correlation_id)
+        _results.put(
+            correlation_id,
+            SPAWN_STATUS_MAP.get(req.status.lower(), "RUNNING"),
+            result=req.result,
+            error=req.error,
+            provider="spawner",
+            spawn_id=req.spawn_id,
+        )
 
-        # TODO: Persist to DB
-        # For now: log to forensics
         write_log(
             "madre",
             f"spawn_callback:received:spawn_id={req.spawn_id}:status={req.status}:correlation_id={correlation_id}",
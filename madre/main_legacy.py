@@ -716,7 +716,7 @@ async def power_auto_decide():
 @app.post("/madre/power/db_retention")
 async def db_retention(req: DBRetentionRequest):
     """
-    Plan (apply=false) or apply (apply=true) DB retention deletes + wal_checkpoint(TRUNCATE).
+    Plan (apply=false) or apply (apply=true) batched DB retention deletes + wal_checkpoint(PASSIVE).
 
     Evidence is written under:
     - $VX11_AUDIT_DIR if set, else /app/logs/audit (docker-compose mounts ./build/artifacts/logs -> /app/logs).
@@ -2477,10 +2477,10 @@ async def compile_dsl_workflow(req: Dict[str, Any]):
         "errors": []
       }
     """
-    from madre.dsl_compiler import VX11DSLCompiler
+    from madre.dsl_compiler import get_compiler
 
     try:
-        compiler = VX11DSLCompiler()
+        compiler = get_compiler()
         plan, errors = compiler.compile_and_validate(req)
 
         if errors:
@@ -2523,10 +2523,10 @@ async def execute_dsl_workflow(req: Dict[str, Any]):
         "final_result": {...}
       }
     """
-    from madre.dsl_compiler import VX11DSLCompiler
+    from madre.dsl_compiler import get_compiler, run_workflow_steps
 
     try:
-        compiler = VX11DSLCompiler()
+        compiler = get_compiler()
         plan, errors = compiler.compile_and_validate(req)
 
         if errors:
@@ -2537,10 +2537,10 @@ async def execute_dsl_workflow(req: Dict[str, Any]):
             "madre", f"workflow_executing:{plan.workflow_id}:{len(plan.steps)} steps"
         )
 
-        results = []
-        final_result = None
+        finals: Dict[int, Any] = {}
 
-        for idx, step in enumerate(plan.steps):
+        async def run_step(idx: int, step) -> Optional[Dict[str, Any]]:
+            entry: Optional[Dict[str, Any]] = None
             try:
                 # Ejecutar paso según executor
                 executor = step.executor.value
@@ -2557,24 +2557,20 @@ async def execute_dsl_workflow(req: Dict[str, Any]):
                         )
                         if resp.status_code == 200:
                             result = resp.json()
-                            results.append(
-                                {
-                                    "step": idx,
-                                    "status": "ok",
-                                    "executor": executor,
-                                    "result": result,
-                                }
-                            )
-                            final_result = result
+                            entry = {
+                                "step": idx,
+                                "status": "ok",
+                                "executor": executor,
+                                "result": result,
+                            }
+                            finals[idx] = result
                         else:
-                            results.append(
-                                {
-                                    "step": idx,
-                                    "status": "error",
-                                    "executor": executor,
-                                    "error": resp.text,
-                                }
-                            )
+                            entry = {
+                                "step": idx,
+                                "status": "error",
+                                "executor": executor,
+                                "error": resp.text,
+                            }
 
                 elif executor == "manifestator":
                     # Llamar Manifestator
@@ -2588,24 +2584,20 @@ async def execute_dsl_workflow(req: Dict[str, Any]):
                         )
                         if resp.status_code == 200:
                             result = resp.json()
-                            results.append(
-                                {
-                                    "step": idx,
-                                    "status": "ok",
-                                    "executor": executor,
-                                    "result": result,
-                                }
-                            )
-                            final_result = result
+                            entry = {
+                                "step": idx,
+                                "status": "ok",
+                                "executor": executor,
+                                "result": result,
+                            }
+                            finals[idx] = result
                         else:
-                            results.append(
-                                {
-                                    "step": idx,
-                                    "status": "error",
-                                    "executor": executor,
-                                    "error": resp.text,
-                                }
-                            )
+                            entry = {
+                                "step": idx,
+                                "status": "error",
+                                "executor": executor,
+                                "error": resp.text,
+                            }
 
                 elif executor == "switch":
                     # Llamar Switch
@@ -2619,24 +2611,20 @@ async def execute_dsl_workflow(req: Dict[str, Any]):
                         )
                         if resp.status_code == 200:
                             result = resp.json()
-                            results.append(
-                                {
-                                    "step": idx,
-                                    "status": "ok",
-                                    "executor": executor,
-                                    "result": result,
-                                }
-                            )
-                            final_result = result
+                            entry = {
+                                "step": idx,
+                                "status": "ok",
+                                "executor": executor,
+                                "result": result,
+                            }
+                            finals[idx] = result
                         else:
-                            results.append(
-                                {
-                                    "step": idx,
-                                    "status": "error",
-                                    "executor": executor,
-                                    "error": resp.text,
-                                }
-                            )
+                            entry = {
+                                "step": idx,
+                                "status": "error",
+                                "executor": executor,
+                                "error": resp.text,
+                            }
 
                 elif executor == "hermes":
                     # Llamar Hermes
@@ -2650,24 +2638,20 @@ async def execute_dsl_workflow(req: Dict[str, Any]):
                         )
                         if resp.status_code == 200:
                             result = resp.json()
-                            results.append(
-                                {
-                                    "step": idx,
-                                    "status": "ok",
-                                    "executor": executor,
-                                    "result": result,
-                                }
-                            )
-                            final_result = result
+                            entry = {
+                                "step": idx,
+                                "status": "ok",
+                                "executor": executor,
+                                "result": result,
+                            }
+                            finals[idx] = result
                         else:
-                            results.append(
-                                {
-                                    "step": idx,
-                                    "status": "error",
-                                    "executor": executor,
-                                    "error": resp.text,
-                                }
-                            )
+                            entry = {
+                                "step": idx,
+                                "status": "error",
+                                "executor": executor,
+                                "error": resp.text,
+                            }
 
                 elif executor == "madre":
                     # Ejecutar localmente (recursive call)
@@ -2685,45 +2669,37 @@ async def execute_dsl_workflow(req: Dict[str, Any]):
                             session.add(task)
                             session.commit()
                             task_id = task.uuid
-                            results.append(
-                                {
-                                    "step": idx,
-                                    "status": "ok",
-                                    "executor": executor,
-                                    "task_id": task_id,
-                                }
-                            )
-                            final_result = {"task_id": task_id}
+                            entry = {
+                                "step": idx,
+                                "status": "ok",
+                                "executor": executor,
+                                "task_id": task_id,
+                            }
+                            finals[idx] = {"task_id": task_id}
                         finally:
                             session.close()
                     else:
-                        results.append(
-                            {"step": idx, "status": "skip", "executor": executor}
-                        )
+                        entry = {"step": idx, "status": "skip", "executor": executor}
 
                 elif executor == "local":
                     # Stub local
-                    results.append(
-                        {
-                            "step": idx,
-                            "status": "ok",
-                            "executor": executor,
-                            "result": {"stub": True},
-                        }
-                    )
+                    entry = {
+                        "step": idx,
+                        "status": "ok",
+                        "executor": executor,
+                        "result": {"stub": True},
+                    }
 
             except Exception as step_err:
                 write_log(
                     "madre", f"workflow_step_error:{idx}:{step_err}", level="ERROR"
                 )
-                results.append(
-                    {
-                        "step": idx,
-                        "status": "error",
-                        "executor": executor,
-                        "error": str(step_err),
-                    }
-                )
+                entry = {
+                    "step": idx,
+                    "status": "error",
+                    "executor": executor,
+                    "error": str(step_err),
+                }
 
                 # Retry si aplica
                 if step.retry_count > 1:
@@ -2731,10 +2707,19 @@ async def execute_dsl_workflow(req: Dict[str, Any]):
                         await asyncio.sleep(1)
                         try:
                             # Re-intentar (simplificado para demostración)
-                            results[-1]["status"] = "ok"
+                            entry["status"] = "ok"
                             break
                         except:
-                            results[-1]["status"] = "error"
+                            entry["status"] = "error"
+
+            return entry
+
+        # Pasos sin dependencias entre sí (depends_on) se ejecutan en paralelo
+        entries = await run_workflow_steps(
+            plan, run_step, max_parallel=settings.madre_plan_max_parallel
+        )
+        results = [entry for entry in entries if entry is not None]
+        final_result = finals[max(finals)] if finals else None
 
         write_log("madre", f"workflow_completed:{plan.workflow_id}:success")
         return {
@@ -1,15 +1,18 @@
+import asyncio
 import json
 import os
 import secrets
+import shlex
 import sqlite3
 import subprocess
 import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from fastapi import APIRouter, Header, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
 try:
@@ -33,6 +36,15 @@ BLOCK_SECONDS = 60
 HARD_OFF_LIMIT = 1
 HARD_OFF_BLOCK_SECONDS = 300
 
+# docker compose binary; a local stub can stand in for it (tests, dev boxes)
+COMPOSE_CMD = shlex.split(os.environ.get("VX11_POWER_COMPOSE_CMD") or "docker compose")
+# Service actions of one plan running at the same time
+POWER_MAX_PARALLEL = int(os.environ.get("VX11_POWER_MAX_PARALLEL", "4"))
+# Subcomandos de compose que separan fases de un plan (stop antes que up, etc.)
+COMPOSE_VERBS = ("stop", "down", "kill", "rm", "up", "start", "restart")
+# Finished jobs kept for GET /madre/power/jobs
+POWER_JOBS_KEEP = 50
+
 CANONICAL_SERVICES = [
     "tentaculo_link",
     "madre",
@@ -71,6 +83,8 @@ router = APIRouter()
 class PowerRequest(BaseModel):
     apply: bool = False
     confirm: Optional[str] = None
+    # False: return 202 + job_id right away and follow /madre/power/jobs/{id}
+    wait: bool = True
 
 
 class PostTaskRequest(BaseModel):
@@ -154,6 +168,35 @@ def _run(
     }
 
 
+async def _run_async(
+    args: List[str], timeout: int = 20, cwd: Optional[str] = None
+) -> Dict[str, Any]:
+    """_run() without blocking the event loop. The process is killed on timeout."""
+    started = time.time()
+    proc = await asyncio.create_subprocess_exec(
+        *args,
+        cwd=cwd or REPO_ROOT,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    timed_out = False
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        timed_out = True
+        proc.kill()
+        stdout, stderr = await proc.communicate()
+    elapsed_ms = int((time.time() - started) * 1000)
+    return {
+        "rc": -1 if timed_out else proc.returncode,
+        "stdout": stdout.decode("utf-8", errors="replace"),
+        "stderr": stderr.decode("utf-8", errors="replace")
+        + (f"\ntimeout after {timeout}s" if timed_out else ""),
+        "cmd": args,
+        "elapsed_ms": elapsed_ms,
+    }
+
+
 def _count_backups(backups_dir: str) -> Dict[str, int]:
     if not os.path.isdir(backups_dir):
         return {"backup_db_count": 0, "backups_archived_count": 0}
@@ -301,7 +344,7 @@ def _compose_services() -> Tuple[List[str], Optional[str]]:
         return [], "compose_files_missing"
 
     # Try to get all services (including those with profiles)
-    args = ["docker", "compose", "-p", "vx11"]
+    args = [*COMPOSE_CMD, "-p", "vx11"]
     for f in files:
         args.extend(["-f", f])
     args.extend(["config", "--services"])
@@ -414,9 +457,9 @@ def _record_db(action: str, reason: str) -> str:
         return "skipped"
 
 
-def _docker_available() -> bool:
+async def _docker_available() -> bool:
     try:
-        res = _run(["docker", "compose", "version"], timeout=10)
+        res = await _run_async([*COMPOSE_CMD, "version"], timeout=10)
     except Exception:
         return False
     return res.get("rc") == 0
@@ -444,6 +487,7 @@ def _response(
     db_write: str,
     security: Dict[str, bool],
     code: int = 200,
+    job_id: Optional[str] = None,
 ) -> JSONResponse:
     payload = {
         "status": status,
@@ -457,6 +501,8 @@ def _response(
         "db_write": db_write,
         "security": security,
     }
+    if job_id is not None:
+        payload["job_id"] = job_id
     return JSONResponse(status_code=code, content=payload)
 
 
@@ -467,12 +513,12 @@ def _ensure_service(service: str, allowlist: List[str]) -> None:
 
 def _plan_for_service(action: str, service: str) -> List[Dict[str, Any]]:
     files = _compose_files()
-    cmd = ["docker", "compose", "-p", "vx11"]
+    cmd = [*COMPOSE_CMD, "-p", "vx11"]
     for f in files:
         cmd.extend(["-f", f])
     cmd.append(action)
     cmd.append(service)
-    return [{"cmd": cmd, "timeout": 30}]
+    return [{"cmd": cmd, "timeout": 30, "service": service}]
 
 
 def _plan_for_mode(action: str, allowlist: List[str]) -> List[Dict[str, Any]]:
@@ -481,37 +527,259 @@ def _plan_for_mode(action: str, allowlist: List[str]) -> List[Dict[str, Any]]:
     for svc in allowlist:
         if action == "idle_min" and svc == "madre":
             continue
-        cmd = ["docker", "compose", "-p", "vx11"]
+        cmd = [*COMPOSE_CMD, "-p", "vx11"]
         for f in files:
             cmd.extend(["-f", f])
         cmd.append("stop")
         cmd.append(svc)
-        cmds.append({"cmd": cmd, "timeout": 30})
+        cmds.append({"cmd": cmd, "timeout": 30, "service": svc})
     return cmds
 
 
-def _execute_plan(out_dir: str, plan: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    executed = []
+async def _execute_step(out_dir: str, idx: int, step: Dict[str, Any]) -> Dict[str, Any]:
+    cmd = step.get("cmd", [])
+    timeout = int(step.get("timeout", 20))
+    try:
+        res = await _run_async(cmd, timeout=timeout)
+    except Exception as exc:
+        res = {"rc": -1, "stdout": "", "stderr": str(exc), "cmd": cmd, "elapsed_ms": 0}
+    stdout_path = os.path.join(out_dir, f"cmd_{idx}_stdout.txt")
+    stderr_path = os.path.join(out_dir, f"cmd_{idx}_stderr.txt")
+    with open(stdout_path, "w", encoding="utf-8") as f:
+        f.write(res.get("stdout", ""))
+    with open(stderr_path, "w", encoding="utf-8") as f:
+        f.write(res.get("stderr", ""))
+    return {
+        "rc": res.get("rc"),
+        "cmd": res.get("cmd"),
+        "stdout_path": stdout_path,
+        "stderr_path": stderr_path,
+        "elapsed_ms": res.get("elapsed_ms"),
+    }
+
+
+async def _execute_plan(
+    out_dir: str,
+    plan: List[Dict[str, Any]],
+    job: Optional["PowerJob"] = None,
+    max_parallel: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Run plan steps, returning results in plan order.
+
+    The plan is split into phases of consecutive steps with the same compose
+    verb, and phases run in plan order: every stop finishes before any
+    `up -d` starts (up also starts dependencies, which must not race a stop).
+    Within a phase, steps for different services run concurrently (at most
+    max_parallel at a time) and steps for the same service keep their order.
+    Progress is reported to job, if given.
+    """
+    executed: List[Optional[Dict[str, Any]]] = [None] * len(plan)
+    limit = asyncio.Semaphore(max(1, max_parallel or POWER_MAX_PARALLEL))
+
+    async def _lane(indexes: List[int]) -> None:
+        for idx in indexes:
+            async with limit:
+                if job is not None:
+                    job.emit("step_started", step=idx, cmd=plan[idx].get("cmd"))
+                executed[idx] = await _execute_step(out_dir, idx, plan[idx])
+            if job is not None:
+                job.executed[idx] = executed[idx]
+                job.emit(
+                    "step_done",
+                    step=idx,
+                    rc=executed[idx]["rc"],
+                    elapsed_ms=executed[idx]["elapsed_ms"],
+                )
+
+    for phase in _plan_phases(plan):
+        lanes: "OrderedDict[str, List[int]]" = OrderedDict()
+        for idx in phase:
+            cmd = plan[idx].get("cmd") or [""]
+            lanes.setdefault(plan[idx].get("service") or cmd[-1], []).append(idx)
+        await asyncio.gather(*(_lane(indexes) for indexes in lanes.values()))
+    return executed  # type: ignore[return-value]
+
+
+def _plan_phases(plan: List[Dict[str, Any]]) -> List[List[int]]:
+    """Step indexes grouped into runs of consecutive steps with the same compose verb."""
+    phases: List[List[int]] = []
+    previous: Optional[str] = None
     for idx, step in enumerate(plan):
-        cmd = step.get("cmd", [])
-        timeout = int(step.get("timeout", 20))
-        res = _run(cmd, timeout=timeout)
-        stdout_path = os.path.join(out_dir, f"cmd_{idx}_stdout.txt")
-        stderr_path = os.path.join(out_dir, f"cmd_{idx}_stderr.txt")
-        with open(stdout_path, "w", encoding="utf-8") as f:
-            f.write(res.get("stdout", ""))
-        with open(stderr_path, "w", encoding="utf-8") as f:
-            f.write(res.get("stderr", ""))
-        executed.append(
-            {
-                "rc": res.get("rc"),
-                "cmd": res.get("cmd"),
-                "stdout_path": stdout_path,
-                "stderr_path": stderr_path,
-                "elapsed_ms": res.get("elapsed_ms"),
-            }
-        )
-    return executed
+        verb = next((t for t in step.get("cmd") or [] if t in COMPOSE_VERBS), None)
+        if not phases or verb != previous:
+            phases.append([])
+        phases[-1].append(idx)
+        previous = verb
+    return phases
+
+
+class PowerJob:
+    """A power plan running in the background, with queryable status and events."""
+
+    def __init__(
+        self,
+        action: str,
+        service: Optional[str],
+        plan: List[Dict[str, Any]],
+        out_dir: str,
+        db_action: Optional[str] = None,
+        db_reason: str = "",
+    ):
+        self.job_id = secrets.token_hex(8)
+        self.action = action
+        self.service = service
+        self.plan = plan
+        self.out_dir = out_dir
+        self.db_action = db_action
+        self.db_reason = db_reason
+        self.status = "queued"  # queued, running, done, failed
+        self.error: Optional[str] = None
+        self.db_write = "skipped"
+        self.executed: List[Optional[Dict[str, Any]]] = [None] * len(plan)
+        self.events: List[Dict[str, Any]] = []
+        self.created_at = _now_ts()
+        self.finished_at: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def emit(self, event: str, **data: Any) -> None:
+        self.events.append({"seq": len(self.events), "event": event, "ts": _now_ts(), **data})
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def run(self) -> None:
+        self.status = "running"
+        self.emit("job_started", steps=len(self.plan))
+        try:
+            await asyncio.to_thread(_write_snapshot, self.out_dir, "pre")
+            await _execute_plan(self.out_dir, self.plan, job=self)
+            await asyncio.to_thread(_write_snapshot, self.out_dir, "post")
+            if self.db_action:
+                self.db_write = await asyncio.to_thread(
+                    _record_db, self.db_action, self.db_reason
+                )
+            self.status = "done"
+        except Exception as exc:
+            self.status = "failed"
+            self.error = str(exc)
+        self.finished_at = _now_ts()
+        _write_json(os.path.join(self.out_dir, "job.json"), self.to_dict())
+        self.emit("job_" + self.status, error=self.error)
+
+    async def wait(self) -> None:
+        if self.task is not None:
+            await asyncio.shield(self.task)
+
+    async def stream(self, after: int = 0) -> AsyncIterator[Dict[str, Any]]:
+        """Events with seq >= after, live until the job finishes."""
+        sent = max(0, after)
+        while True:
+            changed = self._changed
+            while sent < len(self.events):
+                yield self.events[sent]
+                sent += 1
+            if self.finished:
+                return
+            await changed.wait()
+
+    def to_dict(self) -> Dict[str, Any]:
+        done = sum(1 for e in self.executed if e is not None)
+        return {
+            "job_id": self.job_id,
+            "action": self.action,
+            "service": self.service,
+            "status": self.status,
+            "error": self.error,
+            "progress": {"done": done, "total": len(self.plan)},
+            "failed_steps": [
+                i for i, e in enumerate(self.executed) if e is not None and e.get("rc") != 0
+            ],
+            "plan": self.plan,
+            "executed": self.executed,
+            "out_dir": self.out_dir,
+            "db_write": self.db_write,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+_JOBS: "OrderedDict[str, PowerJob]" = OrderedDict()
+
+
+def _start_job(
+    action: str,
+    service: Optional[str],
+    plan: List[Dict[str, Any]],
+    out_dir: str,
+    db_action: Optional[str] = None,
+    db_reason: str = "",
+) -> PowerJob:
+    job = PowerJob(action, service, plan, out_dir, db_action, db_reason)
+    _JOBS[job.job_id] = job
+    finished = [jid for jid, j in _JOBS.items() if j.finished]
+    for jid in finished[: max(0, len(finished) - POWER_JOBS_KEEP)]:
+        del _JOBS[jid]
+    job.task = asyncio.create_task(job.run())
+    return job
+
+
+async def _job_result(job: PowerJob, wait: bool) -> Optional[JSONResponse]:
+    """Wait for job, or return the 202 response when the caller does not want to."""
+    if wait:
+        await job.wait()
+        return None
+    return JSONResponse(
+        status_code=202,
+        content={
+            "status": "accepted",
+            "job_id": job.job_id,
+            "action": job.action,
+            "service": job.service,
+            "plan": job.plan,
+            "out_dir": job.out_dir,
+            "status_url": f"/madre/power/jobs/{job.job_id}",
+            "events_url": f"/madre/power/jobs/{job.job_id}/events",
+        },
+    )
+
+
+@router.get("/madre/power/jobs")
+async def power_jobs() -> Dict[str, Any]:
+    return {
+        "status": "ok",
+        "jobs": [
+            {k: v for k, v in job.to_dict().items() if k not in ("plan", "executed")}
+            for job in reversed(_JOBS.values())
+        ],
+    }
+
+
+@router.get("/madre/power/jobs/{job_id}")
+async def power_job_status(job_id: str) -> Dict[str, Any]:
+    job = _JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="job_not_found")
+    return {"status": "ok", "job": job.to_dict()}
+
+
+@router.get("/madre/power/jobs/{job_id}/events")
+async def power_job_events(job_id: str, after: int = 0):
+    """Server-sent events: step_started / step_done / job_done|job_failed."""
+    job = _JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="job_not_found")
+
+    async def stream():
+        async for event in job.stream(after):
+            yield f"event: {event['event']}\n"
+            yield f"data: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
 
 
 @router.get("/madre/power/services")
@@ -555,21 +823,26 @@ async def maintenance_post_task(
     if apply_retention is None:
         apply_retention = bool(size_mb and size_mb >= 500.0)
 
-    sqlite_results = {
-        "quick_check": _run_sqlite_check(
-            db_path, out_dir, "quick_check", "quick_check"
+    # Read-only checks: run side by side, off the event loop
+    checks = await asyncio.gather(
+        asyncio.to_thread(
+            _run_sqlite_check, db_path, out_dir, "quick_check", "quick_check"
         ),
-        "integrity_check": _run_sqlite_check(
-            db_path, out_dir, "integrity_check", "integrity_check"
+        asyncio.to_thread(
+            _run_sqlite_check, db_path, out_dir, "integrity_check", "integrity_check"
         ),
-        "foreign_key_check": _run_sqlite_check(
+        asyncio.to_thread(
+            _run_sqlite_check,
             db_path,
             out_dir,
             "foreign_key_check",
             "foreign_key_check",
             foreign_keys=True,
         ),
-    }
+    )
+    sqlite_results = dict(
+        zip(("quick_check", "integrity_check", "foreign_key_check"), checks)
+    )
 
     retention_result = None
     rotation_result = None
@@ -578,27 +851,32 @@ async def maintenance_post_task(
     scorecard = None
     if power_saver_module:
         try:
-            retention_result = power_saver_module.db_retention_cleanup(
-                out_dir, apply=bool(apply_retention), db_path=db_path
+            retention_result = await asyncio.to_thread(
+                power_saver_module.db_retention_cleanup,
+                out_dir,
+                apply=bool(apply_retention),
+                db_path=db_path,
             )
         except Exception as exc:
             retention_result = {"status": "error", "error": str(exc)}
 
         try:
-            rotation_result = power_saver_module.rotate_backups(
-                out_dir, keep=2, apply=True
+            rotation_result = await asyncio.to_thread(
+                power_saver_module.rotate_backups, out_dir, keep=2, apply=True
             )
         except Exception as exc:
             rotation_result = {"status": "error", "error": str(exc)}
 
         try:
-            regen_result = power_saver_module.regen_dbmap(out_dir)
+            regen_result = await asyncio.to_thread(
+                power_saver_module.regen_dbmap, out_dir
+            )
         except Exception as exc:
             regen_result = {"status": "error", "error": str(exc)}
 
     counts_path = os.path.join(out_dir, "counts.json")
     try:
-        counts_res = _run(
+        counts_res = await _run_async(
             ["python3", "scripts/audit_counts.py", db_path], timeout=60, cwd=REPO_ROOT
         )
         stdout_text = counts_res.get("stdout") or ""
@@ -764,7 +1042,7 @@ async def _power_action(
 
     out_dir = _make_out_dir(action, name)
     plan = _plan_for_service(action, name)
-    docker_ok = _docker_available()
+    docker_ok = await _docker_available()
     _write_json(
         os.path.join(out_dir, "plan.json"),
         {"plan": plan, "apply": req.apply, "docker_available": docker_ok},
@@ -841,20 +1119,23 @@ async def _power_action(
             code=400,
         )
 
-    _write_snapshot(out_dir, "pre")
-    executed = _execute_plan(out_dir, plan)
-    _write_snapshot(out_dir, "post")
-    db_write = _record_db(f"power_{action}_apply", f"service:{name}")
+    job = _start_job(
+        action, name, plan, out_dir, f"power_{action}_apply", f"service:{name}"
+    )
+    accepted = await _job_result(job, req.wait)
+    if accepted is not None:
+        return accepted
     return _response(
         "ok",
         True,
         name,
         action,
         plan,
-        executed,
+        job.executed,
         out_dir,
-        db_write,
+        job.db_write,
         _security_flags(key_ok, token_ok, confirm_ok, rate_ok),
+        job_id=job.job_id,
     )
 
 
@@ -868,7 +1149,7 @@ async def _power_mode(
     allowlist, _ = _allowlist()
     out_dir = _make_out_dir(action, None)
     plan = _plan_for_mode(action, allowlist)
-    docker_ok = _docker_available()
+    docker_ok = await _docker_available()
     _write_json(
         os.path.join(out_dir, "plan.json"),
         {
@@ -948,20 +1229,21 @@ async def _power_mode(
             code=400,
         )
 
-    _write_snapshot(out_dir, "pre")
-    executed = _execute_plan(out_dir, plan)
-    _write_snapshot(out_dir, "post")
-    db_write = _record_db(f"power_{action}_apply", "mode")
+    job = _start_job(action, None, plan, out_dir, f"power_{action}_apply", "mode")
+    accepted = await _job_result(job, req.wait)
+    if accepted is not None:
+        return accepted
     return _response(
         "ok",
         True,
         None,
         action,
         plan,
-        executed,
+        job.executed,
         out_dir,
-        db_write,
+        job.db_write,
         _security_flags(key_ok, token_ok, confirm_ok, rate_ok),
+        job_id=job.job_id,
     )
 
 
@@ -974,7 +1256,7 @@ class ServiceRequest(BaseModel):
 
 
 @router.post("/madre/power/mode")
-async def set_power_mode_simple(req: ModeRequest, apply: bool = True):
+async def set_power_mode_simple(req: ModeRequest, apply: bool = True, wait: bool = True):
     allowlist, _ = _allowlist()
     mode = req.mode.lower()
     out_dir = _make_out_dir(f"mode_{mode}", None)
@@ -983,12 +1265,21 @@ async def set_power_mode_simple(req: ModeRequest, apply: bool = True):
     if not apply:
         return {"status": "plan", "mode": mode, "plan": plan, "out_dir": out_dir}
 
-    executed = _execute_plan(out_dir, plan)
-    return {"status": "ok", "mode": mode, "executed": executed, "out_dir": out_dir}
+    job = _start_job(f"mode_{mode}", None, plan, out_dir)
+    accepted = await _job_result(job, wait)
+    if accepted is not None:
+        return accepted
+    return {
+        "status": "ok",
+        "mode": mode,
+        "executed": job.executed,
+        "out_dir": out_dir,
+        "job_id": job.job_id,
+    }
 
 
 @router.post("/madre/power/service/start")
-async def start_service_simple(req: ServiceRequest):
+async def start_service_simple(req: ServiceRequest, wait: bool = True):
     # VX11 GUARDRAIL: Service control requires explicit enablement
     if not VX11_ALLOW_SERVICE_CONTROL:
         raise HTTPException(
@@ -1000,7 +1291,8 @@ async def start_service_simple(req: ServiceRequest):
     svc = req.service
     if svc not in allowlist:
         raise HTTPException(status_code=404, detail=f"Service {svc} not in allowlist")
-    out_dir = _make_out_dir("start", svc)
+    action = "start"
+    out_dir = _make_out_dir(action, svc)
     plan = _plan_for_service("up", svc)
     # Ensure -d is present for up
     for step in plan:
@@ -1008,12 +1300,21 @@ async def start_service_simple(req: ServiceRequest):
             idx = step["cmd"].index("up")
             step["cmd"].insert(idx + 1, "-d")
 
-    executed = _execute_plan(out_dir, plan)
-    return {"status": "ok", "service": svc, "executed": executed, "out_dir": out_dir}
+    job = _start_job(action, svc, plan, out_dir)
+    accepted = await _job_result(job, wait)
+    if accepted is not None:
+        return accepted
+    return {
+        "status": "ok",
+        "service": svc,
+        "executed": job.executed,
+        "out_dir": out_dir,
+        "job_id": job.job_id,
+    }
 
 
 @router.post("/madre/power/service/stop")
-async def stop_service_simple(req: ServiceRequest):
+async def stop_service_simple(req: ServiceRequest, wait: bool = True):
     # VX11 GUARDRAIL: Service control requires explicit enablement
     if not VX11_ALLOW_SERVICE_CONTROL:
         raise HTTPException(
@@ -1025,15 +1326,25 @@ async def stop_service_simple(req: ServiceRequest):
     svc = req.service
     if svc not in allowlist:
         raise HTTPException(status_code=404, detail=f"Service {svc} not in allowlist")
-    out_dir = _make_out_dir("stop", svc)
+    action = "stop"
+    out_dir = _make_out_dir(action, svc)
     plan = _plan_for_service("stop", svc)
-    executed = _execute_plan(out_dir, plan)
-    return {"status": "ok", "service": svc, "executed": executed, "out_dir": out_dir}
+    job = _start_job(action, svc, plan, out_dir)
+    accepted = await _job_result(job, wait)
+    if accepted is not None:
+        return accepted
+    return {
+        "status": "ok",
+        "service": svc,
+        "executed": job.executed,
+        "out_dir": out_dir,
+        "job_id": job.job_id,
+    }
 
 
 @router.get("/madre/power/status")
 async def get_power_status_simple():
-    res = _run(["docker", "compose", "-p", "vx11", "ps", "--format", "json"])
+    res = await _run_async([*COMPOSE_CMD, "-p", "vx11", "ps", "--format", "json"])
     try:
         # docker compose ps --format json returns multiple lines of json objects or a list
         raw = res.get("stdout", "").strip()
@@ -1047,7 +1358,7 @@ async def get_power_status_simple():
 
 
 @router.post("/madre/power/policy/solo_madre/apply")
-async def apply_solo_madre_policy():
+async def apply_solo_madre_policy(wait: bool = True):
     """
     Apply SOLO_MADRE policy: stop all services except madre.
     Container-level control only (docker compose, not process-level).
@@ -1067,16 +1378,19 @@ async def apply_solo_madre_policy():
         },
     )
 
-    _write_snapshot(out_dir, "pre")
-    executed = _execute_plan(out_dir, plan)
-    _write_snapshot(out_dir, "post")
-    _record_db("power_solo_madre_apply", "policy")
+    job = _start_job(
+        "solo_madre_policy", None, plan, out_dir, "power_solo_madre_apply", "policy"
+    )
+    accepted = await _job_result(job, wait)
+    if accepted is not None:
+        return accepted
 
     return {
         "status": "ok",
         "policy": "solo_madre",
-        "executed": executed,
+        "executed": job.executed,
         "out_dir": out_dir,
+        "job_id": job.job_id,
         "message": "SOLO_MADRE policy applied: all services stopped except madre",
     }
 
@@ -1087,7 +1401,7 @@ async def check_solo_madre_policy_status():
     Check if SOLO_MADRE policy is currently active.
     Returns true if only madre is running.
     """
-    res = _run(["docker", "compose", "-p", "vx11", "ps", "--format", "json"])
+    res = await _run_async([*COMPOSE_CMD, "-p", "vx11", "ps", "--format", "json"])
     try:
         raw = res.get("stdout", "").strip()
         if raw.startswith("["):
@@ -1140,14 +1454,14 @@ def _plan_for_named_mode(mode: str, allowlist: List[str]) -> List[Dict[str, Any]
     for svc in allowlist:
         if svc not in target and svc != "redis":
             plan.append(
-                {"cmd": ["docker", "compose", "-p", "vx11", "stop", svc], "timeout": 30}
+                {"cmd": [*COMPOSE_CMD, "-p", "vx11", "stop", svc], "timeout": 30, "service": svc}
             )
     # Start services in target
     for svc in target:
         if svc == "madre":
             continue
         plan.append(
-            {"cmd": ["docker", "compose", "-p", "vx11", "up", "-d", svc], "timeout": 30}
+            {"cmd": [*COMPOSE_CMD, "-p", "vx11", "up", "-d", svc], "timeout": 30, "service": svc}
         )
     return plan
 
@@ -4,7 +4,8 @@ import subprocess
 import datetime
 import json
 import sqlite3
-from typing import List, Dict, Any
+import time
+from typing import List, Dict, Any, Optional
 import shutil
 
 def _default_repo_root() -> str:
@@ -294,16 +295,70 @@ def _resolve_db_path(db_path: str = None) -> str:
     return "./data/runtime/vx11.db"
 
 
+def _delete_in_batches(
+    conn: sqlite3.Connection,
+    table: str,
+    ts_col: str,
+    cutoff: str,
+    batch_size: int,
+    pause_s: float,
+    checkpoint_every: int,
+    deadline: Optional[float],
+    progress: Dict[str, Any],
+) -> None:
+    """
+    Delete rows with ts_col < cutoff, oldest first, batch_size rows per
+    transaction. The write lock is released after every batch (plus pause_s
+    so other writers get in) and the WAL is checkpointed PASSIVE every
+    checkpoint_every batches. Updates progress in place.
+    """
+    sql = (
+        f"DELETE FROM {table} WHERE rowid IN ("
+        f"SELECT rowid FROM {table} WHERE {ts_col} IS NOT NULL AND {ts_col} < ? "
+        f"ORDER BY {ts_col} LIMIT ?)"
+    )
+    while True:
+        if deadline is not None and time.monotonic() >= deadline:
+            progress["complete"] = False
+            return
+        conn.execute("BEGIN IMMEDIATE;")
+        try:
+            deleted = conn.execute(sql, (cutoff, batch_size)).rowcount
+            conn.execute("COMMIT;")
+        except Exception:
+            conn.execute("ROLLBACK;")
+            raise
+        progress["deleted"] += deleted
+        progress["batches"] += 1
+        if deleted < batch_size:
+            progress["complete"] = True
+            return
+        if checkpoint_every and progress["batches"] % checkpoint_every == 0:
+            conn.execute("PRAGMA wal_checkpoint(PASSIVE);").fetchall()
+        if pause_s > 0:
+            time.sleep(pause_s)
+
+
 def db_retention_cleanup(
     out_dir: str,
     apply: bool = False,
     db_path: str = None,
+    batch_size: int = None,
+    pause_s: float = None,
+    max_seconds: float = None,
 ) -> Dict[str, Any]:
     """
     Plan (apply=False) or execute (apply=True) DB retention cleanup on the unified vx11 SQLite DB.
 
+    Deletes run in batches of batch_size rows (VX11_RETENTION_BATCH_SIZE, default 500)
+    through the timestamp index, committing between batches and sleeping pause_s
+    (VX11_RETENTION_BATCH_PAUSE_MS, default 20ms) so other services keep writing.
+    max_seconds (VX11_RETENTION_MAX_SECONDS, 0 = unlimited) bounds the whole run;
+    unfinished tables are marked incomplete and the next run carries on.
+
     Writes evidence files into out_dir:
     - db_retention_plan.json
+    - db_retention_progress.json (updated after each table, only when apply=True)
     - db_retention_result.json (only when apply=True)
     """
     db_path = _resolve_db_path(db_path)
@@ -330,6 +385,14 @@ def db_retention_cleanup(
         return "default"
 
     profile = _profile()
+    if batch_size is None:
+        batch_size = _env_int("VX11_RETENTION_BATCH_SIZE", 500)
+    batch_size = max(1, int(batch_size))
+    if pause_s is None:
+        pause_s = _env_int("VX11_RETENTION_BATCH_PAUSE_MS", 20) / 1000.0
+    if max_seconds is None:
+        max_seconds = _env_int("VX11_RETENTION_MAX_SECONDS", 0)
+    checkpoint_every = _env_int("VX11_RETENTION_CHECKPOINT_EVERY", 20)
     default_log_days = _env_int("VX11_RETENTION_LOG_DAYS", 30)
     low_power_log_days = _env_int("VX11_RETENTION_LOG_DAYS_LOW_POWER", 7)
 
@@ -369,6 +432,12 @@ def db_retention_cleanup(
             "log_days_low_power": low_power_log_days,
         },
         "rules": rules,
+        "batching": {
+            "batch_size": batch_size,
+            "pause_s": pause_s,
+            "max_seconds": max_seconds,
+            "checkpoint_every": checkpoint_every,
+        },
         "actions": [],
         "errors": [],
     }
@@ -410,7 +479,7 @@ def db_retention_cleanup(
                     "total_rows": total,
                     "rows_eligible": to_delete,
                     "index_sql": f"CREATE INDEX IF NOT EXISTS idx_{table}_{ts_col} ON {table}({ts_col});",
-                    "delete_sql": f"DELETE FROM {table} WHERE {ts_col} IS NOT NULL AND {ts_col} < datetime('now', '-{days} days');",
+                    "delete_sql": f"DELETE FROM {table} WHERE rowid IN (SELECT rowid FROM {table} WHERE {ts_col} IS NOT NULL AND {ts_col} < datetime('now', '-{days} days') ORDER BY {ts_col} LIMIT {batch_size});",
                 }
             )
 
@@ -425,49 +494,58 @@ def db_retention_cleanup(
             "timestamp_utc": datetime.datetime.utcnow().isoformat() + "Z",
             "db_path": db_path,
             "applied": True,
+            "complete": True,
             "tables": [],
             "checkpoint": None,
             "errors": [],
         }
+        progress_path = os.path.join(out_dir, "db_retention_progress.json")
+        deadline = time.monotonic() + max_seconds if max_seconds and max_seconds > 0 else None
 
-        try:
-            cur.execute("BEGIN;")
-            for a in plan["actions"]:
-                table = a["table"]
-                try:
-                    cur.execute(a["index_sql"])
-                except Exception as e:
-                    result["errors"].append(f"{table}: index_failed: {e}")
-
-                try:
-                    cutoff = f"-{int(a['days'])} days"
-                    before = cur.execute(f"SELECT COUNT(1) FROM {table}").fetchone()[0]
-                    cur.execute(
-                        f"DELETE FROM {table} WHERE {a['ts_col']} IS NOT NULL AND {a['ts_col']} < datetime('now', ?)",
-                        (cutoff,),
-                    )
-                    deleted = cur.rowcount
-                    after = cur.execute(f"SELECT COUNT(1) FROM {table}").fetchone()[0]
-                    result["tables"].append(
-                        {
-                            "table": table,
-                            "deleted": deleted,
-                            "rows_before": before,
-                            "rows_after": after,
-                        }
-                    )
-                except Exception as e:
-                    result["errors"].append(f"{table}: delete_failed: {e}")
-            cur.execute("COMMIT;")
-        except Exception as e:
+        # Autocommit: each batch is its own short BEGIN IMMEDIATE ... COMMIT
+        conn.isolation_level = None
+        for a in plan["actions"]:
+            table = a["table"]
             try:
-                cur.execute("ROLLBACK;")
-            except Exception:
-                pass
-            result["errors"].append(f"transaction_failed: {e}")
+                cur.execute(a["index_sql"])
+            except Exception as e:
+                result["errors"].append(f"{table}: index_failed: {e}")
+
+            progress = {
+                "table": table,
+                "deleted": 0,
+                "batches": 0,
+                "complete": False,
+                "rows_before": a["total_rows"],
+            }
+            started = time.monotonic()
+            try:
+                cutoff = cur.execute(
+                    "SELECT datetime('now', ?)", (f"-{int(a['days'])} days",)
+                ).fetchone()[0]
+                _delete_in_batches(
+                    conn,
+                    table,
+                    a["ts_col"],
+                    cutoff,
+                    batch_size,
+                    pause_s,
+                    checkpoint_every,
+                    deadline,
+                    progress,
+                )
+            except Exception as e:
+                result["errors"].append(f"{table}: delete_failed: {e}")
+            progress["rows_after"] = progress["rows_before"] - progress["deleted"]
+            progress["elapsed_s"] = round(time.monotonic() - started, 3)
+            result["tables"].append(progress)
+            result["complete"] = result["complete"] and progress["complete"]
+
+            with open(progress_path, "w", encoding="utf-8") as fh:
+                json.dump(result, fh, indent=2, ensure_ascii=False)
 
         try:
-            chk = cur.execute("PRAGMA wal_checkpoint(TRUNCATE);").fetchall()
+            chk = cur.execute("PRAGMA wal_checkpoint(PASSIVE);").fetchall()
             result["checkpoint"] = [tuple(r) for r in chk]
         except Exception as e:
             result["errors"].append(f"checkpoint_failed: {e}")
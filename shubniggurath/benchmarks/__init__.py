@@ -0,0 +1,3 @@
+"""Benchmarks reproducibles del stack DSP de Shub-Niggurath."""
+
+__all__ = ["dsp_bench"]
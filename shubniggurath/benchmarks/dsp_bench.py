@@ -0,0 +1,464 @@
+"""
+Benchmark reproducible del stack DSP de Shub (solo CPU, numpy/scipy).
+
+Mide cada etapa del camino de audio (audio_io, loudness, DSPEngine,
+DSPPipelineFull, dsp_fx, Mode C) sobre señales sintéticas deterministas de
+varias duraciones y canales:
+
+- wall time (mediana y mínimo de N repeticiones, tras un warm-up),
+- real-time factor (tiempo de proceso / duración del audio; < 1 = más rápido
+  que tiempo real),
+- pico de memoria Python/numpy (tracemalloc, en una ejecución aparte para no
+  sesgar el tiempo).
+
+Los resultados salen en JSON y pueden compararse con un baseline guardado:
+
+    python -m shubniggurath.benchmarks.dsp_bench --durations 5 30 --save-baseline
+    python -m shubniggurath.benchmarks.dsp_bench --durations 5 30 --baseline
+
+El comando sale con código 1 si alguna etapa empeora más que --threshold.
+Las etapas cuyas dependencias no están instaladas (p.ej. librosa para
+DSPEngine) se reportan como "skipped".
+"""
+
+import argparse
+import asyncio
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+BENCH_VERSION = "1"
+DEFAULT_SAMPLE_RATE = 48000
+DEFAULT_BASELINE = "./data/benchmarks/shub_dsp_baseline.json"
+DEFAULT_THRESHOLD = 0.25  # +25% de wall time / memoria = regresión
+
+# Señal de referencia (ver make_signal)
+SIGNAL_SEED = 1770
+SIGNAL_PEAK = 0.8
+
+
+# =============================================================================
+# SEÑALES SINTÉTICAS
+# =============================================================================
+
+
+def make_signal(
+    duration: float,
+    channels: int = 1,
+    sample_rate: int = DEFAULT_SAMPLE_RATE,
+    seed: int = SIGNAL_SEED,
+) -> np.ndarray:
+    """
+    Señal "musical" determinista: acorde armónico con modulación lenta, ruido
+    rosado aproximado y transitorios percusivos cada 500 ms. Mono 1-D o
+    (frames, channels) float32, pico SIGNAL_PEAK.
+    """
+    from scipy import signal
+
+    rng = np.random.default_rng(seed)
+    frames = int(round(duration * sample_rate))
+    t = np.arange(frames) / sample_rate
+
+    out = np.empty((frames, channels), dtype=np.float32)
+    for ch in range(channels):
+        tone = np.zeros(frames)
+        for k, freq in enumerate((110.0, 220.0, 277.2, 329.6, 440.0)):
+            tone += np.sin(2 * np.pi * freq * t + ch * 0.3 * k) / (k + 1)
+        tone *= 0.6 + 0.4 * np.sin(2 * np.pi * 0.25 * t)
+
+        # Ruido ~1/f (Paul Kellet, filtro de 1 polo en cascada)
+        noise = signal.lfilter([0.049922, -0.095993, 0.050612, -0.004408],
+                               [1, -2.494956, 2.017265, -0.522190],
+                               rng.standard_normal(frames))
+
+        hits = np.zeros(frames)
+        hits[::sample_rate // 2] = 1.0
+        decay = np.exp(-np.arange(sample_rate // 20) / (sample_rate * 0.008))
+        transients = signal.fftconvolve(hits, decay)[:frames] * rng.standard_normal(frames)
+
+        mix = 0.5 * tone + 0.2 * noise + 0.4 * transients
+        out[:, ch] = mix * (SIGNAL_PEAK / (np.max(np.abs(mix)) + 1e-12))
+
+    return out[:, 0].copy() if channels == 1 else out
+
+
+# =============================================================================
+# ETAPAS
+# =============================================================================
+
+
+@dataclass
+class BenchContext:
+    """Entrada de una etapa: señal del caso + directorio temporal"""
+
+    audio: np.ndarray
+    sample_rate: int
+    workdir: str
+
+    @property
+    def mono(self) -> np.ndarray:
+        return self.audio if self.audio.ndim == 1 else self.audio.mean(axis=1, dtype=np.float32)
+
+    @property
+    def channels(self) -> int:
+        return 1 if self.audio.ndim == 1 else self.audio.shape[1]
+
+
+# setup(ctx) -> runner(); el setup no se mide
+Stage = Callable[[BenchContext], Callable[[], Any]]
+STAGES: Dict[str, Stage] = {}
+
+
+def stage(name: str) -> Callable[[Stage], Stage]:
+    def register(setup: Stage) -> Stage:
+        STAGES[name] = setup
+        return setup
+    return register
+
+
+def _wav_path(ctx: BenchContext) -> str:
+    from shubniggurath.pro.audio_io import save_wav
+
+    path = os.path.join(ctx.workdir, f"bench_{len(ctx.audio)}_{ctx.channels}.wav")
+    if not os.path.exists(path):
+        save_wav(path, ctx.audio, ctx.sample_rate)
+    return path
+
+
+@stage("audio_io.save_wav")
+def _save_wav(ctx):
+    from shubniggurath.pro.audio_io import save_wav
+
+    path = os.path.join(ctx.workdir, "save_wav.wav")
+    return lambda: save_wav(path, ctx.audio, ctx.sample_rate)
+
+
+@stage("audio_io.load_audio")
+def _load_audio(ctx):
+    from shubniggurath.pro.audio_io import load_audio
+
+    path = _wav_path(ctx)
+    return lambda: load_audio(path, mono=False)
+
+
+@stage("audio_io.iter_audio_blocks")
+def _iter_blocks(ctx):
+    from shubniggurath.pro.audio_io import iter_audio_blocks
+
+    path = _wav_path(ctx)
+    return lambda: sum(len(block) for block in iter_audio_blocks(path, mono=False))
+
+
+@stage("loudness.measure_loudness")
+def _loudness(ctx):
+    from shubniggurath.pro.loudness import measure_loudness
+
+    return lambda: measure_loudness(ctx.audio, ctx.sample_rate)
+
+
+def _dsp_engine_stage(method: str, with_sr: bool) -> Stage:
+    def setup(ctx):
+        from shubniggurath.core.dsp_engine import DSPEngine
+
+        engine = DSPEngine(ctx.sample_rate)
+        audio = ctx.mono / (np.max(np.abs(ctx.mono)) + 1e-8)
+        compute = getattr(engine, method)
+        if with_sr:
+            return lambda: compute(audio, ctx.sample_rate)
+        return lambda: compute(audio)
+    return setup
+
+
+# Componentes de DSPEngine.analyze_audio, en proceso (sin el pool)
+for _name, _with_sr in (
+    ("loudness", False),
+    ("spectral_features", True),
+    ("temporal_features", True),
+    ("timbral_features", True),
+    ("pitch_features", True),
+    ("quality_metrics", False),
+):
+    stage(f"dsp_engine.{_name}")(_dsp_engine_stage(f"_compute_{_name}", _with_sr))
+
+
+@stage("dsp_pipeline_full.fase3_fft")
+def _pipeline_fft(ctx):
+    from shubniggurath.core.dsp_pipeline_full import DSPPipelineFull
+
+    pipeline = DSPPipelineFull()
+    return lambda: pipeline._fase3_fft_analysis(ctx.mono, ctx.sample_rate)
+
+
+@stage("dsp_pipeline_full.fases_1_5")
+def _pipeline_analysis(ctx):
+    from shubniggurath.core.dsp_pipeline_full import DSPPipelineFull
+
+    pipeline = DSPPipelineFull()
+
+    def run():
+        raw = pipeline._fase1_raw_analysis(ctx.mono, ctx.sample_rate)
+        normalized, norm = pipeline._fase2_normalization(ctx.mono)
+        fft = pipeline._fase3_fft_analysis(normalized, ctx.sample_rate)
+        classification = pipeline._fase4_classification(raw, norm, fft)
+        return pipeline._fase5_detect_issues(raw, norm, fft, classification)
+
+    return run
+
+
+# Cadena de mastering típica (con lookahead: incluye el delay line)
+FX_CHAIN = [
+    {"type": "highpass", "params": {"cutoff_hz": 30, "order": 2}},
+    {"type": "eq", "params": {"low_gain_db": 2, "high_gain_db": 1.5}},
+    {"type": "compressor", "params": {"threshold_db": -18, "ratio": 3, "lookahead_ms": 2}},
+    {"type": "limiter", "params": {"threshold_db": -1}},
+]
+
+
+def _fx_chain(sample_rate: int):
+    from shubniggurath.pro.dsp_fx import EffectConfig, EffectType, FXChain
+
+    chain = FXChain(sample_rate=sample_rate)
+    for fx in FX_CHAIN:
+        chain.add_effect_config(EffectConfig(EffectType(fx["type"]), params=dict(fx["params"])))
+    return chain
+
+
+@stage("dsp_fx.fx_chain")
+def _fx(ctx):
+    chain = _fx_chain(ctx.sample_rate)
+    return lambda: chain.process(ctx.audio)
+
+
+@stage("mode_c.streaming")
+def _mode_c(ctx):
+    from shubniggurath.pro.mode_c_pipeline import ModeCConfig, ModeCPipeline, ProcessingMode
+
+    config = ModeCConfig(mode=ProcessingMode.STREAMING)
+    chunks = [ctx.audio[i:i + config.chunk_size] for i in range(0, len(ctx.audio), config.chunk_size)]
+
+    async def stream():
+        pipeline = ModeCPipeline(config)
+        pipeline.sample_rate = ctx.sample_rate
+        pipeline.configure_fx_chain(FX_CHAIN)
+        for chunk in chunks:
+            await pipeline.process_chunk(chunk)
+
+    return lambda: asyncio.run(stream())
+
+
+# =============================================================================
+# MEDICIÓN
+# =============================================================================
+
+
+def measure(runner: Callable[[], Any], audio_seconds: float, repeats: int = 3, warmup: int = 1) -> Dict[str, float]:
+    """Wall time (mediana/mín), RTF y pico de memoria de un runner"""
+    for _ in range(warmup):
+        runner()
+
+    times = []
+    for _ in range(max(1, repeats)):
+        start = time.perf_counter()
+        runner()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        runner()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    median = statistics.median(times)
+    return {
+        "wall_s_median": median,
+        "wall_s_min": min(times),
+        "rtf": median / audio_seconds,
+        "peak_mem_mb": peak / (1024 * 1024),
+    }
+
+
+def select_stages(patterns: Optional[Sequence[str]] = None) -> List[str]:
+    """Etapas registradas que casan con algún patrón glob (todas si no hay)"""
+    if not patterns:
+        return list(STAGES)
+    return [name for name in STAGES if any(fnmatch.fnmatch(name, p) for p in patterns)]
+
+
+def run_benchmarks(
+    durations: Sequence[float] = (5.0, 30.0),
+    channels: Sequence[int] = (1, 2),
+    stages: Optional[Sequence[str]] = None,
+    repeats: int = 3,
+    sample_rate: int = DEFAULT_SAMPLE_RATE,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """Ejecutar cada etapa sobre cada (duración, canales) y devolver el informe"""
+    results = []
+    with tempfile.TemporaryDirectory(prefix="shub_bench_") as workdir:
+        for duration in durations:
+            for n_channels in channels:
+                ctx = BenchContext(make_signal(duration, n_channels, sample_rate), sample_rate, workdir)
+                for name in select_stages(stages):
+                    entry: Dict[str, Any] = {
+                        "stage": name,
+                        "duration_s": float(duration),
+                        "channels": int(n_channels),
+                    }
+                    try:
+                        runner = STAGES[name](ctx)
+                        entry.update(measure(runner, duration, repeats=repeats))
+                    except ImportError as e:
+                        entry["skipped"] = f"missing dependency: {e}"
+                    except Exception as e:
+                        entry["error"] = f"{type(e).__name__}: {e}"
+                    results.append(entry)
+                    if progress:
+                        progress(entry)
+
+    return {"meta": _environment(sample_rate, repeats), "results": results}
+
+
+def _environment(sample_rate: int, repeats: int) -> Dict[str, Any]:
+    import scipy
+
+    return {
+        "bench_version": BENCH_VERSION,
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "sample_rate": sample_rate,
+        "repeats": repeats,
+        "signal_seed": SIGNAL_SEED,
+    }
+
+
+# =============================================================================
+# BASELINE
+# =============================================================================
+
+
+def _case_key(entry: Dict[str, Any]) -> str:
+    return f"{entry['stage']}@{entry['duration_s']:g}s/{entry['channels']}ch"
+
+
+def compare(
+    report: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[Dict[str, Any]]:
+    """
+    Comparar wall time (mediana) y pico de memoria contra el baseline.
+    Solo se comparan casos medidos en ambos informes.
+    """
+    previous = {_case_key(e): e for e in baseline.get("results", []) if "wall_s_median" in e}
+    rows = []
+    for entry in report.get("results", []):
+        before = previous.get(_case_key(entry))
+        if before is None or "wall_s_median" not in entry:
+            continue
+        time_ratio = entry["wall_s_median"] / max(before["wall_s_median"], 1e-9)
+        mem_ratio = entry["peak_mem_mb"] / max(before["peak_mem_mb"], 1e-6)
+        rows.append({
+            "case": _case_key(entry),
+            "wall_s_baseline": before["wall_s_median"],
+            "wall_s": entry["wall_s_median"],
+            "time_ratio": time_ratio,
+            "peak_mem_mb_baseline": before["peak_mem_mb"],
+            "peak_mem_mb": entry["peak_mem_mb"],
+            "mem_ratio": mem_ratio,
+            "regression": time_ratio > 1 + threshold or mem_ratio > 1 + threshold,
+        })
+    return rows
+
+
+def load_report(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_report(report: Dict[str, Any], path: str) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+
+def _print_entry(entry: Dict[str, Any]) -> None:
+    case = _case_key(entry)
+    if "wall_s_median" in entry:
+        line = (f"{case:<48} {entry['wall_s_median'] * 1000:9.1f} ms  "
+                f"rtf={entry['rtf']:.4f}  mem={entry['peak_mem_mb']:.1f} MB")
+    else:
+        line = f"{case:<48} {entry.get('skipped') or entry.get('error')}"
+    print(line, file=sys.stderr)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark del stack DSP de Shub")
+    parser.add_argument("--durations", type=float, nargs="+", default=[5.0, 30.0], help="segundos de audio por caso")
+    parser.add_argument("--channels", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--stages", nargs="+", help="patrones glob (p.ej. 'dsp_fx.*')")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--sample-rate", type=int, default=DEFAULT_SAMPLE_RATE)
+    parser.add_argument("--output", help="escribir el informe JSON aquí (por defecto stdout)")
+    parser.add_argument("--baseline", nargs="?", const=DEFAULT_BASELINE, help="comparar contra este baseline")
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE, help="guardar el informe como baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--list", action="store_true", help="listar etapas y salir")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(STAGES))
+        return 0
+
+    report = run_benchmarks(
+        durations=args.durations,
+        channels=args.channels,
+        stages=args.stages,
+        repeats=args.repeats,
+        sample_rate=args.sample_rate,
+        progress=_print_entry,
+    )
+
+    exit_code = 0
+    if args.baseline:
+        rows = compare(report, load_report(args.baseline), args.threshold)
+        report["comparison"] = {"baseline": args.baseline, "threshold": args.threshold, "rows": rows}
+        for row in rows:
+            flag = "REGRESSION" if row["regression"] else "ok"
+            print(f"{row['case']:<48} time x{row['time_ratio']:.2f}  mem x{row['mem_ratio']:.2f}  {flag}",
+                  file=sys.stderr)
+        if any(row["regression"] for row in rows):
+            exit_code = 1
+
+    if args.save_baseline:
+        save_report(report, args.save_baseline)
+    if args.output:
+        save_report(report, args.output)
+    else:
+        print(json.dumps(report, indent=2))
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+"""Analysis Cache - Content-addressed, size-bounded store for shub results
+
+Re-analysing the same audio (mastering iterations, library rescans) used to
+rerun the whole DSP pipeline. Results are now cached on disk:
+
+- Key = hash of the decoded samples + pipeline name/version + parameters, so
+  a renamed or re-tagged file still hits and a pipeline change misses.
+- A (path, size, mtime) index maps files to their content hash (always
+  hash_samples of the decoded signal), so an unchanged file is looked up
+  without decoding it at all.
+- Storage is a local SQLite file (``settings.shub_analysis_cache_path``);
+  entries are evicted least-recently-used once the total payload exceeds
+  ``settings.shub_analysis_cache_max_mb`` (``0`` disables the cache).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, is_dataclass
+from typing import Any, Dict, Iterator, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS analysis_entries (
+    cache_key TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    pipeline TEXT NOT NULL,
+    result TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_analysis_entries_last_access
+    ON analysis_entries(last_access);
+CREATE TABLE IF NOT EXISTS file_hashes (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL
+);
+"""
+
+
+def _json_default(value: Any) -> Any:
+    """numpy/dataclass values found in analysis results."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if is_dataclass(value):
+        return asdict(value)
+    return str(value)
+
+
+# =============================================================================
+# CONTENT HASHING
+# =============================================================================
+
+
+def hash_samples(audio: np.ndarray, sample_rate: int) -> str:
+    """Fast content hash of an in-memory signal (dtype/shape/rate included)."""
+    audio = np.ascontiguousarray(audio)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{audio.dtype.str}:{audio.shape}:{sample_rate}".encode())
+    h.update(memoryview(audio).cast("B"))
+    return h.hexdigest()
+
+
+def make_cache_key(
+    content_hash: str,
+    pipeline: str,
+    version: str,
+    params: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Cache key for (content, pipeline version, parameters)."""
+    params_json = json.dumps(params or {}, sort_keys=True, default=str)
+    raw = f"{content_hash}|{pipeline}|{version}|{params_json}"
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+# =============================================================================
+# STORE
+# =============================================================================
+
+
+class AnalysisCache:
+    """SQLite-backed result cache with LRU eviction by total payload size."""
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if self.enabled:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with self._connect() as conn:
+                conn.executescript(_SCHEMA)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per call: safe from worker threads
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:  # commit / rollback
+                yield conn
+        finally:
+            conn.close()
+
+    # -- file index ---------------------------------------------------------
+
+    def lookup_file_hash(self, path: str) -> Optional[str]:
+        """Indexed content hash of an unchanged file, without decoding it."""
+        if not self.enabled:
+            return None
+        stat = os.stat(path)
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT content_hash FROM file_hashes WHERE path=? AND size=? AND mtime_ns=?",
+                    (os.path.abspath(path), stat.st_size, stat.st_mtime_ns),
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"analysis cache index read failed: {e}")
+            return None
+        return row[0] if row else None
+
+    def remember_file_hash(self, path: str, content_hash: str) -> None:
+        """Index a file's content hash by (path, size, mtime)."""
+        if not self.enabled:
+            return
+        stat = os.stat(path)
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO file_hashes (path, size, mtime_ns, content_hash) "
+                    "VALUES (?, ?, ?, ?)",
+                    (os.path.abspath(path), stat.st_size, stat.st_mtime_ns, content_hash),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"analysis cache index write failed: {e}")
+
+    # -- entries ------------------------------------------------------------
+
+    def get(self, cache_key: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT result FROM analysis_entries WHERE cache_key=?", (cache_key,)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                conn.execute(
+                    "UPDATE analysis_entries SET last_access=? WHERE cache_key=?",
+                    (time.time(), cache_key),
+                )
+            self.hits += 1
+            return json.loads(row[0])
+        except sqlite3.Error as e:
+            logger.warning(f"analysis cache read failed: {e}")
+            return None
+
+    def put(self, cache_key: str, content_hash: str, pipeline: str, result: Any) -> None:
+        if not self.enabled:
+            return
+        payload = json.dumps(result, default=_json_default)
+        size = len(payload.encode())
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO analysis_entries "
+                    "(cache_key, content_hash, pipeline, result, size_bytes, created_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (cache_key, content_hash, pipeline, payload, size, now, now),
+                )
+                self._evict(conn)
+        except sqlite3.Error as e:
+            logger.warning(f"analysis cache write failed: {e}")
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Drop least-recently-used entries until the payload fits."""
+        total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM analysis_entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        freed = 0
+        victims = []
+        for key, size in conn.execute(
+            "SELECT cache_key, size_bytes FROM analysis_entries ORDER BY last_access"
+        ):
+            victims.append((key,))
+            freed += size
+            if total - freed <= self.max_bytes:
+                break
+        conn.executemany("DELETE FROM analysis_entries WHERE cache_key=?", victims)
+
+    def clear(self) -> None:
+        if not self.enabled:
+            return
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM analysis_entries")
+            conn.execute("DELETE FROM file_hashes")
+
+    def stats(self) -> Dict[str, Any]:
+        entries, total = 0, 0
+        if self.enabled:
+            with self._connect() as conn:
+                entries, total = conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM analysis_entries"
+                ).fetchone()
+        return {
+            "enabled": self.enabled,
+            "entries": entries,
+            "size_bytes": total,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+_cache: Optional[AnalysisCache] = None
+
+
+def get_analysis_cache() -> AnalysisCache:
+    """Singleton AnalysisCache configured from settings."""
+    global _cache
+    if _cache is None:
+        from config.settings import settings
+
+        _cache = AnalysisCache(
+            path=settings.shub_analysis_cache_path,
+            max_bytes=int(settings.shub_analysis_cache_max_mb) * 1024 * 1024,
+        )
+    return _cache
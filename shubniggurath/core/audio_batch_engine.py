@@ -3,7 +3,8 @@ Audio Batch Engine — Procesamiento de Lotes Paralelo con Persistencia
 =====================================================================
 
 Motor de procesamiento por lotes con:
-- Cola inteligente con prioridades (1-10)
+- Cola inteligente con prioridades (1-10) sobre asyncio.PriorityQueue
+- Workers de archivo concurrentes (configurable) sobre DSPPipelineFull real
 - Integración con Hormiguero para distribución
 - Persistencia en vx11.db (tabla batch_jobs)
 - Manejo automático de errores y recuperación
@@ -15,18 +16,24 @@ Endpoints expuestos vía main.py: /api/batch/*
 """
 
 import asyncio
+import itertools
 import logging
 import uuid
 from typing import Dict, List, Any, Optional
 from datetime import datetime
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, is_dataclass
 import json
 
+import numpy as np
+
 from config.settings import settings
 from config.db_schema import get_session, Task, Context, Spawn
 from config.forensics import write_log, record_crash
-from shubniggurath.core.dsp_pipeline_full import pipeline
+from shubniggurath.core.analysis_cache import get_analysis_cache, hash_samples, make_cache_key
+from shubniggurath.core.dsp_pipeline_full import PIPELINE_VERSION, pipeline
+from shubniggurath.core.dsp_pool import physical_core_count
 from shubniggurath.integrations.vx11_bridge import VX11Bridge
+from shubniggurath.pro.audio_io import load_audio
 
 # FASE 6: Import Hormiguero Pheromone Reporter (Wiring)
 try:
@@ -50,6 +57,13 @@ JOB_STATUS_COMPLETED = "completed"
 JOB_STATUS_FAILED = "failed"
 JOB_STATUS_CANCELLED = "cancelled"
 
+# analysis_type del job -> mode de DSPPipelineFull
+PIPELINE_MODES = {
+    "quick": "quick",
+    "full": "mode_c",
+    "deep": "deep",
+}
+
 # =============================================================================
 # DATA MODELS
 # =============================================================================
@@ -112,6 +126,69 @@ class BatchJob:
                 setattr(self, name, kwargs.get(name))
 
 
+# =============================================================================
+# FILE WORKER
+# =============================================================================
+
+
+def _jsonable(value: Any) -> Any:
+    """Convertir dataclasses/tipos numpy del pipeline a JSON plano."""
+    if is_dataclass(value):
+        value = asdict(value)
+    if isinstance(value, dict):
+        return {k: _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def analyze_audio_file(audio_file: str, analysis_type: str = "full") -> Dict[str, Any]:
+    """
+    Decodificar archivo y ejecutar DSPPipelineFull (síncrono).
+
+    Corre en un thread worker: decode y FFT de numpy liberan el GIL, así que
+    varios archivos avanzan en paralelo sin bloquear el event loop.
+    Antes de decodificar se consulta el caché de análisis por contenido; si
+    el archivo no está indexado se decodifica una sola vez y se hashea el
+    array ya decodificado.
+    """
+    mode = PIPELINE_MODES.get(analysis_type, "mode_c")
+
+    cache = get_analysis_cache()
+    content_hash = cache_key = audio = None
+    if cache.enabled:
+        content_hash = cache.lookup_file_hash(audio_file)
+        if content_hash is None:
+            audio, sample_rate = load_audio(audio_file)
+            content_hash = hash_samples(audio, sample_rate)
+            cache.remember_file_hash(audio_file, content_hash)
+        cache_key = make_cache_key(content_hash, "dsp_pipeline_full", PIPELINE_VERSION, {"mode": mode})
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return {**cached, "cached": True}
+
+    if audio is None:
+        audio, sample_rate = load_audio(audio_file)
+
+    result = asyncio.run(
+        pipeline.run_full_pipeline(audio.tobytes(), sample_rate=sample_rate, mode=mode)
+    )
+    if result.get("status") != "success":
+        raise RuntimeError(result.get("message", "pipeline error"))
+
+    summary = {
+        "pipeline_id": result["pipeline_id"],
+        "processing_time_ms": result["processing_time_ms"],
+        "audio_analysis": _jsonable(result["audio_analysis"]),
+        "fx_chain": _jsonable(result["fx_chain"]),
+    }
+    if cache_key is not None:
+        cache.put(cache_key, content_hash, "dsp_pipeline_full", summary)
+    return summary
+
+
 # =============================================================================
 # AUDIO BATCH ENGINE
 # =============================================================================
@@ -128,9 +205,15 @@ class AudioBatchEngine:
     - process_queue(): Procesar cola (internal)
     """
 
-    def __init__(self):
+    def __init__(self, max_workers: Optional[int] = None):
         self.jobs: Dict[str, BatchJob] = {}  # En-memoria (caché)
-        self.queue: List[str] = []  # Cola de job_ids ordenada por prioridad
+        # Cola de (-priority, seq, job_id): mayor prioridad primero, FIFO en empate
+        self.queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._queue_seq = itertools.count()
+        self._job_tasks: Dict[str, asyncio.Task] = {}
+        if max_workers is None:
+            max_workers = settings.shub_batch_workers or physical_core_count()
+        self.max_workers = max(1, int(max_workers))
         self.vx11_bridge = VX11Bridge()
         self.processing = False
         self.db = None
@@ -164,7 +247,7 @@ class AudioBatchEngine:
                     self.jobs[job.job_id] = job
 
                     if job.status == JOB_STATUS_QUEUED:
-                        self.queue.append(job.job_id)
+                        self._push(job)
 
                 except Exception as e:
                     write_log(
@@ -252,10 +335,9 @@ class AudioBatchEngine:
             self.jobs[job_id] = job
 
             # Insertar en cola (respetando prioridades)
-            self.queue.append(job_id)
-            self.queue.sort(key=lambda jid: self.jobs[jid].priority, reverse=True)
+            self._push(job)
 
-            queue_position = self.queue.index(job_id) + 1
+            queue_position = self._queue_position(job_id)
 
             # Persistir en BD
             await self._save_job_to_db(job)
@@ -395,13 +477,14 @@ class AudioBatchEngine:
             if job.status not in [JOB_STATUS_QUEUED, JOB_STATUS_PROCESSING]:
                 return {"status": "error", "message": f"Cannot cancel {job.status} job"}
 
-            # Cambiar estado
+            # Cambiar estado (entradas canceladas se descartan al salir de la cola)
             job.status = JOB_STATUS_CANCELLED
             job.completed_at = datetime.now().isoformat()
 
-            # Remover de cola
-            if job_id in self.queue:
-                self.queue.remove(job_id)
+            # Detener workers si está procesando
+            task = self._job_tasks.get(job_id)
+            if task is not None and not task.done():
+                task.cancel()
 
             # Persistir
             await self._save_job_to_db(job)
@@ -441,68 +524,37 @@ class AudioBatchEngine:
         self.processing = True
 
         try:
-            write_log("audio_batch_engine", "PROCESS_QUEUE: iniciando", level="INFO")
+            write_log(
+                "audio_batch_engine",
+                f"PROCESS_QUEUE: iniciando, workers={self.max_workers}",
+                level="INFO",
+            )
 
-            while len(self.queue) > 0:
-                job_id = self.queue[0]
-                job = self.jobs[job_id]
+            while not self.queue.empty():
+                _, _, job_id = self.queue.get_nowait()
+                job = self.jobs.get(job_id)
+
+                # Job cancelado mientras esperaba en cola
+                if job is None or job.status != JOB_STATUS_QUEUED:
+                    continue
 
                 # Cambiar estado a processing
                 job.status = JOB_STATUS_PROCESSING
                 job.started_at = datetime.now().isoformat()
                 await self._save_job_to_db(job)
 
-                # Procesar archivos
+                task = asyncio.create_task(self._process_job(job))
+                self._job_tasks[job_id] = task
                 try:
-                    results = []
-                    for audio_file in job.audio_files:
-                        try:
-                            # Aquí iría el análisis real usando dsp_pipeline_full
-                            # Por ahora, simulado:
-                            write_log(
-                                "audio_batch_engine",
-                                f"PROCESSING: {audio_file}",
-                                level="INFO",
-                            )
-
-                            # Simulación
-                            await asyncio.sleep(0.1)
-
-                            job.processed_files += 1
-                            results.append(
-                                {
-                                    "file": audio_file,
-                                    "status": "success",
-                                    "analysis": {"mock": "data"},
-                                }
-                            )
-
-                        except Exception as e:
-                            write_log(
-                                "audio_batch_engine",
-                                f"PROCESS_FILE_ERROR: {audio_file}: {str(e)}",
-                                level="WARNING",
-                            )
-                            job.failed_files += 1
-                            results.append(
-                                {
-                                    "file": audio_file,
-                                    "status": "error",
-                                    "error": str(e),
-                                }
-                            )
-
-                    # Completar job
-                    job.status = JOB_STATUS_COMPLETED
-                    job.completed_at = datetime.now().isoformat()
-                    job.results = results
-
+                    await task
+                except asyncio.CancelledError:
+                    if job.status != JOB_STATUS_CANCELLED:
+                        raise  # Cancelación del propio process_queue
                     write_log(
                         "audio_batch_engine",
-                        f"PROCESS_QUEUE_JOB_COMPLETE: job_id={job_id}, processed={job.processed_files}, failed={job.failed_files}",
+                        f"PROCESS_QUEUE_JOB_CANCELLED: job_id={job_id}, processed={job.processed_files}",
                         level="INFO",
                     )
-
                 except Exception as e:
                     record_crash("audio_batch_engine", e)
                     job.status = JOB_STATUS_FAILED
@@ -513,6 +565,8 @@ class AudioBatchEngine:
                         f"PROCESS_QUEUE_JOB_ERROR: {str(e)}",
                         level="ERROR",
                     )
+                finally:
+                    self._job_tasks.pop(job_id, None)
 
                 # Persistir
                 await self._save_job_to_db(job)
@@ -544,9 +598,6 @@ class AudioBatchEngine:
                             level="WARNING",
                         )
 
-                # Remover de cola
-                self.queue.pop(0)
-
                 # Notificar a Madre
                 await self.vx11_bridge.notify_madre(
                     event_type="batch_job_complete",
@@ -573,6 +624,90 @@ class AudioBatchEngine:
         finally:
             self.processing = False
 
+    async def _process_job(self, job: BatchJob):
+        """
+        Procesar archivos de un job con `max_workers` workers concurrentes.
+
+        El progreso (processed/failed) se actualiza solo en memoria; la BD se
+        escribe en las transiciones de estado del job, no por archivo.
+        """
+        files = asyncio.Queue()
+        for index, audio_file in enumerate(job.audio_files):
+            files.put_nowait((index, audio_file))
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(job.audio_files)
+
+        async def file_worker():
+            while True:
+                try:
+                    index, audio_file = files.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+
+                try:
+                    analysis = await asyncio.to_thread(
+                        analyze_audio_file, audio_file, job.analysis_type
+                    )
+                    job.processed_files += 1
+                    results[index] = {
+                        "file": audio_file,
+                        "status": "success",
+                        "analysis": analysis,
+                    }
+                except Exception as e:
+                    write_log(
+                        "audio_batch_engine",
+                        f"PROCESS_FILE_ERROR: {audio_file}: {str(e)}",
+                        level="WARNING",
+                    )
+                    job.failed_files += 1
+                    results[index] = {
+                        "file": audio_file,
+                        "status": "error",
+                        "error": str(e),
+                    }
+
+        workers = [
+            asyncio.create_task(file_worker())
+            for _ in range(min(self.max_workers, max(len(job.audio_files), 1)))
+        ]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+            # Conservar resultados parciales (p. ej. job cancelado)
+            job.results = [r for r in results if r is not None]
+
+        # Completar job
+        job.status = JOB_STATUS_COMPLETED
+        job.completed_at = datetime.now().isoformat()
+
+        write_log(
+            "audio_batch_engine",
+            f"PROCESS_QUEUE_JOB_COMPLETE: job_id={job.job_id}, processed={job.processed_files}, failed={job.failed_files}",
+            level="INFO",
+        )
+
+    # =========================================================================
+    # HELPERS: Queue
+    # =========================================================================
+
+    def _push(self, job: BatchJob):
+        """Encolar job en la PriorityQueue (10 = máxima prioridad)"""
+        self.queue.put_nowait((-int(job.priority or 0), next(self._queue_seq), job.job_id))
+
+    def _queue_position(self, job_id: str) -> int:
+        """Posición (1-based) entre los jobs aún en cola"""
+        pending = sorted(
+            (job for job in self.jobs.values() if job.status == JOB_STATUS_QUEUED),
+            key=lambda job: -int(job.priority or 0),
+        )
+        for position, job in enumerate(pending, start=1):
+            if job.job_id == job_id:
+                return position
+        return 0
+
     # =========================================================================
     # HELPERS: Database Persistence
     # =========================================================================
@@ -593,13 +728,13 @@ class AudioBatchEngine:
                     module="shubniggurath",
                     action="batch_job",
                     status=job.status,
-                    metadata=json.dumps(job.to_dict()),
+                    metadata=json.dumps(job.to_dict(), default=str),
                     created_at=datetime.now(),
                 )
                 self.db.add(task)
             else:
                 task.status = job.status
-                task.metadata = json.dumps(job.to_dict())
+                task.metadata = json.dumps(job.to_dict(), default=str)
 
             self.db.commit()
 
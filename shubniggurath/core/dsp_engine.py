@@ -1,6 +1,5 @@
 """DSP Audio Engine - Core audio processing"""
 
-import asyncio
 import librosa
 import numpy as np
 from dataclasses import dataclass
@@ -9,6 +8,9 @@ from scipy import signal
 from datetime import datetime
 import logging
 
+from shubniggurath.core.dsp_pool import get_dsp_pool
+from shubniggurath.pro.loudness import measure_loudness
+
 logger = logging.getLogger(__name__)
 
 
@@ -85,19 +87,18 @@ class DSPEngine:
         # Normalization
         audio_mono = audio_mono / (np.max(np.abs(audio_mono)) + 1e-8)
         
-        # Parallel analysis tasks
-        loop = asyncio.get_event_loop()
-        tasks = [
-            loop.run_in_executor(None, self._compute_loudness, audio_mono),
-            loop.run_in_executor(None, self._compute_spectral_features, audio_mono, sr),
-            loop.run_in_executor(None, self._compute_temporal_features, audio_mono, sr),
-            loop.run_in_executor(None, self._compute_timbral_features, audio_mono, sr),
-            loop.run_in_executor(None, self._compute_pitch_features, audio_mono, sr),
-            loop.run_in_executor(None, self._compute_quality_metrics, audio_mono),
+        # Parallel analysis tasks (dedicated process pool, shared-memory buffer)
+        calls = [
+            (self._compute_loudness, (sr,)),
+            (self._compute_spectral_features, (sr,)),
+            (self._compute_temporal_features, (sr,)),
+            (self._compute_timbral_features, (sr,)),
+            (self._compute_pitch_features, (sr,)),
+            (self._compute_quality_metrics, ()),
         ]
         
         (loudness_dict, spectral_dict, temporal_dict, timbral_dict, 
-         pitch_dict, quality_dict) = await asyncio.gather(*tasks)
+         pitch_dict, quality_dict) = await get_dsp_pool().run_many(audio_mono, calls)
         
         # Merge results
         result = AudioAnalysisResult(
@@ -112,22 +113,11 @@ class DSPEngine:
         logger.info(f"Analysis complete: {result.loudness_lufs:.2f} LUFS")
         return result
     
-    def _compute_loudness(self, audio: np.ndarray) -> Dict[str, float]:
-        """Compute loudness metrics (ITU-R BS.1770)"""
-        # Simplified loudness computation
-        rms = np.sqrt(np.mean(audio ** 2))
-        loudness_lufs = 20 * np.log10(rms + 1e-8) - 23.0  # Offset for LUFS
-        
-        # Range: compute LU percentiles
-        frame_size = int(0.4 * self.sample_rate)  # 400ms frames
-        loudness_frames = []
-        for i in range(0, len(audio) - frame_size, frame_size):
-            frame_rms = np.sqrt(np.mean(audio[i:i+frame_size] ** 2))
-            frame_lufs = 20 * np.log10(frame_rms + 1e-8) - 23.0
-            loudness_frames.append(frame_lufs)
-        
-        loudness_frames = np.array(loudness_frames)
-        loudness_range_lu = np.percentile(loudness_frames, 95) - np.percentile(loudness_frames, 5)
+    def _compute_loudness(self, audio: np.ndarray, sr: int) -> Dict[str, float]:
+        """Compute loudness metrics (ITU-R BS.1770, streaming K-weighted meter)"""
+        loudness = measure_loudness(audio, sr)
+        loudness_lufs = loudness["integrated_lufs"]
+        loudness_range_lu = loudness["loudness_range_lu"]
         
         # True peak
         true_peak_dbfs = 20 * np.log10(np.max(np.abs(audio)) + 1e-8)
@@ -152,18 +142,18 @@ class DSPEngine:
     def _compute_spectral_features(self, audio: np.ndarray, sr: int) -> Dict[str, Any]:
         """Compute spectral features"""
         S = librosa.stft(audio, n_fft=self.n_fft, hop_length=self.hop_length)
-        S_db = librosa.power_to_db(np.abs(S) ** 2, ref=np.max)
+        # librosa expects non-negative magnitudes here, not dB
+        mag = np.abs(S)
         
         # Spectral centroids/rolloff
-        centroid = librosa.feature.spectral_centroid(S=S_db, sr=sr)[0]
-        rolloff = librosa.feature.spectral_rolloff(S=S_db, sr=sr)[0]
+        centroid = librosa.feature.spectral_centroid(S=mag, sr=sr)[0]
+        rolloff = librosa.feature.spectral_rolloff(S=mag, sr=sr)[0]
         
         # Spectral flux
-        mag = np.abs(S)
         flux = np.sqrt(np.sum(np.diff(mag, axis=1) ** 2, axis=0))
         
         # Spectral contrast
-        contrast = librosa.feature.spectral_contrast(S=S_db, sr=sr, n_bands=self.n_contrast_bands)
+        contrast = librosa.feature.spectral_contrast(S=mag, sr=sr, n_bands=self.n_contrast_bands)
         
         # Spectral flatness
         mag_sum = np.sum(mag, axis=0) + 1e-8
@@ -231,8 +221,7 @@ class DSPEngine:
         """Compute pitch features (BPM, Key detection)"""
         # Tempo/BPM
         onset_env = librosa.onset.onset_strength(y=audio, sr=sr)
-        tempogram = librosa.feature.tempogram(onset_env=onset_env, sr=sr)
-        bpm = librosa.tempo(onset_env=onset_env, sr=sr)[0]
+        bpm = librosa.feature.tempo(onset_envelope=onset_env, sr=sr)[0]
         bpm_confidence = 0.8  # Placeholder
         
         # Chroma-based key detection
@@ -15,7 +15,8 @@ FASE 2: Normalización
   - Detección de sobrenormalización
 
 FASE 3: Análisis FFT Multi-resolución
-  - FFT sizes: 1024, 2048, 4096, 8192
+  - Espectro de potencia Welch (8192, solape 50%) en una sola pasada
+  - Resoluciones 1024, 2048, 4096, 8192 derivadas del mismo espectro
   - Análisis por bandas (sub_bass, bass, low_mid, mid, high_mid, presence, brilliance)
   - Espectral flatness/crest
   - Detección de picos armónicos
@@ -51,11 +52,13 @@ Modo: mode_c (default) o custom
 
 import asyncio
 import logging
+import time
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 import json
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
 from config.forensics import write_log, record_crash
 from shubniggurath.engines_paso8 import (
@@ -66,6 +69,7 @@ from shubniggurath.engines_paso8 import (
     FXEngine,
     get_shub_core,
 )
+from shubniggurath.pro.loudness import measure_loudness
 
 # =============================================================================
 # LOGGING & CONSTANTS
@@ -84,6 +88,14 @@ FREQ_BANDS = {
     "brilliance": (6000, 20000),
 }
 
+# Versión de los resultados (clave del caché de análisis): subir al cambiar fases
+PIPELINE_VERSION = "8phase-2"
+
+# FFT: un único espectro Welch de WELCH_NFFT; el resto de resoluciones se derivan
+FFT_SIZES = (1024, 2048, 4096, 8192)
+WELCH_NFFT = 8192
+WELCH_BATCH_FRAMES = 64
+
 # Umbrales canónicos para detección de issues
 CLIPPING_THRESHOLD_DB = -0.1
 DC_OFFSET_THRESHOLD = 0.05
@@ -132,6 +144,7 @@ class DSPPipelineFull:
             "timestamp": "2024-12-10T15:30:00Z"
         }
         """
+        marks: List[float] = []  # inicio + fin de cada fase completada
         try:
             start_time = datetime.now()
             pipeline_id = f"pipeline_{datetime.now().isoformat()}"
@@ -146,44 +159,52 @@ class DSPPipelineFull:
             
             # Convertir bytes a numpy array
             audio_data = self._bytes_to_audio(audio_bytes, sample_rate)
+            marks.append(time.perf_counter())
             
             # FASE 1: Análisis Raw
-            write_log("dsp_pipeline", "FASE 1: Análisis Raw", level="INFO")
             raw_analysis = self._fase1_raw_analysis(audio_data, sample_rate)
+            marks.append(time.perf_counter())
             
             # FASE 2: Normalización
-            write_log("dsp_pipeline", "FASE 2: Normalización", level="INFO")
             normalized_audio, norm_analysis = self._fase2_normalization(audio_data)
+            marks.append(time.perf_counter())
             
             # FASE 3: Análisis FFT
-            write_log("dsp_pipeline", "FASE 3: FFT Multi-resolución", level="INFO")
             fft_analysis = self._fase3_fft_analysis(normalized_audio, sample_rate)
+            marks.append(time.perf_counter())
             
             # FASE 4: Clasificación
-            write_log("dsp_pipeline", "FASE 4: Clasificación Avanzada", level="INFO")
             classification = self._fase4_classification(raw_analysis, norm_analysis, fft_analysis)
+            marks.append(time.perf_counter())
             
             # FASE 5: Detección de Issues
-            write_log("dsp_pipeline", "FASE 5: Detección de Issues", level="INFO")
             issues, recommendations = self._fase5_detect_issues(raw_analysis, norm_analysis, fft_analysis, classification)
+            marks.append(time.perf_counter())
             
             # FASE 6: Generación de FX Chain
-            write_log("dsp_pipeline", "FASE 6: Generación de FX Chain", level="INFO")
             fx_chain = await self._fase6_generate_fx_chain(classification, issues)
+            marks.append(time.perf_counter())
             
             # FASE 7: Generación de Preset REAPER
-            write_log("dsp_pipeline", "FASE 7: Generación de Preset REAPER", level="INFO")
             reaper_preset = self._fase7_generate_reaper_preset(fx_chain, classification)
+            marks.append(time.perf_counter())
             
             # FASE 8: JSON para VX11
-            write_log("dsp_pipeline", "FASE 8: JSON para VX11", level="INFO")
             audio_analysis = self._fase8_vx11_json(
-                raw_analysis, norm_analysis, fft_analysis, classification, issues, recommendations
+                raw_analysis, norm_analysis, fft_analysis, classification, issues, recommendations,
+                duration=len(audio_data) / sample_rate,
+                sample_rate=sample_rate,
             )
+            marks.append(time.perf_counter())
             
             processing_ms = (datetime.now() - start_time).total_seconds() * 1000
             
-            write_log("dsp_pipeline", f"RUN_FULL_PIPELINE_COMPLETE: {processing_ms:.1f}ms", level="INFO")
+            # Un único log agregado con el tiempo de cada fase
+            write_log(
+                "dsp_pipeline",
+                f"RUN_FULL_PIPELINE_COMPLETE: {processing_ms:.1f}ms phases={self._phase_timings(marks)}",
+                level="INFO",
+            )
             
             return {
                 "status": "success",
@@ -198,7 +219,11 @@ class DSPPipelineFull:
             
         except Exception as e:
             record_crash("dsp_pipeline", e)
-            write_log("dsp_pipeline", f"RUN_FULL_PIPELINE_ERROR: {str(e)}", level="ERROR")
+            write_log(
+                "dsp_pipeline",
+                f"RUN_FULL_PIPELINE_ERROR: fase={len(marks)} phases={self._phase_timings(marks)} {str(e)}",
+                level="ERROR",
+            )
             return {"status": "error", "message": str(e)}
 
     # =========================================================================
@@ -207,9 +232,13 @@ class DSPPipelineFull:
 
     def _fase1_raw_analysis(self, audio_data: np.ndarray, sample_rate: int) -> Dict[str, Any]:
         """
-        Análisis raw: detección de clipping, NaN/Inf, amplitud máxima.
+        Análisis raw: detección de clipping, NaN/Inf, amplitud máxima,
+        loudness BS.1770 (medidor por bloques, memoria constante).
         """
+        loudness = measure_loudness(audio_data, sample_rate)
         return {
+            "integrated_lufs": loudness["integrated_lufs"],
+            "loudness_range_lu": loudness["loudness_range_lu"],
             "clipping_detected": np.any(np.abs(audio_data) > 1.0),
             "clipping_count": np.sum(np.abs(audio_data) > 1.0),
             "nan_count": np.sum(np.isnan(audio_data)),
@@ -253,15 +282,20 @@ class DSPPipelineFull:
 
     def _fase3_fft_analysis(self, audio_data: np.ndarray, sample_rate: int) -> Dict[str, Any]:
         """
-        Análisis FFT multi-resolución: 1024, 2048, 4096, 8192.
-        Análisis por bandas de frecuencia.
+        Análisis FFT en una sola pasada: espectro de potencia promedio (Welch,
+        frames de WELCH_NFFT con solape 50%). Las resoluciones 1024–4096 se
+        derivan agrupando bins del mismo espectro y la energía por banda sale
+        de una suma acumulada sobre bins (O(bandas)).
         """
-        fft_results = {}
+        power = self._welch_power(audio_data)
+        freqs = np.fft.rfftfreq(WELCH_NFFT, 1 / sample_rate)
         
-        for fft_size in [1024, 2048, 4096, 8192]:
-            fft = np.fft.rfft(audio_data[:fft_size])
-            magnitude = np.abs(fft)
-            freqs = np.fft.rfftfreq(fft_size, 1 / sample_rate)
+        fft_results = {}
+        for fft_size in FFT_SIZES:
+            # Agrupar bins: resolución equivalente a una FFT de fft_size
+            group = WELCH_NFFT // fft_size
+            grouped = power[1:].reshape(-1, group).sum(axis=1)
+            magnitude = np.sqrt(np.concatenate([power[:1], grouped]))
             
             fft_results[f"fft_{fft_size}"] = {
                 "max_magnitude": np.max(magnitude),
@@ -270,17 +304,15 @@ class DSPPipelineFull:
                 "crest": self._spectral_crest(magnitude),
             }
         
-        # Análisis por bandas
-        bands_analysis = {}
-        fft = np.fft.rfft(audio_data)
-        magnitude = np.abs(fft)
-        freqs = np.fft.rfftfreq(len(audio_data), 1 / sample_rate)
+        # Análisis por bandas: lookup en la suma acumulada de potencia
+        cumulative = np.concatenate([[0.0], np.cumsum(power)])
+        total_energy = cumulative[-1]
         
+        bands_analysis = {}
         for band_name, (low_freq, high_freq) in FREQ_BANDS.items():
-            mask = (freqs >= low_freq) & (freqs < high_freq)
-            band_energy = np.sum(magnitude[mask] ** 2)
-            total_energy = np.sum(magnitude ** 2)
-            band_power_db = 10 * np.log10(band_energy / total_energy + 1e-10)
+            lo, hi = np.searchsorted(freqs, [low_freq, high_freq])
+            band_energy = cumulative[hi] - cumulative[lo]
+            band_power_db = 10 * np.log10(band_energy / (total_energy + 1e-20) + 1e-10)
             
             bands_analysis[band_name] = {
                 "power_db": band_power_db,
@@ -290,9 +322,28 @@ class DSPPipelineFull:
         return {
             "fft_multi": fft_results,
             "bands": bands_analysis,
-            "spectral_centroid": self._spectral_centroid(magnitude, freqs),
+            "spectral_centroid": self._spectral_centroid(np.sqrt(power), freqs),
         }
 
+    def _welch_power(self, audio_data: np.ndarray) -> np.ndarray:
+        """
+        Espectro de potencia promedio (Welch): frames Hann de WELCH_NFFT con
+        hop WELCH_NFFT/2, acumulados por lotes para acotar memoria.
+        """
+        hop = WELCH_NFFT // 2
+        if len(audio_data) < WELCH_NFFT:
+            audio_data = np.pad(audio_data, (0, WELCH_NFFT - len(audio_data)))
+        
+        frames = sliding_window_view(audio_data, WELCH_NFFT)[::hop]
+        window = np.hanning(WELCH_NFFT)
+        
+        power = np.zeros(WELCH_NFFT // 2 + 1)
+        for start in range(0, len(frames), WELCH_BATCH_FRAMES):
+            spectrum = np.fft.rfft(frames[start:start + WELCH_BATCH_FRAMES] * window, axis=1)
+            power += np.sum(spectrum.real ** 2 + spectrum.imag ** 2, axis=0)
+        
+        return power / len(frames)
+
     # =========================================================================
     # FASE 4: CLASIFICACIÓN AVANZADA
     # =========================================================================
@@ -494,56 +545,62 @@ class DSPPipelineFull:
         classification: Dict,
         issues: List[str],
         recommendations: List[str],
+        duration: float = 0.0,
+        sample_rate: int = 44100,
     ) -> AudioAnalysis:
         """
         Salida final: AudioAnalysis canónico para VX11.
         """
         return AudioAnalysis(
+            # Información básica
+            duration=float(duration),
+            sample_rate=int(sample_rate),
+            channels=1,
+            
             # Niveles
-            peak_db=raw_analysis["peak_db"],
-            rms_db=raw_analysis["rms_db"],
-            lufs_integrated=raw_analysis["rms_db"] - 23,  # Aproximado
-            lufs_short_term=raw_analysis["rms_db"] - 20,
-            lufs_momentary=raw_analysis["peak_db"] - 5,
-            true_peak_db=raw_analysis["peak_db"],
+            peak_dbfs=float(raw_analysis["peak_db"]),
+            rms_dbfs=float(raw_analysis["rms_db"]),
+            lufs_integrated=float(raw_analysis["integrated_lufs"]),
+            lufs_range=float(raw_analysis["loudness_range_lu"]),
+            true_peak_dbfs=float(raw_analysis["peak_db"]),
             
             # Espectrales
-            spectral_centroid=fft_analysis.get("spectral_centroid", 0.0),
-            spectral_flatness=fft_analysis["fft_multi"]["fft_2048"]["flatness"],
-            spectral_crest=fft_analysis["fft_multi"]["fft_2048"]["crest"],
+            spectral_centroid=float(fft_analysis.get("spectral_centroid", 0.0)),
             spectral_rolloff=0.0,  # Placeholder
+            spectral_flux=0.0,  # Placeholder
+            zero_crossing_rate=0.0,  # Placeholder
+            spectral_flatness=float(fft_analysis["fft_multi"]["fft_2048"]["flatness"]),
             
             # Dinámicos
-            dynamic_range=raw_analysis["peak_db"] - raw_analysis["rms_db"],
-            crest_factor=(raw_analysis["peak_linear"] + 1e-10) / (np.sqrt(raw_analysis["rms_linear"] ** 2) + 1e-10),
+            dynamic_range=float(raw_analysis["peak_db"] - raw_analysis["rms_db"]),
+            crest_factor=float((raw_analysis["peak_linear"] + 1e-10) / (raw_analysis["rms_linear"] + 1e-10)),
             
-            # Bandas
-            bass_power=fft_analysis["bands"]["bass"]["power_db"],
-            midrange_power=fft_analysis["bands"]["mid"]["power_db"],
-            treble_power=fft_analysis["bands"]["presence"]["power_db"],
+            # Problemas
+            clipping_samples=int(raw_analysis["clipping_count"]),
+            dc_offset=float(norm_analysis["dc_offset_removed"]),
             
             # Clasificación
-            instrument=classification["instrument"],
-            genre=classification["genre"],
-            mood=classification["mood"],
-            confidence_instrument=classification.get("confidence_instrument", 0.5),
-            confidence_genre=classification.get("confidence_genre", 0.5),
-            confidence_mood=classification.get("confidence_mood", 0.5),
+            instrument_prediction={classification["instrument"]: classification.get("confidence_instrument", 0.5)},
+            genre_prediction={classification["genre"]: classification.get("confidence_genre", 0.5)},
+            mood_prediction={classification["mood"]: classification.get("confidence_mood", 0.5)},
             
             # Issues & Recommendations
             issues=issues,
             recommendations=recommendations,
-            
-            # Metadata
-            processing_timestamp=datetime.now().isoformat(),
-            pipeline_mode="mode_c",
-            pipeline_version="7.0",
         )
 
     # =========================================================================
     # HELPER METHODS
     # =========================================================================
 
+    @staticmethod
+    def _phase_timings(marks: List[float]) -> str:
+        """'1:0.4ms,2:0.1ms,...' a partir de los timestamps de fin de fase"""
+        return ",".join(
+            f"{i}:{(end - begin) * 1000:.1f}ms"
+            for i, (begin, end) in enumerate(zip(marks, marks[1:]), start=1)
+        )
+
     def _bytes_to_audio(self, audio_bytes: bytes, sample_rate: int) -> np.ndarray:
         """Convertir bytes a numpy array"""
         # Placeholder simplificado; en producción usar librosa o scipy
@@ -0,0 +1,221 @@
+"""DSP Process Pool - Dedicated worker processes for CPU-bound shub analysis
+
+Feature extraction in shub is GIL-bound Python/numpy glue, so running it on
+the default thread pool barely parallelizes and starves other async code.
+This module owns a bounded ``ProcessPoolExecutor`` reserved for DSP work:
+
+- Workers are started once and warmed (librosa/scipy imported up front).
+- Audio buffers travel through ``multiprocessing.shared_memory`` instead of
+  being pickled once per task.
+- Worker count is configurable (``settings.shub_dsp_workers``); ``None``
+  means one worker per physical core, ``0`` disables the pool.
+- A pool that cannot start or breaks (``BrokenProcessPool``) degrades to
+  in-process execution on the default executor, so callers never see a
+  different result shape. Errors raised by feature functions propagate.
+"""
+
+import asyncio
+import atexit
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# (callable, extra_args) — the callable receives the audio array first
+DSPCall = Tuple[Callable[..., Any], Tuple[Any, ...]]
+
+# spawn: never fork an event loop / open DB sessions into the workers
+DEFAULT_START_METHOD = "spawn"
+
+
+# =============================================================================
+# WORKER SIDE
+# =============================================================================
+
+
+def _warm_worker() -> None:
+    """Import heavy DSP modules once per worker process."""
+    for module_name in ("scipy.signal", "librosa", "librosa.feature"):
+        try:
+            __import__(module_name)
+        except Exception:
+            pass
+
+
+def _run_on_shared(
+    func: Callable[..., Any],
+    shm_name: str,
+    shape: Tuple[int, ...],
+    dtype: str,
+    args: Tuple[Any, ...],
+) -> Any:
+    """Attach to the parent's shared buffer and run ``func(audio, *args)``."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        audio = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+        audio.flags.writeable = False
+        try:
+            return func(audio, *args)
+        finally:
+            del audio
+    finally:
+        shm.close()
+
+
+# =============================================================================
+# PARENT SIDE
+# =============================================================================
+
+
+def physical_core_count() -> int:
+    """Physical cores (psutil), falling back to logical CPUs."""
+    try:
+        import psutil
+
+        count = psutil.cpu_count(logical=False)
+        if count:
+            return int(count)
+    except Exception:
+        pass
+    return os.cpu_count() or 1
+
+
+def _configured_workers() -> Optional[int]:
+    try:
+        from config.settings import settings
+
+        return settings.shub_dsp_workers
+    except Exception:
+        return None
+
+
+class DSPProcessPool:
+    """Bounded process pool for shub DSP work with in-process fallback."""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        start_method: str = DEFAULT_START_METHOD,
+    ):
+        if max_workers is None:
+            max_workers = physical_core_count()
+        self.max_workers = max(0, int(max_workers))
+        self.start_method = start_method
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._disabled = self.max_workers == 0
+
+    @property
+    def enabled(self) -> bool:
+        return not self._disabled
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self._disabled:
+            return None
+        if self._executor is None:
+            try:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                    initializer=_warm_worker,
+                )
+                logger.info(f"DSP process pool started: workers={self.max_workers}")
+            except Exception as e:
+                self._degrade(f"pool start failed: {e}")
+        return self._executor
+
+    def _degrade(self, reason: str) -> None:
+        logger.warning(f"DSP process pool disabled, running in-process ({reason})")
+        self._disabled = True
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, func: Callable[..., Any], audio: np.ndarray, *args: Any) -> Any:
+        """Run ``func(audio, *args)`` on the pool."""
+        results = await self.run_many(audio, [(func, args)])
+        return results[0]
+
+    async def run_many(self, audio: np.ndarray, calls: Sequence[DSPCall]) -> List[Any]:
+        """
+        Run several feature functions over the same buffer concurrently.
+
+        The buffer is copied into shared memory once and every call attaches
+        to it. Results are returned in ``calls`` order; the first exception
+        raised by a feature function propagates as with ``asyncio.gather``.
+        """
+        loop = asyncio.get_running_loop()
+        audio = np.ascontiguousarray(audio)
+        executor = self._get_executor()
+
+        if executor is not None and audio.nbytes > 0:
+            try:
+                shm = shared_memory.SharedMemory(create=True, size=audio.nbytes)
+            except OSError as e:
+                # /dev/shm missing or full: the pool cannot be fed at all
+                self._degrade(f"shared memory unavailable: {e}")
+                shm = None
+
+            if shm is not None:
+                futures = []
+                try:
+                    np.ndarray(audio.shape, dtype=audio.dtype, buffer=shm.buf)[...] = audio
+                    futures = [
+                        loop.run_in_executor(
+                            executor,
+                            _run_on_shared,
+                            func,
+                            shm.name,
+                            audio.shape,
+                            audio.dtype.str,
+                            tuple(args),
+                        )
+                        for func, args in calls
+                    ]
+                    # Exceptions raised by a feature function (OSError included)
+                    # propagate unchanged; only a dead pool triggers the fallback
+                    return list(await asyncio.gather(*futures))
+                except BrokenProcessPool as e:
+                    self._degrade(str(e))
+                except Exception:
+                    # Let sibling calls finish before their buffer is unlinked
+                    await asyncio.gather(*futures, return_exceptions=True)
+                    raise
+                finally:
+                    shm.close()
+                    shm.unlink()
+
+        futures = [loop.run_in_executor(None, func, audio, *args) for func, args in calls]
+        return list(await asyncio.gather(*futures))
+
+    def shutdown(self, wait: bool = True) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_pool: Optional[DSPProcessPool] = None
+
+
+def get_dsp_pool() -> DSPProcessPool:
+    """Singleton DSPProcessPool sized from settings."""
+    global _pool
+    if _pool is None:
+        _pool = DSPProcessPool(max_workers=_configured_workers())
+    return _pool
+
+
+def shutdown_dsp_pool(wait: bool = True) -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=wait)
+        _pool = None
+
+
+atexit.register(shutdown_dsp_pool, False)
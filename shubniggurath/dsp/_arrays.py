@@ -0,0 +1,26 @@
+"""
+Adaptadores lista <-> numpy para el paquete dsp.
+
+Las funciones del paquete trabajan sobre np.ndarray float64; los callers
+históricos pasan listas de floats y esperan listas de vuelta.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import numpy as np
+
+Samples = Union[Sequence[float], np.ndarray]
+
+
+def as_array(samples: Samples) -> np.ndarray:
+    """Vista float64 1-D de las muestras (sin copia si ya es ndarray float64)."""
+    return np.asarray(samples, dtype=np.float64).reshape(-1)
+
+
+def like_input(result: np.ndarray, samples: Samples):
+    """Devolver en el mismo tipo que la entrada: ndarray o lista."""
+    if isinstance(samples, np.ndarray):
+        return result
+    return result.tolist()
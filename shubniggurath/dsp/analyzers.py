@@ -1,13 +1,15 @@
 """
 Lightweight audio analyzer that avoids heavy DSP dependencies.
-The input is expected to be a list of floats (normalized samples).
+The input is a list of floats or a numpy array (normalized samples).
 """
 
 from __future__ import annotations
 
-from statistics import mean
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List
 
+import numpy as np
+
+from shubniggurath.dsp._arrays import as_array
 from shubniggurath.dsp.filters import FilterBank
 from shubniggurath.dsp.segmenter import AudioSegmenter
 
@@ -18,12 +20,13 @@ class AudioAnalyzer:
         self.segmenter = segmenter
 
     async def analyze(self, audio: List[float], sample_rate: int = 48000, metadata: Dict[str, Any] | None = None) -> Dict[str, Any]:
-        duration = len(audio) / float(sample_rate) if sample_rate else 0.0
-        peak = max(audio) if audio else 0.0
-        rms = self._rms(audio)
-        segments = self.segmenter.split(audio, sample_rate)
+        data = as_array(audio)
+        duration = len(data) / float(sample_rate) if sample_rate else 0.0
+        peak = float(np.max(data)) if len(data) else 0.0
+        rms = self._rms(data)
+        segments = self.segmenter.split(data, sample_rate)
 
-        spectral_hint = self.filters.estimate_balance(audio)
+        spectral_hint = self.filters.estimate_balance(data)
         mood = self._estimate_mood(rms, spectral_hint)
 
         return {
@@ -39,9 +42,10 @@ class AudioAnalyzer:
         }
 
     def _rms(self, audio: List[float]) -> float:
-        if not audio:
+        data = as_array(audio)
+        if len(data) == 0:
             return 0.0
-        return (sum(sample * sample for sample in audio) / len(audio)) ** 0.5
+        return float(np.sqrt(np.dot(data, data) / len(data)))
 
     def _estimate_mood(self, rms: float, spectral: Dict[str, float]) -> str:
         highs = spectral.get("high", 0.0)
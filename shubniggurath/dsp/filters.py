@@ -1,38 +1,47 @@
 """
 Simple DSP filters utilities (placeholder math only).
+
+Vectorizado con numpy: acepta listas o arrays y devuelve el mismo tipo.
 """
 
 from __future__ import annotations
 
 from typing import Dict, List
 
+import numpy as np
+
+from shubniggurath.dsp._arrays import Samples, as_array, like_input
+
 
 class FilterBank:
     """Very small set of helpers to avoid heavy DSP libs."""
 
     def normalize(self, samples: List[float], target_peak: float = 0.9) -> List[float]:
-        if not samples:
+        if len(samples) == 0:
             return samples
-        current_peak = max(abs(s) for s in samples)
+        data = as_array(samples)
+        current_peak = np.max(np.abs(data))
         if current_peak == 0:
             return samples
         gain = target_peak / current_peak
-        return [max(min(s * gain, 1.0), -1.0) for s in samples]
+        return like_input(np.clip(data * gain, -1.0, 1.0), samples)
 
     def highpass(self, samples: List[float], threshold: float = 0.01) -> List[float]:
         # Placeholder: zero-out very low-amplitude drift (dc-ish)
-        return [s if abs(s) > threshold else 0.0 for s in samples]
+        data = as_array(samples)
+        return like_input(np.where(np.abs(data) > threshold, data, 0.0), samples)
 
-    def estimate_balance(self, samples: List[float]) -> Dict[str, float]:
+    def estimate_balance(self, samples: Samples) -> Dict[str, float]:
         # Coarse spectral split based on sample index bands (no FFT required)
-        total = len(samples) or 1
+        data = np.abs(as_array(samples))
+        total = len(data) or 1
         thirds = total // 3 or 1
-        low = sum(abs(s) for s in samples[:thirds]) / thirds
-        mid = sum(abs(s) for s in samples[thirds: 2 * thirds]) / thirds
-        high = sum(abs(s) for s in samples[2 * thirds:]) / thirds
+        low = data[:thirds].sum() / thirds
+        mid = data[thirds: 2 * thirds].sum() / thirds
+        high = data[2 * thirds:].sum() / thirds
         total_energy = low + mid + high or 1.0
         return {
-            "low": low / total_energy,
-            "mid": mid / total_energy,
-            "high": high / total_energy,
+            "low": float(low / total_energy),
+            "mid": float(mid / total_energy),
+            "high": float(high / total_energy),
         }
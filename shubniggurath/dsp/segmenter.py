@@ -1,30 +1,93 @@
 """
-Audio segmenter stub to split frames into coarse chunks.
+Audio segmenter: ventanas fijas y detección de silencio por energía.
+
+Vectorizado con numpy (reduceat por ventana); acepta listas o arrays.
 """
 
 from __future__ import annotations
 
 from typing import Dict, List
 
+import numpy as np
+
+from shubniggurath.dsp._arrays import Samples, as_array
+
 
 class AudioSegmenter:
     def split(self, samples: List[float], sample_rate: int, window_seconds: int = 5) -> List[Dict[str, float]]:
-        if not samples or not sample_rate:
+        if len(samples) == 0 or not sample_rate:
             return []
 
+        data = as_array(samples)
         window_size = max(1, sample_rate * window_seconds)
-        segments = []
-        for idx in range(0, len(samples), window_size):
-            chunk = samples[idx: idx + window_size]
-            peak = max(chunk) if chunk else 0.0
-            rms = (sum(s * s for s in chunk) / len(chunk)) ** 0.5 if chunk else 0.0
-            segments.append(
-                {
-                    "index": len(segments),
-                    "start_sec": idx / sample_rate,
-                    "end_sec": (idx + len(chunk)) / sample_rate,
-                    "peak": peak,
-                    "rms": rms,
-                }
-            )
-        return segments
+        starts = np.arange(0, len(data), window_size)
+        lengths = np.minimum(window_size, len(data) - starts)
+
+        peaks = np.maximum.reduceat(data, starts)
+        rms = np.sqrt(np.add.reduceat(data * data, starts) / lengths)
+
+        return [
+            {
+                "index": i,
+                "start_sec": int(start) / sample_rate,
+                "end_sec": int(start + length) / sample_rate,
+                "peak": float(peak),
+                "rms": float(value),
+            }
+            for i, (start, length, peak, value) in enumerate(zip(starts, lengths, peaks, rms))
+        ]
+
+    def frame_energy_db(self, samples: Samples, sample_rate: int, frame_seconds: float = 0.02) -> np.ndarray:
+        """RMS por frame (dBFS); el último frame parcial se descarta."""
+        data = as_array(samples)
+        frame = max(1, int(sample_rate * frame_seconds))
+        n = len(data) // frame
+        if n == 0:
+            return np.zeros(0)
+        ms = np.mean(data[:n * frame].reshape(n, frame) ** 2, axis=1)
+        return 10 * np.log10(np.maximum(ms, 1e-20))
+
+    def detect_silence(
+        self,
+        samples: Samples,
+        sample_rate: int,
+        threshold_db: float = -50.0,
+        min_silence_seconds: float = 0.3,
+        frame_seconds: float = 0.02,
+    ) -> List[Dict[str, float]]:
+        """Regiones de silencio (energía por frame bajo el umbral)."""
+        if len(samples) == 0 or not sample_rate:
+            return []
+        energy = self.frame_energy_db(samples, sample_rate, frame_seconds)
+        frame = max(1, int(sample_rate * frame_seconds))
+
+        # Bordes de las corridas de frames silenciosos
+        quiet = np.concatenate([[False], energy < threshold_db, [False]])
+        edges = np.flatnonzero(np.diff(quiet.astype(np.int8)))
+        starts, ends = edges[::2], edges[1::2]
+        keep = (ends - starts) * frame >= min_silence_seconds * sample_rate
+
+        return [
+            {"start_sec": int(s) * frame / sample_rate, "end_sec": int(e) * frame / sample_rate}
+            for s, e in zip(starts[keep], ends[keep])
+        ]
+
+    def split_on_silence(
+        self,
+        samples: Samples,
+        sample_rate: int,
+        threshold_db: float = -50.0,
+        min_silence_seconds: float = 0.3,
+    ) -> List[Dict[str, float]]:
+        """Regiones con señal entre silencios."""
+        if len(samples) == 0 or not sample_rate:
+            return []
+        duration = len(samples) / sample_rate
+        regions, cursor = [], 0.0
+        for silence in self.detect_silence(samples, sample_rate, threshold_db, min_silence_seconds):
+            if silence["start_sec"] > cursor:
+                regions.append({"start_sec": cursor, "end_sec": silence["start_sec"]})
+            cursor = silence["end_sec"]
+        if cursor < duration:
+            regions.append({"start_sec": cursor, "end_sec": duration})
+        return regions
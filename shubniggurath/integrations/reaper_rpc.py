@@ -12,12 +12,18 @@ Módulo canónico para integración completa VX11 ↔ REAPER:
 Protocolo: HTTP JSON RPC (puerto 8007 internamente, REAPER escucha 7899)
 Auth: X-VX11-Token header
 Respuestas: JSON estándar VX11 con status/success/error
+
+Batching: varias operaciones viajan en un único POST /batch (o, si REAPER no
+lo soporta, se pipelinan sobre la conexión keep-alive del cliente). Las
+lecturas de estado del proyecto (pistas/items/FX) se cachean unos segundos o
+hasta la siguiente mutación; /health y /projects siempre van a REAPER.
 """
 
 import asyncio
 import json
 import logging
-from typing import Dict, List, Any, Optional
+import time
+from typing import Dict, List, Any, Optional, Sequence, Tuple
 from pathlib import Path
 from datetime import datetime
 import httpx
@@ -43,6 +49,78 @@ REAPER_HEADERS = {
     "Content-Type": "application/json",
 }
 
+# Batching
+RPC_BATCH_PATH = "/batch"
+RPC_BATCH_MAX_OPS = 200          # operaciones por request /batch
+RPC_PIPELINE_CONCURRENCY = 8     # requests en vuelo si no hay /batch
+
+# Caché de lecturas: solo estado del proyecto, con TTL corto porque también
+# se edita desde REAPER. /health y /projects nunca se cachean.
+RPC_READ_CACHE_PREFIXES = ("/tracks", "/items")
+RPC_READ_CACHE_TTL_S = 2.0
+
+# (method, path, data)
+RPCOperation = Tuple[str, str, Optional[Dict[str, Any]]]
+
+
+class REAPERBatch:
+    """
+    Acumula operaciones y las envía juntas al salir del contexto.
+
+        async with controller.batch() as batch:
+            tracks = batch.add("GET", "/tracks")
+            batch.add("POST", "/tracks/0/apply_fx_chain", {...})
+        tracks.result()  # respuesta de esa operación
+
+    Si el bloque termina con excepción no se envía nada y los futures
+    pendientes quedan cancelados; si falla el envío, reciben ese error.
+    """
+
+    def __init__(self, controller: "REAPERController"):
+        self.controller = controller
+        self.operations: List[RPCOperation] = []
+        self.futures: List[asyncio.Future] = []
+
+    def add(self, method: str, path: str, data: Dict = None) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self.operations.append((method.upper(), path, data))
+        self.futures.append(future)
+        return future
+
+    async def flush(self) -> List[Dict[str, Any]]:
+        operations, futures = self.operations, self.futures
+        self.operations, self.futures = [], []
+        try:
+            results = await self.controller.call_many(operations)
+        except BaseException as e:
+            # Nadie debe quedar esperando una respuesta que no llegará
+            for future in futures:
+                if isinstance(e, Exception):
+                    future.set_exception(e)
+                else:
+                    future.cancel()
+            raise
+        for future, result in zip(futures, results):
+            future.set_result(result)
+        return results
+
+    async def __aenter__(self) -> "REAPERBatch":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.cancel()
+        elif self.operations:
+            await self.flush()
+
+    def cancel(self) -> None:
+        """Descartar las operaciones encoladas y cancelar sus futures"""
+        futures = self.futures
+        self.operations, self.futures = [], []
+        for future in futures:
+            future.cancel()
+
+
 # =============================================================================
 # REAPER RPC CONTROLLER (12 Métodos Canónicos)
 # =============================================================================
@@ -67,19 +145,33 @@ class REAPERController:
     12. auto_master()               — Mastering automático IA
     """
 
-    def __init__(self, reaper_host: str = None, reaper_port: int = None):
+    def __init__(
+        self,
+        reaper_host: str = None,
+        reaper_port: int = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
         self.reaper_host = reaper_host or REAPER_HOST
         self.reaper_port = reaper_port or REAPER_PORT
         self.endpoint = f"http://{self.reaper_host}:{self.reaper_port}/api"
         self.current_project: Optional[str] = None
         self.current_project_data: Optional[Dict] = None
-        self.http_client: Optional[httpx.AsyncClient] = None
+        self.http_client: Optional[httpx.AsyncClient] = http_client
         self.connected = False
+        
+        # Estado de proyecto cacheado entre mutaciones (path GET -> (expira, respuesta))
+        self._read_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # None = aún no sabemos si REAPER expone /batch
+        self._batch_supported: Optional[bool] = None
+        self.round_trips = 0
 
     async def _ensure_client(self):
-        """Asegurar cliente HTTP inicializado"""
+        """Asegurar cliente HTTP inicializado (conexión keep-alive persistente)"""
         if self.http_client is None:
-            self.http_client = httpx.AsyncClient(timeout=30.0)
+            self.http_client = httpx.AsyncClient(
+                timeout=30.0,
+                limits=httpx.Limits(max_keepalive_connections=RPC_PIPELINE_CONCURRENCY),
+            )
 
     async def _http_call(self, method: str, path: str, data: Dict = None) -> Dict[str, Any]:
         """
@@ -93,9 +185,24 @@ class REAPERController:
         Returns:
             JSON response con estructura {status, data, error}
         """
+        if method == "GET":
+            cached = self._cached(path)
+            if cached is not None:
+                return cached
+        else:
+            self.invalidate_cache()
+        
+        result = await self._send(method, path, data)
+        if method == "GET":
+            self._remember(path, result)
+        return result
+
+    async def _send(self, method: str, path: str, data: Dict = None) -> Dict[str, Any]:
+        """Un round-trip HTTP sin caché"""
         try:
             await self._ensure_client()
             url = f"{self.endpoint}{path}"
+            self.round_trips += 1
             
             if method == "GET":
                 response = await self.http_client.get(url, headers=REAPER_HEADERS)
@@ -117,6 +224,171 @@ class REAPERController:
             write_log("reaper_rpc", f"HTTP_CALL_ERROR: {str(e)}", level="ERROR")
             return {"status": "error", "message": str(e)}
 
+    # =========================================================================
+    # BATCHING
+    # =========================================================================
+
+    def invalidate_cache(self) -> None:
+        """Descartar el estado cacheado (tras cualquier mutación)"""
+        self._read_cache.clear()
+
+    def _cached(self, path: str) -> Optional[Dict[str, Any]]:
+        """Respuesta cacheada de un GET si sigue vigente"""
+        entry = self._read_cache.get(path)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if time.monotonic() >= expires_at:
+            del self._read_cache[path]
+            return None
+        return result
+
+    def _remember(self, path: str, result: Dict[str, Any]) -> None:
+        """Cachear un GET exitoso de estado de proyecto (pistas/items/FX)"""
+        if result.get("status") != "success":
+            return
+        if not path.startswith(RPC_READ_CACHE_PREFIXES):
+            return
+        self._read_cache[path] = (time.monotonic() + RPC_READ_CACHE_TTL_S, result)
+
+    def batch(self) -> REAPERBatch:
+        """Contexto que envía las operaciones acumuladas en un solo lote"""
+        return REAPERBatch(self)
+
+    async def call_many(self, operations: Sequence[RPCOperation]) -> List[Dict[str, Any]]:
+        """
+        Ejecutar varias operaciones con los mínimos round-trips.
+        
+        Se respetan el orden y la semántica de caché: un GET cacheable previo
+        a cualquier mutación del lote se sirve del caché; tras una mutación
+        todo se envía a REAPER. Devuelve una respuesta por operación.
+        """
+        operations = [(m.upper(), p, d) for m, p, d in operations]
+        results: List[Optional[Dict[str, Any]]] = [None] * len(operations)
+        pending: List[int] = []
+        mutated = False
+        
+        for i, (method, path, _) in enumerate(operations):
+            if method == "GET" and not mutated:
+                cached = self._cached(path)
+                if cached is not None:
+                    results[i] = cached
+                    continue
+            if method != "GET":
+                mutated = True
+            pending.append(i)
+        
+        if mutated:
+            self.invalidate_cache()
+        
+        for start in range(0, len(pending), RPC_BATCH_MAX_OPS):
+            indexes = pending[start:start + RPC_BATCH_MAX_OPS]
+            responses = await self._send_batch([operations[i] for i in indexes])
+            for i, response in zip(indexes, responses):
+                results[i] = response
+        
+        # Cachear los GET posteriores a la última mutación del lote
+        last_mutation = max(
+            (i for i, (m, _, _) in enumerate(operations) if m != "GET"), default=-1
+        )
+        for i in pending:
+            method, path, _ = operations[i]
+            if method == "GET" and i > last_mutation:
+                self._remember(path, results[i])
+        
+        write_log(
+            "reaper_rpc",
+            f"CALL_MANY: ops={len(operations)} sent={len(pending)} round_trips={self.round_trips}",
+            level="DEBUG",
+        )
+        return results
+
+    async def _send_batch(self, operations: List[RPCOperation]) -> List[Dict[str, Any]]:
+        """Un POST /batch; si REAPER no lo soporta, pipelining concurrente"""
+        if not operations:
+            return []
+        
+        if self._batch_supported is not False:
+            payload = {
+                "requests": [
+                    {"id": i, "method": method, "path": path, "data": data}
+                    for i, (method, path, data) in enumerate(operations)
+                ]
+            }
+            result = await self._send("POST", RPC_BATCH_PATH, payload)
+            if result.get("status") == "success":
+                self._batch_supported = True
+                by_id = {r.get("id"): r for r in result.get("responses", [])}
+                return [
+                    by_id.get(i, {"status": "error", "message": "missing batch response"})
+                    for i in range(len(operations))
+                ]
+            if result.get("http_status") in (404, 405, 501):
+                self._batch_supported = False
+                write_log("reaper_rpc", "BATCH_UNSUPPORTED: fallback a pipelining", level="INFO")
+            else:
+                return [result] * len(operations)
+        
+        return await self._pipeline(operations)
+
+    async def _pipeline(self, operations: List[RPCOperation]) -> List[Dict[str, Any]]:
+        """
+        Pipelining sobre la conexión persistente: lecturas consecutivas en
+        paralelo (acotado), mutaciones en orden estricto.
+        """
+        semaphore = asyncio.Semaphore(RPC_PIPELINE_CONCURRENCY)
+        results: List[Dict[str, Any]] = []
+        
+        async def limited(method, path, data):
+            async with semaphore:
+                return await self._send(method, path, data)
+        
+        reads: List[RPCOperation] = []
+        for method, path, data in operations:
+            if method == "GET":
+                reads.append((method, path, data))
+                continue
+            if reads:
+                results.extend(await asyncio.gather(*(limited(*op) for op in reads)))
+                reads = []
+            results.append(await self._send(method, path, data))
+        if reads:
+            results.extend(await asyncio.gather(*(limited(*op) for op in reads)))
+        return results
+
+    async def inspect_project(self) -> Dict[str, Any]:
+        """
+        Pistas, items y FX de todas las pistas en dos round-trips:
+        /tracks + /items, y luego los /fx de cada pista en un solo lote.
+        """
+        tracks, items = await self.call_many([("GET", "/tracks", None), ("GET", "/items", None)])
+        if tracks.get("status") != "success":
+            return tracks
+        
+        track_list = tracks.get("data", [])
+        fx_results = await self.call_many([
+            ("GET", f"/tracks/{t.get('index', i)}/fx", None) for i, t in enumerate(track_list)
+        ])
+        return {
+            "status": "success",
+            "tracks": track_list,
+            "items": items.get("data", []) if items.get("status") == "success" else [],
+            "fx": {
+                t.get("index", i): r.get("data", []) if r.get("status") == "success" else []
+                for i, (t, r) in enumerate(zip(track_list, fx_results))
+            },
+            "timestamp": datetime.now().isoformat(),
+        }
+
+    async def apply_fx_chains(self, chains: Dict[int, Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+        """Aplicar varias cadenas de FX (track_index -> fx_chain) en un lote"""
+        write_log("reaper_rpc", f"APPLY_FX_CHAINS: tracks={len(chains)}", level="INFO")
+        operations = [
+            ("POST", f"/tracks/{track_index}/apply_fx_chain", {"fx_chain": fx_chain})
+            for track_index, fx_chain in chains.items()
+        ]
+        return dict(zip(chains.keys(), await self.call_many(operations)))
+
     # =========================================================================
     # MÉTODO 1: list_projects
     # =========================================================================
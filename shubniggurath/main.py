@@ -208,6 +208,9 @@ async def lifespan(app: FastAPI):
         write_log("shubniggurath", "SHUTDOWN: Limpiando recursos", level="INFO")
         if _vx11_bridge:
             await _vx11_bridge.cleanup()
+        from shubniggurath.core.dsp_pool import shutdown_dsp_pool
+
+        shutdown_dsp_pool()
         write_log("shubniggurath", "SHUTDOWN_COMPLETE", level="INFO")
     except Exception as e:
         record_crash("shubniggurath", e)
@@ -14,8 +14,8 @@ except Exception:  # pragma: no cover
 
 def spectral_centroid(samples: Sequence[float], sr: int) -> float:
     if librosa and _np is not None:
-        return float(_np.mean(librosa.feature.spectral_centroid(y=_np.array(samples), sr=sr)))
-    if not samples:
+        return float(_np.mean(librosa.feature.spectral_centroid(y=_np.asarray(samples, dtype=_np.float32), sr=sr)))
+    if len(samples) == 0:
         return 0.0
     # Fallback simple: promedio de frecuencia ponderada por magnitud FFT
     import cmath
@@ -30,7 +30,7 @@ def spectral_centroid(samples: Sequence[float], sr: int) -> float:
 
 def tempo_detect(samples: Sequence[float], sr: int) -> float:
     if librosa and _np is not None:
-        tempo, _ = librosa.beat.beat_track(y=_np.array(samples), sr=sr)
+        tempo, _ = librosa.beat.beat_track(y=_np.asarray(samples, dtype=_np.float32), sr=sr)
         return float(tempo)
     return 0.0
 
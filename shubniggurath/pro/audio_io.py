@@ -1,19 +1,105 @@
 """
 Lectura/escritura de audio (WAV/FLAC/MP3) con dependencias estándar.
+
+Todo el I/O trabaja con arrays numpy float32 contiguos (nunca listas Python):
+decode con np.frombuffer, clamp vectorizado y lectura por bloques para
+archivos largos.
 """
 from pathlib import Path
+from typing import Iterator, Tuple
 import wave
-import array
+
+import numpy as np
 
 try:  # opcional
     import soundfile as sf  # type: ignore
 except Exception:  # pragma: no cover
     sf = None
 
+# Frames por bloque para lectura/escritura incremental
+DEFAULT_BLOCK_FRAMES = 65536
+
+
+def _pcm_to_float32(frames: bytes, sampwidth: int) -> np.ndarray:
+    """Decodificar PCM little-endian (8/16/24/32 bits) a float32 en [-1, 1)."""
+    if sampwidth == 1:  # WAV 8-bit es unsigned
+        data = np.frombuffer(frames, dtype=np.uint8).astype(np.float32)
+        return (data - 128.0) / 128.0
+    if sampwidth == 3:
+        raw = np.frombuffer(frames, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        data = raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)
+        data = np.where(data & 0x800000, data - 0x1000000, data)
+        return data.astype(np.float32) / np.float32(1 << 23)
+    if sampwidth in (2, 4):
+        data = np.frombuffer(frames, dtype=f"<i{sampwidth}").astype(np.float32)
+        return data / np.float32(2 ** (8 * sampwidth - 1))
+    raise ValueError(f"sample width no soportado: {sampwidth}")
+
+
+def _float32_to_pcm(samples: np.ndarray, bit_depth: int) -> bytes:
+    """Clamp vectorizado + encode a PCM entero little-endian."""
+    clamped = np.clip(samples, -1.0, 1.0)
+    if bit_depth == 16:
+        return (clamped * 32767).astype("<i2").tobytes()
+    if bit_depth == 24:
+        ints = (clamped * 8388607).astype("<i4")
+        return ints.view(np.uint8).reshape(-1, 4)[:, :3].tobytes()
+    if bit_depth == 32:
+        return (clamped.astype(np.float64) * 2147483647).astype("<i4").tobytes()
+    raise ValueError(f"bit_depth no soportado: {bit_depth}")
+
+
+def _shape_channels(data: np.ndarray, mono: bool) -> np.ndarray:
+    """(frames, channels) -> mono 1-D o 2-D, siempre float32 contiguo."""
+    if mono:
+        data = data.mean(axis=1, dtype=np.float32) if data.shape[1] > 1 else data[:, 0]
+    return np.ascontiguousarray(data, dtype=np.float32)
+
+
+def audio_info(path: str) -> Tuple[int, int, int]:
+    """Retorna (sample_rate, channels, frames) sin decodificar el audio."""
+    p = Path(path)
+    if not p.exists():
+        raise FileNotFoundError(path)
+
+    if sf:
+        info = sf.info(str(p))
+        return info.samplerate, info.channels, info.frames
+
+    with wave.open(str(p), "rb") as wf:
+        return wf.getframerate(), wf.getnchannels(), wf.getnframes()
+
 
-def load_audio(path: str):
+def iter_audio_blocks(
+    path: str, block_frames: int = DEFAULT_BLOCK_FRAMES, mono: bool = True
+) -> Iterator[np.ndarray]:
     """
-    Retorna (samples mono list[float], sample_rate).
+    Leer audio por bloques de `block_frames` frames (float32 contiguo).
+    Memoria constante independientemente de la duración del archivo.
+    """
+    p = Path(path)
+    if not p.exists():
+        raise FileNotFoundError(path)
+
+    if sf:
+        for block in sf.blocks(str(p), blocksize=block_frames, dtype="float32", always_2d=True):
+            yield _shape_channels(block, mono)
+        return
+
+    with wave.open(str(p), "rb") as wf:
+        channels = wf.getnchannels()
+        sampwidth = wf.getsampwidth()
+        while True:
+            frames = wf.readframes(block_frames)
+            if not frames:
+                break
+            yield _shape_channels(_pcm_to_float32(frames, sampwidth).reshape(-1, channels), mono)
+
+
+def load_audio(path: str, mono: bool = True) -> Tuple[np.ndarray, int]:
+    """
+    Retorna (samples float32 contiguo, sample_rate).
+    Mono 1-D por defecto; con mono=False, shape (frames, channels).
     Usa soundfile si está disponible; fallback a wave.
     """
     p = Path(path)
@@ -21,33 +107,29 @@ def load_audio(path: str):
         raise FileNotFoundError(path)
 
     if sf:
-        data, sr = sf.read(str(p))
-        if len(data.shape) > 1:
-            data = data.mean(axis=1)
-        return data.astype("float32").tolist(), sr
+        data, sr = sf.read(str(p), dtype="float32", always_2d=True)
+        return _shape_channels(data, mono), sr
 
     with wave.open(str(p), "rb") as wf:
         sr = wf.getframerate()
-        sampwidth = wf.getsampwidth()
-        nframes = wf.getnframes()
-        frames = wf.readframes(nframes)
-        arr = array.array("h" if sampwidth == 2 else "b")
-        arr.frombytes(frames)
-        data = list(arr)
-        if wf.getnchannels() > 1:
-            data = [sum(data[i:i + wf.getnchannels()]) / wf.getnchannels() for i in range(0, len(data), wf.getnchannels())]
-        norm = float(2 ** (8 * sampwidth - 1))
-        samples = [float(x) / norm for x in data]
-        return samples, sr
-
-
-def save_wav(path: str, samples, sample_rate: int = 48000):
-    """Guarda WAV mono 16-bit."""
-    clamped = [max(-1.0, min(1.0, float(s))) for s in samples]
-    ints = array.array("h", [int(s * 32767) for s in clamped])
+        channels = wf.getnchannels()
+        data = _pcm_to_float32(wf.readframes(wf.getnframes()), wf.getsampwidth())
+    return _shape_channels(data.reshape(-1, channels), mono), sr
+
+
+def save_wav(path: str, samples, sample_rate: int = 48000, bit_depth: int = 16):
+    """
+    Guarda WAV PCM (16/24/32-bit). Acepta mono 1-D o (frames, channels).
+    Escribe por bloques para no duplicar en memoria señales largas.
+    """
+    data = np.asarray(samples, dtype=np.float32)
+    if data.ndim == 1:
+        data = data[:, np.newaxis]
+
     with wave.open(str(path), "wb") as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)
+        wf.setnchannels(data.shape[1])
+        wf.setsampwidth(bit_depth // 8)
         wf.setframerate(sample_rate)
-        wf.writeframes(ints.tobytes())
+        for start in range(0, len(data), DEFAULT_BLOCK_FRAMES):
+            wf.writeframes(_float32_to_pcm(data[start:start + DEFAULT_BLOCK_FRAMES], bit_depth))
     return str(path)
@@ -1,19 +1,30 @@
 """
 Funciones DSP básicas para Shub Pro.
 Se basan en numpy; sin dependencias pesadas en tiempo de prueba.
+Aceptan arrays float32 (audio_io) o cualquier secuencia de floats.
 """
 import math
 from typing import Dict, Sequence
 
+import numpy as np
+
+
+def _as_array(samples: Sequence[float]) -> np.ndarray:
+    return np.asarray(samples, dtype=np.float32)
+
 
 def rms(samples: Sequence[float]) -> float:
-    if not samples:
+    x = _as_array(samples)
+    if x.size == 0:
         return 0.0
-    return math.sqrt(sum(s * s for s in samples) / len(samples))
+    return float(np.sqrt(np.mean(np.square(x, dtype=np.float64))))
 
 
 def peak(samples: Sequence[float]) -> float:
-    return max((abs(s) for s in samples), default=0.0)
+    x = _as_array(samples)
+    if x.size == 0:
+        return 0.0
+    return float(np.max(np.abs(x)))
 
 
 def lufs_approx(samples: Sequence[float]) -> float:
@@ -32,15 +43,16 @@ def dynamic_range(samples: Sequence[float]) -> float:
 
 
 def detect_clipping(samples: Sequence[float], threshold: float = 0.99) -> int:
-    return sum(1 for s in samples if abs(s) >= threshold)
+    return int(np.count_nonzero(np.abs(_as_array(samples)) >= threshold))
 
 
 def noise_floor(samples: Sequence[float]) -> float:
-    if not samples:
+    x = _as_array(samples)
+    if x.size == 0:
         return -120.0
-    sorted_abs = sorted(abs(s) for s in samples)
-    idx = max(0, int(len(sorted_abs) * 0.1) - 1)
-    silent = sorted_abs[idx]
+    # Percentil 10 de |x| (mismo índice que el sort completo, en O(n))
+    idx = max(0, int(x.size * 0.1) - 1)
+    silent = float(np.partition(np.abs(x), idx)[idx])
     return 20 * math.log10(silent + 1e-9)
 
 
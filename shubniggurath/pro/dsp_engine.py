@@ -119,8 +119,7 @@ class DSPEngine:
         """Análisis completo de archivo de audio"""
         from .audio_io import load_audio
         
-        samples, sr = load_audio(file_path)
-        audio_data = np.array(samples, dtype=np.float32)
+        audio_data, sr = load_audio(file_path)
         
         return await self.analyze_audio(audio_data, sr)
     
@@ -3,12 +3,15 @@ Motor de efectos DSP: EQ, compresión, limitador, reverb, etc.
 Cadena procesable y configurable.
 """
 
+import asyncio
 import numpy as np
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import warnings
 
+from shubniggurath.pro.filter_design import SOSStream, design_sos
+
 try:
     import importlib
     signal = importlib.import_module("scipy.signal")
@@ -17,15 +20,10 @@ except Exception:
     HAS_SCIPY = False
 
     # Fallback stub for environments without scipy.signal.
-    # Provides minimal butter/filtfilt API used by this module and performs no-op filtering.
+    # Provides minimal sosfiltfilt API used by this module and performs no-op filtering.
     class _SignalStub:
         @staticmethod
-        def butter(order, Wn, btype='low'):
-            # Return neutral filter coefficients (no filtering).
-            return np.array([1.0]), np.array([1.0])
-
-        @staticmethod
-        def filtfilt(b, a, x):
+        def sosfiltfilt(sos, x, axis=-1):
             # No-op: return input unchanged, preserving shape and dtype.
             return x
 
@@ -65,10 +63,35 @@ class Effect:
         self.sample_rate = sample_rate
         self.state = {}
     
+    @property
+    def latency_samples(self) -> int:
+        """Latencia que introduce process_block() (lookahead)"""
+        return 0
+    
     def process(self, audio: np.ndarray) -> np.ndarray:
         """Procesar audio (override en subclases)"""
         return audio
     
+    def process_block(self, audio: np.ndarray) -> np.ndarray:
+        """
+        Procesar un bloque de un stream, conservando estado entre bloques.
+        Puede modificar `audio` in-place y devolverlo. Efectos sin memoria
+        reutilizan process(); los que tienen estado (filtros, dinámica) lo
+        sobreescriben.
+        """
+        return self.process(audio)
+    
+    def reset(self) -> None:
+        """Descartar estado de streaming"""
+        self.state = {}
+    
+    def _sos_stream(self, key: Any, sos: np.ndarray) -> SOSStream:
+        """Stream SOS con estado en self.state; se reinicia si cambia el diseño"""
+        stream = self.state.get(key)
+        if stream is None or stream.sos is not sos:
+            stream = self.state[key] = SOSStream(sos)
+        return stream
+    
     async def process_async(self, audio: np.ndarray) -> np.ndarray:
         """Procesamiento asincrónico (opcional)"""
         return self.process(audio)
@@ -77,147 +100,262 @@ class Effect:
 class GainEffect(Effect):
     """Gain/Atenuación simple"""
     
+    def _gain(self) -> float:
+        return 10 ** (self.config.params.get("gain_db", 0) / 20)
+    
     def process(self, audio: np.ndarray) -> np.ndarray:
-        gain_db = self.config.params.get("gain_db", 0)
-        gain_linear = 10 ** (gain_db / 20)
-        return audio * gain_linear
+        return audio * self._gain()
+    
+    def process_block(self, audio: np.ndarray) -> np.ndarray:
+        np.multiply(audio, self._gain(), out=audio, casting="unsafe")
+        return audio
+
+
+def _time_coeff(time_ms: float, sample_rate: int) -> float:
+    """Coeficiente one-pole para una constante de tiempo (0 ms = instantáneo)"""
+    if time_ms <= 0:
+        return 0.0
+    return float(np.exp(-1000.0 / (time_ms * sample_rate)))
 
 
 class CompressorEffect(Effect):
-    """Compresor dinámico"""
+    """
+    Compresor dinámico vectorizado.
+
+    Detector de pico suavizado desacoplado (Giannoulis et al., JAES 2012):
+    1. release: y1[n] = max(|x[n]|, a_r * y1[n-1]), resuelto sin bucle como
+       máximo acumulado en dominio logarítmico;
+    2. attack: one-pole y[n] = a_a * y[n-1] + (1 - a_a) * y1[n] vía lfilter.
+    La curva de ganancia se aplica como operaciones de array. Estéreo se
+    detecta enlazado (máximo entre canales, audio con shape (frames, ch)).
+    """
+    
+    default_params = {
+        "threshold_db": -20,
+        "ratio": 4.0,
+        "attack_ms": 10,
+        "release_ms": 100,
+        "makeup_db": 0,
+        "lookahead_ms": 0,
+    }
+    
+    def _param(self, name: str) -> float:
+        return self.config.params.get(name, self.default_params[name])
+    
+    def _envelope(self, level: np.ndarray, state: Dict[str, float]) -> np.ndarray:
+        """Envolvente attack/release de `level` (>= 0); actualiza `state`"""
+        release_coeff = _time_coeff(self._param("release_ms"), self.sample_rate)
+        attack_coeff = _time_coeff(self._param("attack_ms"), self.sample_rate)
+        
+        # Etapa release: y1[n] = max_m a_r^(n-m) * |x[m]| (incluye el estado previo en m=-1)
+        prev_peak = state.get("peak", 0.0)
+        if release_coeff > 0:
+            log_a = np.log(release_coeff)
+            n = np.arange(len(level), dtype=np.float64)
+            with np.errstate(divide="ignore"):
+                terms = np.log(level.astype(np.float64)) - n * log_a
+                seed = np.log(prev_peak) + log_a if prev_peak > 0 else -np.inf
+            peak = np.exp(np.maximum(np.maximum.accumulate(terms), seed) + n * log_a)
+        else:
+            peak = level.astype(np.float64)
+        
+        # Etapa attack: one-pole con estado inicial
+        if attack_coeff > 0:
+            zi = [attack_coeff * state.get("env", 0.0)]
+            envelope, _ = signal.lfilter([1.0 - attack_coeff], [1.0, -attack_coeff], peak, zi=zi)
+        else:
+            envelope = peak
+        
+        if len(level):
+            state["peak"] = float(peak[-1])
+            state["env"] = float(envelope[-1])
+        return envelope
+    
+    def _gain_curve(self, envelope: np.ndarray) -> np.ndarray:
+        """Ganancia lineal por muestra (hard knee) + makeup"""
+        threshold_linear = 10 ** (self._param("threshold_db") / 20)
+        ratio = self._param("ratio")
+        slope = (1.0 / ratio - 1.0) if np.isfinite(ratio) and ratio > 0 else -1.0
+        
+        gain = np.ones_like(envelope)
+        over = envelope > threshold_linear
+        gain[over] = (envelope[over] / threshold_linear) ** slope
+        return gain * 10 ** (self._param("makeup_db") / 20)
+    
+    def compute_gain(self, audio: np.ndarray, state: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """Ganancia por frame para `audio` (1-D o (frames, ch))"""
+        level = np.abs(audio) if audio.ndim == 1 else np.max(np.abs(audio), axis=1)
+        return self._gain_curve(self._envelope(level, {} if state is None else state))
     
     def process(self, audio: np.ndarray) -> np.ndarray:
         if not HAS_SCIPY:
             warnings.warn("scipy no disponible; compresor desactivado")
             return audio
         
-        threshold = self.config.params.get("threshold_db", -20)
-        ratio = self.config.params.get("ratio", 4.0)
-        attack_ms = self.config.params.get("attack_ms", 10)
-        release_ms = self.config.params.get("release_ms", 100)
+        gain = self.compute_gain(audio)
         
-        # Envoltura
-        threshold_linear = 10 ** (threshold / 20)
-        attack_samples = int(attack_ms * self.sample_rate / 1000)
-        release_samples = int(release_ms * self.sample_rate / 1000)
+        # Lookahead offline: adelantar la ganancia (sin latencia añadida)
+        lookahead = int(self._param("lookahead_ms") * self.sample_rate / 1000)
+        if 0 < lookahead < len(gain):
+            gain = np.concatenate([gain[lookahead:], np.full(lookahead, gain[-1])])
         
-        # Detector (simplificado)
-        detected = np.abs(audio)
+        if audio.ndim > 1:
+            gain = gain[:, np.newaxis]
+        return (audio * gain).astype(audio.dtype, copy=False)
+    
+    @property
+    def latency_samples(self) -> int:
+        return int(self._param("lookahead_ms") * self.sample_rate / 1000)
+    
+    def process_block(self, audio: np.ndarray) -> np.ndarray:
+        if not HAS_SCIPY:
+            return audio
         
-        # Envolvente de ataque/release
-        envelope = np.zeros_like(audio)
-        for i in range(len(audio)):
-            if detected[i] > (envelope[i-1] if i > 0 else 0):
-                envelope[i] = detected[i]
-            else:
-                envelope[i] = detected[i]
+        gain = self.compute_gain(audio, self.state)
+        if audio.ndim > 1:
+            gain = gain[:, np.newaxis]
         
-        # Ganancia de compresión
-        gain = np.ones_like(audio)
-        over_threshold = envelope > threshold_linear
-        gain[over_threshold] = threshold_linear / (envelope[over_threshold] / (ratio - 1) + threshold_linear)
+        # Lookahead en streaming: línea de retardo (latencia = latency_samples)
+        lookahead = self.latency_samples
+        if lookahead > 0:
+            delay = self.state.get("delay")
+            if delay is None:
+                delay = np.zeros((lookahead,) + audio.shape[1:], dtype=audio.dtype)
+            joined = np.concatenate([delay, audio])
+            self.state["delay"] = joined[len(audio):]
+            audio[...] = joined[:len(audio)]
         
-        return audio * gain
+        np.multiply(audio, gain, out=audio, casting="unsafe")
+        return audio
 
 
-class LimiterEffect(Effect):
-    """Limitador (compresor con ratio infinita)"""
+class LimiterEffect(CompressorEffect):
+    """Limitador (compresor con ratio infinita, attack instantáneo)"""
+    
+    default_params = {
+        "threshold_db": -3,
+        "ratio": float("inf"),
+        "attack_ms": 0,
+        "release_ms": 50,
+        "makeup_db": 0,
+        "lookahead_ms": 0,
+    }
     
     def process(self, audio: np.ndarray) -> np.ndarray:
-        threshold_db = self.config.params.get("threshold_db", -3)
-        threshold_linear = 10 ** (threshold_db / 20)
+        threshold_linear = 10 ** (self._param("threshold_db") / 20)
+        if HAS_SCIPY:
+            audio = super().process(audio)
         
-        # Hard limiting
+        # Techo duro de seguridad (lookahead/attack > 0 pueden dejar sobrepicos)
         return np.clip(audio, -threshold_linear, threshold_linear)
+    
+    def process_block(self, audio: np.ndarray) -> np.ndarray:
+        threshold_linear = 10 ** (self._param("threshold_db") / 20)
+        audio = super().process_block(audio)
+        return np.clip(audio, -threshold_linear, threshold_linear, out=audio)
 
 
 class EQEffect(Effect):
     """Ecualizador paramétrico (3 bandas: lo, mid, hi)"""
     
+    low_cutoff = 200
+    high_cutoff = 3000
+    
+    def _shelves(self):
+        """(sos, gain_linear) por shelf activo; diseños desde el caché"""
+        shelves = []
+        low_gain_db = self.config.params.get("low_gain_db", 0)
+        high_gain_db = self.config.params.get("high_gain_db", 0)
+        
+        # Filtros simples (shelving de primer orden)
+        if low_gain_db != 0:
+            shelves.append((design_sos("low", 1, self.low_cutoff, self.sample_rate), 10 ** (low_gain_db / 20)))
+        if high_gain_db != 0:
+            shelves.append((design_sos("high", 1, self.high_cutoff, self.sample_rate), 10 ** (high_gain_db / 20)))
+        return shelves
+    
     def process(self, audio: np.ndarray) -> np.ndarray:
         if not HAS_SCIPY:
             warnings.warn("scipy no disponible; EQ desactivado")
             return audio
         
         try:
-            # Parámetros
-            low_gain_db = self.config.params.get("low_gain_db", 0)
-            mid_gain_db = self.config.params.get("mid_gain_db", 0)
-            high_gain_db = self.config.params.get("high_gain_db", 0)
-            
-            # Filtros simples (shelving de primer orden)
-            low_cutoff = 200
-            high_cutoff = 3000
-            
             output = audio.copy()
-            
-            # Low shelf
-            if low_gain_db != 0:
-                gain_linear = 10 ** (low_gain_db / 20)
-                # Aproximación: sumar/restar versión LP
-                b, a = signal.butter(1, low_cutoff / (self.sample_rate / 2), btype='low')
-                lp = signal.filtfilt(b, a, audio)
-                output = output + (lp - audio) * (gain_linear - 1)
-            
-            # High shelf
-            if high_gain_db != 0:
-                gain_linear = 10 ** (high_gain_db / 20)
-                b, a = signal.butter(1, high_cutoff / (self.sample_rate / 2), btype='high')
-                hp = signal.filtfilt(b, a, audio)
-                output = output + (hp - audio) * (gain_linear - 1)
-            
+            # Aproximación: sumar/restar versión filtrada (fase cero, offline)
+            for sos, gain_linear in self._shelves():
+                filtered = signal.sosfiltfilt(sos, audio, axis=0)
+                output = output + (filtered - audio) * (gain_linear - 1)
             return output
         except Exception as e:
             warnings.warn(f"Error en EQ: {e}")
             return audio
+    
+    def process_block(self, audio: np.ndarray) -> np.ndarray:
+        if not HAS_SCIPY:
+            return audio
+        
+        output = audio.copy()
+        for index, (sos, gain_linear) in enumerate(self._shelves()):
+            filtered = self._sos_stream(("shelf", index), sos).process(audio)
+            output = output + (filtered - audio) * (gain_linear - 1)
+        return output
 
 
-class HighPassEffect(Effect):
-    """Filtro paso-alto"""
+class _ButterworthEffect(Effect):
+    """Base de filtros Butterworth (HighPass/LowPass) con diseño cacheado"""
+    
+    btype = "low"
+    default_cutoff_hz = 1000.0
+    
+    def _sos(self) -> Optional[np.ndarray]:
+        """Diseño SOS cacheado; None si el corte deja el filtro transparente"""
+        cutoff_hz = self.config.params.get("cutoff_hz", self.default_cutoff_hz)
+        order = self.config.params.get("order", 2)
+        
+        nyquist = self.sample_rate / 2
+        normalized_cutoff = cutoff_hz / nyquist
+        if self.btype == "high" and normalized_cutoff < 0.01:
+            return None
+        if self.btype == "low" and normalized_cutoff > 0.99:
+            return None
+        
+        return design_sos(self.btype, int(order), float(cutoff_hz), self.sample_rate)
     
     def process(self, audio: np.ndarray) -> np.ndarray:
         if not HAS_SCIPY:
             return audio
         
         try:
-            cutoff_hz = self.config.params.get("cutoff_hz", 20)
-            order = self.config.params.get("order", 2)
-            
-            nyquist = self.sample_rate / 2
-            normalized_cutoff = cutoff_hz / nyquist
-            
-            if normalized_cutoff < 0.01:
+            sos = self._sos()
+            if sos is None:
                 return audio
-            
-            b, a = signal.butter(order, normalized_cutoff, btype='high')
-            return signal.filtfilt(b, a, audio)
+            return signal.sosfiltfilt(sos, audio, axis=0)
         except Exception as e:
-            warnings.warn(f"Error en HighPass: {e}")
+            warnings.warn(f"Error en {type(self).__name__}: {e}")
             return audio
-
-
-class LowPassEffect(Effect):
-    """Filtro paso-bajo"""
     
-    def process(self, audio: np.ndarray) -> np.ndarray:
+    def process_block(self, audio: np.ndarray) -> np.ndarray:
         if not HAS_SCIPY:
             return audio
         
-        try:
-            cutoff_hz = self.config.params.get("cutoff_hz", 10000)
-            order = self.config.params.get("order", 2)
-            
-            nyquist = self.sample_rate / 2
-            normalized_cutoff = cutoff_hz / nyquist
-            
-            if normalized_cutoff > 0.99:
-                return audio
-            
-            b, a = signal.butter(order, normalized_cutoff, btype='low')
-            return signal.filtfilt(b, a, audio)
-        except Exception as e:
-            warnings.warn(f"Error en LowPass: {e}")
+        sos = self._sos()
+        if sos is None:
             return audio
+        return self._sos_stream("stream", sos).process(audio)
+
+
+class HighPassEffect(_ButterworthEffect):
+    """Filtro paso-alto"""
+    
+    btype = "high"
+    default_cutoff_hz = 20
+
+
+class LowPassEffect(_ButterworthEffect):
+    """Filtro paso-bajo"""
+    
+    btype = "low"
+    default_cutoff_hz = 10000
 
 
 class DistortionEffect(Effect):
@@ -234,13 +372,35 @@ class DistortionEffect(Effect):
         # Mezcla
         mix = self.config.params.get("mix", 0.5)
         return audio * (1 - mix) + saturated * mix
+    
+    def process_block(self, audio: np.ndarray) -> np.ndarray:
+        drive = self.config.params.get("drive", 1.0)
+        mix = self.config.params.get("mix", 0.5)
+        
+        saturated = np.tanh(audio * drive)
+        np.multiply(audio, 1 - mix, out=audio, casting="unsafe")
+        saturated *= mix
+        np.add(audio, saturated, out=audio, casting="unsafe")
+        return audio
+
+
+# Frames por bloque del render fusionado
+DEFAULT_BLOCK_SIZE = 4096
 
 
 class FXChain:
-    """Cadena de procesamiento de efectos"""
+    """
+    Cadena de procesamiento de efectos.
+    
+    Render fusionado por bloques: cada bloque de `block_size` frames atraviesa
+    todos los efectos en un buffer de trabajo preasignado, con el estado de
+    cada efecto conservado entre bloques. El pico de memoria es un bloque por
+    efecto en lugar de una copia completa de la señal por efecto.
+    """
     
-    def __init__(self, sample_rate: int = 48000):
+    def __init__(self, sample_rate: int = 48000, block_size: int = DEFAULT_BLOCK_SIZE):
         self.sample_rate = sample_rate
+        self.block_size = block_size
         self.effects: List[Effect] = []
     
     def add_effect(self, effect: Effect) -> "FXChain":
@@ -274,26 +434,121 @@ class FXChain:
         
         return effect_class(config, self.sample_rate)
     
-    def process(self, audio: np.ndarray) -> np.ndarray:
-        """Procesar audio a través de la cadena"""
-        output = audio.copy()
-        
+    @property
+    def latency_samples(self) -> int:
+        """Latencia total de la cadena en modo streaming"""
+        return sum(e.latency_samples for e in self.effects if e.config.enabled)
+    
+    def reset(self) -> None:
+        """Reiniciar el estado de streaming de todos los efectos"""
         for effect in self.effects:
-            if effect.config.enabled:
-                output = effect.process(output)
-        
-        return output
+            effect.reset()
     
-    async def process_async(self, audio: np.ndarray) -> np.ndarray:
-        """Procesamiento asincrónico"""
-        output = audio.copy()
-        
+    def process_block(self, block: np.ndarray) -> np.ndarray:
+        """
+        Procesar un bloque de un stream (realtime/Mode C).
+        Conserva estado entre llamadas; puede modificar `block` in-place.
+        """
         for effect in self.effects:
             if effect.config.enabled:
-                output = await effect.process_async(output)
+                block = effect.process_block(block)
+        return block
+    
+    def _segments(self, use_async: bool) -> List[Tuple[bool, List[Effect]]]:
+        """
+        Agrupar los efectos activos en tramos (fusionado, efectos).
+        Solo se fusionan efectos que implementan su propio process_block; el
+        resto (y, en async, los que sobreescriben process_async) procesa el
+        buffer completo como antes, sin trocearlo.
+        """
+        segments: List[Tuple[bool, List[Effect]]] = []
+        for effect in self.effects:
+            if not effect.config.enabled:
+                continue
+            kind = type(effect)
+            fused = kind.process_block is not Effect.process_block and not (
+                use_async and kind.process_async is not Effect.process_async
+            )
+            if fused and segments and segments[-1][0]:
+                segments[-1][1].append(effect)
+            else:
+                segments.append((fused, [effect]))
+        return segments
+    
+    def _render_blocks(self, audio: np.ndarray, effects: List[Effect]):
+        """
+        Generador del render fusionado de `effects`: escribe en un output
+        preasignado y cede el control tras cada bloque. Compensa la latencia
+        de lookahead alimentando ceros al final y descartando los primeros
+        frames.
+        """
+        dtype = audio.dtype if np.issubdtype(audio.dtype, np.floating) else np.float32
+        output = np.empty(audio.shape, dtype=dtype)
+        work = np.empty((self.block_size,) + audio.shape[1:], dtype=dtype)
+        latency = sum(e.latency_samples for e in effects)
+        total = len(audio) + latency
+        
+        for start in range(0, total, self.block_size):
+            n = min(self.block_size, total - start)
+            block = work[:n]
+            
+            # Copiar entrada (o ceros de cola para vaciar el lookahead)
+            available = max(0, min(n, len(audio) - start))
+            block[:available] = audio[start:start + available]
+            block[available:] = 0
+            
+            for effect in effects:
+                block = effect.process_block(block)
+            
+            # Alinear salida restando la latencia
+            out_start = start - latency
+            skip = max(0, -out_start)
+            if skip < n:
+                output[out_start + skip:out_start + n] = block[skip:n]
+            yield
         
         return output
     
+    def process(self, audio: np.ndarray) -> np.ndarray:
+        """Procesar audio a través de la cadena (render fusionado por bloques)"""
+        self.reset()
+        output = audio
+        for fused, effects in self._segments(use_async=False):
+            if not fused:
+                # Copia solo si aún es la entrada del llamador
+                output = effects[0].process(output.copy() if output is audio else output)
+                continue
+            render = self._render_blocks(output, effects)
+            while True:
+                try:
+                    next(render)
+                except StopIteration as done:
+                    output = done.value
+                    break
+        return output.copy() if output is audio else output
+    
+    async def process_async(self, audio: np.ndarray, yield_every: int = 16) -> np.ndarray:
+        """Procesamiento asincrónico: cede el event loop cada `yield_every` bloques"""
+        self.reset()
+        output = audio
+        blocks = 0
+        for fused, effects in self._segments(use_async=True):
+            if not fused:
+                # Copia solo si aún es la entrada del llamador
+                output = await effects[0].process_async(output.copy() if output is audio else output)
+                continue
+            render = self._render_blocks(output, effects)
+            while True:
+                try:
+                    next(render)
+                except StopIteration as done:
+                    output = done.value
+                    break
+                blocks += 1
+                if blocks % yield_every == 0:
+                    await asyncio.sleep(0)
+        return output.copy() if output is audio else output
+    
     def save_preset(self) -> Dict[str, Any]:
         """Guardar preset de cadena"""
         return {
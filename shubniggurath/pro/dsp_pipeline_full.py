@@ -183,8 +183,8 @@ class DSPPipeline:
             progress.update("exporting", 85, f"Exportando a {output_path}...")
             
             success = save_wav(
-                processed_audio,
                 output_path,
+                processed_audio,
                 sample_rate=sr,
                 bit_depth=config.export_quality,
             )
@@ -0,0 +1,66 @@
+"""
+Caché de diseños de filtro (second-order sections) y filtrado por bloques.
+
+- design_sos(): diseño Butterworth memoizado por (tipo, orden, cutoff, sr);
+  devuelve SOS compartidas entre efectos y llamadas (no mutar).
+- SOSStream: filtro causal con estado (zi) persistente entre bloques, para
+  procesar audio en chunks sin artefactos en los bordes.
+"""
+
+from functools import lru_cache
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    import importlib
+    signal = importlib.import_module("scipy.signal")
+    HAS_SCIPY = True
+except Exception:  # pragma: no cover
+    signal = None
+    HAS_SCIPY = False
+
+Cutoff = Union[float, Tuple[float, float]]
+
+
+@lru_cache(maxsize=256)
+def design_sos(btype: str, order: int, cutoff_hz: Cutoff, sample_rate: int) -> np.ndarray:
+    """
+    Diseño Butterworth en SOS, memoizado.
+
+    Args:
+        btype: 'low', 'high', 'bandpass', 'bandstop'
+        order: Orden del filtro
+        cutoff_hz: Frecuencia de corte (tupla (lo, hi) para band*)
+        sample_rate: Sample rate en Hz
+    """
+    if not HAS_SCIPY:
+        raise RuntimeError("scipy.signal no disponible")
+    return signal.butter(int(order), cutoff_hz, btype=btype, output="sos", fs=sample_rate)
+
+
+def design_cache_info():
+    """Estadísticas del caché (hits/misses/currsize)"""
+    return design_sos.cache_info()
+
+
+class SOSStream:
+    """Filtro SOS causal con estado persistente entre bloques (axis=0)"""
+
+    def __init__(self, sos: np.ndarray):
+        self.sos = sos
+        self.zi: Optional[np.ndarray] = None
+
+    def reset(self) -> None:
+        self.zi = None
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Filtrar un bloque (frames,) o (frames, ch) continuando el estado previo"""
+        if len(block) == 0:
+            return block
+        if self.zi is None:
+            # Estado estacionario escalado al primer frame: sin transitorio inicial
+            zi = signal.sosfilt_zi(self.sos)
+            self.zi = zi.reshape(zi.shape + (1,) * (block.ndim - 1)) * block[0]
+        out, self.zi = signal.sosfilt(self.sos, block, axis=0, zi=self.zi)
+        return out
@@ -0,0 +1,193 @@
+"""
+Análisis incremental por chunk para streaming/realtime (Mode C).
+
+En lugar de recalcular el set completo de features sobre cada chunk, el
+analizador mantiene estadísticas acumuladas y solo procesa las muestras
+nuevas:
+
+- Niveles: RMS/peak acumulados y RMS corto (400 ms) por sub-bloques de 100 ms.
+- Loudness BS.1770 (momentary/short-term/integrated con gating) mediante el
+  LoudnessMeter de streaming.
+- STFT alineada al hop: cada frame se calcula una sola vez; las muestras que
+  aún no completan un frame quedan pendientes para el siguiente chunk.
+- Centroide espectral (último chunk y acumulado) y onsets por spectral flux.
+"""
+
+from collections import deque
+from typing import Any, Dict
+
+import numpy as np
+
+from numpy.lib.stride_tricks import sliding_window_view
+
+from shubniggurath.pro.loudness import LoudnessMeter
+
+_EPS = 1e-12
+
+
+def _db(value: float) -> float:
+    return float(20 * np.log10(max(value, _EPS)))
+
+
+class IncrementalAnalyzer:
+    """Estadísticas de audio actualizadas solo con las muestras nuevas"""
+
+    def __init__(
+        self,
+        sample_rate: int = 48000,
+        n_fft: int = 2048,
+        hop_length: int = 512,
+        onset_sensitivity: float = 1.5,
+        min_onset_interval: float = 0.1,
+    ):
+        self.sample_rate = sample_rate
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.onset_sensitivity = onset_sensitivity
+        self.min_onset_frames = max(1, int(min_onset_interval * sample_rate / hop_length))
+
+        self.window = np.hanning(n_fft)
+        self.freqs = np.fft.rfftfreq(n_fft, 1 / sample_rate)
+        self.sub_block = int(0.1 * sample_rate)  # 100 ms
+
+        self.reset()
+
+    def reset(self) -> None:
+        """Reiniciar todo el estado acumulado"""
+        self.samples = 0
+
+        # Niveles
+        self.sum_squares = 0.0
+        self.peak = 0.0
+
+        # Sub-bloques de 100 ms (RMS corto = últimos 4)
+        self._sub_sum = 0.0
+        self._sub_count = 0
+        self._sub_energies = deque(maxlen=4)
+        self.loudness = LoudnessMeter(self.sample_rate, channels=1)
+
+        # STFT
+        self._pending = np.zeros(0)
+        self._prev_mag = None
+        self.frames = 0
+        self._centroid_num = 0.0
+        self._centroid_den = 0.0
+        self.last_centroid = 0.0
+
+        # Onsets
+        self._flux_sum = 0.0
+        self._prev_flux = 0.0
+        self.onset_count = 0
+        self.last_onset_time = None
+        self._last_onset_frame = None
+
+    # ------------------------------------------------------------------
+
+    def _update_levels(self, x: np.ndarray) -> None:
+        x2 = x * x
+        self.sum_squares += float(x2.sum())
+        self.peak = max(self.peak, float(np.max(np.abs(x))))
+
+        sub = self.sub_block
+        need = sub - self._sub_count
+        if len(x2) < need:
+            self._sub_sum += float(x2.sum())
+            self._sub_count += len(x2)
+            return
+
+        rest = x2[need:]
+        n_full = len(rest) // sub
+        energies = np.empty(n_full + 1)
+        energies[0] = (self._sub_sum + x2[:need].sum()) / sub
+        energies[1:] = rest[:n_full * sub].reshape(n_full, sub).mean(axis=1)
+
+        tail = rest[n_full * sub:]
+        self._sub_sum = float(tail.sum())
+        self._sub_count = len(tail)
+        self._sub_energies.extend(energies[-4:])
+
+    def _update_spectrum(self, x: np.ndarray) -> int:
+        buf = np.concatenate([self._pending, x])
+        if len(buf) < self.n_fft:
+            self._pending = buf
+            return 0
+
+        n_frames = 1 + (len(buf) - self.n_fft) // self.hop_length
+        frames = sliding_window_view(buf, self.n_fft)[::self.hop_length][:n_frames]
+        self._pending = buf[n_frames * self.hop_length:].copy()
+
+        mag = np.abs(np.fft.rfft(frames * self.window, axis=1))
+
+        # Centroide
+        num = mag @ self.freqs
+        den = mag.sum(axis=1)
+        self._centroid_num += float(num.sum())
+        self._centroid_den += float(den.sum())
+        if den.sum() > _EPS:
+            self.last_centroid = float(num.sum() / den.sum())
+
+        # Spectral flux (el primer frame se compara con el del chunk anterior)
+        prev = mag[:1] if self._prev_mag is None else self._prev_mag[np.newaxis]
+        stacked = np.concatenate([prev, mag])
+        flux = np.maximum(np.diff(stacked, axis=0), 0).sum(axis=1)
+        self._prev_mag = mag[-1]
+
+        # Onsets: cruce ascendente de un umbral relativo al flux medio previo
+        mean_flux = self._flux_sum / self.frames if self.frames else 0.0
+        threshold = self.onset_sensitivity * mean_flux
+        if threshold > _EPS:
+            above = flux > threshold
+            previous = np.concatenate([[self._prev_flux > threshold], above[:-1]])
+            # Candidatos (pocos) con intervalo mínimo entre onsets
+            for candidate in np.flatnonzero(above & ~previous):
+                frame_index = self.frames + int(candidate)
+                last = self._last_onset_frame
+                if last is not None and frame_index - last < self.min_onset_frames:
+                    continue
+                self._last_onset_frame = frame_index
+                self.onset_count += 1
+                # Tiempo al centro del frame
+                self.last_onset_time = (
+                    frame_index * self.hop_length + self.n_fft / 2
+                ) / self.sample_rate
+
+        self._flux_sum += float(flux.sum())
+        self._prev_flux = float(flux[-1])
+        self.frames += n_frames
+        return n_frames
+
+    # ------------------------------------------------------------------
+
+    def update(self, chunk: np.ndarray) -> Dict[str, Any]:
+        """Incorporar un chunk (mono o (frames, ch)) y devolver el snapshot"""
+        x = np.asarray(chunk, dtype=np.float64)
+        if x.ndim > 1:
+            x = x.mean(axis=1)
+        if len(x):
+            self.samples += len(x)
+            self._update_levels(x)
+            self.loudness.update(x)
+            self._update_spectrum(x)
+        return self.snapshot()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Estado actual de las features (sin recalcular)"""
+        rms = np.sqrt(self.sum_squares / self.samples) if self.samples else 0.0
+        recent = list(self._sub_energies)
+        short_term = np.sqrt(np.mean(recent)) if recent else 0.0
+        return {
+            "duration": self.samples / self.sample_rate,
+            "rms_db": _db(rms),
+            "peak_db": _db(self.peak),
+            "short_term_rms_db": _db(short_term),
+            "momentary_lufs": self.loudness.momentary(),
+            "short_term_lufs": self.loudness.short_term(),
+            "integrated_lufs": self.loudness.integrated(),
+            "spectral_centroid": self.last_centroid,
+            "spectral_centroid_mean": (
+                self._centroid_num / self._centroid_den if self._centroid_den > _EPS else 0.0
+            ),
+            "onset_count": self.onset_count,
+            "last_onset_time": self.last_onset_time,
+            "stft_frames": self.frames,
+        }
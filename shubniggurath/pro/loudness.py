@@ -0,0 +1,266 @@
+"""
+Medición de loudness ITU-R BS.1770 / EBU R128 en streaming.
+
+- K-weighting como dos secciones SOS (shelf + high-pass RLB) con estado
+  persistente entre bloques: el resultado no depende del tamaño de bloque.
+- Energía por sub-bloques de 100 ms con operaciones numpy (reshape/strides);
+  los bloques de 400 ms (momentary, solape 75%) y 3 s (short-term) se forman
+  como medias deslizantes de sub-bloques.
+- Gating en dos etapas (absoluto -70 LUFS, relativo -10 LU / -20 LU para LRA)
+  sobre histogramas acumulados de 0.01 LU: memoria constante, sin guardar
+  la lista de bloques.
+- Silencio o audio más corto que un bloque se reporta en el gate absoluto
+  (-70 LUFS), nunca -inf: los resultados van tal cual a respuestas JSON.
+
+Un archivo de una hora se mide con measure_file() leyendo por bloques.
+"""
+
+from collections import deque
+from functools import lru_cache
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from shubniggurath.pro.filter_design import SOSStream
+
+ABSOLUTE_GATE_LUFS = -70.0
+RELATIVE_GATE_LU = -10.0
+LRA_RELATIVE_GATE_LU = -20.0
+
+# Histograma de loudness por bloque: [-70, +10) LUFS en pasos de 0.01 LU
+HIST_MIN_LUFS = ABSOLUTE_GATE_LUFS
+HIST_STEP_LU = 0.01
+HIST_BINS = int((10.0 - HIST_MIN_LUFS) / HIST_STEP_LU)
+
+_EPS = 1e-20
+
+
+def energy_to_lufs(mean_square):
+    """Energía media ponderada → LUFS"""
+    return -0.691 + 10 * np.log10(np.maximum(mean_square, _EPS))
+
+
+def lufs_to_energy(lufs: float) -> float:
+    return 10 ** ((lufs + 0.691) / 10)
+
+
+@lru_cache(maxsize=16)
+def k_weighting_sos(sample_rate: int) -> np.ndarray:
+    """
+    Filtro K (BS.1770-4) en SOS para cualquier sample rate: pre-filtro
+    shelving de alta frecuencia + high-pass RLB (diseño bilineal).
+    """
+    # Etapa 1: high shelf (+4 dB)
+    f0, gain_db, q = 1681.974450955533, 3.999843853973347, 0.7071752369554196
+    k = np.tan(np.pi * f0 / sample_rate)
+    vh = 10 ** (gain_db / 20)
+    vb = vh ** 0.4996667741545416
+    a0 = 1 + k / q + k * k
+    shelf = [
+        (vh + vb * k / q + k * k) / a0,
+        2 * (k * k - vh) / a0,
+        (vh - vb * k / q + k * k) / a0,
+        1.0,
+        2 * (k * k - 1) / a0,
+        (1 - k / q + k * k) / a0,
+    ]
+
+    # Etapa 2: high-pass RLB
+    f0, q = 38.13547087602444, 0.5003270373238773
+    k = np.tan(np.pi * f0 / sample_rate)
+    a0 = 1 + k / q + k * k
+    highpass = [1.0, -2.0, 1.0, 1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0]
+
+    return np.array([shelf, highpass])
+
+
+def default_channel_weights(channels: int) -> np.ndarray:
+    """Pesos BS.1770: 1.0 para L/R/C, 1.41 para surrounds (5.0/5.1), LFE fuera"""
+    weights = np.ones(channels)
+    if channels in (5, 6):
+        weights[-2:] = 1.41
+        if channels == 6:
+            weights[3] = 0.0  # LFE (orden L R C LFE Ls Rs)
+    return weights
+
+
+class LoudnessMeter:
+    """Medidor integrated/short-term/momentary/LRA alimentado por bloques"""
+
+    def __init__(
+        self,
+        sample_rate: int = 48000,
+        channels: int = 1,
+        channel_weights: Optional[Sequence[float]] = None,
+    ):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.weights = (
+            np.asarray(channel_weights, dtype=np.float64)
+            if channel_weights is not None
+            else default_channel_weights(channels)
+        )
+        self.step = int(round(0.1 * sample_rate))  # sub-bloque de 100 ms
+        self.reset()
+
+    def reset(self) -> None:
+        sos = k_weighting_sos(self.sample_rate)
+        self._filter = SOSStream(sos)
+        self._filter.zi = np.zeros((len(sos), 2, self.channels))
+
+        self.samples = 0
+        self.peak = 0.0
+
+        # Sub-bloque en curso y últimos 30 (3 s) completos
+        self._partial = np.zeros(self.channels)
+        self._partial_count = 0
+        self._recent = deque(maxlen=30)
+
+        self.momentary_max = ABSOLUTE_GATE_LUFS
+        self.short_term_max = ABSOLUTE_GATE_LUFS
+
+        # Histogramas (count + energía) de bloques sobre el gate absoluto
+        self._m_count = np.zeros(HIST_BINS, dtype=np.int64)
+        self._m_energy = np.zeros(HIST_BINS)
+        self._s_count = np.zeros(HIST_BINS, dtype=np.int64)
+        self._s_energy = np.zeros(HIST_BINS)
+
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _accumulate(count, energy, block_energies: np.ndarray) -> None:
+        loudness = energy_to_lufs(block_energies)
+        keep = loudness > ABSOLUTE_GATE_LUFS
+        if not np.any(keep):
+            return
+        idx = ((loudness[keep] - HIST_MIN_LUFS) / HIST_STEP_LU).astype(np.int64)
+        np.clip(idx, 0, HIST_BINS - 1, out=idx)
+        count += np.bincount(idx, minlength=HIST_BINS)
+        energy += np.bincount(idx, weights=block_energies[keep], minlength=HIST_BINS)
+
+    def _sub_block_energies(self, squared: np.ndarray) -> np.ndarray:
+        """Energía ponderada de cada sub-bloque de 100 ms completado"""
+        step = self.step
+        need = step - self._partial_count
+        if len(squared) < need:
+            self._partial += squared.sum(axis=0)
+            self._partial_count += len(squared)
+            return np.zeros(0)
+
+        rest = squared[need:]
+        n_full = len(rest) // step
+        per_channel = np.empty((n_full + 1, self.channels))
+        per_channel[0] = self._partial + squared[:need].sum(axis=0)
+        per_channel[1:] = rest[:n_full * step].reshape(n_full, step, self.channels).sum(axis=1)
+
+        tail = rest[n_full * step:]
+        self._partial = tail.sum(axis=0)
+        self._partial_count = len(tail)
+        return (per_channel / step) @ self.weights
+
+    def update(self, block: np.ndarray) -> None:
+        """Incorporar un bloque (frames,) o (frames, channels)"""
+        x = np.asarray(block, dtype=np.float64)
+        if x.ndim == 1:
+            x = x[:, np.newaxis]
+        if len(x) == 0:
+            return
+        self.samples += len(x)
+        self.peak = max(self.peak, float(np.max(np.abs(x))))
+
+        filtered = self._filter.process(x)
+        energies = self._sub_block_energies(filtered * filtered)
+        if len(energies) == 0:
+            return
+
+        history = np.concatenate([np.fromiter(self._recent, float, len(self._recent)), energies])
+        for window, count, energy, attr in (
+            (4, self._m_count, self._m_energy, "momentary_max"),
+            (30, self._s_count, self._s_energy, "short_term_max"),
+        ):
+            if len(history) < window:
+                continue
+            blocks = sliding_window_view(history, window).mean(axis=1)
+            blocks = blocks[max(0, len(blocks) - len(energies)):]
+            self._accumulate(count, energy, blocks)
+            setattr(self, attr, max(getattr(self, attr), float(energy_to_lufs(blocks.max()))))
+
+        self._recent.extend(energies[-30:])
+
+    # ------------------------------------------------------------------
+
+    def _window(self, n: int) -> float:
+        if len(self._recent) < n:
+            return ABSOLUTE_GATE_LUFS
+        recent = list(self._recent)[-n:]
+        return max(ABSOLUTE_GATE_LUFS, float(energy_to_lufs(np.mean(recent))))
+
+    def momentary(self) -> float:
+        """Loudness de los últimos 400 ms"""
+        return self._window(4)
+
+    def short_term(self) -> float:
+        """Loudness de los últimos 3 s"""
+        return self._window(30)
+
+    @staticmethod
+    def _relative_gate_index(count, energy, gate_lu: float) -> Optional[int]:
+        total = count.sum()
+        if total == 0:
+            return None
+        threshold = energy_to_lufs(energy.sum() / total) + gate_lu
+        return max(0, int(np.ceil((threshold - HIST_MIN_LUFS) / HIST_STEP_LU)))
+
+    def integrated(self) -> float:
+        """Loudness integrado con gating absoluto + relativo (-10 LU)"""
+        start = self._relative_gate_index(self._m_count, self._m_energy, RELATIVE_GATE_LU)
+        if start is None:
+            return ABSOLUTE_GATE_LUFS
+        count = self._m_count[start:].sum()
+        if not count:
+            return ABSOLUTE_GATE_LUFS
+        return float(energy_to_lufs(self._m_energy[start:].sum() / count))
+
+    def loudness_range(self) -> float:
+        """LRA (EBU Tech 3342): percentiles 10–95 de short-term con gate -20 LU"""
+        start = self._relative_gate_index(self._s_count, self._s_energy, LRA_RELATIVE_GATE_LU)
+        if start is None:
+            return 0.0
+        cumulative = np.cumsum(self._s_count[start:])
+        if cumulative[-1] == 0:
+            return 0.0
+        lo, hi = np.searchsorted(cumulative, [0.10 * cumulative[-1], 0.95 * cumulative[-1]])
+        return float((hi - lo) * HIST_STEP_LU)
+
+    def result(self) -> Dict[str, Any]:
+        return {
+            "integrated_lufs": self.integrated(),
+            "loudness_range_lu": self.loudness_range(),
+            "momentary_lufs": self.momentary(),
+            "short_term_lufs": self.short_term(),
+            "momentary_max_lufs": self.momentary_max,
+            "short_term_max_lufs": self.short_term_max,
+            "sample_peak_dbfs": float(20 * np.log10(max(self.peak, 1e-10))),
+            "duration": self.samples / self.sample_rate,
+        }
+
+
+def measure_loudness(audio: np.ndarray, sample_rate: int, block_frames: int = 65536) -> Dict[str, Any]:
+    """Medir un array en memoria (procesado por bloques)"""
+    channels = 1 if audio.ndim == 1 else audio.shape[1]
+    meter = LoudnessMeter(sample_rate, channels)
+    for start in range(0, len(audio), block_frames):
+        meter.update(audio[start:start + block_frames])
+    return meter.result()
+
+
+def measure_file(path: str, block_frames: int = 65536) -> Dict[str, Any]:
+    """Medir un archivo en memoria constante (lectura por bloques)"""
+    from shubniggurath.pro.audio_io import audio_info, iter_audio_blocks
+
+    sample_rate, channels, _ = audio_info(path)
+    meter = LoudnessMeter(sample_rate, channels)
+    for block in iter_audio_blocks(path, block_frames=block_frames, mono=False):
+        meter.update(block)
+    return meter.result()
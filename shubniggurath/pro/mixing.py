@@ -1,25 +1,29 @@
 """
-Funciones de mezcla automatizada básica.
+Funciones de mezcla automatizada básica (vectorizadas sobre numpy).
 """
 import math
-from typing import Dict, List, Sequence, Tuple
+from typing import Dict, Sequence, Tuple
 
+import numpy as np
 
-def gain_stage(samples: Sequence[float], target_lufs: float = -16.0) -> List[float]:
-    if not samples:
-        return list(samples)
-    current = 20 * math.log10(math.sqrt(sum(s * s for s in samples) / len(samples)) + 1e-9)
+
+def gain_stage(samples: Sequence[float], target_lufs: float = -16.0) -> np.ndarray:
+    x = np.asarray(samples, dtype=np.float32)
+    if x.size == 0:
+        return x
+    current = 20 * math.log10(math.sqrt(float(np.mean(np.square(x, dtype=np.float64)))) + 1e-9)
     gain_db = target_lufs - current
-    factor = 10 ** (gain_db / 20)
-    return [max(-1.0, min(1.0, s * factor)) for s in samples]
+    factor = np.float32(10 ** (gain_db / 20))
+    return np.clip(x * factor, -1.0, 1.0)
 
 
-def pan(samples: Sequence[float], pan_value: float = 0.0) -> Tuple[List[float], List[float]]:
+def pan(samples: Sequence[float], pan_value: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
     """
-    pan_value -1.0 (L) to 1.0 (R); return stereo lists (L, R)
+    pan_value -1.0 (L) to 1.0 (R); return stereo arrays (L, R)
     """
-    left = [s * (1 - max(0, pan_value)) for s in samples]
-    right = [s * (1 + min(0, pan_value)) for s in samples]
+    x = np.asarray(samples, dtype=np.float32)
+    left = x * np.float32(1 - max(0, pan_value))
+    right = x * np.float32(1 + min(0, pan_value))
     return left, right
 
 
@@ -4,14 +4,19 @@ Optimizado para baja latencia y recursos limitados.
 """
 
 import asyncio
+from collections import OrderedDict
 from typing import Optional, Dict, Any, List
 from dataclasses import dataclass
 from enum import Enum
-from collections import deque
 import numpy as np
 
 from shubniggurath.pro.dsp_engine import DSPEngine
 from shubniggurath.pro.dsp_fx import FXChain, EffectConfig, EffectType
+from shubniggurath.pro.incremental_analysis import IncrementalAnalyzer
+
+
+# Versión del análisis por chunks de process_batch (clave del caché)
+MODE_C_ANALYSIS_VERSION = "1"
 
 
 class ProcessingMode(Enum):
@@ -40,48 +45,160 @@ class ModeCConfig:
     
     # FX
     max_parallel_effects: int = 2
+    
+    # Análisis
+    incremental_analysis: bool = True  # False = analyze_audio completo por chunk
+    analysis_cache_size: int = 100
+
+
+class LRUCache:
+    """Caché LRU con get/put/evicción O(1)"""
+    
+    def __init__(self, maxsize: int = 100):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Any, Any]" = OrderedDict()
+    
+    def get(self, key, default=None):
+        if key not in self._data:
+            return default
+        self._data.move_to_end(key)
+        return self._data[key]
+    
+    def put(self, key, value) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def __contains__(self, key) -> bool:
+        return key in self._data
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def keys(self):
+        return self._data.keys()
 
 
 class StreamBuffer:
-    """Buffer circular para streaming"""
+    """
+    Buffer circular preasignado (float32) para streaming.
+    
+    Single-producer/single-consumer sin lock: el productor solo avanza
+    `write_pos` y el consumidor solo `read_pos` (contadores monótonos de
+    frames), así push y pop nunca compiten por el mismo índice.
+    
+    - peek(): vista zero-copy de la ventana cuando es contigua en el anillo;
+      si cruza el final, se copia a un scratch preasignado (válida hasta la
+      próxima lectura).
+    - Overrun: si no hay espacio, los frames entrantes que no caben se
+      descartan y se contabilizan (`overruns`, `dropped_frames`).
+    """
     
     def __init__(self, size: int, channels: int = 1):
         self.size = size
         self.channels = channels
-        self.buffer = deque(maxlen=size)
-        self.lock = asyncio.Lock()
+        shape = (size,) if channels == 1 else (size, channels)
+        self.buffer = np.zeros(shape, dtype=np.float32)
+        self._scratch = np.zeros(shape, dtype=np.float32)
+        
+        self.write_pos = 0
+        self.read_pos = 0
+        
+        # Métricas
+        self.overruns = 0
+        self.dropped_frames = 0
+        self.underruns = 0
+    
+    @property
+    def available(self) -> int:
+        """Frames listos para leer"""
+        return self.write_pos - self.read_pos
+    
+    @property
+    def free(self) -> int:
+        """Frames libres para escribir"""
+        return self.size - self.available
+    
+    def write(self, chunk: np.ndarray) -> int:
+        """Escribir frames (productor). Retorna frames escritos."""
+        frames = len(chunk)
+        n = min(frames, self.free)
+        if n < frames:
+            self.overruns += 1
+            self.dropped_frames += frames - n
+        if n == 0:
+            return 0
+        
+        start = self.write_pos % self.size
+        first = min(n, self.size - start)
+        self.buffer[start:start + first] = chunk[:first]
+        if first < n:
+            self.buffer[:n - first] = chunk[first:n]
+        
+        self.write_pos += n
+        return n
+    
+    def peek(self, num_frames: int) -> Optional[np.ndarray]:
+        """Ventana de los próximos `num_frames` sin consumir (consumidor)"""
+        if num_frames > self.size:
+            raise ValueError(f"ventana ({num_frames}) mayor que el buffer ({self.size})")
+        if self.available < num_frames:
+            self.underruns += 1
+            return None
+        
+        start = self.read_pos % self.size
+        first = min(num_frames, self.size - start)
+        if first == num_frames:
+            return self.buffer[start:start + num_frames]
+        
+        window = self._scratch[:num_frames]
+        window[:first] = self.buffer[start:]
+        window[first:] = self.buffer[:num_frames - first]
+        return window
+    
+    def advance(self, num_frames: int) -> None:
+        """Consumir frames ya leídos con peek()"""
+        self.read_pos += min(num_frames, self.available)
+    
+    def read(self, num_frames: int, out: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """Extraer `num_frames` copiándolos a `out` (o a un array nuevo)"""
+        window = self.peek(num_frames)
+        if window is None:
+            return None
+        if out is None:
+            out = window.copy()
+        else:
+            out[:num_frames] = window
+        self.advance(num_frames)
+        return out
+    
+    def clear(self) -> None:
+        """Descartar todo lo pendiente"""
+        self.read_pos = self.write_pos
+    
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "size": self.size,
+            "available": self.available,
+            "overruns": self.overruns,
+            "dropped_frames": self.dropped_frames,
+            "underruns": self.underruns,
+        }
+    
+    # API async (compatibilidad)
     
     async def push(self, chunk: np.ndarray) -> None:
         """Agregar chunk"""
-        async with self.lock:
-            self.buffer.append(chunk)
-    
-    async def pop(self, num_chunks: int = 1) -> Optional[np.ndarray]:
-        """Extraer chunks"""
-        async with self.lock:
-            if len(self.buffer) < num_chunks:
-                return None
-            
-            result = []
-            for _ in range(num_chunks):
-                if self.buffer:
-                    result.append(self.buffer.popleft())
-            
-            return np.concatenate(result) if result else None
+        self.write(chunk)
     
-    async def peek(self, num_chunks: int = 1) -> Optional[np.ndarray]:
-        """Ver sin extraer"""
-        async with self.lock:
-            if len(self.buffer) < num_chunks:
-                return None
-            
-            result = list(self.buffer)[:num_chunks]
-            return np.concatenate(result) if result else None
+    async def pop(self, num_frames: int) -> Optional[np.ndarray]:
+        """Extraer frames"""
+        return self.read(num_frames)
     
     async def get_size(self) -> int:
-        """Obtener tamaño actual"""
-        async with self.lock:
-            return len(self.buffer)
+        """Obtener frames disponibles"""
+        return self.available
 
 
 class ModeCPipeline:
@@ -100,7 +217,8 @@ class ModeCPipeline:
         # Estado
         self.sample_rate = 48000
         self.chunk_counter = 0
-        self.analysis_cache = {}
+        self.analysis_cache = LRUCache(self.config.analysis_cache_size)
+        self.analyzer = IncrementalAnalyzer(sample_rate=self.sample_rate)
     
     def configure_fx_chain(self, configs: List[Dict[str, Any]]) -> None:
         """Configurar cadena de efectos"""
@@ -121,29 +239,25 @@ class ModeCPipeline:
     ) -> np.ndarray:
         """Procesar un chunk de audio"""
         
-        output = chunk.copy()
-        
         # Análisis (opcional)
-        if not skip_analysis and self.config.mode != ProcessingMode.REALTIME:
-            if self.chunk_counter not in self.analysis_cache:
-                # Análisis básico (no computacionalmente pesado)
+        if not skip_analysis:
+            if self.config.incremental_analysis:
+                # Solo muestras nuevas: coste constante por chunk
+                self.analysis_cache.put(self.chunk_counter, self.analyzer.update(chunk))
+            elif self.config.mode != ProcessingMode.REALTIME and self.chunk_counter not in self.analysis_cache:
                 try:
                     analysis = await self.dsp_engine.analyze_audio(chunk, self.sample_rate)
-                    self.analysis_cache[self.chunk_counter] = analysis
+                    self.analysis_cache.put(self.chunk_counter, analysis)
                 except Exception as e:
                     pass  # Silent fail en streaming
         
-        # Efectos
+        # Efectos (stream: estado de filtros/dinámica continuo entre chunks).
+        # Solo se copia cuando hay cadena, para no mutar el buffer del caller.
+        output = chunk
         if self.fx_chain:
-            output = await self.fx_chain.process_async(output)
+            output = self.fx_chain.process_block(np.array(chunk, dtype=np.float32))
         
         self.chunk_counter += 1
-        
-        # Limpiar cache viejo
-        if len(self.analysis_cache) > 100:
-            oldest_key = min(self.analysis_cache.keys())
-            del self.analysis_cache[oldest_key]
-        
         return output
     
     async def process_streaming(
@@ -193,14 +307,35 @@ class ModeCPipeline:
         audio: np.ndarray,
         sample_rate: int = 48000,
     ) -> Dict[str, Any]:
-        """Procesamiento en batch (máxima calidad)"""
+        """
+        Procesamiento en batch (máxima calidad).
+        El análisis por chunks se guarda en el caché de análisis por contenido:
+        reprocesar el mismo audio solo vuelve a aplicar la cadena de FX.
+        """
+        from shubniggurath.core.analysis_cache import (
+            get_analysis_cache,
+            hash_samples,
+            make_cache_key,
+        )
         
         if self.config.mode != ProcessingMode.BATCH:
             raise ValueError("Este método requiere mode=BATCH")
         
         self.sample_rate = sample_rate
+        # Análisis incremental propio del batch, al sample rate del batch
+        self.analyzer = IncrementalAnalyzer(sample_rate=sample_rate)
         
         try:
+            cache = get_analysis_cache()
+            cache_key = cached_analysis = content_hash = None
+            if cache.enabled:
+                content_hash = hash_samples(audio, sample_rate)
+                cache_key = make_cache_key(
+                    content_hash, "mode_c_batch", MODE_C_ANALYSIS_VERSION,
+                    {"chunk_size": self.config.chunk_size},
+                )
+                cached_analysis = cache.get(cache_key)
+            
             # Dividir en chunks
             num_chunks = (len(audio) + self.config.chunk_size - 1) // self.config.chunk_size
             output_audio = np.zeros_like(audio)
@@ -217,14 +352,19 @@ class ModeCPipeline:
                 output_audio[start:end] = output_chunk[:len(chunk)]
                 
                 # Análisis (completo en batch)
-                if i % max(1, num_chunks // 10) == 0:
+                if cached_analysis is None and i % max(1, num_chunks // 10) == 0:
                     analysis = await self.dsp_engine.analyze_audio(chunk, sample_rate)
                     analysis_results.append({
                         "chunk_idx": i,
-                        "peak_db": analysis.peak_db,
-                        "lufs": analysis.lufs,
+                        "peak_db": float(analysis.peak_dbfs),
+                        "lufs": float(analysis.lufs_integrated),
                     })
             
+            if cached_analysis is not None:
+                analysis_results = cached_analysis
+            elif cache_key is not None:
+                cache.put(cache_key, content_hash, "mode_c_batch", analysis_results)
+            
             return {
                 "success": True,
                 "output_audio": output_audio,
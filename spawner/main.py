@@ -1,15 +1,18 @@
 import asyncio
+import codecs
 import json
 import os
-import subprocess
+import signal
+import time
 import uuid
 from contextlib import asynccontextmanager  # P1-1: Add for reaper job
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
-import httpx
 from fastapi import BackgroundTasks, FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
+from sqlalchemy import insert
 
 from config.db_schema import (
     Daughter,
@@ -21,6 +24,8 @@ from config.db_schema import (
     Spawn,
     get_session,
 )
+from spawner.notifier import MadreNotifier
+from spawner.pool import PoolSaturated, SpawnPool
 
 # NOTE: decouple from tentaculo_link.db.events_metrics to avoid circular import
 # spawner runs independently; will re-enable when db/events is refactored
@@ -40,8 +45,59 @@ REAPER_INTERVAL_SECONDS = int(
     os.environ.get("VX11_SPAWNER_REAPER_INTERVAL_SECONDS", "60")
 )
 
+# ============ OUTPUT SPOOLING ============
+# Daughter stdout/stderr is streamed to spool files (one pair per spawn) instead
+# of being buffered in memory; the DB only keeps a bounded head + tail.
+SPOOL_DIR = os.environ.get("VX11_SPAWNER_SPOOL_DIR") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data",
+    "runtime",
+    "spawner_spool",
+)
+SPOOL_MAX_BYTES = int(os.environ.get("VX11_SPAWNER_SPOOL_MAX_BYTES", str(8 * 1024 * 1024)))
+SPOOL_RETENTION_SECONDS = int(os.environ.get("VX11_SPAWNER_SPOOL_RETENTION_SECONDS", "86400"))
+OUTPUT_HEAD_BYTES = int(os.environ.get("VX11_SPAWNER_OUTPUT_HEAD_BYTES", "4096"))
+OUTPUT_TAIL_BYTES = int(os.environ.get("VX11_SPAWNER_OUTPUT_TAIL_BYTES", "4096"))
+OUTPUT_CHUNK_BYTES = 64 * 1024
+
+# ============ EXECUTION POOL ============
+# At most MAX_CONCURRENCY daughters run at once; the rest wait by priority.
+# New spawns get 503 when MAX_QUEUE are already waiting; a queued attempt
+# that gets no slot within QUEUE_WAIT_SECONDS fails as spawner_saturated.
+_spawn_pool = SpawnPool(
+    max_concurrency=int(os.environ.get("VX11_SPAWNER_MAX_CONCURRENCY", "4")),
+    max_queue=int(os.environ.get("VX11_SPAWNER_MAX_QUEUE", "100")),
+    max_wait_s=float(os.environ.get("VX11_SPAWNER_QUEUE_WAIT_SECONDS", "300")),
+    cpu_max_percent=float(os.environ.get("VX11_SPAWNER_CPU_MAX_PERCENT", "90")),
+    mem_max_percent=float(os.environ.get("VX11_SPAWNER_MEM_MAX_PERCENT", "90")),
+)
+
 
 # ============ P1-1: TTL/REAPER BACKGROUND JOB ============
+REAPABLE_STATUSES = ("spawned", "running", "completed", "expired")
+
+
+def _reap_expired() -> int:
+    """Mark daughters past their TTL as reaped: one UPDATE on (status, expires_at)."""
+    session = get_session("vx11")
+    try:
+        reaped = (
+            session.query(Daughter)
+            .filter(
+                Daughter.status.in_(REAPABLE_STATUSES),
+                Daughter.expires_at < _now(),
+            )
+            .update({Daughter.status: "reaped"}, synchronize_session=False)
+        )
+        session.commit()
+        return reaped
+    except Exception:
+        session.rollback()
+        return 0
+    finally:
+        session.close()
+
+
 async def _reaper_job():
     """
     P1-1: Background job that periodically cleans expired daughters.
@@ -50,35 +106,8 @@ async def _reaper_job():
     while True:
         try:
             await asyncio.sleep(REAPER_INTERVAL_SECONDS)  # Configurable interval
-            session = get_session("vx11")
-            try:
-                now = _now()
-                from datetime import timedelta
-
-                # Find daughters past their TTL (started_at + ttl_seconds < now)
-                # Only process daughters that are not yet marked as reaped/killed
-                expired = (
-                    session.query(Daughter)
-                    .filter(
-                        Daughter.status.in_(
-                            ["spawned", "running", "completed", "expired"]
-                        ),
-                        Daughter.started_at != None,
-                        Daughter.started_at + timedelta(seconds=Daughter.ttl_seconds)
-                        < now,
-                    )
-                    .all()
-                )
-
-                if expired:
-                    for daughter in expired:
-                        daughter.status = "reaped"
-                        session.add(daughter)
-                    session.commit()
-            except Exception:
-                session.rollback()
-            finally:
-                session.close()
+            await asyncio.to_thread(_reap_expired)
+            await asyncio.to_thread(_prune_spool)
         except Exception:
             # Swallow exceptions in reaper to keep it running
             await asyncio.sleep(5)
@@ -86,9 +115,10 @@ async def _reaper_job():
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Startup/shutdown: start reaper background task."""
+    """Startup/shutdown: start reaper background task and the madre notifier."""
     # Start reaper job
     reaper_task = asyncio.create_task(_reaper_job())
+    _notifier.start()
     try:
         yield
     finally:
@@ -97,6 +127,7 @@ async def lifespan(app: FastAPI):
             await reaper_task
         except asyncio.CancelledError:
             pass
+        await _notifier.stop()
 
 
 app = FastAPI(title="VX11 Spawner - Advanced", lifespan=lifespan)
@@ -120,6 +151,8 @@ class SpawnRequest(BaseModel):
     max_retries: int = Field(default=2, ge=0)
     auto_retry: bool = True
     subtasks: Optional[List[Dict[str, Any]]] = None
+    # Menor número = mayor prioridad en la cola del pool
+    priority: int = Field(default=5, ge=0, le=10)
 
 
 class SpawnResponse(BaseModel):
@@ -177,7 +210,7 @@ def _serialize(obj: Any) -> str:
         return json.dumps({"value": str(obj)}, ensure_ascii=True)
 
 
-def _register_intent(session, req: SpawnRequest) -> None:
+def _build_intent(req: SpawnRequest) -> IntentLog:
     payload = {
         "intent": req.intent,
         "task_id": req.task_id,
@@ -186,19 +219,20 @@ def _register_intent(session, req: SpawnRequest) -> None:
         "task_type": req.task_type,
         "metadata": req.metadata or {},
     }
-    entry = IntentLog(
+    return IntentLog(
         source=req.source or "spawner",
         payload_json=_serialize(payload),
         created_at=_now(),
         result_status="planned",
         notes="spawner_spawn_request",
     )
-    session.add(entry)
 
 
-def _create_task_and_daughter(
-    session, req: SpawnRequest, spawn_uuid: str
-) -> Tuple[DaughterTask, Daughter]:
+def _register_intent(session, req: SpawnRequest) -> None:
+    session.add(_build_intent(req))
+
+
+def _build_task(req: SpawnRequest, spawn_uuid: str) -> DaughterTask:
     metadata = dict(req.metadata or {})
     metadata.update(
         {
@@ -210,7 +244,7 @@ def _create_task_and_daughter(
             "spawn_uuid": spawn_uuid,  # P0-1: Persist spawn_uuid in metadata
         }
     )
-    task = DaughterTask(
+    return DaughterTask(
         intent_id=req.trace_id or req.task_id or req.parent_task_id,
         source=req.source or "spawner",
         priority=3,
@@ -224,29 +258,40 @@ def _create_task_and_daughter(
         metadata_json=_serialize(metadata),
         plan_json=None,
     )
-    session.add(task)
-    session.flush()
 
-    daughter = Daughter(
-        task_id=task.id,
-        name=req.name or f"hija-{task.id}-mut{req.mutation_level}",
+
+def _build_daughter(req: SpawnRequest, task_id: int, spawn_uuid: str) -> Daughter:
+    started_at = _now()
+    return Daughter(
+        task_id=task_id,
+        name=req.name or f"hija-{task_id}-mut{req.mutation_level}",
         purpose=req.description or req.intent,
         tools_json=_serialize(req.tool_allowlist or []),
         ttl_seconds=req.ttl_seconds,
-        started_at=_now(),
-        last_heartbeat_at=_now(),
+        started_at=started_at,
+        expires_at=started_at + timedelta(seconds=req.ttl_seconds),
+        last_heartbeat_at=started_at,
         status="spawned",
         mutation_level=req.mutation_level,
         error_last=None,
         spawn_uuid=spawn_uuid,  # P0-1: Persist spawn_uuid directly to column
     )
+
+
+def _create_task_and_daughter(
+    session, req: SpawnRequest, spawn_uuid: str
+) -> Tuple[DaughterTask, Daughter]:
+    task = _build_task(req, spawn_uuid)
+    session.add(task)
+    session.flush()
+    daughter = _build_daughter(req, task.id, spawn_uuid)
     session.add(daughter)
     session.flush()
     return task, daughter
 
 
-def _create_spawn(session, req: SpawnRequest, spawn_uuid: str) -> Spawn:
-    spawn = Spawn(
+def _build_spawn(req: SpawnRequest, spawn_uuid: str) -> Spawn:
+    return Spawn(
         uuid=spawn_uuid,
         name=req.name or f"spawn-{spawn_uuid[:8]}",
         cmd=req.cmd or "",
@@ -260,12 +305,16 @@ def _create_spawn(session, req: SpawnRequest, spawn_uuid: str) -> Spawn:
         parent_task_id=req.parent_task_id or req.task_id,
         created_at=_now(),
     )
+
+
+def _create_spawn(session, req: SpawnRequest, spawn_uuid: str) -> Spawn:
+    spawn = _build_spawn(req, spawn_uuid)
     session.add(spawn)
     return spawn
 
 
-def _create_attempt(session, daughter_id: int, attempt_number: int) -> DaughterAttempt:
-    attempt = DaughterAttempt(
+def _build_attempt(daughter_id: int, attempt_number: int) -> DaughterAttempt:
+    return DaughterAttempt(
         daughter_id=daughter_id,
         attempt_number=attempt_number,
         started_at=_now(),
@@ -278,6 +327,10 @@ def _create_attempt(session, daughter_id: int, attempt_number: int) -> DaughterA
         cli_provider_used=None,
         created_at=_now(),
     )
+
+
+def _create_attempt(session, daughter_id: int, attempt_number: int) -> DaughterAttempt:
+    attempt = _build_attempt(daughter_id, attempt_number)
     session.add(attempt)
     session.flush()
     return attempt
@@ -292,52 +345,58 @@ def _init_hijas_records(
     attempt_id: int,
 ) -> None:
     name = f"hija-{daughter.id}"
-    existing_runtime = session.query(HijasRuntime).filter_by(name=name).first()
-    if not existing_runtime:
-        meta = {
-            "spawn_uuid": spawn_uuid,
-            "task_id": task.id,
-            "daughter_id": daughter.id,
-            "attempt_id": attempt_id,
-            "trace_id": req.trace_id,
-            "source": req.source,
-        }
-        birth_context = {
-            "intent": req.intent,
-            "task_type": req.task_type,
-            "parent_task_id": req.parent_task_id,
-            "task_id": req.task_id,
-        }
-        runtime = HijasRuntime(
-            name=name,
-            state="running",
-            pid=None,
-            last_heartbeat=_now(),
-            meta_json=_serialize(meta),
-            birth_context=_serialize(birth_context),
-            intent_type=req.intent,
-            ttl=req.ttl_seconds,
-            purpose=req.description or req.intent,
-            module_creator=req.source or "spawner",
-            born_at=_now(),
-        )
+    runtime, state = _build_hijas_records(req, task.id, daughter.id, spawn_uuid, attempt_id)
+    if not session.query(HijasRuntime).filter_by(name=name).first():
         session.add(runtime)
+    if not session.query(HijasState).filter_by(hija_id=str(daughter.id)).first():
+        session.add(state)
 
-    existing_state = (
-        session.query(HijasState).filter_by(hija_id=str(daughter.id)).first()
+
+def _build_hijas_records(
+    req: SpawnRequest,
+    task_id: int,
+    daughter_id: int,
+    spawn_uuid: str,
+    attempt_id: int,
+) -> Tuple[HijasRuntime, HijasState]:
+    meta = {
+        "spawn_uuid": spawn_uuid,
+        "task_id": task_id,
+        "daughter_id": daughter_id,
+        "attempt_id": attempt_id,
+        "trace_id": req.trace_id,
+        "source": req.source,
+    }
+    birth_context = {
+        "intent": req.intent,
+        "task_type": req.task_type,
+        "parent_task_id": req.parent_task_id,
+        "task_id": req.task_id,
+    }
+    runtime = HijasRuntime(
+        name=f"hija-{daughter_id}",
+        state="running",
+        pid=None,
+        last_heartbeat=_now(),
+        meta_json=_serialize(meta),
+        birth_context=_serialize(birth_context),
+        intent_type=req.intent,
+        ttl=req.ttl_seconds,
+        purpose=req.description or req.intent,
+        module_creator=req.source or "spawner",
+        born_at=_now(),
     )
-    if not existing_state:
-        state = HijasState(
-            hija_id=str(daughter.id),
-            module="spawner",
-            status="running",
-            cpu_usage=0.0,
-            ram_usage=0.0,
-            pid=None,
-            created_at=_now(),
-            updated_at=_now(),
-        )
-        session.add(state)
+    state = HijasState(
+        hija_id=str(daughter_id),
+        module="spawner",
+        status="running",
+        cpu_usage=0.0,
+        ram_usage=0.0,
+        pid=None,
+        created_at=_now(),
+        updated_at=_now(),
+    )
+    return runtime, state
 
 
 def _update_hijas_records(
@@ -345,55 +404,239 @@ def _update_hijas_records(
     daughter_id: int,
     status: str,
     death_context: Optional[Dict[str, Any]] = None,
+) -> None:
+    runtime = session.query(HijasRuntime).filter_by(name=f"hija-{daughter_id}").first()
+    state = session.query(HijasState).filter_by(hija_id=str(daughter_id)).first()
+    _apply_hijas_status(runtime, state, status, death_context)
+
+
+def _apply_hijas_status(
+    runtime: Optional[HijasRuntime],
+    state: Optional[HijasState],
+    status: str,
+    death_context: Optional[Dict[str, Any]] = None,
 ) -> None:
     now = _now()
-    name = f"hija-{daughter_id}"
-    runtime = session.query(HijasRuntime).filter_by(name=name).first()
     if runtime:
         runtime.state = status
         if status in ("completed", "failed", "expired", "cancelled"):
             runtime.died_at = now
             if death_context is not None:
                 runtime.death_context = _serialize(death_context)
-        session.add(runtime)
-
-    state = session.query(HijasState).filter_by(hija_id=str(daughter_id)).first()
     if state:
         state.status = status
         state.updated_at = now
-        session.add(state)
 
 
-def _update_status(session, task_id: int, daughter_id: int, status: str) -> None:
-    task = session.query(DaughterTask).filter_by(id=task_id).first()
+def _apply_status(
+    task: Optional[DaughterTask], daughter: Optional[Daughter], status: str
+) -> None:
     if task:
         task.status = status
         task.updated_at = _now()
         if status in ("completed", "failed", "expired", "cancelled"):
             task.finished_at = _now()
-        session.add(task)
-    daughter = session.query(Daughter).filter_by(id=daughter_id).first()
     if daughter:
         daughter.status = status
         if status in ("finished", "failed", "expired", "killed"):
             daughter.ended_at = _now()
-        session.add(daughter)
+
+
+def _update_status(session, task_id: int, daughter_id: int, status: str) -> None:
+    task = session.get(DaughterTask, task_id)
+    daughter = session.get(Daughter, daughter_id)
+    _apply_status(task, daughter, status)
     _update_hijas_records(session, daughter_id, status)
 
 
-def _notify_madre(daughter_id: int, status: str, payload: Dict[str, Any]) -> None:
+class _LifecycleRows:
+    """Rows a spawn lifecycle updates, loaded once into its single session."""
+
+    def __init__(self, session, spawn_uuid: str, task_id: int, daughter_id: int, attempt_id: int):
+        self.spawn = session.query(Spawn).filter_by(uuid=spawn_uuid).first()
+        self.task = session.get(DaughterTask, task_id)
+        self.daughter = session.get(Daughter, daughter_id)
+        self.attempt = session.get(DaughterAttempt, attempt_id)
+        self.runtime = session.query(HijasRuntime).filter_by(name=f"hija-{daughter_id}").first()
+        self.state = session.query(HijasState).filter_by(hija_id=str(daughter_id)).first()
+
+    def set_status(self, status: str, death_context: Optional[Dict[str, Any]] = None) -> None:
+        """Task, daughter and hijas transition, coalesced into the next commit."""
+        _apply_status(self.task, self.daughter, status)
+        _apply_hijas_status(self.runtime, self.state, status, death_context)
+
+
+def _madre_endpoint(daughter_id: int, status: str) -> str:
     url = _madre_url().rstrip("/")
-    endpoint = f"{url}/madre/daughter/{daughter_id}/complete"
     if status in ("failed", "expired", "killed"):
-        endpoint = f"{url}/madre/daughter/{daughter_id}/fail"
+        return f"{url}/madre/daughter/{daughter_id}/fail"
+    return f"{url}/madre/daughter/{daughter_id}/complete"
+
+
+# ============ MADRE NOTIFICATIONS ============
+# Completion/failure reports are queued and sent by a background task, so a
+# slow or down madre never holds up the spawn lifecycle. Undelivered reports
+# are kept in NOTIFY_OUTBOX and retried after a restart.
+_notifier = MadreNotifier(
+    _madre_endpoint,
+    outbox_path=os.environ.get("VX11_SPAWNER_NOTIFY_OUTBOX")
+    or os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        "data",
+        "runtime",
+        "spawner_madre_outbox.json",
+    ),
+    max_in_flight=int(os.environ.get("VX11_SPAWNER_NOTIFY_MAX_IN_FLIGHT", "8")),
+    max_delay_s=float(os.environ.get("VX11_SPAWNER_NOTIFY_MAX_DELAY_SECONDS", "60")),
+    max_age_s=float(os.environ.get("VX11_SPAWNER_NOTIFY_MAX_AGE_SECONDS", "86400")),
+)
+
+
+def _notify_madre(daughter_id: int, status: str, payload: Dict[str, Any]) -> None:
+    _notifier.enqueue(daughter_id, status, payload)
+
+
+class _Spool:
+    """
+    One output stream of a running spawn.
+
+    Chunks go to a spool file capped at max_bytes (the pipe keeps being drained
+    past the cap), and only the first head_bytes / last tail_bytes are kept in
+    memory for the DB excerpt.
+    """
+
+    def __init__(self, path: str, max_bytes: int, head_bytes: int, tail_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.head_bytes = head_bytes
+        self.tail_bytes = tail_bytes
+        self.total = 0
+        self.spooled = 0
+        self.head = bytearray()
+        self.tail = bytearray()
+        self._fh = open(path, "wb")
+
+    @property
+    def truncated(self) -> bool:
+        return self.total > self.spooled
+
+    def write(self, chunk: bytes) -> None:
+        self.total += len(chunk)
+        if len(self.head) < self.head_bytes:
+            self.head += chunk[: self.head_bytes - len(self.head)]
+        if self.tail_bytes:
+            self.tail += chunk[-self.tail_bytes :]
+            del self.tail[: -self.tail_bytes]
+        room = self.max_bytes - self.spooled
+        if room > 0:
+            self._fh.write(chunk[:room])
+            self.spooled += min(room, len(chunk))
+            if len(chunk) > room:
+                self._fh.write(f"\n[spool truncated at {self.max_bytes} bytes]\n".encode())
+            self._fh.flush()
+
+    def close(self) -> None:
+        self._fh.close()
+
+    def excerpt(self) -> str:
+        """Head + tail of the stream, with the size of the gap in between."""
+        if self.total <= self.head_bytes:
+            data = bytes(self.head)
+        elif self.total <= self.head_bytes + self.tail_bytes:
+            data = bytes(self.head) + bytes(self.tail[len(self.tail) - (self.total - self.head_bytes) :])
+        else:
+            omitted = self.total - self.head_bytes - self.tail_bytes
+            data = bytes(self.head) + f"\n...[{omitted} bytes omitted]...\n".encode() + bytes(self.tail)
+        return data.decode("utf-8", errors="replace")
+
+
+class SpawnOutput:
+    """Live output of one spawn attempt, followed by GET /process/uuid/{uuid}/output."""
+
+    def __init__(self, spawn_uuid: str, attempt: int):
+        self.spawn_uuid = spawn_uuid
+        self.attempt = attempt
+        paths = _spool_paths(spawn_uuid)
+        os.makedirs(SPOOL_DIR, exist_ok=True)
+        self.streams = {
+            name: _Spool(path, SPOOL_MAX_BYTES, OUTPUT_HEAD_BYTES, OUTPUT_TAIL_BYTES)
+            for name, path in paths.items()
+        }
+        self.exit_code: Optional[int] = None
+        self.status: Optional[str] = None
+        self.done = False
+        self._changed = asyncio.Event()
+
+    def notify(self) -> None:
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def changed(self) -> asyncio.Event:
+        """Event set on the next write or state change."""
+        return self._changed
+
+    def finish(self, exit_code: int, status: str) -> None:
+        for spool in self.streams.values():
+            spool.close()
+        self.exit_code = exit_code
+        self.status = status
+        self.done = True
+        self.notify()
+
+
+# spawn_uuid -> output of its current attempt, while the spawn lifecycle runs
+_LIVE_OUTPUT: Dict[str, SpawnOutput] = {}
+
+
+def _spool_paths(spawn_uuid: str) -> Dict[str, str]:
+    safe = "".join(c for c in spawn_uuid if c.isalnum() or c == "-")
+    return {
+        "stdout": os.path.join(SPOOL_DIR, f"{safe}.stdout.log"),
+        "stderr": os.path.join(SPOOL_DIR, f"{safe}.stderr.log"),
+    }
+
+
+def _set_live_output(spawn_uuid: str, output: Optional[SpawnOutput]) -> None:
+    previous = _LIVE_OUTPUT.pop(spawn_uuid, None)
+    if output is not None:
+        _LIVE_OUTPUT[spawn_uuid] = output
+    if previous is not None:
+        previous.notify()
+
+
+def _prune_spool() -> int:
+    """Delete spool files older than SPOOL_RETENTION_SECONDS."""
+    cutoff = time.time() - SPOOL_RETENTION_SECONDS
+    live = {p for uid in _LIVE_OUTPUT for p in _spool_paths(uid).values()}
+    removed = 0
     try:
-        httpx.post(endpoint, json=payload, timeout=10.0)
-    except Exception:
-        pass
+        entries = list(os.scandir(SPOOL_DIR))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        try:
+            if entry.path not in live and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except OSError:
+            pass
+    return removed
 
 
-def _execute_command(
-    cmd: str, ttl_seconds: int, task_type: Optional[str] = None
+async def _pump(stream: asyncio.StreamReader, spool: _Spool, output: SpawnOutput) -> None:
+    while True:
+        chunk = await stream.read(OUTPUT_CHUNK_BYTES)
+        if not chunk:
+            return
+        spool.write(chunk)
+        output.notify()
+
+
+async def _execute_command(
+    cmd: str,
+    ttl_seconds: int,
+    task_type: Optional[str] = None,
+    output: Optional[SpawnOutput] = None,
 ) -> Tuple[int, str, str, str]:
     """Execute command with appropriate interpreter based on task_type.
 
@@ -401,55 +644,76 @@ def _execute_command(
     For python: uses 'python3' interpreter
     For bash: uses '/bin/bash' explicitly
     For shell (default): uses shell=True
+
+    Output is streamed into output's spool files as it is produced; the
+    returned stdout/stderr are the bounded head + tail excerpts.
     """
+    if output is None:
+        output = SpawnOutput(f"adhoc-{uuid.uuid4()}", 1)
+    # Own session, so a timeout also kills whatever the shell started
+    pipes = {
+        "stdout": asyncio.subprocess.PIPE,
+        "stderr": asyncio.subprocess.PIPE,
+        "start_new_session": True,
+    }
     # Choose shell and command based on task_type
     if task_type == "python":
         # Run code as Python script
-        proc = subprocess.Popen(
-            ["python3", "-c", cmd],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
+        proc = await asyncio.create_subprocess_exec("python3", "-c", cmd, **pipes)
     elif task_type == "bash":
         # Run code as bash script
-        proc = subprocess.Popen(
-            ["/bin/bash", "-c", cmd],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
+        proc = await asyncio.create_subprocess_exec("/bin/bash", "-c", cmd, **pipes)
     else:
         # Default: shell execution
-        proc = subprocess.Popen(
-            cmd,
-            shell=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
+        proc = await asyncio.create_subprocess_shell(cmd, **pipes)
 
+    pumps = [
+        asyncio.create_task(_pump(proc.stdout, output.streams["stdout"], output)),
+        asyncio.create_task(_pump(proc.stderr, output.streams["stderr"], output)),
+    ]
     try:
-        stdout, stderr = proc.communicate(timeout=ttl_seconds)
+        await asyncio.wait_for(proc.wait(), ttl_seconds)
         exit_code = proc.returncode
         status = "success" if exit_code == 0 else "error"
-        return exit_code, stdout, stderr, status
-    except subprocess.TimeoutExpired:
-        proc.kill()
-        stdout, stderr = proc.communicate()
-        return -1, stdout, stderr, "timeout"
+    except asyncio.TimeoutError:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        await proc.wait()
+        exit_code, status = -1, "timeout"
+    # Grandchildren may keep the pipes open; don't wait on them forever
+    _done, pending = await asyncio.wait(pumps, timeout=5)
+    for task in pending:
+        task.cancel()
+
+    output.finish(exit_code, status)
+    return (
+        exit_code,
+        output.streams["stdout"].excerpt(),
+        output.streams["stderr"].excerpt(),
+        status,
+    )
+
+
+def _values(obj: Any) -> Dict[str, Any]:
+    """Column values set on an unsaved ORM object, as a row for a bulk INSERT."""
+    return {
+        col.key: getattr(obj, col.key)
+        for col in obj.__table__.columns
+        if getattr(obj, col.key) is not None
+    }
 
 
 def _spawn_subtasks(req: SpawnRequest, parent_task_id: int) -> int:
+    """Create all subtask records with a handful of bulk INSERTs and one commit."""
     if not req.subtasks:
         return 0
-    created = 0
-    session = get_session("vx11")
-    try:
-        for idx, payload in enumerate(req.subtasks):
-            sub_name = payload.get("name") or f"subtask-{parent_task_id}-{idx}"
-            sub_req = SpawnRequest(
-                name=sub_name,
+    sub_reqs = []
+    for idx, payload in enumerate(req.subtasks):
+        sub_reqs.append(
+            SpawnRequest(
+                name=payload.get("name") or f"subtask-{parent_task_id}-{idx}",
                 cmd=payload.get("cmd"),
                 task_id=req.task_id,
                 parent_task_id=str(parent_task_id),
@@ -466,30 +730,100 @@ def _spawn_subtasks(req: SpawnRequest, parent_task_id: int) -> int:
                 max_retries=payload.get("max_retries") or req.max_retries,
                 auto_retry=payload.get("auto_retry", req.auto_retry),
                 subtasks=None,
+                priority=payload.get("priority", req.priority),
             )
-            _register_intent(session, sub_req)
-            spawn_uuid = str(
-                uuid.uuid4()
-            )  # P0-1: Generate UUID before creating daughter
-            task, daughter = _create_task_and_daughter(
-                session, sub_req, spawn_uuid
-            )  # P0-1: Pass spawn_uuid
-            _create_spawn(session, sub_req, spawn_uuid)
-            attempt = _create_attempt(session, daughter.id, 1)
-            _update_status(session, task.id, daughter.id, "running")
-            _init_hijas_records(
-                session, sub_req, task, daughter, spawn_uuid, attempt.id
+        )
+    # P0-1: Generate UUIDs before creating daughters
+    spawn_uuids = [str(uuid.uuid4()) for _ in sub_reqs]
+
+    session = get_session("vx11")
+    try:
+        session.execute(insert(IntentLog), [_values(_build_intent(r)) for r in sub_reqs])
+
+        # Generated ids come back from batched INSERT ... RETURNING and are
+        # matched on a unique value, not on row order.
+        task_rows = []
+        for sub_req, spawn_uuid in zip(sub_reqs, spawn_uuids):
+            task = _build_task(sub_req, spawn_uuid)
+            task.status = "running"
+            task_rows.append(_values(task))
+        task_ids = dict(
+            session.execute(
+                insert(DaughterTask).returning(DaughterTask.metadata_json, DaughterTask.id),
+                task_rows,
+            ).all()
+        )
+
+        daughter_rows = []
+        for sub_req, spawn_uuid, row in zip(sub_reqs, spawn_uuids, task_rows):
+            daughter = _build_daughter(sub_req, task_ids[row["metadata_json"]], spawn_uuid)
+            daughter.status = "running"
+            daughter_rows.append(_values(daughter))
+        daughter_ids = dict(
+            session.execute(
+                insert(Daughter).returning(Daughter.spawn_uuid, Daughter.id), daughter_rows
+            ).all()
+        )
+        session.execute(
+            insert(Spawn), [_values(_build_spawn(r, u)) for r, u in zip(sub_reqs, spawn_uuids)]
+        )
+        attempt_ids = dict(
+            session.execute(
+                insert(DaughterAttempt).returning(
+                    DaughterAttempt.daughter_id, DaughterAttempt.id
+                ),
+                [_values(_build_attempt(daughter_ids[u], 1)) for u in spawn_uuids],
+            ).all()
+        )
+
+        existing_runtimes = {
+            row[0]
+            for row in session.query(HijasRuntime.name).filter(
+                HijasRuntime.name.in_([f"hija-{d}" for d in daughter_ids.values()])
             )
-            created += 1
+        }
+        existing_states = {
+            row[0]
+            for row in session.query(HijasState.hija_id).filter(
+                HijasState.hija_id.in_([str(d) for d in daughter_ids.values()])
+            )
+        }
+        runtimes, states = [], []
+        for sub_req, spawn_uuid, row in zip(sub_reqs, spawn_uuids, task_rows):
+            daughter_id = daughter_ids[spawn_uuid]
+            runtime, state = _build_hijas_records(
+                sub_req,
+                task_ids[row["metadata_json"]],
+                daughter_id,
+                spawn_uuid,
+                attempt_ids[daughter_id],
+            )
+            if runtime.name not in existing_runtimes:
+                runtimes.append(_values(runtime))
+            if state.hija_id not in existing_states:
+                states.append(_values(state))
+        if runtimes:
+            session.execute(insert(HijasRuntime), runtimes)
+        if states:
+            session.execute(insert(HijasState), states)
         session.commit()
+        return len(sub_reqs)
     except Exception:
         session.rollback()
+        return 0
     finally:
         session.close()
-    return created
 
 
-async def _run_spawn_lifecycle(
+async def _run_spawn_lifecycle(spawn_uuid: str, *args: Any, **kwargs: Any) -> None:
+    """Run the spawn attempts; its live output stays followable until they end."""
+    try:
+        await _run_spawn_attempts(spawn_uuid, *args, **kwargs)
+    finally:
+        _set_live_output(spawn_uuid, None)
+
+
+async def _run_spawn_attempts(
     spawn_uuid: str,
     task_id: int,
     daughter_id: int,
@@ -500,159 +834,151 @@ async def _run_spawn_lifecycle(
     auto_retry: bool,
     mutation_level: int,
     task_type: Optional[str] = None,
+    priority: int = 5,
 ) -> None:
     attempt_number = 1
     current_mutation = mutation_level
-    while True:
-        session = get_session("vx11")
-        try:
-            spawn = session.query(Spawn).filter_by(uuid=spawn_uuid).first()
-            if spawn:
-                spawn.status = "running"
-                spawn.started_at = spawn.started_at or _now()
-                session.add(spawn)
-                session.commit()
-        except Exception:
-            session.rollback()
-        finally:
-            session.close()
-
-        _log_spawn_event(
-            "spawn_running",
-            {
-                "spawn_uuid": spawn_uuid,
-                "task_id": task_id,
-                "daughter_id": daughter_id,
-                "attempt_id": attempt_id,
-                "attempt_number": attempt_number,
-                "cmd": cmd,
-            },
-        )
+    # One session for the whole lifecycle: rows are loaded once and every
+    # transition (running, retry, final state) is a single commit.
+    session = get_session("vx11")
+    session.expire_on_commit = False
+    try:
+        rows = _LifecycleRows(session, spawn_uuid, task_id, daughter_id, attempt_id)
+    except Exception:
+        session.close()
+        return
+    try:
+        while True:
+            try:
+                async with _spawn_pool.slot(priority):
+                    if rows.spawn:
+                        try:
+                            rows.spawn.status = "running"
+                            rows.spawn.started_at = rows.spawn.started_at or _now()
+                            session.commit()
+                        except Exception:
+                            session.rollback()
+
+                    _log_spawn_event(
+                        "spawn_running",
+                        {
+                            "spawn_uuid": spawn_uuid,
+                            "task_id": task_id,
+                            "daughter_id": daughter_id,
+                            "attempt_id": attempt_id,
+                            "attempt_number": attempt_number,
+                            "cmd": cmd,
+                        },
+                    )
 
-        exit_code, stdout, stderr, status = await asyncio.to_thread(
-            _execute_command, cmd, ttl_seconds, task_type
-        )
-        session = get_session("vx11")
-        try:
-            spawn = session.query(Spawn).filter_by(uuid=spawn_uuid).first()
-            if spawn:
-                spawn.pid = None
-                spawn.status = (
-                    "completed"
-                    if status == "success"
-                    else "failed" if status == "error" else "timeout"
-                )
-                spawn.started_at = spawn.started_at or _now()
-                spawn.ended_at = _now()
-                spawn.exit_code = exit_code
-                spawn.stdout = stdout
-                spawn.stderr = stderr
-                session.add(spawn)
-
-            attempt = session.query(DaughterAttempt).filter_by(id=attempt_id).first()
-            if attempt:
-                attempt.status = status
-                attempt.finished_at = _now()
-                attempt.error_message = stderr[:500] if stderr else None
-                session.add(attempt)
-
-            if status == "success":
-                _update_status(session, task_id, daughter_id, "completed")
-                _update_hijas_records(
-                    session,
-                    daughter_id,
-                    "completed",
-                    {
-                        "exit_code": exit_code,
-                        "stdout": stdout[:500],
-                        "stderr": stderr[:500],
-                    },
-                )
-                session.commit()
-                _log_spawn_event(
-                    "spawn_done",
-                    {
-                        "spawn_uuid": spawn_uuid,
-                        "task_id": task_id,
-                        "daughter_id": daughter_id,
-                        "attempt_id": attempt_id,
-                        "exit_code": exit_code,
-                        "status": "completed",
-                    },
-                )
-                _notify_madre(
-                    daughter_id,
-                    "completed",
-                    {"status": "ok", "exit_code": exit_code, "spawn_uuid": spawn_uuid},
-                )
-                return
+                    output = SpawnOutput(spawn_uuid, attempt_number)
+                    _set_live_output(spawn_uuid, output)
+                    exit_code, stdout, stderr, status = await _execute_command(
+                        cmd, ttl_seconds, task_type, output
+                    )
+            except PoolSaturated as exc:
+                exit_code, stdout, stderr, status = -1, "", f"spawner_saturated: {exc}", "error"
 
-            if not auto_retry or attempt_number >= max_retries:
-                final_state = "expired" if status == "timeout" else "failed"
-                _update_status(session, task_id, daughter_id, final_state)
-                _update_hijas_records(
-                    session,
-                    daughter_id,
-                    final_state,
-                    {
-                        "exit_code": exit_code,
-                        "stdout": stdout[:500],
-                        "stderr": stderr[:500],
-                    },
-                )
+            try:
+                if rows.spawn:
+                    rows.spawn.pid = None
+                    rows.spawn.status = (
+                        "completed"
+                        if status == "success"
+                        else "failed" if status == "error" else "timeout"
+                    )
+                    rows.spawn.started_at = rows.spawn.started_at or _now()
+                    rows.spawn.ended_at = _now()
+                    rows.spawn.exit_code = exit_code
+                    rows.spawn.stdout = stdout
+                    rows.spawn.stderr = stderr
+
+                if rows.attempt:
+                    rows.attempt.status = status
+                    rows.attempt.finished_at = _now()
+                    rows.attempt.error_message = stderr[:500] if stderr else None
+
+                if status == "success":
+                    rows.set_status(
+                        "completed",
+                        {
+                            "exit_code": exit_code,
+                            "stdout": stdout[:500],
+                            "stderr": stderr[:500],
+                        },
+                    )
+                    session.commit()
+                    _log_spawn_event(
+                        "spawn_done",
+                        {
+                            "spawn_uuid": spawn_uuid,
+                            "task_id": task_id,
+                            "daughter_id": daughter_id,
+                            "attempt_id": attempt_id,
+                            "exit_code": exit_code,
+                            "status": "completed",
+                        },
+                    )
+                    _notify_madre(
+                        daughter_id,
+                        "completed",
+                        {"status": "ok", "exit_code": exit_code, "spawn_uuid": spawn_uuid},
+                    )
+                    return
+
+                if not auto_retry or attempt_number >= max_retries:
+                    final_state = "expired" if status == "timeout" else "failed"
+                    rows.set_status(
+                        final_state,
+                        {
+                            "exit_code": exit_code,
+                            "stdout": stdout[:500],
+                            "stderr": stderr[:500],
+                        },
+                    )
+                    session.commit()
+                    _log_spawn_event(
+                        "spawn_error",
+                        {
+                            "spawn_uuid": spawn_uuid,
+                            "task_id": task_id,
+                            "daughter_id": daughter_id,
+                            "attempt_id": attempt_id,
+                            "exit_code": exit_code,
+                            "status": final_state,
+                        },
+                    )
+                    _notify_madre(
+                        daughter_id,
+                        final_state,
+                        {
+                            "status": "error",
+                            "error": (stderr or "")[:200] or final_state,
+                            "exit_code": exit_code,
+                            "spawn_uuid": spawn_uuid,
+                        },
+                    )
+                    return
+
+                # Retry: attempt result, mutation and the next attempt in one commit
+                attempt_number += 1
+                current_mutation += 1
+                if rows.daughter:
+                    rows.daughter.mutation_level = current_mutation
+                    rows.daughter.status = "mutated"
+                if rows.task:
+                    rows.task.current_retry = attempt_number - 1
+                    rows.task.status = "retrying"
+                    rows.task.updated_at = _now()
+                rows.attempt = _build_attempt(daughter_id, attempt_number)
+                session.add(rows.attempt)
                 session.commit()
-                _log_spawn_event(
-                    "spawn_error",
-                    {
-                        "spawn_uuid": spawn_uuid,
-                        "task_id": task_id,
-                        "daughter_id": daughter_id,
-                        "attempt_id": attempt_id,
-                        "exit_code": exit_code,
-                        "status": final_state,
-                    },
-                )
-                _notify_madre(
-                    daughter_id,
-                    final_state,
-                    {
-                        "status": "error",
-                        "exit_code": exit_code,
-                        "spawn_uuid": spawn_uuid,
-                    },
-                )
+                attempt_id = rows.attempt.id
+            except Exception:
+                session.rollback()
                 return
-
-            attempt_number += 1
-            current_mutation += 1
-            daughter = session.query(Daughter).filter_by(id=daughter_id).first()
-            if daughter:
-                daughter.mutation_level = current_mutation
-                daughter.status = "mutated"
-                session.add(daughter)
-            task = session.query(DaughterTask).filter_by(id=task_id).first()
-            if task:
-                task.current_retry = attempt_number - 1
-                task.status = "retrying"
-                task.updated_at = _now()
-                session.add(task)
-            session.commit()
-        except Exception:
-            session.rollback()
-            return
-        finally:
-            session.close()
-
-        session = get_session("vx11")
-        try:
-            attempt = _create_attempt(session, daughter_id, attempt_number)
-            session.commit()
-            attempt_id = attempt.id
-        except Exception:
-            session.rollback()
-            return
-        finally:
-            session.close()
+    finally:
+        session.close()
 
 
 @app.get("/health")
@@ -660,6 +986,18 @@ def health():
     return {"status": "ok", "service": "spawner", "version": "v7.0"}
 
 
+@app.get("/spawner/pool")
+def pool_stats():
+    """Execution pool metrics: running, queue depth, wait times, rejections."""
+    return {"status": "ok", "pool": _spawn_pool.stats()}
+
+
+@app.get("/spawner/notifications")
+def notification_stats():
+    """Madre notification queue: pending, sent, retries, coalesced, dropped."""
+    return {"status": "ok", "notifications": _notifier.stats()}
+
+
 # P0-2: Process management endpoints
 @app.get("/process/{daughter_id}")
 async def query_process(daughter_id: int):
@@ -744,6 +1082,71 @@ async def query_by_uuid(spawn_uuid: str):
         session.close()
 
 
+async def _follow_output(spawn_uuid: str, from_start: bool) -> AsyncIterator[str]:
+    paths = _spool_paths(spawn_uuid)
+    offsets = {name: 0 for name in paths}
+    if not from_start:
+        for name, path in paths.items():
+            try:
+                offsets[name] = max(0, os.path.getsize(path) - OUTPUT_TAIL_BYTES)
+            except OSError:
+                pass
+    decoders = {name: codecs.getincrementaldecoder("utf-8")("replace") for name in paths}
+    current = _LIVE_OUTPUT.get(spawn_uuid)
+    last = current
+    while True:
+        live = _LIVE_OUTPUT.get(spawn_uuid)
+        if live is not None and live is not current:
+            if current is not None:
+                # Retry: the spool files were rewritten from the start
+                offsets = {name: 0 for name in paths}
+                decoders = {name: codecs.getincrementaldecoder("utf-8")("replace") for name in paths}
+                yield f"event: attempt\ndata: {json.dumps({'attempt': live.attempt})}\n\n"
+            current = last = live
+        finished = live is None
+        changed = None if finished else live.changed()
+        for name, path in paths.items():
+            try:
+                with open(path, "rb") as fh:
+                    fh.seek(offsets[name])
+                    while True:
+                        chunk = fh.read(OUTPUT_CHUNK_BYTES)
+                        if not chunk:
+                            break
+                        offsets[name] += len(chunk)
+                        text = decoders[name].decode(chunk)
+                        if text:
+                            yield f"event: {name}\ndata: {json.dumps({'text': text})}\n\n"
+            except FileNotFoundError:
+                pass
+        if finished:
+            end = {"exit_code": None, "status": None}
+            if last is not None:
+                end = {"exit_code": last.exit_code, "status": last.status}
+            yield f"event: end\ndata: {json.dumps(end)}\n\n"
+            return
+        try:
+            await asyncio.wait_for(changed.wait(), 1.0)
+        except asyncio.TimeoutError:
+            pass
+
+
+@app.get("/process/uuid/{spawn_uuid}/output")
+async def stream_output(spawn_uuid: str, from_start: bool = False):
+    """Live tail of a spawn's stdout/stderr as server-sent events.
+
+    Starts from the last OUTPUT_TAIL_BYTES of each stream (or the beginning
+    with from_start=true) and follows the spool files until the spawn ends.
+    """
+    if spawn_uuid not in _LIVE_OUTPUT and not any(
+        os.path.exists(p) for p in _spool_paths(spawn_uuid).values()
+    ):
+        raise HTTPException(status_code=404, detail=f"no output for {spawn_uuid}")
+    return StreamingResponse(
+        _follow_output(spawn_uuid, from_start), media_type="text/event-stream"
+    )
+
+
 @app.delete("/kill/{daughter_id}")
 async def kill_daughter(daughter_id: int):
     """Kill/terminate a spawned daughter process."""
@@ -801,6 +1204,16 @@ async def spawn(req: SpawnRequest, background_tasks: BackgroundTasks):
     if req.cmd is None:
         req.cmd = ""
 
+    if req.cmd:
+        try:
+            _spawn_pool.check_admission()
+        except PoolSaturated as exc:
+            raise HTTPException(
+                status_code=503,
+                detail=f"spawner_saturated: {exc}",
+                headers={"Retry-After": "5"},
+            ) from exc
+
     spawn_uuid = str(uuid.uuid4())  # P0-1: Generate UUID early
     session = get_session("vx11")
     try:
@@ -838,6 +1251,7 @@ async def spawn(req: SpawnRequest, background_tasks: BackgroundTasks):
             req.auto_retry,
             req.mutation_level,
             req.task_type,
+            req.priority,
         )
 
     _log_spawn_event(
@@ -0,0 +1,248 @@
+"""Outbound queue for spawner -> madre completion notifications."""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+log = logging.getLogger("spawner.notifier")
+
+
+class _Notification:
+    def __init__(
+        self,
+        key: str,
+        daughter_id: int,
+        status: str,
+        payload: Dict[str, Any],
+        attempts: int = 0,
+        created_at: Optional[float] = None,
+    ):
+        self.key = key
+        self.daughter_id = daughter_id
+        self.status = status
+        self.payload = payload
+        self.attempts = attempts
+        self.created_at = created_at or time.time()
+        self.next_at = 0.0  # monotonic; 0 = send now
+        self.in_flight = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "key": self.key,
+            "daughter_id": self.daughter_id,
+            "status": self.status,
+            "payload": self.payload,
+            "attempts": self.attempts,
+            "created_at": self.created_at,
+        }
+
+
+class MadreNotifier:
+    """
+    Delivers daughter completion/failure notifications to madre off the spawn path.
+
+    enqueue() only records the notification. A background sender posts it over
+    one pooled AsyncClient; a newer notification for the same spawn (keyed on
+    payload["spawn_uuid"], else the daughter id) replaces a pending one. The
+    request trace_id is not used as the key: one trace can cover several
+    daughters, each with its own madre endpoint. Failures (network errors, 5xx,
+    408/429) are retried with exponential backoff and jitter until max_age_s.
+    Undelivered notifications are kept in outbox_path so they survive restarts.
+    """
+
+    def __init__(
+        self,
+        endpoint_for: Callable[[int, str], str],
+        outbox_path: Optional[str] = None,
+        max_in_flight: int = 8,
+        base_delay_s: float = 0.5,
+        max_delay_s: float = 60.0,
+        max_age_s: float = 86400.0,
+        max_pending: int = 10000,
+        timeout_s: float = 10.0,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        self.endpoint_for = endpoint_for
+        self.outbox_path = outbox_path
+        self.max_in_flight = max(1, max_in_flight)
+        self.base_delay_s = base_delay_s
+        self.max_delay_s = max_delay_s
+        self.max_age_s = max_age_s
+        self.max_pending = max_pending
+        self.timeout_s = timeout_s
+        self.sent = 0
+        self.retries = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self._client = client
+        self._owns_client = client is None
+        self._pending: "OrderedDict[str, _Notification]" = OrderedDict()
+        self._dirty = False
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def enqueue(self, daughter_id: int, status: str, payload: Dict[str, Any]) -> None:
+        """Queue a notification; never blocks on madre."""
+        key = str(payload.get("spawn_uuid") or daughter_id)
+        if key in self._pending:
+            self.coalesced += 1
+            del self._pending[key]
+        self._pending[key] = _Notification(key, daughter_id, status, payload)
+        while len(self._pending) > self.max_pending:
+            self._pending.popitem(last=False)
+            self.dropped += 1
+        self._dirty = True
+        self._wakeup.set()
+
+    def start(self) -> None:
+        """Load the persisted outbox and start the sender on the running loop."""
+        if self._task is not None and not self._task.done():
+            return
+        self._wakeup = asyncio.Event()
+        for item in self._load():
+            if item.key not in self._pending:
+                self._pending[item.key] = item
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout_s,
+                limits=httpx.Limits(
+                    max_connections=self.max_in_flight,
+                    max_keepalive_connections=self.max_in_flight,
+                ),
+            )
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop sending; whatever is still pending stays in the outbox."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for item in self._pending.values():
+            item.in_flight = False
+        await asyncio.to_thread(self._save)
+        if self._owns_client and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": len(self._pending),
+            "sent": self.sent,
+            "retries": self.retries,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "oldest_age_s": (
+                round(time.time() - min(n.created_at for n in self._pending.values()), 1)
+                if self._pending
+                else None
+            ),
+        }
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.max_delay_s, self.base_delay_s * (2 ** (attempts - 1)))
+        return random.uniform(delay / 2, delay)
+
+    async def _deliver(self, item: _Notification) -> None:
+        item.in_flight = True
+        try:
+            resp = await self._client.post(
+                self.endpoint_for(item.daughter_id, item.status), json=item.payload
+            )
+            delivered = resp.status_code < 500 and resp.status_code not in (408, 429)
+            if delivered and resp.status_code >= 400:
+                log.warning(f"madre rejected notification {item.key}: {resp.status_code}")
+        except Exception as e:
+            delivered = False
+            log.debug(f"madre notification {item.key} failed: {e}")
+        finally:
+            item.in_flight = False
+
+        current = self._pending.get(item.key)
+        if delivered:
+            self.sent += 1
+            if current is item:
+                del self._pending[item.key]
+                self._dirty = True
+            return
+        self.retries += 1
+        item.attempts += 1
+        if time.time() - item.created_at > self.max_age_s:
+            if current is item:
+                del self._pending[item.key]
+                self.dropped += 1
+            log.error(f"madre notification {item.key} dropped after {item.attempts} attempts")
+        else:
+            item.next_at = time.monotonic() + self._backoff(item.attempts)
+        self._dirty = True
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            if self._dirty:
+                self._dirty = False
+                try:
+                    await asyncio.to_thread(self._save)
+                except Exception as e:
+                    log.error(f"madre outbox save failed: {e}")
+            now = time.monotonic()
+            waiting = [n for n in self._pending.values() if not n.in_flight]
+            due = [n for n in waiting if n.next_at <= now][: self.max_in_flight]
+            if due:
+                await asyncio.gather(*(self._deliver(n) for n in due))
+                continue
+            timeout = min((n.next_at for n in waiting), default=None)
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), None if timeout is None else max(0.0, timeout - now)
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    def _save(self) -> None:
+        if not self.outbox_path:
+            return
+        items = [n.to_dict() for n in list(self._pending.values())]
+        if not items:
+            if os.path.exists(self.outbox_path):
+                os.remove(self.outbox_path)
+            return
+        os.makedirs(os.path.dirname(self.outbox_path) or ".", exist_ok=True)
+        tmp = f"{self.outbox_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"notifications": items}, fh)
+        os.replace(tmp, self.outbox_path)
+
+    def _load(self) -> List[_Notification]:
+        if not self.outbox_path or not os.path.exists(self.outbox_path):
+            return []
+        try:
+            with open(self.outbox_path, "r", encoding="utf-8") as fh:
+                items = json.load(fh).get("notifications", [])
+            return [
+                _Notification(
+                    i["key"],
+                    i["daughter_id"],
+                    i["status"],
+                    i["payload"],
+                    attempts=i.get("attempts", 0),
+                    created_at=i.get("created_at"),
+                )
+                for i in items
+            ]
+        except Exception as e:
+            log.error(f"madre outbox unreadable, ignoring: {e}")
+            return []
@@ -0,0 +1,166 @@
+"""Bounded execution pool with priority queueing and host-load admission."""
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Tuple
+
+import psutil
+
+
+class PoolSaturated(Exception):
+    """The pool cannot take (or could not start in time) another daughter."""
+
+
+def host_load() -> Tuple[float, float]:
+    """(cpu_percent, memory_percent) of the host; cpu since the previous call."""
+    return psutil.cpu_percent(interval=None), psutil.virtual_memory().percent
+
+
+class SpawnPool:
+    """
+    Caps how many daughters run at once.
+
+    Callers wait for a slot in priority order (lower number first, FIFO within
+    a priority). A slot is only handed out while the host is below the CPU and
+    memory thresholds, except when nothing is running, so the pool always
+    makes progress. submit-time rejection (queue full) and wait timeouts raise
+    PoolSaturated; both are counted in stats().
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        max_queue: int = 100,
+        max_wait_s: float = 300.0,
+        cpu_max_percent: float = 90.0,
+        mem_max_percent: float = 90.0,
+        recheck_s: float = 0.5,
+        load_probe: Callable[[], Tuple[float, float]] = host_load,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max_queue
+        self.max_wait_s = max_wait_s
+        self.cpu_max_percent = cpu_max_percent
+        self.mem_max_percent = mem_max_percent
+        self.recheck_s = recheck_s
+        self.load_probe = load_probe
+        self.running = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.wait_timeouts = 0
+        self.load_deferrals = 0
+        self.last_load: Optional[Tuple[float, float]] = None
+        self._queue: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._recheck: Optional[asyncio.TimerHandle] = None
+        self._waits_ms: Deque[float] = deque(maxlen=500)
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    @property
+    def saturated(self) -> bool:
+        """True when a new request would be rejected right away."""
+        return self.running >= self.max_concurrency and self.queued >= self.max_queue
+
+    def check_admission(self) -> None:
+        """Fast rejection for new work; raises PoolSaturated when the queue is full."""
+        if self.saturated:
+            self.rejected += 1
+            raise PoolSaturated(f"queue_full ({self.queued} waiting)")
+
+    async def acquire(self, priority: int = 5) -> float:
+        """Wait for a slot; returns the seconds spent waiting."""
+        self.check_admission()
+        started = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority, next(self._seq), future))
+        self._dispatch()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.max_wait_s)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as exc:
+            if future.done() and not future.cancelled():
+                self.release()  # granted just as we gave up
+            self._discard(future)
+            if isinstance(exc, asyncio.CancelledError):
+                raise
+            self.wait_timeouts += 1
+            raise PoolSaturated(f"no slot after {self.max_wait_s:.0f}s")
+        waited = time.monotonic() - started
+        self._waits_ms.append(waited * 1000)
+        return waited
+
+    def release(self) -> None:
+        self.running = max(0, self.running - 1)
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, priority: int = 5) -> AsyncIterator[float]:
+        waited = await self.acquire(priority)
+        try:
+            yield waited
+        finally:
+            self.release()
+
+    def _discard(self, future: asyncio.Future) -> None:
+        if not future.done():
+            future.cancel()
+        self._queue = [entry for entry in self._queue if entry[2] is not future]
+        heapq.heapify(self._queue)
+
+    def _load_ok(self) -> bool:
+        try:
+            self.last_load = self.load_probe()
+        except Exception:
+            return True
+        cpu, mem = self.last_load
+        return cpu < self.cpu_max_percent and mem < self.mem_max_percent
+
+    def _dispatch(self) -> None:
+        if self._recheck is not None:
+            self._recheck.cancel()
+            self._recheck = None
+        while self._queue and self.running < self.max_concurrency:
+            if self.running > 0 and not self._load_ok():
+                # Host is busy: look again shortly instead of forking now
+                self.load_deferrals += 1
+                self._recheck = asyncio.get_running_loop().call_later(
+                    self.recheck_s, self._dispatch
+                )
+                return
+            _priority, _seq, future = heapq.heappop(self._queue)
+            if future.done():
+                continue
+            self.running += 1
+            self.admitted += 1
+            future.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        waits = sorted(self._waits_ms)
+
+        def pct(p: float) -> Optional[float]:
+            if not waits:
+                return None
+            return round(waits[min(len(waits) - 1, int(p * len(waits)))], 1)
+
+        return {
+            "running": self.running,
+            "queued": self.queued,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "wait_timeouts": self.wait_timeouts,
+            "load_deferrals": self.load_deferrals,
+            "wait_ms": {"p50": pct(0.5), "p95": pct(0.95), "max": pct(1.0)},
+            "host_load": (
+                {"cpu_percent": self.last_load[0], "memory_percent": self.last_load[1]}
+                if self.last_load
+                else None
+            ),
+        }
@@ -843,9 +843,65 @@ async def core_intent(
         )
 
 
+_SPAWN_RESULT_COLUMNS = (
+    "uuid, name, status, exit_code, stdout, stderr, created_at, started_at, ended_at"
+)
+_SPAWN_TERMINAL_STATUSES = {"completed", "done", "failed", "error", "timeout"}
+_spawn_db_conns: Dict[str, Any] = {}
+
+
+def _spawn_db():
+    """Conexión sqlite reutilizada (solo lectura de spawns) por ruta de BD."""
+    import sqlite3
+
+    db_path = os.environ.get("DATABASE_PATH", "data/runtime/vx11.db")
+    conn = _spawn_db_conns.get(db_path)
+    if conn is None:
+        if not Path(db_path).exists():
+            raise HTTPException(
+                status_code=404, detail="Spawn not found (DB unavailable)"
+            )
+        conn = sqlite3.connect(db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        _spawn_db_conns[db_path] = conn
+    return conn
+
+
+def _lookup_spawn(result_id: str):
+    """
+    Resolver spawn-* con lookups indexados: spawns.name exacto
+    (ix_spawns_name), luego uuid exacto y, como último recurso, prefijo de
+    uuid como rango sobre el índice único (sin LIKE).
+    """
+    conn = _spawn_db()
+    row = conn.execute(
+        f"SELECT {_SPAWN_RESULT_COLUMNS} FROM spawns WHERE name = ?", (result_id,)
+    ).fetchone()
+    if row:
+        return row
+
+    prefix = result_id[len("spawn-") :]
+    row = conn.execute(
+        f"SELECT {_SPAWN_RESULT_COLUMNS} FROM spawns WHERE uuid = ?", (prefix,)
+    ).fetchone()
+    if row or not prefix:
+        return row
+
+    rows = conn.execute(
+        f"SELECT {_SPAWN_RESULT_COLUMNS} FROM spawns WHERE uuid >= ? AND uuid < ? LIMIT 2",
+        (prefix, prefix + "\uffff"),
+    ).fetchall()
+    if len(rows) > 1:
+        raise HTTPException(
+            status_code=400, detail="Ambiguous spawn_id (multiple matches)"
+        )
+    return rows[0] if rows else None
+
+
 @app.get("/vx11/result/{result_id}")
 async def vx11_result_NEW_HANDLER_2025(
     result_id: str,
+    wait: float = 0.0,
     _: bool = Depends(token_guard),
 ):
     """
@@ -854,53 +910,33 @@ async def vx11_result_NEW_HANDLER_2025(
     INVARIANT:
     - If result_id starts with 'spawn-' → resolve from spawns table (real spawn result)
     - Otherwise → proxy to madre for correlation_id lookup
+    - ?wait=N long-polls up to N seconds for a terminal state (madre wakes
+      the request when the result is written)
 
     Returns:
     - For spawn-* IDs: SpawnResult with status, exit_code, stdout, stderr
     - For UUID/correlation_id: CoreResultQuery from madre
     """
+    wait = min(max(wait, 0.0), settings.madre_result_wait_max_s)
     try:
         write_log("tentaculo_link", f"result:handler_called:result_id={result_id}")
 
         # SPAWN PATH: resolve from BD
         if result_id.startswith("spawn-"):
             write_log("tentaculo_link", f"result:spawn_path:{result_id}")
-            import sqlite3
-            from pathlib import Path
 
-            db_path = Path(os.environ.get("DATABASE_PATH", "data/runtime/vx11.db"))
-            if not db_path.exists():
-                raise HTTPException(
-                    status_code=404, detail="Spawn not found (DB unavailable)"
-                )
-
-            conn = sqlite3.connect(str(db_path))
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-
-            # Try exact name match first (preferred)
-            cursor.execute(
-                "SELECT uuid, name, status, exit_code, stdout, stderr, created_at, started_at, ended_at FROM spawns WHERE name = ?",
-                (result_id,),
-            )
-            row = cursor.fetchone()
-
-            # Fallback: prefix match on uuid (strip 'spawn-')
-            if not row:
-                prefix = result_id[len("spawn-") :]
-                cursor.execute(
-                    "SELECT uuid, name, status, exit_code, stdout, stderr, created_at, started_at, ended_at FROM spawns WHERE uuid LIKE ?",
-                    (f"{prefix}%",),
-                )
-                rows = cursor.fetchall()
-                if len(rows) > 1:
-                    conn.close()
-                    raise HTTPException(
-                        status_code=400, detail="Ambiguous spawn_id (multiple matches)"
-                    )
-                row = rows[0] if rows else None
+            # Spawner escribe en BD sin notificar: re-consulta indexada con backoff
+            deadline = time.monotonic() + wait
+            delay = 0.05
+            row = _lookup_spawn(result_id)
+            while (
+                time.monotonic() < deadline
+                and (row is None or (row["status"] or "").lower() not in _SPAWN_TERMINAL_STATUSES)
+            ):
+                await asyncio.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+                delay = min(delay * 2, 1.0)
+                row = _lookup_spawn(result_id)
 
-            conn.close()
             if not row:
                 raise HTTPException(status_code=404, detail="Spawn not found")
 
@@ -936,11 +972,12 @@ async def vx11_result_NEW_HANDLER_2025(
 
         # CORRELATION_ID PATH: proxy to madre
         else:
-            async with httpx.AsyncClient(timeout=15.0) as client:
+            async with httpx.AsyncClient(timeout=15.0 + wait) as client:
                 resp = await client.get(
                     f"http://madre:8001/vx11/result/{result_id}",
+                    params={"wait": wait} if wait else None,
                     headers=AUTH_HEADERS,
-                    timeout=15.0,
+                    timeout=15.0 + wait,
                 )
 
                 if resp.status_code == 200:
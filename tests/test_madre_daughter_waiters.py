@@ -0,0 +1,94 @@
+"""Tests for event-driven daughter completion with DB polling fallback."""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from config.db_schema import Base, Daughter as DBDaughter, DaughterTask
+from madre import daughters as daughters_module
+from madre.daughters import Daughter, DaughterManager
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'vx11.db'}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(daughters_module, "get_session", lambda name="vx11": factory())
+    return factory
+
+
+def _running(manager, ttl_seconds=300, spawn_uuid="spawn-1", spawner_id=7):
+    daughter = Daughter("job", "generic", {}, ttl_seconds=ttl_seconds)
+    daughter.status = "running"
+    daughter.started_at = datetime.utcnow()
+    daughter.spawn_uuid = spawn_uuid
+    manager.daughters[daughter.id] = daughter
+    manager._aliases[str(spawner_id)] = daughter.id
+    manager._aliases[spawn_uuid] = daughter.id
+    return daughter
+
+
+@pytest.mark.asyncio
+async def test_waiter_wakes_on_spawner_notification():
+    manager = DaughterManager(poll_fallback_interval=60)
+    daughter = _running(manager)
+    waiter = asyncio.create_task(manager.wait_for_daughter(daughter.id, timeout=10))
+    await asyncio.sleep(0.05)
+
+    start = time.perf_counter()
+    # Spawner notifies with its own integer daughter id
+    assert await manager.complete_daughter(7, {"exit_code": 0})
+    record = await waiter
+
+    assert time.perf_counter() - start < 0.5
+    assert record["status"] == "completed" and record["result"] == {"exit_code": 0}
+    assert manager._waiters == {}
+
+
+@pytest.mark.asyncio
+async def test_failure_wakes_every_waiter():
+    manager = DaughterManager(poll_fallback_interval=60)
+    daughter = _running(manager)
+    waiters = [asyncio.create_task(manager.wait_for_daughter("spawn-1", timeout=10)) for _ in range(3)]
+    await asyncio.sleep(0.05)
+    await manager.fail_daughter(daughter.id, "boom")
+
+    assert [r["error"] for r in await asyncio.gather(*waiters)] == ["boom"] * 3
+    assert (await manager.wait_for_daughter(daughter.id, timeout=0))["status"] == "failed"
+
+
+@pytest.mark.asyncio
+async def test_fallback_poll_recovers_lost_notification(session_factory):
+    with session_factory() as db:
+        task = DaughterTask(source="spawner", task_type="long", status="running")
+        db.add(task)
+        db.flush()
+        db.add(DBDaughter(task_id=task.id, name="hija", status="failed",
+                          error_last="exit 2", spawn_uuid="spawn-lost"))
+        db.commit()
+
+    manager = DaughterManager(poll_fallback_interval=0.05)
+    daughter = _running(manager, spawn_uuid="spawn-lost")
+    record = await asyncio.wait_for(manager.wait_for_daughter(daughter.id, timeout=5), 1)
+    assert record["status"] == "failed" and record["error"] == "exit 2"
+
+
+@pytest.mark.asyncio
+async def test_ttl_expiry_and_timeout(session_factory):
+    manager = DaughterManager(poll_fallback_interval=60)
+    daughter = _running(manager, ttl_seconds=1)
+    daughter.started_at = datetime.utcnow() - timedelta(seconds=0.9)
+    record = await asyncio.wait_for(manager.wait_for_daughter(daughter.id, timeout=5), 1)
+    assert record["status"] == "expired"
+
+    other = _running(manager, spawn_uuid="spawn-2", spawner_id=8)
+    assert await manager.wait_for_daughter(other.id, timeout=0.05) is None
+    assert await manager.wait_for_daughter("unknown", timeout=1) is None
+    assert manager._waiters == {}
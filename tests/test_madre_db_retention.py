@@ -0,0 +1,80 @@
+"""Tests for batched DB retention cleanup in madre.power_saver."""
+
+import json
+import sqlite3
+
+import pytest
+
+from madre import power_saver
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "vx11.db"
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute(
+        "CREATE TABLE routing_events (id INTEGER PRIMARY KEY, timestamp DATETIME, trace_id TEXT)"
+    )
+    conn.execute(
+        "CREATE TABLE cli_usage_stats (id INTEGER PRIMARY KEY, timestamp DATETIME, provider_id TEXT)"
+    )
+    old = [(f"2000-01-01 00:00:{i % 60:02d}", f"old-{i}") for i in range(1050)]
+    new = [("2999-01-01 00:00:00", f"new-{i}") for i in range(5)]
+    conn.executemany("INSERT INTO routing_events (timestamp, trace_id) VALUES (?, ?)", old + new)
+    conn.executemany("INSERT INTO cli_usage_stats (timestamp, provider_id) VALUES (?, ?)", old[:7])
+    conn.commit()
+    conn.close()
+    return str(path)
+
+
+def _count(db_path, table):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(f"SELECT COUNT(1) FROM {table}").fetchone()[0]
+
+
+def test_plan_only_does_not_delete(db_path, tmp_path):
+    res = power_saver.db_retention_cleanup(str(tmp_path / "out"), apply=False, db_path=db_path)
+    assert res["status"] == "planned"
+    plan = json.loads(open(res["plan_path"]).read())
+    action = next(a for a in plan["actions"] if a["table"] == "routing_events")
+    assert action["rows_eligible"] == 1050 and "LIMIT 500" in action["delete_sql"]
+    assert _count(db_path, "routing_events") == 1055
+
+
+def test_apply_deletes_in_batches_and_checkpoints_passively(db_path, tmp_path):
+    out = tmp_path / "out"
+    res = power_saver.db_retention_cleanup(
+        str(out), apply=True, db_path=db_path, batch_size=100, pause_s=0
+    )
+    assert res["status"] == "applied"
+    result = json.loads(open(res["result_path"]).read())
+
+    tables = {t["table"]: t for t in result["tables"]}
+    routing = tables["routing_events"]
+    assert routing["deleted"] == 1050 and routing["batches"] == 11 and routing["complete"]
+    assert routing["rows_after"] == 5
+    assert tables["cli_usage_stats"]["deleted"] == 7
+    assert result["complete"] and result["checkpoint"] is not None
+    assert (out / "db_retention_progress.json").exists()
+
+    assert _count(db_path, "routing_events") == 5
+    assert _count(db_path, "cli_usage_stats") == 0
+    with sqlite3.connect(db_path) as conn:
+        indexes = {r[1] for r in conn.execute("PRAGMA index_list(routing_events)")}
+    assert "idx_routing_events_timestamp" in indexes
+
+
+def test_time_budget_leaves_work_for_next_run(db_path, tmp_path):
+    res = power_saver.db_retention_cleanup(
+        str(tmp_path / "a"), apply=True, db_path=db_path, batch_size=100, pause_s=0, max_seconds=1e-9
+    )
+    result = json.loads(open(res["result_path"]).read())
+    assert not result["complete"]
+    assert _count(db_path, "routing_events") == 1055
+
+    res = power_saver.db_retention_cleanup(
+        str(tmp_path / "b"), apply=True, db_path=db_path, batch_size=100, pause_s=0
+    )
+    assert json.loads(open(res["result_path"]).read())["complete"]
+    assert _count(db_path, "routing_events") == 5
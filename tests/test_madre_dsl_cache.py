@@ -0,0 +1,91 @@
+"""Tests for precompiled DSL parsing and the compiled-plan cache."""
+
+import pytest
+
+from madre.dsl_compiler import VX11DSLCompiler
+from madre.dsl_parser import VX11Domain, VX11DSLParser, normalize_intent_text
+
+
+@pytest.fixture
+def parser():
+    return VX11DSLParser()
+
+
+@pytest.mark.parametrize(
+    "text, domain, action, confidence",
+    [
+        ("crear tarea audio con archivo.mp3", VX11Domain.AUDIO, "default", 0.95),
+        ("Aplica el PATCH de drift", VX11Domain.PATCH, "apply", 0.95),
+        ("shub restore vocal", VX11Domain.AUDIO, "restore", 0.99),
+        ("hormiguero report", VX11Domain.HORMIGUERO, "report", 0.98),
+        ("run   comando cli", VX11Domain.HERMES, "execute", 0.9),
+        ("escanea el sistema", VX11Domain.SCAN, "system", 0.9),
+    ],
+)
+def test_highest_weight_domain_and_first_action_win(parser, text, domain, action, confidence):
+    intent = parser.parse(text)
+    assert (intent.domain, intent.action, intent.confidence) == (domain, action, confidence)
+    assert intent.original_text == text
+
+
+def test_equal_weights_keep_declaration_order(parser):
+    # "drift" (PATCH, 0.95) and "audio" (AUDIO, 0.95): AUDIO is declared first
+    assert parser.parse("drift audio").domain == VX11Domain.AUDIO
+    assert parser.parse("hola") is None
+
+
+def test_parameters_are_extracted_from_normalized_text(parser):
+    intent = parser.parse("Nueva  TAREA de audio con  archivo Mix.WAV prioridad 3")
+    assert intent.domain == VX11Domain.AUDIO
+    assert intent.parameters == {"file": "mix.wav", "priority": 3}
+    assert normalize_intent_text("  A \t b\nC ") == "a b c"
+
+
+def test_compile_cache_returns_independent_plans():
+    compiler = VX11DSLCompiler()
+    intent = {"domain": "TASK", "action": "create", "parameters": {"name": "t"}}
+
+    first = compiler.compile(intent)
+    first.steps[0].parameters["name"] = "mutated"
+    second = compiler.compile(dict(intent))
+
+    assert (compiler.cache_misses, compiler.cache_hits) == (1, 1)
+    assert second.workflow_id != first.workflow_id
+    assert second.steps[0].parameters["name"] == "t"
+    assert [s.depends_on for s in second.steps] == [[], [0]]
+
+    compiler.compile(intent, policy_version="v2")
+    assert compiler.cache_misses == 2
+
+
+def test_compile_text_skips_parsing_on_hit(parser, monkeypatch):
+    compiler = VX11DSLCompiler()
+    plan, errors = compiler.compile_text("Genera un parche de drift", parser)
+    assert errors == [] and plan.domain == "PATCH"
+
+    monkeypatch.setattr(parser, "parse", lambda text: pytest.fail("parsed again"))
+    again, _ = compiler.compile_text("genera   un parche de DRIFT", parser)
+    assert again.to_dict()["steps"] == plan.to_dict()["steps"]
+
+    assert compiler.compile_text("nada que ver", VX11DSLParser()) == (
+        None,
+        ["No se pudo parsear DSL text"],
+    )
+
+
+def test_cache_is_bounded_lru():
+    compiler = VX11DSLCompiler(cache_size=2)
+    intents = [{"domain": "SCAN", "action": "health", "parameters": {"n": i}} for i in range(3)]
+    compiler.compile(intents[0])
+    compiler.compile(intents[1])
+    compiler.compile(intents[0])  # refresh 0, so 1 is evicted next
+    compiler.compile(intents[2])
+
+    assert len(compiler._plan_cache) == 2
+    compiler.compile(intents[0])
+    assert compiler.cache_hits == 2
+    compiler.compile(intents[1])
+    assert compiler.cache_misses == 4
+
+    compiler.invalidate_cache()
+    assert not compiler._plan_cache
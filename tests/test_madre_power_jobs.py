@@ -0,0 +1,140 @@
+"""Tests for non-blocking power plan jobs in madre.power_manager."""
+
+import asyncio
+import json
+import sys
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from madre import power_manager
+
+STUB = """
+import sys, time
+args = sys.argv[1:]
+with open({log!r}, "a") as f:
+    f.write(" ".join(args) + "\\n")
+time.sleep(float({delay!r}))
+sys.exit(3 if "broken" in args else 0)
+"""
+
+
+@pytest.fixture
+def compose_stub(tmp_path, monkeypatch):
+    """A fake `docker compose` that logs its arguments and sleeps."""
+    log = tmp_path / "calls.log"
+    script = tmp_path / "compose_stub.py"
+    script.write_text(STUB.format(log=str(log), delay=0.3))
+    monkeypatch.setattr(power_manager, "COMPOSE_CMD", [sys.executable, str(script)])
+    monkeypatch.setattr(power_manager, "AUDIT_BASE", str(tmp_path / "audit"))
+    monkeypatch.setattr(power_manager, "MadreDB", None)
+    monkeypatch.setattr(power_manager, "_JOBS", power_manager.OrderedDict())
+    return log
+
+
+def _calls(log):
+    return [line.split()[-2:] for line in log.read_text().splitlines()]
+
+
+def _step(action, svc, timeout=30):
+    return {
+        "cmd": [*power_manager.COMPOSE_CMD, "-p", "vx11", action, svc],
+        "timeout": timeout,
+        "service": svc,
+    }
+
+
+@pytest.mark.asyncio
+async def test_services_run_concurrently_and_keep_per_service_order(compose_stub, tmp_path):
+    plan = [_step("stop", "a"), _step("stop", "a"), _step("stop", "b"), _step("stop", "c")]
+
+    start = time.perf_counter()
+    executed = await power_manager._execute_plan(str(tmp_path), plan)
+    elapsed = time.perf_counter() - start
+
+    # a: two steps in sequence; b and c alongside -> ~2 steps, not 4
+    assert elapsed < 0.3 * 4 - 0.2
+    assert [e["rc"] for e in executed] == [0, 0, 0, 0]
+    assert [e["cmd"][-1] for e in executed] == ["a", "a", "b", "c"]
+    assert (tmp_path / "cmd_3_stdout.txt").exists()
+
+
+@pytest.mark.asyncio
+async def test_every_stop_finishes_before_any_start(compose_stub, tmp_path):
+    plan = [_step("stop", "a"), _step("stop", "b"), _step("up", "c"), _step("up", "a")]
+
+    start = time.perf_counter()
+    await power_manager._execute_plan(str(tmp_path), plan)
+    elapsed = time.perf_counter() - start
+
+    # Two phases (stops, then ups), each running its services concurrently
+    assert 0.3 * 2 <= elapsed < 0.3 * 4 - 0.2
+    verbs = [call[0] for call in _calls(compose_stub)]
+    assert verbs == ["stop", "stop", "up", "up"]
+
+
+@pytest.mark.asyncio
+async def test_max_parallel_bounds_concurrency(compose_stub, tmp_path):
+    plan = [_step("stop", svc) for svc in ("a", "b", "c")]
+    start = time.perf_counter()
+    await power_manager._execute_plan(str(tmp_path), plan, max_parallel=1)
+    assert time.perf_counter() - start >= 0.3 * 3
+
+
+@pytest.mark.asyncio
+async def test_step_timeout_kills_process(tmp_path):
+    plan = [{"cmd": [sys.executable, "-c", "import time; time.sleep(30)"], "timeout": 1}]
+    start = time.perf_counter()
+    (result,) = await power_manager._execute_plan(str(tmp_path), plan)
+    assert time.perf_counter() - start < 5
+    assert result["rc"] == -1
+
+
+@pytest.mark.asyncio
+async def test_job_keeps_event_loop_responsive(compose_stub, tmp_path):
+    plan = [_step("stop", svc) for svc in ("a", "b", "broken")]
+    job = power_manager._start_job("stop", None, plan, str(tmp_path))
+
+    lag = 0.0
+    while not job.finished:
+        tick = time.perf_counter()
+        await asyncio.sleep(0.01)
+        lag = max(lag, time.perf_counter() - tick - 0.01)
+    assert lag < 0.2
+
+    state = job.to_dict()
+    assert state["status"] == "done"
+    assert state["progress"] == {"done": 3, "total": 3}
+    assert state["failed_steps"] == [2]
+    events = [e["event"] for e in job.events]
+    assert events[0] == "job_started" and events[-1] == "job_done"
+    assert events.count("step_done") == 3
+    assert json.loads((tmp_path / "job.json").read_text())["job_id"] == job.job_id
+
+
+@pytest.mark.asyncio
+async def test_endpoints_accept_and_report_job(compose_stub):
+    app = FastAPI()
+    power_manager.register_power_routes(app)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://madre") as client:
+        res = await client.post("/madre/power/mode?wait=false", json={"mode": "low_power"})
+        assert res.status_code == 202
+        job_id = res.json()["job_id"]
+
+        res = await client.get(f"/madre/power/jobs/{job_id}/events")
+        assert res.headers["content-type"].startswith("text/event-stream")
+        names = [l.split(": ", 1)[1] for l in res.text.splitlines() if l.startswith("event: ")]
+        assert names[0] == "job_started" and names[-1] == "job_done"
+
+        job = (await client.get(f"/madre/power/jobs/{job_id}")).json()["job"]
+        assert job["status"] == "done" and job["progress"]["done"] == job["progress"]["total"]
+        assert (await client.get("/madre/power/jobs")).json()["jobs"][0]["job_id"] == job_id
+        assert (await client.get("/madre/power/jobs/nope")).status_code == 404
+
+        res = await client.post("/madre/power/mode", json={"mode": "low_power"})
+        body = res.json()
+        assert body["status"] == "ok" and body["job_id"] != job_id
+        assert all(e["rc"] == 0 for e in body["executed"])
@@ -0,0 +1,94 @@
+"""Tests for the madre correlation result store and /vx11/result long-poll."""
+
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from config.db_schema import Base
+from madre.core import db as madre_db
+from madre.core.results import ResultStore
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'vx11.db'}")
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(madre_db, "get_session", lambda name="vx11": sessionmaker(bind=engine)())
+    return ResultStore(cache_ttl_s=60)
+
+
+def test_put_persists_and_terminal_results_are_cached(store, monkeypatch):
+    store.put("c1", "QUEUED", result={"task_id": "t"}, provider="spawner")
+    assert store.get("c1")["status"] == "QUEUED"
+    assert "c1" not in store._cache
+
+    store.put("c1", "done", result={"out": 1}, spawn_id="spawn-1")
+    assert store.get("c1")["status"] == "DONE"
+
+    # Served from memory without touching the DB
+    monkeypatch.setattr(madre_db.MadreDB, "get_result", staticmethod(lambda cid: pytest.fail("db hit")))
+    assert store.get("c1")["result"] == {"out": 1}
+
+
+def test_persisted_result_survives_a_new_store(store):
+    store.put("c2", "ERROR", error="boom", mode="MADRE")
+    fresh = ResultStore()
+    record = fresh.get("c2")
+    assert record["status"] == "ERROR" and record["error"] == "boom" and record["mode"] == "MADRE"
+    assert fresh.get("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_wait_wakes_when_result_is_written(store):
+    store.put("c3", "QUEUED")
+    waiter = asyncio.create_task(store.wait("c3", timeout=5))
+    await asyncio.sleep(0.05)
+    start = time.perf_counter()
+    store.put("c3", "DONE", result={"ok": True})
+
+    record = await waiter
+    assert record["status"] == "DONE"
+    assert time.perf_counter() - start < 0.5
+    assert store._waiters == {}
+
+
+@pytest.mark.asyncio
+async def test_wait_times_out_with_latest_state(store):
+    store.put("c4", "RUNNING")
+    record = await store.wait("c4", timeout=0.05)
+    assert record["status"] == "RUNNING"
+    assert await store.wait("nobody", timeout=0.01) is None
+    assert store._waiters == {}
+
+
+@pytest.mark.asyncio
+async def test_cache_entries_expire(store, monkeypatch):
+    store.cache_ttl_s = 0
+    store.put("c5", "DONE")
+    calls = []
+    original = madre_db.MadreDB.get_result
+    monkeypatch.setattr(madre_db.MadreDB, "get_result", staticmethod(lambda cid: calls.append(cid) or original(cid)))
+    assert store.get("c5")["status"] == "DONE"
+    assert calls == ["c5"]
+
+
+@pytest.mark.asyncio
+async def test_result_endpoint_long_polls_and_reports_unknown_ids(store, monkeypatch):
+    import madre.main as madre_main
+
+    monkeypatch.setattr(madre_main, "_results", store)
+
+    missing = await madre_main.vx11_result("unknown", wait=0)
+    assert missing.status_code == 404
+
+    store.put("c6", "QUEUED", provider="spawner")
+    pending = asyncio.create_task(madre_main.vx11_result("c6", wait=5))
+    await asyncio.sleep(0.05)
+    store.put("c6", "DONE", result={"stdout": "hi"}, provider="spawner")
+
+    body = await pending
+    assert body["status"] == "DONE"
+    assert body["result"] == {"stdout": "hi"}
@@ -0,0 +1,261 @@
+"""Tests for parallel DAG execution of madre plans."""
+
+import asyncio
+import time
+
+import pytest
+
+from madre.core import runner as runner_module
+from madre.core.models import (
+    DSL,
+    IntentV2,
+    ModeEnum,
+    PlanV2,
+    RiskLevel,
+    StatusEnum,
+    StepType,
+    StepV2,
+)
+from madre.core.planner import Planner
+from madre.core.runner import Runner
+from madre.dsl_compiler import (
+    ExecutorType,
+    VX11DSLCompiler,
+    WorkflowPlan,
+    WorkflowStep,
+    run_workflow_steps,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_db(monkeypatch):
+    monkeypatch.setattr(runner_module.MadreDB, "record_action", staticmethod(lambda **kw: None))
+    monkeypatch.setattr(runner_module.MadreDB, "update_task", staticmethod(lambda *a, **kw: None))
+
+
+class FakeRunner(Runner):
+    """Steps sleep for payload['delay'] and fail when payload['fail'] is set."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.active = 0
+        self.max_active = 0
+        self.order = []
+
+    async def _execute_step(self, step):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(step.payload.get("delay", 0.05))
+            if step.payload.get("fail"):
+                raise RuntimeError("boom")
+            self.order.append(step.payload["name"])
+            return {"name": step.payload["name"]}
+        finally:
+            self.active -= 1
+
+
+def _step(name, depends_on=(), **payload):
+    deps = None if depends_on is None else list(depends_on)
+    return StepV2(type=StepType.NOOP, payload={"name": name, **payload}, depends_on=deps)
+
+
+def _plan(*steps):
+    return PlanV2(intent_id="i", session_id="s", steps=list(steps))
+
+
+@pytest.mark.asyncio
+async def test_independent_steps_run_concurrently_with_timings():
+    plan = _plan(*[_step(f"s{i}", delay=0.1) for i in range(4)])
+    start = time.perf_counter()
+    plan = await FakeRunner(max_parallel=4).execute_plan(plan, "p")
+
+    assert time.perf_counter() - start < 0.3
+    assert plan.status == StatusEnum.DONE
+    assert all(s.status == StatusEnum.DONE and s.duration_ms >= 90 for s in plan.steps)
+    assert all(s.started_at is not None for s in plan.steps)
+
+
+@pytest.mark.asyncio
+async def test_parallelism_is_bounded_and_dependencies_respected():
+    a, b, c = _step("a"), _step("b"), _step("c")
+    d = _step("d", depends_on=[a.step_id, b.step_id])
+    runner = FakeRunner(max_parallel=2)
+    await runner.execute_plan(_plan(a, b, c, d), "p")
+
+    assert runner.max_active == 2
+    assert runner.order.index("d") > max(runner.order.index("a"), runner.order.index("b"))
+
+
+@pytest.mark.asyncio
+async def test_legacy_steps_without_dependencies_stay_sequential():
+    runner = FakeRunner(max_parallel=4)
+    await runner.execute_plan(_plan(*[_step(n, depends_on=None) for n in "abc"]), "p")
+    assert runner.order == ["a", "b", "c"]
+    assert runner.max_active == 1
+
+
+@pytest.mark.asyncio
+async def test_failure_only_propagates_to_dependents():
+    a = _step("a", fail=True)
+    b = _step("b", depends_on=[a.step_id])
+    c = _step("c")
+    plan = await FakeRunner().execute_plan(_plan(a, b, c), "p")
+
+    assert plan.status == StatusEnum.DONE
+    assert a.status == StatusEnum.ERROR and a.error == "boom"
+    assert b.status == StatusEnum.ERROR and b.error == f"dependency_failed:{a.step_id}"
+    assert c.status == StatusEnum.DONE
+
+
+@pytest.mark.asyncio
+async def test_blocking_waiting_step_pauses_plan():
+    first = _step("first")
+    gate = _step("gate", depends_on=None)
+    gate.blocking, gate.status = True, StatusEnum.WAITING
+    after = _step("after")
+    runner = FakeRunner()
+    plan = await runner.execute_plan(_plan(first, gate, after), "p")
+
+    assert plan.status == StatusEnum.WAITING
+    assert runner.order == ["first"]
+    assert after.status == StatusEnum.PENDING
+
+
+@pytest.mark.asyncio
+async def test_cancellation_cancels_in_flight_steps():
+    plan = _plan(_step("slow", delay=5), _step("slow2", delay=5))
+    task = asyncio.create_task(FakeRunner().execute_plan(plan, "p"))
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert all(s.status == StatusEnum.PENDING and s.started_at is None for s in plan.steps)
+
+
+@pytest.mark.asyncio
+async def test_unknown_dependency_is_reported():
+    plan = await FakeRunner().execute_plan(_plan(_step("x", depends_on=["missing"])), "p")
+    assert plan.steps[0].status == StatusEnum.ERROR
+    assert plan.steps[0].error == "unresolvable_dependencies"
+
+
+def test_compiler_infers_dependencies():
+    compiler = VX11DSLCompiler()
+
+    task = compiler.compile({"domain": "TASK", "action": "create", "parameters": {}})
+    assert [s.depends_on for s in task.steps] == [[], [0]]  # ${steps[0].task_id}
+
+    patch = compiler.compile({"domain": "PATCH", "action": "apply", "parameters": {}})
+    assert [s.depends_on for s in patch.steps] == [[], [0]]  # same executor, ordered
+    assert patch.critical_path_ms() == 15000
+    assert patch.to_dict()["steps"][1]["depends_on"] == [0]
+
+
+def test_concurrent_actions_on_same_executor_are_independent():
+    steps = [WorkflowStep(ExecutorType.SPAWNER, "spawn", {"n": i}, timeout_ms=1000) for i in range(3)]
+    VX11DSLCompiler.infer_dependencies(steps)
+    assert [s.depends_on for s in steps] == [[], [], []]
+    assert WorkflowPlan("wf", "TASK", "run", steps).critical_path_ms() == 1000
+
+
+def test_legacy_steps_count_as_sequential_in_critical_path():
+    steps = [WorkflowStep(ExecutorType.LOCAL, "noop", {}, timeout_ms=1000) for _ in range(3)]
+    assert WorkflowPlan("wf", "TASK", "run", steps).critical_path_ms() == 3000
+
+
+def test_planner_gather_step_waits_for_every_step():
+    intent = IntentV2(
+        session_id="s",
+        mode=ModeEnum.MADRE,
+        dsl=DSL(domain="general", action="query"),
+        risk=RiskLevel.LOW,
+    )
+    plan = Planner().plan(intent)
+
+    gather = plan.steps[-1]
+    assert gather.payload == {"reason": "plan_complete"}
+    assert gather.depends_on == [step.step_id for step in plan.steps[:-1]]
+
+
+@pytest.mark.asyncio
+async def test_gather_step_finishes_after_slow_sibling():
+    steps = [_step("slow", delay=0.2), _step("fast", delay=0.01)]
+    gather = StepV2(
+        type=StepType.NOOP,
+        payload={"name": "gather", "delay": 0},
+        depends_on=[s.step_id for s in steps],
+    )
+    runner = FakeRunner(max_parallel=4)
+    await runner.execute_plan(_plan(*steps, gather), "p")
+    assert runner.order == ["fast", "slow", "gather"]
+
+
+@pytest.mark.asyncio
+async def test_compiled_workflow_steps_run_by_dependencies():
+    compiler = VX11DSLCompiler()
+    plan = compiler.compile({"domain": "TASK", "action": "create", "parameters": {}})
+    plan.steps.extend(
+        WorkflowStep(ExecutorType.SPAWNER, "spawn", {"n": i}, depends_on=[]) for i in range(3)
+    )
+    active = {"now": 0, "max": 0}
+    order = []
+
+    async def run_step(idx, step):
+        active["now"] += 1
+        active["max"] = max(active["max"], active["now"])
+        await asyncio.sleep(0.05)
+        order.append(idx)
+        active["now"] -= 1
+        return {"step": idx}
+
+    start = time.perf_counter()
+    results = await run_workflow_steps(plan, run_step, max_parallel=4)
+
+    assert results == [{"step": i} for i in range(5)]
+    assert order.index(0) < order.index(1)  # enqueue waits for register_task
+    assert active["max"] == 4
+    assert time.perf_counter() - start < 0.05 * 5 - 0.05
+
+
+def _workflow(*deps):
+    steps = [WorkflowStep(ExecutorType.LOCAL, "noop", {}, depends_on=d) for d in deps]
+    return WorkflowPlan("wf", "TASK", "run", steps)
+
+
+@pytest.mark.asyncio
+async def test_workflow_and_plan_share_failure_and_cycle_semantics():
+    # 0 fails; 1 depends on 0; 2 and 3 form a cycle; 4 points at a missing step
+    workflow = _workflow([], [0], [3], [2], [9])
+    ran = []
+
+    async def run_step(idx, step):
+        ran.append(idx)
+        return {"step": idx, "status": "error" if idx == 0 else "ok"}
+
+    results = await run_workflow_steps(workflow, run_step)
+    assert ran == [0]
+    assert [r["error"] for r in results[1:]] == [
+        "dependency_failed:0",
+        "unresolvable_dependencies",
+        "unresolvable_dependencies",
+        "unresolvable_dependencies",
+    ]
+
+    steps = [_step("a", fail=True), _step("b"), _step("c"), _step("d"), _step("e")]
+    for step, deps in zip(steps, [[], [0], [3], [2], None]):
+        step.depends_on = [steps[j].step_id for j in deps] if deps is not None else ["missing"]
+    plan = await FakeRunner().execute_plan(_plan(*steps), "p")
+    assert [s.error for s in plan.steps[1:]] == [
+        f"dependency_failed:{steps[0].step_id}",
+        "unresolvable_dependencies",
+        "unresolvable_dependencies",
+        "unresolvable_dependencies",
+    ]
+
+
+def test_critical_path_ignores_cycles_and_forward_references():
+    workflow = _workflow([1], [], [2])
+    for step in workflow.steps:
+        step.timeout_ms = 1000
+    assert workflow.critical_path_ms() == 2000
@@ -0,0 +1,229 @@
+"""Tests for the madre intent unit of work and the write-behind queue."""
+
+import asyncio
+import threading
+
+import httpx
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from config.db_schema import Base, CLIUsageStat, Context, IntentLog, RoutingEvent, Task
+from madre.core import db as madre_db
+from madre.core.db import MadreDB
+from madre.core.results import ResultStore
+from madre.core.write_behind import WriteBehindQueue
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'vx11.db'}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(engine)
+    engine.commits = 0
+
+    @event.listens_for(engine, "commit")
+    def _count(conn):
+        engine.commits += 1
+
+    monkeypatch.setattr(madre_db, "get_session", lambda name="vx11": sessionmaker(bind=engine)())
+    return engine
+
+
+def _rows(engine, model):
+    with sessionmaker(bind=engine)() as db:
+        return db.query(model).all()
+
+
+def test_unit_of_work_writes_everything_in_one_commit(engine):
+    uow = MadreDB.unit_of_work()
+    uow.log_intent("tentaculo_link", {"text": "hi"}, result_status="processing")
+    uow.create_task("t1", "vx11_spawner_task", "madre", "spawn", status="queued")
+    uow.set_context("t1", "spawn:payload", {"cmd": "ls"})
+    uow.close_intent("spawner_queued", notes="spawner_task_id:t1")
+    uow.upsert_result("c1", "QUEUED", result={"task_id": "t1"}, provider="spawner")
+    assert engine.commits == 0
+
+    intent_log_id = uow.commit()
+    assert engine.commits == 1
+    (entry,) = _rows(engine, IntentLog)
+    assert entry.id == intent_log_id
+    assert entry.result_status == "spawner_queued" and entry.processed_by_madre_at is not None
+    assert _rows(engine, Task)[0].status == "queued"
+    assert _rows(engine, Context)[0].value == '{"cmd": "ls"}'
+    assert MadreDB.get_result("c1")["provider"] == "spawner"
+
+    # Nothing left staged
+    assert not uow.pending and uow.commit() == intent_log_id
+    assert engine.commits == 1
+
+
+def test_failed_commit_rolls_back_and_keeps_staging(engine):
+    uow = MadreDB.unit_of_work()
+    uow.log_intent("tentaculo_link", {"text": "hi"})
+    uow.create_task("dup", "a", "madre", "spawn")
+    uow.create_task("dup", "b", "madre", "spawn")
+    with pytest.raises(Exception):
+        uow.commit()
+    assert _rows(engine, IntentLog) == [] and uow.pending
+
+
+def test_result_store_stages_into_unit_of_work(engine):
+    store = ResultStore()
+    uow = MadreDB.unit_of_work()
+    store.put("c2", "DONE", result={"ok": True}, uow=uow)
+    # Not visible (cache or DB) until the unit of work commits
+    assert store.get("c2") is None and "c2" not in store._cache
+    uow.commit()
+    assert MadreDB.get_result("c2")["result"] == {"ok": True}
+    assert "c2" in store._cache
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_woken_only_after_a_successful_commit(engine):
+    store = ResultStore()
+    waiter = asyncio.create_task(store.wait("c3", timeout=5))
+    await asyncio.sleep(0)
+
+    uow = MadreDB.unit_of_work()
+    uow.create_task("dup", "a", "madre", "spawn")
+    uow.create_task("dup", "b", "madre", "spawn")
+    store.put("c3", "DONE", result={"ok": True}, uow=uow)
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+
+    with pytest.raises(Exception):
+        uow.commit()
+    await asyncio.sleep(0.01)
+    assert not waiter.done() and "c3" not in store._cache
+
+    # The error path overwrites the staged result and commits it
+    uow._tasks = []
+    store.put("c3", "ERROR", error="boom", uow=uow)
+    uow.commit()
+    record = await asyncio.wait_for(waiter, 1)
+    assert record["status"] == "ERROR"
+    assert MadreDB.get_result("c3")["status"] == "ERROR"
+
+
+@pytest.mark.asyncio
+async def test_write_behind_batches_rows(engine):
+    queue = WriteBehindQueue(batch_size=3, interval_s=60)
+    for i in range(5):
+        queue.routing_event(f"trace-{i}", "intent_delegation", "switch")
+    queue.cli_usage_stat("switch", True, 12)
+    assert engine.commits == 0 and len(queue) == 6
+
+    assert await queue.flush() == 6
+    assert engine.commits == 2
+    assert len(_rows(engine, RoutingEvent)) == 5
+    assert _rows(engine, CLIUsageStat)[0].latency_ms == 12
+
+
+@pytest.mark.asyncio
+async def test_write_behind_flusher_drops_oldest_and_drains_on_stop(engine):
+    queue = WriteBehindQueue(batch_size=2, interval_s=60)
+    queue.start()
+    for i in range(4):
+        queue.routing_event(f"trace-{i}", "provider_call", "p")
+    await asyncio.sleep(0.1)  # a full batch wakes the flusher early
+    assert queue.dropped == 0 and len(_rows(engine, RoutingEvent)) >= 2
+
+    await queue.stop()
+    assert len(queue) == 0
+    assert [r.trace_id for r in _rows(engine, RoutingEvent)] == [f"trace-{i}" for i in range(4)]
+
+    with pytest.raises(ValueError):
+        queue.enqueue("unknown")
+    queue.max_pending = 3
+    for i in range(5):
+        queue.cli_usage_stat("p", False, i)
+    assert queue.dropped == 2 and len(queue) == 3
+
+
+def _gated_insert(monkeypatch, fail=False):
+    """Block MadreDB.insert_observations until released; returns (entered, release)."""
+    entered, release = threading.Event(), threading.Event()
+    insert = MadreDB.insert_observations
+
+    def gated(rows):
+        entered.set()
+        release.wait(5)
+        if fail:
+            raise RuntimeError("db down")
+        return insert(rows)
+
+    monkeypatch.setattr(MadreDB, "insert_observations", staticmethod(gated))
+    return entered, release
+
+
+@pytest.mark.asyncio
+async def test_write_behind_stop_waits_for_in_flight_flush(engine, monkeypatch):
+    entered, release = _gated_insert(monkeypatch)
+    queue = WriteBehindQueue(batch_size=2, interval_s=60)
+    queue.start()
+    for i in range(3):
+        queue.routing_event(f"trace-{i}", "provider_call", "p")
+    assert await asyncio.to_thread(entered.wait, 5)
+
+    stopping = asyncio.create_task(queue.stop())
+    await asyncio.sleep(0.05)
+    assert not stopping.done()
+    release.set()
+    await stopping
+
+    assert queue.written == 3 and len(queue) == 0
+    assert [r.trace_id for r in _rows(engine, RoutingEvent)] == [f"trace-{i}" for i in range(3)]
+
+
+@pytest.mark.asyncio
+async def test_write_behind_failed_flush_respects_max_pending(engine, monkeypatch):
+    entered, release = _gated_insert(monkeypatch, fail=True)
+    queue = WriteBehindQueue(batch_size=2, interval_s=60, max_pending=3)
+    queue.cli_usage_stat("p", False, 0)
+    queue.cli_usage_stat("p", False, 1)
+
+    flushing = asyncio.create_task(queue.flush())
+    assert await asyncio.to_thread(entered.wait, 5)
+    for i in range(2, 5):
+        queue.cli_usage_stat("p", False, i)
+    release.set()
+    assert await flushing == 0
+
+    # The failed batch went back in front, then the oldest rows were dropped
+    assert queue.dropped == 2
+    assert [fields["latency_ms"] for _, fields in queue._pending] == [2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_vx11_intent_commits_once(engine, monkeypatch):
+    import madre.main as madre_main
+
+    monkeypatch.setattr(madre_main, "_results", ResultStore())
+    monkeypatch.setattr(madre_main, "_observations", WriteBehindQueue(interval_s=60))
+
+    req = madre_main.CoreMVPIntentRequest(intent_type="spawn", text="x", require={"spawner": True})
+    body = await madre_main.vx11_intent(req)
+    assert body["status"] == "queued"
+    assert engine.commits == 1
+    assert _rows(engine, IntentLog)[0].result_status == "spawner_queued"
+    assert len(_rows(engine, Context)) == 2
+
+    def switch(request):
+        return httpx.Response(200, json={"provider": "deepseek", "reasoning": "r"})
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        madre_main.httpx,
+        "AsyncClient",
+        lambda **kw: real_client(transport=httpx.MockTransport(switch), **kw),
+    )
+    body = await madre_main.vx11_intent(
+        madre_main.CoreMVPIntentRequest(intent_type="chat", text="y", require={"switch": True})
+    )
+    assert body["provider"] == "deepseek"
+    assert engine.commits == 2
+    assert len(madre_main._observations) == 2
+    await madre_main._observations.flush()
+    assert _rows(engine, RoutingEvent)[0].provider_id == "deepseek"
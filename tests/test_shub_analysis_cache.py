@@ -0,0 +1,135 @@
+"""Tests for the content-addressed shub analysis cache."""
+
+import os
+
+import numpy as np
+import pytest
+
+from shubniggurath.core import analysis_cache, audio_batch_engine as abe
+from shubniggurath.core.analysis_cache import AnalysisCache, hash_samples, make_cache_key
+from shubniggurath.pro.audio_io import load_audio, save_wav
+from shubniggurath.pro.mode_c_pipeline import ModeCConfig, ModeCPipeline, ProcessingMode
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    store = AnalysisCache(str(tmp_path / "cache.db"), max_bytes=1 << 20)
+    monkeypatch.setattr(analysis_cache, "_cache", store)
+    return store
+
+
+def _sine(freq=440.0, n=24000, sr=24000):
+    return (0.5 * np.sin(2 * np.pi * freq * np.arange(n) / sr)).astype(np.float32)
+
+
+def test_key_depends_on_content_version_and_params():
+    a = hash_samples(_sine(440), 24000)
+    b = hash_samples(_sine(880), 24000)
+    assert a != b
+    assert a == hash_samples(_sine(440).copy(), 24000)
+    assert hash_samples(_sine(440), 48000) != a
+
+    base = make_cache_key(a, "p", "1", {"mode": "x", "n": 1})
+    assert base == make_cache_key(a, "p", "1", {"n": 1, "mode": "x"})
+    assert base != make_cache_key(a, "p", "2", {"mode": "x", "n": 1})
+    assert base != make_cache_key(a, "p", "1", {"mode": "y", "n": 1})
+
+
+def test_roundtrip_converts_numpy_values(cache):
+    cache.put("k", "h", "p", {"lufs": np.float32(-14.5), "mfcc": np.arange(3)})
+    assert cache.get("k") == {"lufs": -14.5, "mfcc": [0, 1, 2]}
+    assert cache.get("missing") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_eviction_by_size(tmp_path):
+    store = AnalysisCache(str(tmp_path / "small.db"), max_bytes=250)
+    blob = "x" * 90
+    store.put("a", "h", "p", blob)
+    store.put("b", "h", "p", blob)
+    store.get("a")  # "b" pasa a ser el menos usado
+    store.put("c", "h", "p", blob)
+
+    assert store.get("b") is None
+    assert store.get("a") == blob
+    assert store.get("c") == blob
+    assert store.stats()["size_bytes"] <= 250
+
+
+def test_disabled_cache_is_a_no_op(tmp_path):
+    store = AnalysisCache(str(tmp_path / "off.db"), max_bytes=0)
+    store.put("k", "h", "p", {"x": 1})
+    assert store.get("k") is None
+    assert not os.path.exists(tmp_path / "off.db")
+
+
+def test_file_index_uses_the_decoded_signal_hash(cache, tmp_path):
+    path = tmp_path / "a.wav"
+    save_wav(path, _sine(), sample_rate=24000)
+    assert cache.lookup_file_hash(str(path)) is None
+
+    abe.analyze_audio_file(str(path), "full")
+    audio, sr = load_audio(str(path))
+    assert cache.lookup_file_hash(str(path)) == hash_samples(audio, sr)
+
+    # Archivo modificado (size/mtime) → fuera del índice
+    save_wav(path, _sine(880), sample_rate=24000)
+    os.utime(path, ns=(0, 0))
+    assert cache.lookup_file_hash(str(path)) is None
+
+
+def test_batch_worker_reuses_cached_analysis(cache, tmp_path, monkeypatch):
+    path = tmp_path / "tone.wav"
+    save_wav(path, _sine(), sample_rate=24000)
+
+    first = abe.analyze_audio_file(str(path), "full")
+    assert "cached" not in first
+
+    monkeypatch.setattr(abe, "load_audio", lambda p: pytest.fail("decoded again"))
+    second = abe.analyze_audio_file(str(path), "full")
+    assert second["cached"] is True
+    assert second["audio_analysis"] == first["audio_analysis"]
+
+
+def test_first_analysis_decodes_once(cache, tmp_path, monkeypatch):
+    path = tmp_path / "tone.wav"
+    save_wav(path, _sine(), sample_rate=24000)
+    calls = []
+    real_load = abe.load_audio
+    monkeypatch.setattr(abe, "load_audio", lambda p: calls.append(p) or real_load(p))
+
+    abe.analyze_audio_file(str(path), "full")
+    assert len(calls) == 1
+    assert cache.lookup_file_hash(str(path)) is not None
+
+
+def test_unusable_cache_db_falls_back_to_uncached_analysis(cache, tmp_path, monkeypatch):
+    path = tmp_path / "tone.wav"
+    save_wav(path, _sine(), sample_rate=24000)
+
+    def locked(*args, **kwargs):
+        raise analysis_cache.sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(analysis_cache.sqlite3, "connect", locked)
+    result = abe.analyze_audio_file(str(path), "full")
+    assert "cached" not in result and result["audio_analysis"]
+    assert cache.lookup_file_hash(str(path)) is None
+
+
+@pytest.mark.asyncio
+async def test_mode_c_batch_caches_chunk_analysis(cache, monkeypatch):
+    audio = _sine(n=48000, sr=48000)
+    pipeline = ModeCPipeline(ModeCConfig(mode=ProcessingMode.BATCH, chunk_size=8192))
+    first = await pipeline.process_batch(audio, sample_rate=48000)
+    assert first["success"], first
+    assert len(first["analysis"]) > 0
+
+    async def fail(*args, **kwargs):
+        pytest.fail("analysed again")
+
+    monkeypatch.setattr(pipeline.dsp_engine, "analyze_audio", fail)
+    second = await pipeline.process_batch(audio, sample_rate=48000)
+    assert second["success"], second
+    assert second["analysis"] == first["analysis"]
+    np.testing.assert_array_equal(second["output_audio"], first["output_audio"])
@@ -0,0 +1,153 @@
+"""Tests for AudioBatchEngine: priority queue, concurrent file workers, cancellation."""
+
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from shubniggurath.core import analysis_cache, audio_batch_engine as abe
+from shubniggurath.core.audio_batch_engine import (
+    AudioBatchEngine,
+    JOB_STATUS_CANCELLED,
+    JOB_STATUS_COMPLETED,
+)
+from shubniggurath.pro.audio_io import save_wav
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path, monkeypatch):
+    store = analysis_cache.AnalysisCache(str(tmp_path / "cache.db"), max_bytes=1 << 20)
+    monkeypatch.setattr(analysis_cache, "_cache", store)
+
+
+class _FakeBridge:
+    async def batch_submit(self, **kwargs):
+        return {"status": "success"}
+
+    async def notify_madre(self, **kwargs):
+        return {"status": "success"}
+
+    async def cleanup(self):
+        pass
+
+
+def _engine(max_workers):
+    engine = AudioBatchEngine(max_workers=max_workers)
+    engine.vx11_bridge = _FakeBridge()
+    return engine
+
+
+@pytest.fixture
+def sine_files(tmp_path):
+    paths = []
+    for i, freq in enumerate([220.0, 440.0, 880.0, 1760.0]):
+        t = np.arange(24000) / 24000
+        path = tmp_path / f"sine_{i}.wav"
+        save_wav(str(path), 0.5 * np.sin(2 * np.pi * freq * t), sample_rate=24000)
+        paths.append(str(path))
+    return paths
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_real_pipeline_on_sine_files(sine_files):
+    engine = _engine(max_workers=2)
+    enqueued = await engine.enqueue_job(audio_files=sine_files, job_name="sines")
+    await engine.process_queue()
+
+    job = engine.jobs[enqueued["job_id"]]
+    assert job.status == JOB_STATUS_COMPLETED
+    assert job.processed_files == 4
+    assert job.failed_files == 0
+    assert [r["file"] for r in job.results] == sine_files
+
+    centroids = [r["analysis"]["audio_analysis"]["spectral_centroid"] for r in job.results]
+    assert centroids == pytest.approx([220.0, 440.0, 880.0, 1760.0], rel=0.05)
+
+
+@pytest.mark.asyncio
+async def test_missing_file_counts_as_failed(sine_files, tmp_path):
+    engine = _engine(max_workers=2)
+    files = sine_files[:1] + [str(tmp_path / "missing.wav")]
+    enqueued = await engine.enqueue_job(audio_files=files)
+    await engine.process_queue()
+
+    job = engine.jobs[enqueued["job_id"]]
+    assert job.processed_files == 1
+    assert job.failed_files == 1
+    assert job.results[1]["status"] == "error"
+
+
+@pytest.mark.asyncio
+async def test_jobs_run_by_priority(monkeypatch):
+    order = []
+    monkeypatch.setattr(abe, "analyze_audio_file", lambda f, t: order.append(f) or {})
+
+    engine = _engine(max_workers=1)
+    low = await engine.enqueue_job(audio_files=["low.wav"], priority=1)
+    high = await engine.enqueue_job(audio_files=["high.wav"], priority=9)
+    assert high["queue_position"] == 1
+    assert low["queue_position"] == 1
+
+    await engine.process_queue()
+    assert order == ["high.wav", "low.wav"]
+
+
+@pytest.mark.asyncio
+async def test_file_workers_are_bounded(monkeypatch):
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+
+    def fake_analyze(audio_file, analysis_type):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.05)
+        with lock:
+            state["active"] -= 1
+        return {}
+
+    monkeypatch.setattr(abe, "analyze_audio_file", fake_analyze)
+
+    engine = _engine(max_workers=3)
+    enqueued = await engine.enqueue_job(audio_files=[f"f{i}.wav" for i in range(9)])
+    await engine.process_queue()
+
+    assert engine.jobs[enqueued["job_id"]].processed_files == 9
+    assert state["peak"] == 3
+
+
+@pytest.mark.asyncio
+async def test_cancel_running_job(monkeypatch):
+    monkeypatch.setattr(abe, "analyze_audio_file", lambda f, t: time.sleep(0.05) or {})
+
+    engine = _engine(max_workers=1)
+    enqueued = await engine.enqueue_job(audio_files=[f"f{i}.wav" for i in range(50)])
+    job = engine.jobs[enqueued["job_id"]]
+
+    runner = asyncio.create_task(engine.process_queue())
+    while job.processed_files < 2:
+        await asyncio.sleep(0.01)
+
+    cancelled = await engine.cancel_job(job.job_id)
+    await runner
+
+    assert cancelled["status"] == "success"
+    assert job.status == JOB_STATUS_CANCELLED
+    assert job.processed_files < 50
+    assert len(job.results) == job.processed_files
+
+
+@pytest.mark.asyncio
+async def test_cancelled_queued_job_is_skipped(monkeypatch):
+    monkeypatch.setattr(abe, "analyze_audio_file", lambda f, t: {})
+
+    engine = _engine(max_workers=1)
+    enqueued = await engine.enqueue_job(audio_files=["a.wav"])
+    await engine.cancel_job(enqueued["job_id"])
+    await engine.process_queue()
+
+    job = engine.jobs[enqueued["job_id"]]
+    assert job.status == JOB_STATUS_CANCELLED
+    assert job.processed_files == 0
@@ -0,0 +1,87 @@
+"""Tests for the numpy-native shub audio I/O layer."""
+
+import wave
+
+import numpy as np
+import pytest
+
+from shubniggurath.pro import audio_io
+from shubniggurath.pro.audio_io import audio_info, iter_audio_blocks, load_audio, save_wav
+
+
+@pytest.fixture(params=["soundfile", "wave"])
+def backend(request, monkeypatch):
+    if request.param == "wave":
+        monkeypatch.setattr(audio_io, "sf", None)
+    elif audio_io.sf is None:
+        pytest.skip("soundfile not installed")
+    return request.param
+
+
+def _sine(n=4800, freq=440.0, sr=48000):
+    return (0.5 * np.sin(2 * np.pi * freq * np.arange(n) / sr)).astype(np.float32)
+
+
+@pytest.mark.parametrize("bit_depth, tol", [(16, 1e-4), (24, 1e-6), (32, 1e-6)])
+def test_roundtrip_returns_float32_array(tmp_path, backend, bit_depth, tol):
+    path = tmp_path / "sine.wav"
+    signal = _sine()
+    save_wav(path, signal, sample_rate=48000, bit_depth=bit_depth)
+
+    data, sr = load_audio(str(path))
+    assert sr == 48000
+    assert isinstance(data, np.ndarray)
+    assert data.dtype == np.float32
+    assert data.flags.c_contiguous
+    np.testing.assert_allclose(data, signal, atol=tol)
+
+
+def test_save_clamps_out_of_range(tmp_path, backend):
+    path = tmp_path / "hot.wav"
+    save_wav(path, np.array([2.0, -3.0, 0.25], dtype=np.float32))
+
+    data, _ = load_audio(str(path))
+    np.testing.assert_allclose(data, [32767 / 32768, -32767 / 32768, 0.25], atol=1e-4)
+
+
+def test_stereo_downmix_and_multichannel(tmp_path, backend):
+    path = tmp_path / "stereo.wav"
+    stereo = np.stack([_sine(), np.zeros(4800, dtype=np.float32)], axis=1)
+    save_wav(path, stereo, sample_rate=48000)
+
+    mono, _ = load_audio(str(path))
+    both, _ = load_audio(str(path), mono=False)
+    assert mono.shape == (4800,)
+    assert both.shape == (4800, 2)
+    np.testing.assert_allclose(mono, stereo.mean(axis=1), atol=1e-4)
+    assert audio_info(str(path)) == (48000, 2, 4800)
+
+
+def test_block_reader_matches_full_load(tmp_path, backend):
+    path = tmp_path / "long.wav"
+    save_wav(path, _sine(n=10007), sample_rate=48000)
+
+    full, _ = load_audio(str(path))
+    blocks = list(iter_audio_blocks(str(path), block_frames=1000))
+    assert [len(b) for b in blocks] == [1000] * 10 + [7]
+    assert all(b.dtype == np.float32 for b in blocks)
+    np.testing.assert_array_equal(np.concatenate(blocks), full)
+
+
+def test_wave_fallback_decodes_unsigned_8bit(tmp_path, monkeypatch):
+    monkeypatch.setattr(audio_io, "sf", None)
+    path = tmp_path / "u8.wav"
+    with wave.open(str(path), "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(1)
+        wf.setframerate(8000)
+        wf.writeframes(bytes([0, 128, 255]))
+
+    data, sr = load_audio(str(path))
+    assert sr == 8000
+    np.testing.assert_allclose(data, [-1.0, 0.0, 127 / 128])
+
+
+def test_missing_file_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_audio(str(tmp_path / "nope.wav"))
@@ -0,0 +1,65 @@
+"""Tests for the shub DSP benchmark harness."""
+
+import json
+
+import numpy as np
+
+from shubniggurath.benchmarks import dsp_bench
+
+
+def test_signals_are_deterministic_and_shaped():
+    mono = dsp_bench.make_signal(0.5, 1, 8000)
+    stereo = dsp_bench.make_signal(0.5, 2, 8000)
+
+    assert mono.shape == (4000,) and mono.dtype == np.float32
+    assert stereo.shape == (4000, 2)
+    np.testing.assert_array_equal(mono, dsp_bench.make_signal(0.5, 1, 8000))
+    assert np.max(np.abs(mono)) == np.float32(dsp_bench.SIGNAL_PEAK)
+    assert not np.array_equal(stereo[:, 0], stereo[:, 1])
+
+
+def test_run_reports_time_rtf_and_memory():
+    report = dsp_bench.run_benchmarks(
+        durations=[0.5], channels=[1, 2], stages=["loudness.*", "dsp_fx.*"], repeats=1
+    )
+
+    assert report["meta"]["bench_version"] == dsp_bench.BENCH_VERSION
+    cases = {(e["stage"], e["channels"]) for e in report["results"]}
+    assert cases == {(s, c) for s in ("loudness.measure_loudness", "dsp_fx.fx_chain") for c in (1, 2)}
+    for entry in report["results"]:
+        assert entry["wall_s_min"] <= entry["wall_s_median"]
+        assert entry["rtf"] == entry["wall_s_median"] / 0.5
+        assert entry["peak_mem_mb"] > 0
+
+
+def _report(wall, mem, stage="dsp_fx.fx_chain"):
+    return {"results": [{"stage": stage, "duration_s": 5.0, "channels": 2,
+                         "wall_s_median": wall, "peak_mem_mb": mem}]}
+
+
+def test_compare_flags_time_and_memory_regressions():
+    baseline = _report(1.0, 10.0)
+
+    (row,) = dsp_bench.compare(_report(1.1, 10.0), baseline, threshold=0.25)
+    assert not row["regression"]
+    (row,) = dsp_bench.compare(_report(1.5, 10.0), baseline, threshold=0.25)
+    assert row["regression"] and row["time_ratio"] == 1.5
+    (row,) = dsp_bench.compare(_report(1.0, 20.0), baseline, threshold=0.25)
+    assert row["regression"]
+    assert dsp_bench.compare(_report(9.0, 9.0, stage="other"), baseline) == []
+
+
+def test_cli_saves_and_compares_baseline(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    args = ["--durations", "0.25", "--channels", "1", "--stages", "loudness.*", "--repeats", "1"]
+
+    assert dsp_bench.main(args + ["--save-baseline", str(baseline), "--output", str(tmp_path / "a.json")]) == 0
+    assert json.loads(baseline.read_text())["results"][0]["stage"] == "loudness.measure_loudness"
+
+    # A baseline 1000x faster than reality must be flagged
+    fast = json.loads(baseline.read_text())
+    fast["results"][0]["wall_s_median"] /= 1000
+    baseline.write_text(json.dumps(fast))
+    out = tmp_path / "b.json"
+    assert dsp_bench.main(args + ["--baseline", str(baseline), "--output", str(out)]) == 1
+    assert json.loads(out.read_text())["comparison"]["rows"][0]["regression"]
@@ -0,0 +1,254 @@
+"""Tests for shub pro DSP effects (dsp_fx)."""
+
+import numpy as np
+import pytest
+
+from scipy import signal
+
+from shubniggurath.pro.dsp_fx import (
+    CompressorEffect,
+    EQEffect,
+    Effect,
+    EffectConfig,
+    EffectType,
+    FXChain,
+    HighPassEffect,
+    LimiterEffect,
+    _time_coeff,
+)
+from shubniggurath.pro.filter_design import SOSStream, design_sos
+
+SR = 48000
+
+
+def _compressor(**params):
+    return CompressorEffect(EffectConfig(EffectType.COMPRESSOR, params=params), SR)
+
+
+def _reference_envelope(level, attack_ms, release_ms):
+    """Per-sample branching detector the vectorized one must reproduce."""
+    a_r = _time_coeff(release_ms, SR)
+    a_a = _time_coeff(attack_ms, SR)
+    peak = env = 0.0
+    out = np.zeros(len(level))
+    for i, v in enumerate(level):
+        peak = max(v, a_r * peak)
+        env = a_a * env + (1 - a_a) * peak
+        out[i] = env
+    return out
+
+
+def test_compressor_matches_per_sample_reference():
+    rng = np.random.default_rng(0)
+    audio = (rng.standard_normal(SR // 4) * 0.3).astype(np.float32)
+    comp = _compressor(threshold_db=-12, ratio=4, attack_ms=5, release_ms=80)
+
+    expected = comp._gain_curve(_reference_envelope(np.abs(audio.astype(np.float64)), 5, 80))
+    np.testing.assert_allclose(comp.compute_gain(audio), expected, rtol=1e-9, atol=1e-12)
+
+
+def test_compressor_honours_attack_and_release():
+    step = np.concatenate([np.full(SR // 10, 0.05), np.full(SR // 10, 1.0), np.full(SR // 5, 0.05)])
+    fast = _compressor(threshold_db=-20, ratio=10, attack_ms=1, release_ms=20).compute_gain(step)
+    slow = _compressor(threshold_db=-20, ratio=10, attack_ms=20, release_ms=200).compute_gain(step)
+
+    onset, offset = SR // 10, SR // 5
+    # Slower attack lets more of the transient through
+    assert slow[onset + 48] > fast[onset + 48]
+    # Slower release keeps gain reduction longer after the loud section
+    assert slow[offset + 2400] < fast[offset + 2400]
+    # Steady state reaches the static curve: 1.0 in, -20 dB threshold, 10:1
+    assert fast[offset - 1] == pytest.approx((1.0 / 0.1) ** (1 / 10 - 1), rel=1e-3)
+
+
+def test_compressor_below_threshold_is_transparent():
+    audio = (0.01 * np.sin(np.arange(4800) / 10)).astype(np.float32)
+    out = _compressor(threshold_db=-20).process(audio)
+    np.testing.assert_allclose(out, audio)
+    assert out.dtype == np.float32
+
+
+def test_compressor_links_stereo_channels():
+    left = np.full(4800, 0.9, dtype=np.float32)
+    right = np.full(4800, 0.1, dtype=np.float32)
+    out = _compressor(threshold_db=-20, attack_ms=0).process(np.stack([left, right], axis=1))
+    np.testing.assert_allclose(out[:, 0] / left, out[:, 1] / right, rtol=1e-6)
+
+
+def test_limiter_enforces_ceiling():
+    rng = np.random.default_rng(1)
+    audio = (rng.standard_normal(SR) * 0.8).astype(np.float32)
+    limiter = LimiterEffect(EffectConfig(EffectType.LIMITER, params={"threshold_db": -6}), SR)
+    out = limiter.process(audio)
+    assert np.max(np.abs(out)) <= 10 ** (-6 / 20) + 1e-6
+
+
+def test_lookahead_reduces_gain_before_transient():
+    audio = np.concatenate([np.full(4800, 0.05), np.full(4800, 1.0)]).astype(np.float32)
+    plain = _compressor(threshold_db=-20, attack_ms=2).compute_gain(audio)
+    ahead = _compressor(threshold_db=-20, attack_ms=2, lookahead_ms=2)
+    out = ahead.process(audio)
+    assert out[4799] / audio[4799] < plain[4799]
+
+
+def _noise(n=SR, channels=None, seed=2):
+    shape = (n,) if channels is None else (n, channels)
+    return np.random.default_rng(seed).standard_normal(shape).astype(np.float32)
+
+
+def test_design_sos_is_memoized():
+    first = design_sos("high", 4, 123.0, SR)
+    assert design_sos("high", 4, 123.0, SR) is first
+    assert design_sos("high", 4, 123.0, 44100) is not first
+
+
+def test_eq_offline_matches_filtfilt_reference():
+    audio = _noise()
+    eq = EQEffect(EffectConfig(EffectType.EQ, params={"low_gain_db": 3, "high_gain_db": -2}), SR)
+
+    b, a = signal.butter(1, 200 / (SR / 2), "low")
+    expected = audio + (signal.filtfilt(b, a, audio) - audio) * (10 ** (3 / 20) - 1)
+    b, a = signal.butter(1, 3000 / (SR / 2), "high")
+    expected = expected + (signal.filtfilt(b, a, audio) - audio) * (10 ** (-2 / 20) - 1)
+
+    np.testing.assert_allclose(eq.process(audio), expected, atol=1e-5)
+
+
+@pytest.mark.parametrize("effect_type, params", [
+    (EffectType.EQ, {"low_gain_db": 4, "high_gain_db": 2}),
+    (EffectType.HIGHPASS, {"cutoff_hz": 400, "order": 4}),
+])
+def test_block_streaming_matches_single_pass(effect_type, params):
+    audio = _noise(channels=2)
+    effect_cls = EQEffect if effect_type == EffectType.EQ else HighPassEffect
+    effect = effect_cls(EffectConfig(effect_type, params=params), SR)
+
+    streamed = np.concatenate([effect.process_block(b) for b in np.array_split(audio, 11)])
+    effect.reset()
+    single = effect.process_block(audio)
+
+    assert streamed.shape == audio.shape
+    np.testing.assert_allclose(streamed, single, atol=1e-5)
+
+
+def test_sos_stream_has_no_startup_transient_on_dc():
+    stream = SOSStream(design_sos("low", 2, 1000.0, SR))
+    out = stream.process(np.full(256, 0.5))
+    np.testing.assert_allclose(out, 0.5, atol=1e-9)
+
+
+def test_filter_stream_restarts_when_design_changes():
+    hp = HighPassEffect(EffectConfig(EffectType.HIGHPASS, params={"cutoff_hz": 500}), SR)
+    hp.process_block(_noise(1024))
+    first = hp.state["stream"]
+    hp.config.params["cutoff_hz"] = 1000
+    hp.process_block(_noise(1024))
+    assert hp.state["stream"] is not first
+
+
+def _chain(block_size=1024, **effects):
+    chain = FXChain(sample_rate=SR, block_size=block_size)
+    for effect_type, params in effects.items():
+        chain.add_effect_config(EffectConfig(EffectType(effect_type), params=params))
+    return chain
+
+
+CHAIN = {
+    "gain": {"gain_db": 6},
+    "highpass": {"cutoff_hz": 400, "order": 2},
+    "compressor": {"threshold_db": -18, "ratio": 4, "lookahead_ms": 1},
+    "limiter": {"threshold_db": -3},
+}
+
+
+def test_fused_chain_is_independent_of_block_size():
+    audio = _noise(channels=2) * 0.3
+    small = _chain(block_size=333, **CHAIN).process(audio)
+    whole = _chain(block_size=len(audio) * 2, **CHAIN).process(audio)
+
+    assert small.shape == audio.shape
+    np.testing.assert_allclose(small, whole, atol=1e-5)
+    assert np.max(np.abs(small)) <= 10 ** (-3 / 20) + 1e-6
+
+
+def test_fused_chain_compensates_lookahead_latency():
+    chain = _chain(compressor={"threshold_db": 0, "lookahead_ms": 2})
+    assert chain.latency_samples == 96
+    impulse = np.zeros(4800, dtype=np.float32)
+    impulse[100] = 0.5
+    out = chain.process(impulse)
+    assert np.argmax(np.abs(out)) == 100
+
+
+def test_fused_chain_does_not_touch_input():
+    audio = _noise(4096)
+    before = audio.copy()
+    _chain(**CHAIN).process(audio)
+    np.testing.assert_array_equal(audio, before)
+
+
+def test_chain_stream_blocks_match_offline_render():
+    audio = _noise(channels=2) * 0.3
+    effects = {k: v for k, v in CHAIN.items() if k != "compressor"}
+    offline = _chain(**effects).process(audio)
+
+    stream = _chain(**effects)
+    streamed = np.concatenate([stream.process_block(b.copy()) for b in np.array_split(audio, 7)])
+    np.testing.assert_allclose(streamed, offline, atol=1e-5)
+
+
+@pytest.mark.asyncio
+async def test_async_chain_matches_sync():
+    audio = _noise(20000)
+    expected = _chain(**CHAIN).process(audio)
+    result = await _chain(**CHAIN).process_async(audio, yield_every=2)
+    np.testing.assert_allclose(result, expected)
+
+
+class _FadeIn(Effect):
+    """Whole-buffer effect without process_block: ramps over the input it sees."""
+
+    def __init__(self):
+        super().__init__(EffectConfig(EffectType.GAIN), SR)
+        self.calls = 0
+
+    def process(self, audio):
+        self.calls += 1
+        ramp = np.linspace(0.0, 1.0, len(audio), dtype=audio.dtype)
+        return audio * ramp.reshape((-1,) + (1,) * (audio.ndim - 1))
+
+
+class _AsyncOnly(Effect):
+    def __init__(self):
+        super().__init__(EffectConfig(EffectType.GAIN), SR)
+
+    async def process_async(self, audio):
+        return audio * 0.5
+
+
+def test_effect_without_process_block_sees_whole_buffer():
+    audio = _noise(5000, channels=2) * 0.3
+    fade = _FadeIn()
+    chain = _chain(block_size=512, **CHAIN)
+    chain.effects.insert(1, fade)
+
+    reference = _chain(block_size=len(audio), gain=CHAIN["gain"]).process(audio)
+    reference = _FadeIn().process(reference)
+    rest = {k: v for k, v in CHAIN.items() if k != "gain"}
+    reference = _chain(block_size=len(audio), **rest).process(reference)
+
+    out = chain.process(audio)
+    assert fade.calls == 1
+    np.testing.assert_allclose(out, reference, atol=1e-5)
+
+
+@pytest.mark.asyncio
+async def test_async_chain_honours_effect_process_async():
+    audio = _noise(3000)
+    chain = _chain(block_size=256, gain={"gain_db": 0})
+    chain.add_effect(_AsyncOnly())
+
+    result = await chain.process_async(audio)
+    np.testing.assert_allclose(result, audio * 0.5, atol=1e-6)
+    # Sync render keeps using process(), which is the identity here
+    np.testing.assert_allclose(chain.process(audio), audio, atol=1e-6)
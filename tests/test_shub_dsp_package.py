@@ -0,0 +1,112 @@
+"""Tests for the vectorized shubniggurath.dsp helpers against the list-based originals."""
+
+import numpy as np
+import pytest
+
+from shubniggurath.dsp.analyzers import AudioAnalyzer
+from shubniggurath.dsp.filters import FilterBank
+from shubniggurath.dsp.segmenter import AudioSegmenter
+
+SR = 8000
+
+
+# -- list-based reference implementations (previous behaviour) ----------------
+
+
+def _ref_normalize(samples, target_peak=0.9):
+    if not samples:
+        return samples
+    current_peak = max(abs(s) for s in samples)
+    if current_peak == 0:
+        return samples
+    gain = target_peak / current_peak
+    return [max(min(s * gain, 1.0), -1.0) for s in samples]
+
+
+def _ref_balance(samples):
+    total = len(samples) or 1
+    thirds = total // 3 or 1
+    low = sum(abs(s) for s in samples[:thirds]) / thirds
+    mid = sum(abs(s) for s in samples[thirds: 2 * thirds]) / thirds
+    high = sum(abs(s) for s in samples[2 * thirds:]) / thirds
+    total_energy = low + mid + high or 1.0
+    return {"low": low / total_energy, "mid": mid / total_energy, "high": high / total_energy}
+
+
+def _ref_split(samples, sample_rate, window_seconds=5):
+    window_size = max(1, sample_rate * window_seconds)
+    segments = []
+    for idx in range(0, len(samples), window_size):
+        chunk = samples[idx: idx + window_size]
+        segments.append({
+            "index": len(segments),
+            "start_sec": idx / sample_rate,
+            "end_sec": (idx + len(chunk)) / sample_rate,
+            "peak": max(chunk),
+            "rms": (sum(s * s for s in chunk) / len(chunk)) ** 0.5,
+        })
+    return segments
+
+
+@pytest.fixture(params=[0, 1, 2, 7, SR * 12 + 123])
+def signal(request):
+    rng = np.random.default_rng(request.param)
+    return (rng.standard_normal(request.param) * 0.3).tolist()
+
+
+def test_filters_match_reference(signal):
+    bank = FilterBank()
+    assert bank.normalize(signal) == pytest.approx(_ref_normalize(signal))
+    assert bank.highpass(signal, 0.2) == [s if abs(s) > 0.2 else 0.0 for s in signal]
+    assert bank.estimate_balance(signal) == pytest.approx(_ref_balance(signal))
+
+
+def test_split_matches_reference(signal):
+    segments = AudioSegmenter().split(signal, SR)
+    if not signal:
+        assert segments == []
+        return
+    expected = _ref_split(signal, SR)
+    assert [s["index"] for s in segments] == [s["index"] for s in expected]
+    for got, want in zip(segments, expected):
+        assert got == pytest.approx(want)
+
+
+def test_numpy_in_numpy_out():
+    bank = FilterBank()
+    data = np.linspace(-0.5, 0.5, 101)
+    assert isinstance(bank.normalize(data), np.ndarray)
+    assert isinstance(bank.highpass(data), np.ndarray)
+    assert isinstance(bank.normalize(data.tolist()), list)
+    assert np.max(np.abs(bank.normalize(data))) == pytest.approx(0.9)
+
+
+def test_detect_silence_and_split_on_silence():
+    tone = 0.5 * np.sin(2 * np.pi * 440 * np.arange(SR) / SR)
+    audio = np.concatenate([tone, np.zeros(SR), tone])
+    segmenter = AudioSegmenter()
+
+    silences = segmenter.detect_silence(audio, SR)
+    assert len(silences) == 1
+    assert silences[0]["start_sec"] == pytest.approx(1.0, abs=0.02)
+    assert silences[0]["end_sec"] == pytest.approx(2.0, abs=0.02)
+
+    regions = segmenter.split_on_silence(audio, SR)
+    assert len(regions) == 2
+    assert regions[-1]["end_sec"] == pytest.approx(3.0)
+
+    # Silencios más cortos que el mínimo no cuentan
+    assert segmenter.detect_silence(audio, SR, min_silence_seconds=1.5) == []
+
+
+@pytest.mark.asyncio
+async def test_analyzer_accepts_lists_and_arrays(signal):
+    analyzer = AudioAnalyzer(FilterBank(), AudioSegmenter())
+    from_list = await analyzer.analyze(signal, SR)
+    from_array = await analyzer.analyze(np.asarray(signal), SR)
+
+    expected_rms = (sum(s * s for s in signal) / len(signal)) ** 0.5 if signal else 0.0
+    assert from_list["rms"] == pytest.approx(expected_rms)
+    assert from_list["peak"] == (max(signal) if signal else 0.0)
+    assert from_list["headline"] == from_array["headline"]
+    assert isinstance(from_list["rms"], float)
@@ -0,0 +1,117 @@
+"""Tests for the shub DSP process pool (shared-memory dispatch + fallback)."""
+
+import os
+
+import numpy as np
+import pytest
+
+from shubniggurath.core.dsp_pool import DSPProcessPool
+
+
+def _rms(audio, scale):
+    return float(np.sqrt(np.mean(audio ** 2)) * scale)
+
+
+def _worker_pid(audio):
+    return os.getpid(), audio.shape, str(audio.dtype), bool(audio.flags.writeable)
+
+
+def _fail(audio):
+    raise ValueError("feature failed")
+
+
+def _io_fail(audio):
+    raise OSError("feature could not read its model")
+
+
+@pytest.fixture
+def sine():
+    t = np.arange(48000, dtype=np.float32) / 48000
+    return np.sin(2 * np.pi * 440 * t).astype(np.float32)
+
+
+@pytest.mark.asyncio
+async def test_run_many_uses_worker_processes(sine):
+    pool = DSPProcessPool(max_workers=2)
+    try:
+        results = await pool.run_many(sine, [(_rms, (2.0,)), (_worker_pid, ())])
+    finally:
+        pool.shutdown()
+
+    assert results[0] == pytest.approx(np.sqrt(0.5) * 2.0, rel=1e-3)
+    pid, shape, dtype, writeable = results[1]
+    assert pid != os.getpid()
+    assert shape == sine.shape
+    assert dtype == "float32"
+    assert writeable is False
+
+
+@pytest.mark.asyncio
+async def test_zero_workers_runs_in_process(sine):
+    pool = DSPProcessPool(max_workers=0)
+    assert pool.enabled is False
+
+    pid, _, _, _ = await pool.run(_worker_pid, sine)
+    assert pid == os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_feature_errors_propagate(sine):
+    pool = DSPProcessPool(max_workers=1)
+    try:
+        with pytest.raises(ValueError):
+            await pool.run(_fail, sine)
+        # A feature error must not disable the pool
+        assert pool.enabled is True
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_feature_oserror_keeps_pool(sine):
+    pool = DSPProcessPool(max_workers=1)
+    try:
+        with pytest.raises(OSError, match="model"):
+            await pool.run(_io_fail, sine)
+        assert pool.enabled is True
+
+        pid, _, _, _ = await pool.run(_worker_pid, sine)
+        assert pid != os.getpid()
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_analyze_audio_runs_on_pool(sine, monkeypatch):
+    from shubniggurath.core import dsp_engine
+
+    pool = DSPProcessPool(max_workers=2)
+    dispatched = []
+    run_many = pool.run_many
+
+    async def spy(audio, calls):
+        dispatched.extend(func.__name__ for func, _ in calls)
+        return await run_many(audio, calls)
+
+    monkeypatch.setattr(pool, "run_many", spy)
+    monkeypatch.setattr(dsp_engine, "get_dsp_pool", lambda: pool)
+    try:
+        result = await dsp_engine.DSPEngine().analyze_audio(sine, sr=48000)
+        # Bound engine methods pickled to the workers without degrading
+        assert pool.enabled is True and pool._executor is not None
+    finally:
+        pool.shutdown()
+
+    assert "_compute_loudness" in dispatched and len(dispatched) == 6
+    assert result.loudness_lufs > -70.0
+    assert result.spectral_centroid == pytest.approx(440.0, rel=0.1)
+    assert result.key == "A"
+
+
+@pytest.mark.asyncio
+async def test_broken_pool_degrades_to_in_process(sine):
+    pool = DSPProcessPool(max_workers=1, start_method="no-such-method")
+
+    value = await pool.run(_rms, sine, 1.0)
+    assert value == pytest.approx(np.sqrt(0.5), rel=1e-3)
+    assert pool.enabled is False
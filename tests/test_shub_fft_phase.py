@@ -0,0 +1,62 @@
+"""Tests for the single-pass Welch band analysis in DSPPipelineFull phase 3."""
+
+import numpy as np
+import pytest
+
+from shubniggurath.core import dsp_pipeline_full as dpf
+from shubniggurath.core.dsp_pipeline_full import DSPPipelineFull, FREQ_BANDS
+
+SR = 48000
+
+
+def _tone(freq, seconds=2.0):
+    return 0.5 * np.sin(2 * np.pi * freq * np.arange(int(SR * seconds)) / SR)
+
+
+def test_band_energy_matches_masked_sum():
+    audio = np.random.default_rng(0).standard_normal(SR * 3)
+    pipeline = DSPPipelineFull()
+    result = pipeline._fase3_fft_analysis(audio, SR)
+
+    power = pipeline._welch_power(audio)
+    freqs = np.fft.rfftfreq(dpf.WELCH_NFFT, 1 / SR)
+    for name, (low, high) in FREQ_BANDS.items():
+        mask = (freqs >= low) & (freqs < high)
+        assert result["bands"][name]["energy"] == pytest.approx(power[mask].sum(), rel=1e-9)
+
+
+def test_welch_average_is_independent_of_batching(monkeypatch):
+    audio = np.random.default_rng(1).standard_normal(SR * 2)
+    pipeline = DSPPipelineFull()
+    reference = pipeline._welch_power(audio)
+    monkeypatch.setattr(dpf, "WELCH_BATCH_FRAMES", 3)
+    np.testing.assert_allclose(pipeline._welch_power(audio), reference, rtol=1e-12)
+
+
+@pytest.mark.parametrize("freq, band", [(100, "bass"), (1000, "mid"), (8000, "brilliance")])
+def test_tone_lands_in_its_band(freq, band):
+    result = DSPPipelineFull()._fase3_fft_analysis(_tone(freq), SR)
+    loudest = max(result["bands"], key=lambda b: result["bands"][b]["power_db"])
+    assert loudest == band
+    assert result["bands"][band]["power_db"] == pytest.approx(0.0, abs=0.1)
+    assert result["spectral_centroid"] == pytest.approx(freq, rel=0.05)
+
+
+def test_short_audio_is_zero_padded():
+    result = DSPPipelineFull()._fase3_fft_analysis(_tone(440, seconds=0.01), SR)
+    assert set(result["fft_multi"]) == {"fft_1024", "fft_2048", "fft_4096", "fft_8192"}
+    assert np.isfinite(result["fft_multi"]["fft_2048"]["flatness"])
+
+
+@pytest.mark.asyncio
+async def test_pipeline_logs_phases_once(monkeypatch):
+    messages = []
+    monkeypatch.setattr(dpf, "write_log", lambda module, msg, level="INFO": messages.append(msg))
+
+    audio = _tone(440, seconds=1.0).astype(np.float32)
+    result = await DSPPipelineFull().run_full_pipeline(audio.tobytes(), sample_rate=SR)
+
+    assert result["status"] == "success"
+    assert len(messages) == 2
+    assert messages[1].startswith("RUN_FULL_PIPELINE_COMPLETE")
+    assert "8:" in messages[1]
@@ -0,0 +1,123 @@
+"""Tests for incremental per-chunk analysis and the ModeC LRU cache."""
+
+import numpy as np
+import pytest
+
+from shubniggurath.core import analysis_cache
+from shubniggurath.core.analysis_cache import AnalysisCache
+from shubniggurath.pro.incremental_analysis import IncrementalAnalyzer
+from shubniggurath.pro.mode_c_pipeline import (
+    LRUCache,
+    ModeCConfig,
+    ModeCPipeline,
+    ProcessingMode,
+)
+
+SR = 48000
+
+
+def _sine(freq, seconds=1.0, amp=0.5):
+    t = np.arange(int(SR * seconds)) / SR
+    return amp * np.sin(2 * np.pi * freq * t)
+
+
+def _feed(analyzer, audio, chunk):
+    for start in range(0, len(audio), chunk):
+        snap = analyzer.update(audio[start:start + chunk])
+    return snap
+
+
+def test_chunking_does_not_change_results():
+    audio = np.concatenate([_sine(440), _sine(2000, amp=0.2)])
+    small = _feed(IncrementalAnalyzer(SR), audio, 256)
+    large = _feed(IncrementalAnalyzer(SR), audio, 12000)
+
+    for key in ("rms_db", "peak_db", "integrated_lufs", "momentary_lufs", "spectral_centroid_mean"):
+        assert small[key] == pytest.approx(large[key], rel=1e-9), key
+    assert small["stft_frames"] == large["stft_frames"]
+
+
+def test_levels_match_whole_signal():
+    audio = _sine(997)
+    snap = _feed(IncrementalAnalyzer(SR), audio, 1000)
+    assert snap["rms_db"] == pytest.approx(20 * np.log10(np.sqrt(np.mean(audio ** 2))), abs=1e-9)
+    assert snap["peak_db"] == pytest.approx(20 * np.log10(np.max(np.abs(audio))), abs=1e-9)
+    # Seno 997 Hz de amplitud 0.5 (-6 dBFS): -3.01 - 6.02 LUFS
+    assert snap["integrated_lufs"] == pytest.approx(-9.03, abs=0.05)
+
+
+def test_stft_frames_are_computed_once():
+    analyzer = IncrementalAnalyzer(SR, n_fft=2048, hop_length=512)
+    _feed(analyzer, np.zeros(SR), 300)
+    assert analyzer.frames == 1 + (SR - 2048) // 512
+    assert len(analyzer._pending) < 2048
+
+
+def test_centroid_tracks_latest_content():
+    analyzer = IncrementalAnalyzer(SR)
+    _feed(analyzer, _sine(500), 4096)
+    snap = _feed(analyzer, _sine(4000), 4096)
+    assert snap["spectral_centroid"] == pytest.approx(4000, rel=0.05)
+    assert 500 < snap["spectral_centroid_mean"] < 4000
+
+
+def test_onsets_detected_from_clicks():
+    audio = np.random.default_rng(0).standard_normal(SR * 2) * 1e-3
+    for t in (0.5, 1.0, 1.5):
+        i = int(t * SR)
+        audio[i:i + 2400] += _sine(1000, 0.05, amp=0.8)
+    snap = _feed(IncrementalAnalyzer(SR), audio, 512)
+    assert snap["onset_count"] == 3
+    assert snap["last_onset_time"] == pytest.approx(1.5, abs=0.05)
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "b" not in cache
+    assert list(cache.keys()) == ["a", "c"]
+
+
+@pytest.mark.asyncio
+async def test_mode_c_chunks_use_incremental_analysis():
+    pipeline = ModeCPipeline(ModeCConfig(mode=ProcessingMode.STREAMING, analysis_cache_size=4))
+    chunk = _sine(440, seconds=0.05).astype(np.float32)
+
+    for _ in range(10):
+        out = await pipeline.process_chunk(chunk)
+        assert out is chunk  # sin cadena de efectos no hay copia
+
+    assert len(pipeline.analysis_cache) == 4
+    assert pipeline.analysis_cache.get(9)["duration"] == pytest.approx(0.5)
+
+
+@pytest.mark.asyncio
+async def test_mode_c_fx_does_not_mutate_input():
+    pipeline = ModeCPipeline(ModeCConfig(mode=ProcessingMode.REALTIME))
+    pipeline.configure_fx_chain([{"type": "gain", "params": {"gain_db": -6}}])
+    chunk = _sine(440, seconds=0.05).astype(np.float32)
+    before = chunk.copy()
+
+    out = await pipeline.process_chunk(chunk, skip_analysis=True)
+    np.testing.assert_array_equal(chunk, before)
+    np.testing.assert_allclose(out, before * 10 ** (-6 / 20), rtol=1e-6)
+
+
+@pytest.mark.asyncio
+async def test_mode_c_batch_analyzes_at_the_batch_sample_rate(tmp_path, monkeypatch):
+    monkeypatch.setattr(analysis_cache, "_cache", AnalysisCache(str(tmp_path / "off.db"), 0))
+    sr = 44100
+    audio = (0.5 * np.sin(2 * np.pi * 997 * np.arange(sr) / sr)).astype(np.float32)
+    pipeline = ModeCPipeline(ModeCConfig(mode=ProcessingMode.BATCH, chunk_size=8192))
+
+    for _ in range(2):  # el segundo batch no hereda estado del primero
+        assert (await pipeline.process_batch(audio, sample_rate=sr))["success"]
+
+    expected = _feed(IncrementalAnalyzer(sample_rate=sr), audio, 8192)
+    snap = pipeline.analysis_cache.get(pipeline.chunk_counter - 1)
+    assert pipeline.analyzer.sample_rate == sr
+    assert snap["duration"] == pytest.approx(1.0)
+    assert snap == pytest.approx(expected)
@@ -0,0 +1,124 @@
+"""Tests for the streaming BS.1770 loudness meter."""
+
+import json
+
+import numpy as np
+import pytest
+
+from scipy import signal
+
+from shubniggurath.core.audio_batch_engine import _jsonable
+from shubniggurath.core.dsp_pipeline_full import DSPPipelineFull
+from shubniggurath.pro.audio_io import save_wav
+from shubniggurath.pro.loudness import (
+    ABSOLUTE_GATE_LUFS,
+    LoudnessMeter,
+    energy_to_lufs,
+    k_weighting_sos,
+    measure_file,
+    measure_loudness,
+)
+
+SR = 48000
+
+
+def _reference_integrated(audio, sr):
+    """Whole-signal BS.1770 reference: filter, 400 ms blocks, two gates."""
+    x = audio if audio.ndim > 1 else audio[:, np.newaxis]
+    y = signal.sosfilt(k_weighting_sos(sr).copy(), x, axis=0)
+    step = int(0.1 * sr)
+    n = len(y) // step
+    sub = (y[:n * step] ** 2).reshape(n, step, -1).mean(axis=1).sum(axis=1)
+    blocks = np.convolve(sub, np.ones(4) / 4, "valid")
+    gated = blocks[energy_to_lufs(blocks) > -70]
+    relative = energy_to_lufs(gated.mean()) - 10
+    return energy_to_lufs(gated[energy_to_lufs(gated) > relative].mean())
+
+
+def _ramped_noise(seconds=20, channels=2):
+    rng = np.random.default_rng(0)
+    envelope = np.repeat(np.linspace(0.01, 0.5, seconds), SR)[:, np.newaxis]
+    return rng.standard_normal((SR * seconds, channels)) * envelope
+
+
+def test_k_weighting_matches_published_48k_coefficients():
+    sos = k_weighting_sos(48000)
+    np.testing.assert_allclose(sos[0, :3], [1.53512485958697, -2.69169618940638, 1.19839281085285])
+    np.testing.assert_allclose(sos[0, 4:], [-1.69065929318241, 0.73248077421585])
+    np.testing.assert_allclose(sos[1, 4:], [-1.99004745483398, 0.99007225036621])
+
+
+def test_sine_reads_minus_3_lufs_per_channel():
+    t = np.arange(SR * 5) / SR
+    tone = np.sin(2 * np.pi * 997 * t)
+    assert measure_loudness(tone, SR)["integrated_lufs"] == pytest.approx(-3.01, abs=0.02)
+    stereo = np.stack([tone, tone], axis=1) * 10 ** (-23 / 20)
+    assert measure_loudness(stereo, SR)["integrated_lufs"] == pytest.approx(-23.0, abs=0.02)
+
+
+def test_gated_integrated_matches_reference():
+    audio = _ramped_noise()
+    result = measure_loudness(audio, SR)
+    assert result["integrated_lufs"] == pytest.approx(_reference_integrated(audio, SR), abs=0.01)
+    assert result["loudness_range_lu"] > 10
+
+
+@pytest.mark.parametrize("block", [1, 333, 4800, 100000])
+def test_result_independent_of_block_size(block):
+    audio = _ramped_noise(seconds=6)[:SR * 6 - 17]
+    whole = measure_loudness(audio, SR, block_frames=len(audio))
+    if block == 1:
+        audio = audio[:SR]  # bloques de 1 frame: solo 1 s para no eternizar
+        whole = measure_loudness(audio, SR, block_frames=len(audio))
+    chunked = measure_loudness(audio, SR, block_frames=block)
+    for key, value in whole.items():
+        assert chunked[key] == pytest.approx(value, abs=1e-9), key
+
+
+def test_silence_is_gated_out():
+    meter = LoudnessMeter(SR)
+    meter.update(np.zeros(SR * 2))
+    assert meter.integrated() == ABSOLUTE_GATE_LUFS
+    assert meter.loudness_range() == 0.0
+
+    tone = 0.1 * np.sin(2 * np.pi * 997 * np.arange(SR * 2) / SR)
+    meter.update(tone)
+    # El silencio previo queda fuera (solo cuentan los bloques de transición)
+    expected = _reference_integrated(np.concatenate([np.zeros(SR * 2), tone]), SR)
+    assert meter.integrated() == pytest.approx(expected, abs=0.01)
+    assert meter.integrated() > -23.5
+
+
+def test_momentary_and_short_term_windows():
+    meter = LoudnessMeter(SR)
+    meter.update(0.1 * np.sin(2 * np.pi * 997 * np.arange(SR * 3) / SR))
+    assert meter.momentary() == pytest.approx(-23.01, abs=0.05)
+    assert meter.short_term() == pytest.approx(-23.01, abs=0.05)
+    meter.update(np.zeros(SR // 2))
+    assert meter.momentary() < -60
+    assert meter.short_term_max == pytest.approx(-23.01, abs=0.05)
+
+
+def test_measure_file_streams_blocks(tmp_path):
+    audio = _ramped_noise(seconds=8) * 0.5
+    path = tmp_path / "noise.wav"
+    save_wav(path, audio, sample_rate=SR, bit_depth=24)
+    from_file = measure_file(str(path), block_frames=4096)
+    assert from_file["integrated_lufs"] == pytest.approx(
+        measure_loudness(audio, SR)["integrated_lufs"], abs=0.01
+    )
+
+
+@pytest.mark.parametrize(
+    "audio",
+    [np.zeros(SR, dtype=np.float32), 0.1 * np.ones(SR // 10, dtype=np.float32)],
+    ids=["silent", "shorter_than_a_block"],
+)
+@pytest.mark.asyncio
+async def test_pipeline_reports_finite_loudness(audio):
+    result = await DSPPipelineFull().run_full_pipeline(audio.tobytes(), sample_rate=SR)
+
+    assert result["status"] == "success"
+    assert result["audio_analysis"].lufs_integrated == ABSOLUTE_GATE_LUFS
+    # Lo que Starlette serializa (JSONResponse usa allow_nan=False)
+    json.dumps(_jsonable(result["audio_analysis"]), allow_nan=False)
@@ -0,0 +1,80 @@
+"""Tests for the ModeC preallocated SPSC ring buffer."""
+
+import numpy as np
+import pytest
+
+from shubniggurath.pro.mode_c_pipeline import StreamBuffer
+
+
+def _ramp(start, n):
+    return np.arange(start, start + n, dtype=np.float32)
+
+
+def test_fifo_order_across_wraparound():
+    buf = StreamBuffer(size=10)
+    out = []
+    pos = 0
+    for _ in range(20):
+        assert buf.write(_ramp(pos, 3)) == 3
+        pos += 3
+        out.append(buf.read(3))
+    np.testing.assert_array_equal(np.concatenate(out), _ramp(0, 60))
+    assert buf.available == 0
+
+
+def test_contiguous_window_is_zero_copy():
+    buf = StreamBuffer(size=16)
+    buf.write(_ramp(0, 8))
+    window = buf.peek(8)
+    assert np.shares_memory(window, buf.buffer)
+    np.testing.assert_array_equal(window, _ramp(0, 8))
+    assert buf.available == 8
+
+
+def test_wrapped_window_uses_preallocated_scratch():
+    buf = StreamBuffer(size=8)
+    buf.write(_ramp(0, 6))
+    buf.advance(6)
+    buf.write(_ramp(6, 5))  # ocupa [6, 7, 0, 1, 2]
+
+    window = buf.peek(5)
+    assert not np.shares_memory(window, buf.buffer)
+    assert np.shares_memory(window, buf._scratch)
+    np.testing.assert_array_equal(window, _ramp(6, 5))
+
+
+def test_overrun_drops_incoming_and_is_counted():
+    buf = StreamBuffer(size=8)
+    assert buf.write(_ramp(0, 6)) == 6
+    assert buf.write(_ramp(6, 5)) == 2
+    assert buf.overruns == 1
+    assert buf.dropped_frames == 3
+    np.testing.assert_array_equal(buf.read(8), _ramp(0, 8))
+
+
+def test_underrun_returns_none():
+    buf = StreamBuffer(size=8)
+    buf.write(_ramp(0, 2))
+    assert buf.peek(4) is None
+    assert buf.underruns == 1
+    with pytest.raises(ValueError):
+        buf.peek(9)
+
+
+def test_multichannel_read_into_caller_buffer():
+    buf = StreamBuffer(size=8, channels=2)
+    frames = np.stack([_ramp(0, 5), -_ramp(0, 5)], axis=1)
+    buf.write(frames)
+    out = np.empty((8, 2), dtype=np.float32)
+    result = buf.read(5, out=out)
+    assert result is out
+    np.testing.assert_array_equal(out[:5], frames)
+
+
+@pytest.mark.asyncio
+async def test_async_wrappers():
+    buf = StreamBuffer(size=8)
+    await buf.push(_ramp(0, 4))
+    assert await buf.get_size() == 4
+    np.testing.assert_array_equal(await buf.pop(4), _ramp(0, 4))
+    assert await buf.pop(1) is None
@@ -0,0 +1,185 @@
+"""Tests for batched / pipelined REAPER RPC calls against a fake REAPER."""
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from shubniggurath.integrations import reaper_rpc
+from shubniggurath.integrations.reaper_rpc import REAPERController
+
+N_TRACKS = 40
+
+
+class FakeReaper:
+    """In-process REAPER API that counts HTTP round-trips."""
+
+    def __init__(self, supports_batch=True):
+        self.requests = []
+        self.fx = {i: [f"fx-{i}"] for i in range(N_TRACKS)}
+        self.app = FastAPI()
+        self.supports_batch = supports_batch
+        self.app.add_api_route("/api/{path:path}", self.handle, methods=["GET", "POST"])
+
+    def dispatch(self, method, path, data):
+        parts = path.strip("/").split("/")
+        if parts == ["tracks"]:
+            return {"status": "success", "data": [{"index": i} for i in range(N_TRACKS)]}
+        if parts in (["health"], ["projects"]):
+            return {"status": "success", "data": []}
+        if parts == ["items"]:
+            return {"status": "success", "data": []}
+        if parts[0] == "tracks" and parts[2] == "fx":
+            return {"status": "success", "data": list(self.fx[int(parts[1])])}
+        if parts[0] == "tracks" and parts[2] == "apply_fx_chain":
+            self.fx[int(parts[1])] = [fx["name"] for fx in data["fx_chain"]["effects"]]
+            return {"status": "success", "track_index": int(parts[1])}
+        return {"status": "error", "message": f"unknown {path}"}
+
+    async def handle(self, path: str, request: Request):
+        self.requests.append((request.method, path))
+        data = await request.json() if request.method == "POST" else None
+        if path == "batch":
+            if not self.supports_batch:
+                return JSONResponse({"detail": "Not Found"}, status_code=404)
+            return {
+                "status": "success",
+                "responses": [
+                    {"id": op["id"], **self.dispatch(op["method"], op["path"], op["data"])}
+                    for op in data["requests"]
+                ],
+            }
+        return self.dispatch(request.method, "/" + path, data)
+
+
+def _controller(fake):
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=fake.app))
+    return REAPERController("reaper", 7899, http_client=client)
+
+
+@pytest.mark.asyncio
+async def test_inspect_project_uses_two_round_trips():
+    fake = FakeReaper()
+    rpc = _controller(fake)
+
+    project = await rpc.inspect_project()
+
+    assert project["status"] == "success"
+    assert len(project["tracks"]) == N_TRACKS
+    assert project["fx"][7] == ["fx-7"]
+    assert fake.requests == [("POST", "batch"), ("POST", "batch")]
+    await rpc.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_reads_are_cached_until_a_mutation():
+    fake = FakeReaper()
+    rpc = _controller(fake)
+
+    await rpc.inspect_project()
+    sent = len(fake.requests)
+    await rpc.inspect_project()
+    assert len(fake.requests) == sent  # served from cache
+
+    results = await rpc.apply_fx_chains({3: {"effects": [{"name": "eq"}]}})
+    assert results[3]["status"] == "success"
+
+    project = await rpc.inspect_project()
+    assert project["fx"][3] == ["eq"]
+    assert len(fake.requests) == sent + 3
+    await rpc.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_batch_context_resolves_futures_in_order():
+    fake = FakeReaper()
+    rpc = _controller(fake)
+
+    async with rpc.batch() as batch:
+        before = batch.add("GET", "/tracks/1/fx")
+        batch.add("POST", "/tracks/1/apply_fx_chain", {"fx_chain": {"effects": [{"name": "comp"}]}})
+        after = batch.add("GET", "/tracks/1/fx")
+
+    assert before.result()["data"] == ["fx-1"]
+    assert after.result()["data"] == ["comp"]
+    assert fake.requests == [("POST", "batch")]
+
+    # Only the read issued after the mutation is cached
+    assert (await rpc._http_call("GET", "/tracks/1/fx"))["data"] == ["comp"]
+    assert len(fake.requests) == 1
+    await rpc.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_batch_context_cancels_futures_on_error():
+    fake = FakeReaper()
+    rpc = _controller(fake)
+
+    with pytest.raises(RuntimeError):
+        async with rpc.batch() as batch:
+            queued = batch.add("POST", "/tracks/1/apply_fx_chain", {"fx_chain": {}})
+            raise RuntimeError("caller failed")
+
+    assert queued.cancelled()
+    assert fake.requests == []
+    await rpc.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_batch_flush_failure_reaches_futures(monkeypatch):
+    rpc = _controller(FakeReaper())
+
+    async def broken(operations):
+        raise ValueError("bad operation")
+
+    monkeypatch.setattr(rpc, "call_many", broken)
+    with pytest.raises(ValueError):
+        async with rpc.batch() as batch:
+            queued = batch.add("GET", "/tracks")
+
+    with pytest.raises(ValueError):
+        await queued
+    await rpc.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_pipelining_without_batch_endpoint():
+    fake = FakeReaper(supports_batch=False)
+    rpc = _controller(fake)
+
+    project = await rpc.inspect_project()
+
+    assert project["fx"][N_TRACKS - 1] == [f"fx-{N_TRACKS - 1}"]
+    assert rpc._batch_supported is False
+    assert fake.requests.count(("POST", "batch")) == 1
+    assert len(fake.requests) == 1 + 2 + N_TRACKS
+    await rpc.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_health_and_projects_always_reach_reaper():
+    fake = FakeReaper()
+    rpc = _controller(fake)
+
+    for _ in range(2):
+        await rpc._http_call("GET", "/health")
+        await rpc.call_many([("GET", "/projects", None)])
+
+    assert fake.requests == [("GET", "health"), ("POST", "batch")] * 2
+    await rpc.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_cached_reads_expire():
+    fake = FakeReaper()
+    rpc = _controller(fake)
+
+    await rpc._http_call("GET", "/tracks")
+    await rpc._http_call("GET", "/tracks")
+    assert len(fake.requests) == 1
+
+    expires_at, result = rpc._read_cache["/tracks"]
+    rpc._read_cache["/tracks"] = (expires_at - reaper_rpc.RPC_READ_CACHE_TTL_S, result)
+    await rpc._http_call("GET", "/tracks")
+    assert len(fake.requests) == 2
+    await rpc.cleanup()
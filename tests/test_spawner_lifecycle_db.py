@@ -0,0 +1,149 @@
+"""Tests for the single-session spawn lifecycle, bulk subtasks and the indexed reaper."""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import BackgroundTasks
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from config.db_schema import (
+    Base,
+    Daughter,
+    DaughterAttempt,
+    DaughterTask,
+    HijasRuntime,
+    HijasState,
+    Spawn,
+)
+from spawner import main as spawner_main
+from spawner.pool import SpawnPool
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'vx11.db'}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    engine.stats = {"sessions": 0, "statements": 0, "commits": 0}
+
+    def get_session(name="vx11"):
+        engine.stats["sessions"] += 1
+        return factory()
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _statement(*args):
+        engine.stats["statements"] += 1
+
+    @event.listens_for(engine, "commit")
+    def _commit(conn):
+        engine.stats["commits"] += 1
+
+    monkeypatch.setattr(spawner_main, "get_session", get_session)
+    monkeypatch.setattr(spawner_main, "SPOOL_DIR", str(tmp_path / "spool"))
+    monkeypatch.setattr(spawner_main, "_spawn_pool", SpawnPool())
+    engine.notified = []
+    monkeypatch.setattr(spawner_main, "_notify_madre", lambda *args: engine.notified.append(args))
+    engine.factory = factory
+    return engine
+
+
+def _reset(db):
+    for key in db.stats:
+        db.stats[key] = 0
+
+
+async def _spawn(db, **fields):
+    background = BackgroundTasks()
+    res = await spawner_main.spawn(spawner_main.SpawnRequest(**fields), background)
+    _reset(db)
+    await background()
+    return res
+
+
+@pytest.mark.asyncio
+async def test_successful_lifecycle_uses_one_session(db):
+    res = await _spawn(db, name="ok", cmd="echo hi")
+
+    assert db.stats["sessions"] == 1 and db.stats["commits"] == 2
+    assert db.stats["statements"] <= 14
+    with db.factory() as s:
+        spawn = s.query(Spawn).filter_by(uuid=res.spawn_uuid).one()
+        assert (spawn.status, spawn.exit_code, spawn.stdout) == ("completed", 0, "hi\n")
+        assert s.get(DaughterTask, res.daughter_task_id).status == "completed"
+        assert s.get(Daughter, res.daughter_id).status == "completed"
+        runtime = s.query(HijasRuntime).filter_by(name=f"hija-{res.daughter_id}").one()
+        assert runtime.state == "completed" and json.loads(runtime.death_context)["exit_code"] == 0
+        assert s.query(HijasState).filter_by(hija_id=str(res.daughter_id)).one().status == "completed"
+    assert db.notified[0][:2] == (res.daughter_id, "completed")
+
+
+@pytest.mark.asyncio
+async def test_retries_commit_once_per_transition(db):
+    res = await _spawn(db, name="bad", cmd="echo nope >&2; exit 3", max_retries=2)
+
+    # running + retry for attempt 1, running + final for attempt 2
+    assert db.stats["sessions"] == 1 and db.stats["commits"] == 4
+    with db.factory() as s:
+        attempts = s.query(DaughterAttempt).filter_by(daughter_id=res.daughter_id).all()
+        assert [(a.attempt_number, a.status) for a in attempts] == [(1, "error"), (2, "error")]
+        task = s.get(DaughterTask, res.daughter_task_id)
+        assert (task.status, task.current_retry) == ("failed", 1)
+        daughter = s.get(Daughter, res.daughter_id)
+        assert (daughter.status, daughter.mutation_level) == ("failed", 1)
+    assert db.notified[0][1] == "failed" and db.notified[0][2]["error"] == "nope\n"
+
+
+def test_subtasks_are_bulk_inserted_and_linked(db):
+    created = spawner_main._spawn_subtasks(
+        spawner_main.SpawnRequest(
+            name="parent", subtasks=[{"cmd": f"echo {i}"} for i in range(25)]
+        ),
+        parent_task_id=99,
+    )
+
+    assert created == 25
+    assert db.stats["commits"] == 1 and db.stats["statements"] <= 12
+    with db.factory() as s:
+        daughters = s.query(Daughter).all()
+        assert len(daughters) == 25
+        for daughter in daughters:
+            task = s.get(DaughterTask, daughter.task_id)
+            assert json.loads(task.metadata_json)["spawn_uuid"] == daughter.spawn_uuid
+            assert daughter.status == task.status == "running"
+            assert daughter.expires_at == daughter.started_at + timedelta(seconds=300)
+            attempt = s.query(DaughterAttempt).filter_by(daughter_id=daughter.id).one()
+            runtime = s.query(HijasRuntime).filter_by(name=f"hija-{daughter.id}").one()
+            assert json.loads(runtime.meta_json)["attempt_id"] == attempt.id
+        assert s.query(Spawn).count() == 25 and s.query(HijasState).count() == 25
+
+
+def test_reaper_updates_expired_rows_in_one_statement(db):
+    now = datetime.utcnow()
+    with db.factory() as s:
+        task = DaughterTask(source="t", task_type="long")
+        s.add(task)
+        s.flush()
+        for name, status, age in [
+            ("old", "running", 600),
+            ("old-done", "completed", 600),
+            ("fresh", "running", 10),
+            ("old-failed", "failed", 600),
+        ]:
+            s.add(Daughter(task_id=task.id, name=name, status=status, ttl_seconds=300,
+                           started_at=now - timedelta(seconds=age)))
+        s.commit()
+        # expires_at is derived from started_at + ttl on insert
+        assert s.query(Daughter).filter_by(name="fresh").one().expires_at > now
+
+    _reset(db)
+    assert spawner_main._reap_expired() == 2
+    assert db.stats["statements"] == 1
+    with db.factory() as s:
+        statuses = dict(s.query(Daughter.name, Daughter.status))
+    assert statuses == {
+        "old": "reaped", "old-done": "reaped", "fresh": "running", "old-failed": "failed"
+    }
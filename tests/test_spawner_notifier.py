@@ -0,0 +1,142 @@
+"""Tests for the asynchronous spawner -> madre notification queue."""
+
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from spawner import main as spawner_main
+from spawner.notifier import MadreNotifier
+
+
+def _endpoint(daughter_id, status):
+    return f"http://madre/madre/daughter/{daughter_id}/{status}"
+
+
+def _client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+async def _until(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_pending_notifications_coalesce_per_spawn(tmp_path):
+    seen = []
+
+    def handler(request):
+        seen.append((request.url.path, json.loads(request.content)))
+        return httpx.Response(200)
+
+    notifier = MadreNotifier(_endpoint, client=_client(handler))
+    notifier.enqueue(1, "running", {"spawn_uuid": "u1", "step": 1})
+    notifier.enqueue(1, "completed", {"spawn_uuid": "u1", "step": 2})
+    notifier.enqueue(2, "failed", {"spawn_uuid": "u2"})
+    assert len(notifier) == 2
+
+    notifier.start()
+    await _until(lambda: notifier.stats()["sent"] == 2)
+    await notifier.stop()
+
+    assert sorted(seen, key=lambda s: s[0]) == [
+        ("/madre/daughter/1/completed", {"spawn_uuid": "u1", "step": 2}),
+        ("/madre/daughter/2/failed", {"spawn_uuid": "u2"}),
+    ]
+    assert notifier.stats()["coalesced"] == 1 and len(notifier) == 0
+
+
+@pytest.mark.asyncio
+async def test_server_errors_are_retried_with_backoff():
+    calls = []
+
+    def handler(request):
+        calls.append(time.monotonic())
+        return httpx.Response(503 if len(calls) < 3 else 200)
+
+    notifier = MadreNotifier(_endpoint, base_delay_s=0.1, client=_client(handler))
+    notifier.start()
+    notifier.enqueue(7, "completed", {"spawn_uuid": "u7"})
+    await _until(lambda: notifier.stats()["sent"] == 1)
+    await notifier.stop()
+
+    assert len(calls) == 3 and notifier.stats()["retries"] == 2
+    # second retry waits at least half of base * 2
+    assert calls[2] - calls[1] >= 0.1
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(404)
+
+    notifier = MadreNotifier(_endpoint, client=_client(handler))
+    notifier.start()
+    notifier.enqueue(3, "completed", {"spawn_uuid": "u3"})
+    await _until(lambda: len(notifier) == 0)
+    await notifier.stop()
+    assert len(calls) == 1 and notifier.stats()["retries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_undelivered_notifications_survive_restart(tmp_path):
+    outbox = tmp_path / "outbox.json"
+
+    def down(request):
+        raise httpx.ConnectError("madre down", request=request)
+
+    notifier = MadreNotifier(_endpoint, outbox_path=str(outbox), client=_client(down))
+    notifier.start()
+    notifier.enqueue(4, "failed", {"spawn_uuid": "u4", "error": "boom"})
+    await _until(lambda: notifier.stats()["retries"] >= 1)
+    await notifier.stop()
+    saved = json.loads(outbox.read_text())["notifications"]
+    assert [(n["key"], n["attempts"]) for n in saved] == [("u4", 1)]
+
+    seen = []
+
+    def up(request):
+        seen.append(json.loads(request.content))
+        return httpx.Response(200)
+
+    restarted = MadreNotifier(_endpoint, outbox_path=str(outbox), client=_client(up))
+    restarted.start()
+    await _until(lambda: restarted.stats()["sent"] == 1)
+    await restarted.stop()
+    assert seen == [{"spawn_uuid": "u4", "error": "boom"}]
+    assert not outbox.exists()
+
+
+@pytest.mark.asyncio
+async def test_slow_madre_does_not_block_spawner(monkeypatch):
+    release = asyncio.Event()
+
+    async def handler(request):
+        await release.wait()
+        return httpx.Response(200)
+
+    notifier = MadreNotifier(_endpoint, client=_client(handler))
+    monkeypatch.setattr(spawner_main, "_notifier", notifier)
+    notifier.start()
+
+    start = time.perf_counter()
+    for i in range(50):
+        spawner_main._notify_madre(i, "completed", {"spawn_uuid": f"u{i}"})
+    assert time.perf_counter() - start < 0.1
+
+    transport = httpx.ASGITransport(app=spawner_main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://spawner") as client:
+        stats = (await client.get("/spawner/notifications")).json()["notifications"]
+    assert stats["pending"] == 50 and stats["sent"] == 0
+
+    release.set()
+    await _until(lambda: notifier.stats()["sent"] == 50)
+    await notifier.stop()
@@ -0,0 +1,110 @@
+"""Tests for streamed daughter output (spool files, SSE tail, bounded DB excerpt)."""
+
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from spawner import main as spawner_main
+
+
+@pytest.fixture(autouse=True)
+def spool_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(spawner_main, "SPOOL_DIR", str(tmp_path / "spool"))
+    monkeypatch.setattr(spawner_main, "_LIVE_OUTPUT", {})
+    return tmp_path / "spool"
+
+
+def _events(chunks):
+    out = []
+    for block in "".join(chunks).split("\n\n"):
+        if block.strip():
+            name, data = block.split("\n", 1)
+            out.append((name[len("event: ") :], json.loads(data[len("data: ") :])))
+    return out
+
+
+def test_spool_keeps_bounded_head_and_tail(tmp_path):
+    spool = spawner_main._Spool(str(tmp_path / "s.log"), max_bytes=10, head_bytes=4, tail_bytes=3)
+    spool.write(b"abc")
+    assert spool.excerpt() == "abc"
+    spool.write(b"defg")
+    assert spool.excerpt() == "abcdefg"
+    spool.write(b"hijklmnop")
+    spool.close()
+
+    assert spool.excerpt() == "abcd\n...[9 bytes omitted]...\nnop"
+    assert spool.total == 16 and spool.spooled == 10 and spool.truncated
+    assert (tmp_path / "s.log").read_bytes().startswith(b"abcdefghij\n[spool truncated")
+
+
+@pytest.mark.asyncio
+async def test_large_output_is_spooled_not_buffered(monkeypatch):
+    monkeypatch.setattr(spawner_main, "SPOOL_MAX_BYTES", 100_000)
+    output = spawner_main.SpawnOutput("big", 1)
+    code = "import sys; sys.stdout.write('x' * 3_000_000); sys.stderr.write('oops')"
+
+    exit_code, stdout, stderr, status = await spawner_main._execute_command(
+        code, 30, "python", output
+    )
+
+    assert (exit_code, status, stderr) == (0, "success", "oops")
+    assert len(stdout) < spawner_main.OUTPUT_HEAD_BYTES + spawner_main.OUTPUT_TAIL_BYTES + 64
+    assert "bytes omitted" in stdout
+    assert output.streams["stdout"].total == 3_000_000
+    assert len(output.streams["stdout"].tail) == spawner_main.OUTPUT_TAIL_BYTES
+
+
+@pytest.mark.asyncio
+async def test_timeout_kills_and_keeps_partial_output():
+    exit_code, stdout, _stderr, status = await spawner_main._execute_command(
+        "echo started; sleep 30", 1, None
+    )
+    assert (exit_code, status) == (-1, "timeout")
+    assert stdout == "started\n"
+
+
+@pytest.mark.asyncio
+async def test_live_tail_streams_before_process_exits():
+    output = spawner_main.SpawnOutput("live", 1)
+    spawner_main._set_live_output("live", output)
+    code = "import time; print('first', flush=True); time.sleep(1.5); print('second')"
+    run = asyncio.create_task(spawner_main._execute_command(code, 30, "python", output))
+
+    start = time.perf_counter()
+    seen = []
+    follower = spawner_main._follow_output("live", from_start=True)
+    async for chunk in follower:
+        seen.append(chunk)
+        if "first" in chunk:
+            break
+    assert time.perf_counter() - start < 1.0 and not run.done()
+
+    await run
+    spawner_main._set_live_output("live", None)
+    seen.extend([chunk async for chunk in follower])
+
+    events = _events(seen)
+    text = "".join(d["text"] for name, d in events if name == "stdout")
+    assert text == "first\nsecond\n"
+    assert events[-1] == ("end", {"exit_code": 0, "status": "success"})
+
+
+@pytest.mark.asyncio
+async def test_output_endpoint_serves_finished_spool(monkeypatch):
+    monkeypatch.setattr(spawner_main, "OUTPUT_TAIL_BYTES", 4)
+    output = spawner_main.SpawnOutput("done", 1)
+    await spawner_main._execute_command("printf 'hello world'", 30, "bash", output)
+
+    transport = httpx.ASGITransport(app=spawner_main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://spawner") as client:
+        res = await client.get("/process/uuid/done/output")
+        assert res.headers["content-type"].startswith("text/event-stream")
+        assert _events([res.text])[0] == ("stdout", {"text": "orld"})
+
+        res = await client.get("/process/uuid/done/output?from_start=true")
+        assert _events([res.text])[0] == ("stdout", {"text": "hello world"})
+
+        assert (await client.get("/process/uuid/missing/output")).status_code == 404
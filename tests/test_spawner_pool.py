@@ -0,0 +1,129 @@
+"""Tests for the spawner execution pool (concurrency cap, priority, admission)."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from spawner import main as spawner_main
+from spawner.pool import PoolSaturated, SpawnPool
+
+
+def _idle():
+    return 10.0, 10.0
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_capped():
+    pool = SpawnPool(max_concurrency=2, load_probe=_idle)
+    peak = 0
+
+    async def work():
+        nonlocal peak
+        async with pool.slot():
+            peak = max(peak, pool.running)
+            await asyncio.sleep(0.05)
+
+    await asyncio.gather(*(work() for _ in range(6)))
+    assert peak == 2
+    assert pool.running == 0 and pool.queued == 0
+    stats = pool.stats()
+    assert stats["admitted"] == 6 and stats["wait_ms"]["max"] >= 50
+
+
+@pytest.mark.asyncio
+async def test_waiters_start_by_priority_then_fifo():
+    pool = SpawnPool(max_concurrency=1, load_probe=_idle)
+    order = []
+
+    async def work(name, priority):
+        async with pool.slot(priority):
+            order.append(name)
+
+    await pool.acquire()
+    tasks = []
+    for name, priority in [("late", 5), ("high", 1), ("later", 5), ("urgent", 0)]:
+        tasks.append(asyncio.create_task(work(name, priority)))
+        await asyncio.sleep(0)
+    assert pool.queued == 4
+    pool.release()
+    await asyncio.gather(*tasks)
+    assert order == ["urgent", "high", "late", "later"]
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_fast_and_wait_times_out():
+    pool = SpawnPool(max_concurrency=1, max_queue=1, max_wait_s=0.05, load_probe=_idle)
+    await pool.acquire()
+    waiter = asyncio.create_task(pool.acquire())
+    await asyncio.sleep(0)
+
+    assert pool.saturated
+    with pytest.raises(PoolSaturated, match="queue_full"):
+        await pool.acquire()
+    with pytest.raises(PoolSaturated, match="no slot"):
+        await waiter
+
+    stats = pool.stats()
+    assert (stats["rejected"], stats["wait_timeouts"], stats["queued"]) == (1, 1, 0)
+    pool.release()
+    assert pool.running == 0
+
+
+@pytest.mark.asyncio
+async def test_busy_host_defers_until_load_drops():
+    load = {"cpu": 99.0}
+    pool = SpawnPool(
+        max_concurrency=4, recheck_s=0.02, load_probe=lambda: (load["cpu"], 40.0)
+    )
+    # Nothing running: always admitted, so the pool keeps making progress
+    await pool.acquire()
+    waiter = asyncio.create_task(pool.acquire())
+    await asyncio.sleep(0.1)
+    assert not waiter.done() and pool.load_deferrals >= 2
+
+    load["cpu"] = 20.0
+    await asyncio.wait_for(waiter, 1)
+    assert pool.running == 2
+    assert pool.stats()["host_load"] == {"cpu_percent": 20.0, "memory_percent": 40.0}
+
+
+@pytest.mark.asyncio
+async def test_spawn_endpoint_rejects_when_saturated(monkeypatch):
+    pool = SpawnPool(max_concurrency=1, max_queue=0, load_probe=_idle)
+    monkeypatch.setattr(spawner_main, "_spawn_pool", pool)
+    await pool.acquire()
+
+    transport = httpx.ASGITransport(app=spawner_main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://spawner") as client:
+        res = await client.post("/spawn", json={"name": "burst", "cmd": "true"})
+        assert res.status_code == 503 and res.headers["retry-after"] == "5"
+        stats = (await client.get("/spawner/pool")).json()["pool"]
+        assert stats["rejected"] == 1 and stats["running"] == 1
+
+
+@pytest.mark.asyncio
+async def test_attempt_without_slot_fails_as_saturated(tmp_path, monkeypatch):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from config.db_schema import Base
+
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'vx11.db'}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(spawner_main, "get_session", lambda name="vx11": sessionmaker(bind=engine)())
+    monkeypatch.setattr(spawner_main, "SPOOL_DIR", str(tmp_path / "spool"))
+    notified = []
+    monkeypatch.setattr(spawner_main, "_notify_madre", lambda *args: notified.append(args))
+    pool = SpawnPool(max_concurrency=1, max_wait_s=0.05, load_probe=_idle)
+    monkeypatch.setattr(spawner_main, "_spawn_pool", pool)
+
+    await pool.acquire()
+    await spawner_main._run_spawn_lifecycle(
+        "spawn-x", 1, 1, 1, "echo never", 30, max_retries=1, auto_retry=False, mutation_level=0
+    )
+    ((daughter_id, status, payload),) = notified
+    assert status == "failed" and payload["error"].startswith("spawner_saturated")
+    assert pool.running == 1 and pool.stats()["wait_timeouts"] == 1